@@ -19,7 +19,7 @@ Generic Framework API - FastAPI backend for web interface.
 """
 
 from fastapi import FastAPI, HTTPException, Response, BackgroundTasks, Request
-from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
@@ -39,8 +39,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.factory import DomainFactory
 from core.domain import DomainConfig
 from core.generic_domain import GenericDomain  # NEW: Use GenericDomain
-from core.phase1_engine import Phase1Engine  # Phase 1: New simplified engine
-from assist.engine import GenericAssistantEngine
+from core.phase1_engine import Phase1Engine, TRACE_LOG_PATH  # Phase 1: New simplified engine
+from core.domain_loader import DomainLoader
+from assist.engine import GenericAssistantEngine, TRACE_DIR
+from state.event_writer import flush_event_writers
+from state.trace_store import QueryLogStore, get_trace_store, maintain_periodically, summarize_query_events
 from diagnostics.search_metrics import SearchMetrics, SearchTrace, SearchOutcome
 from diagnostics.pattern_analyzer import PatternAnalyzer
 from diagnostics.health_checker import HealthChecker
@@ -60,6 +63,7 @@ class QueryRequest(BaseModel):
     show_thinking: Optional[bool] = False  # Show step-by-step reasoning before answer
     format: Optional[str] = None  # Output format: json, markdown, compact, table, etc.
     search_patterns: Optional[bool] = None  # Phase 1: Control pattern search (True/False/None=use config)
+    stream: Optional[bool] = False  # Stream the answer as Server-Sent Events (token, done, error)
 
 
 class ConfirmLLMRequest(BaseModel):
@@ -383,6 +387,15 @@ if brainuse_assets_path.exists():
 # Global state
 engines: Dict[str, GenericAssistantEngine] = {}  # Domain engines registry
 
+# Background index/rotation of the trace logs (started at startup, cancelled at shutdown)
+trace_maintenance_task: Optional[asyncio.Task] = None
+
+# Warms domain artifacts concurrently at startup, or on first query with DOMAIN_LAZY_LOAD
+domain_loader = DomainLoader(lazy=os.getenv("DOMAIN_LAZY_LOAD", "false").lower() in ("1", "true", "yes"))
+
+# Background embedding model / domain warm-up (started at startup, cancelled at shutdown)
+warmup_task: Optional[asyncio.Task] = None
+
 
 async def _regenerate_domain_embeddings(domain_id: str) -> None:
     """
@@ -477,7 +490,7 @@ async def startup_event():
 
     Loads all domains from the domains/ directory.
     """
-    global engines
+    global engines, trace_maintenance_task, warmup_task
 
     # Get the domains base path
     if os.getenv("APP_HOME"):
@@ -495,38 +508,25 @@ async def startup_event():
     # This ensures files from git clone are writable by the container user
     _ensure_writable_permissions(domains_base)
 
-    # Load all domains
+    # Register all domains; artifacts warm in the background with the embedding model
     try:
         await _load_all_domains(domains_base)
-        logger.info(f"✓ Loaded {len(engines)} domains")
-
-        # Get pattern counts
-        for domain_id, engine in engines.items():
-            if hasattr(engine, 'domain') and hasattr(engine.domain, 'knowledge_base'):
-                kb = engine.domain.knowledge_base
-                if kb and hasattr(kb, '_patterns'):
-                    pattern_count = len(kb._patterns)
-                    logger.info(f"    - {domain_id}: {pattern_count} patterns")
-
+        logger.info(f"✓ Registered {len(engines)} domains")
     except Exception as e:
         logger.error(f"✗ Failed to load domains: {e}")
         logger.exception(e)
 
-    # Pre-load embedding model at startup (before marking ready)
-    try:
-        import time
-        from core.embeddings import get_embedding_service
-        logger.info("Pre-loading embedding model...")
-        start = time.time()
-        service = get_embedding_service()
-        if service and service.is_available:
-            service.load_model()
-            elapsed = time.time() - start
-            logger.info(f"✓ Embedding model loaded in {elapsed:.1f}s")
-        else:
-            logger.info("✗ Embedding service not available")
-    except Exception as e:
-        logger.warning(f"✗ Failed to pre-load embedding model: {e}")
+    # Serve immediately; /health/ready reports "loading" until the warm-up is done
+    warmup_task = asyncio.create_task(_warm_up())
+
+    # Rotate and index trace logs even when nobody looks them up
+    trace_stores = [
+        get_trace_store(STATE_MACHINE_LOG_PATH),
+        get_trace_store(TRACE_DIR / "queries.log", QueryLogStore),
+    ]
+    if TRACE_LOG_PATH.resolve() != (TRACE_DIR / "queries.log").resolve():
+        trace_stores.append(get_trace_store(TRACE_LOG_PATH, QueryLogStore))
+    trace_maintenance_task = asyncio.create_task(maintain_periodically(trace_stores))
 
     # Initialize BrainUse database
     try:
@@ -545,9 +545,49 @@ async def startup_event():
     logger.info(f"=" * 60)
 
 
+async def _warm_up() -> None:
+    """Load the embedding model and (unless lazy) all domains concurrently."""
+    warmups = [_preload_embedding_model()]
+    if not domain_loader.lazy:
+        warmups.append(domain_loader.load_all())
+    await asyncio.gather(*warmups)
+
+
+async def _preload_embedding_model() -> None:
+    """Pre-load the embedding model (before marking ready), off the event loop."""
+    try:
+        import time
+        from core.embeddings import get_embedding_service
+        logger.info("Pre-loading embedding model...")
+        start = time.time()
+        service = get_embedding_service()
+        if service and service.is_available:
+            await asyncio.to_thread(service.load_model)
+            elapsed = time.time() - start
+            logger.info(f"✓ Embedding model loaded in {elapsed:.1f}s")
+        else:
+            logger.info("✗ Embedding service not available")
+    except Exception as e:
+        logger.warning(f"✗ Failed to pre-load embedding model: {e}")
+
+
+def _warm_domain(domain_dir: Path) -> None:
+    """Read a domain's config, patterns and vectors into the domain cache."""
+    from core.domain_cache import get_domain_cache, load_patterns_file, load_vector_store
+
+    get_domain_cache().load_json(domain_dir / "domain.json", kind="domain_config")
+    patterns_file = domain_dir / "patterns.json"
+    if patterns_file.exists():
+        load_patterns_file(patterns_file)
+        load_vector_store(domain_dir)
+
+
 async def _load_all_domains(domains_base: Path) -> None:
     """
     Load all domains from the domains directory.
+
+    Engines are registered immediately; each domain's artifacts are warmed
+    by domain_loader (at startup, or on first query in lazy mode).
     """
     global engines
 
@@ -574,6 +614,10 @@ async def _load_all_domains(domains_base: Path) -> None:
 
             # Register in global engines dict
             engines[domain_id] = engine
+            domain_loader.register(
+                domain_id,
+                lambda domain_dir=domain_dir: asyncio.to_thread(_warm_domain, domain_dir)
+            )
 
             logger.debug(f"✓ Loaded domain: {domain_id}")
 
@@ -685,6 +729,26 @@ async def _initialize_domain_registry(loaded_domains: List[Dict[str, Any]]) -> N
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
+    # Close pooled HTTP clients (LLM endpoints, web fetches)
+    from core.http_clients import close_http_clients
+    await close_http_clients()
+    logger.info("✓ HTTP client pools closed")
+
+    # Stop background document indexers
+    from core.document_indexer import stop_document_indexers
+    stop_document_indexers()
+
+    # Flush buffered state machine events
+    from state.event_writer import close_event_writers
+    close_event_writers()
+
+    # Stop trace log maintenance and any unfinished warm-up
+    if trace_maintenance_task is not None:
+        trace_maintenance_task.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    domain_loader.clear()
+
     # Cleanup universes
     if universe_manager:
         await universe_manager.unload_all()
@@ -802,6 +866,31 @@ async def health_check():
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness check: per-domain load state and the embedding model.
+
+    Returns 503 until startup loading has finished (in lazy mode, domains
+    that have not been queried yet count as ready to load).
+    """
+    from core.embeddings import get_embedding_service
+
+    summary = domain_loader.summary()
+    service = get_embedding_service()
+    embedding_ready = bool(service and (not service.is_available or service.is_loaded))
+    ready = summary['ready'] and embedding_ready
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "embedding_model_loaded": embedding_ready,
+            **summary
+        }
+    )
+
+
 @app.get("/api/domains")
 async def list_domains() -> Dict[str, Any]:
     """List available domains."""
@@ -1057,7 +1146,15 @@ async def process_query(request: QueryRequest) -> Response:
         curl -X POST "http://localhost:3000/api/query" \\
           -H "Content-Type: application/json" \\
           -d '{"query": "What is XOR?", "domain": "binary_symmetry", "format": "markdown"}'
+
+    Streaming (Server-Sent Events: `token` events, then one `done` event):
+        curl -N -X POST http://localhost:3000/api/query \\
+          -H "Content-Type: application/json" \\
+          -d '{"query": "What is XOR?", "domain": "binary_symmetry", "stream": true}'
     """
+    if request.stream:
+        return _stream_query_response(request)
+
     return await _process_query_impl(
         query=request.query,
         domain_id=request.domain,
@@ -1131,6 +1228,12 @@ async def process_query_phase1(request: QueryRequest) -> Response:
           -H "Content-Type: application/json" \\
           -d '{"query": "How to cook rice", "domain": "cooking", "search_patterns": true}'
     """
+    if request.stream:
+        return _stream_query_response(request)
+
+    if request.domain:
+        await domain_loader.ensure(request.domain)
+
     # Create Phase 1 engine instance
     phase1_engine = Phase1Engine(enable_trace=request.include_trace)
 
@@ -1144,37 +1247,79 @@ async def process_query_phase1(request: QueryRequest) -> Response:
             show_thinking=request.show_thinking or False  # Show reasoning flag
         )
 
-        # Map Phase 1 response format to frontend-expected format
-        # Frontend expects: response, specialist, confidence, query, llm_used, ai_generated
-        # Phase 1 returns: answer, persona_type, source, query, pattern_override_used
-        frontend_response = {
-            "response": result.get("answer", ""),  # Map answer → response
-            "specialist": result.get("persona_type", "General"),  # Map persona_type → specialist
-            "confidence": 0.9 if result.get("pattern_override_used") else 0.7,  # Synthetic confidence
-            "query": result.get("query", ""),
-            "llm_used": True,  # Phase 1 always uses LLM
-            "ai_generated": not result.get("pattern_override_used", False),  # True if no patterns used
-            "processing_time_ms": result.get("processing_time_ms", 0),
-            "trace": result.get("trace", []) if request.include_trace else [],  # Only include trace when requested
-            # Keep Phase 1 metadata for debugging
-            "phase1_metadata": {
-                "source": result.get("source"),
-                "persona_type": result.get("persona_type"),
-                "pattern_override_used": result.get("pattern_override_used"),
-                "search_patterns_enabled": result.get("search_patterns_enabled"),
-                "pattern_count": result.get("pattern_count", 0),
-                "engine_version": result.get("engine_version")
-            }
-        }
-
         # Return mapped result
-        return JSONResponse(content=frontend_response)
+        return JSONResponse(content=_phase1_frontend_response(result, request.include_trace))
 
     except Exception as e:
         logger.error(f"[Phase1] Error processing query: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _phase1_frontend_response(result: Dict[str, Any], include_trace: Optional[bool]) -> Dict[str, Any]:
+    """
+    Map Phase 1 response format to frontend-expected format.
+
+    Frontend expects: response, specialist, confidence, query, llm_used, ai_generated
+    Phase 1 returns: answer, persona_type, source, query, pattern_override_used
+    """
+    return {
+        "response": result.get("answer", ""),  # Map answer → response
+        "specialist": result.get("persona_type", "General"),  # Map persona_type → specialist
+        "confidence": 0.9 if result.get("pattern_override_used") else 0.7,  # Synthetic confidence
+        "query": result.get("query", ""),
+        "llm_used": True,  # Phase 1 always uses LLM
+        "ai_generated": not result.get("pattern_override_used", False),  # True if no patterns used
+        "processing_time_ms": result.get("processing_time_ms", 0),
+        "trace": result.get("trace", []) if include_trace else [],  # Only include trace when requested
+        # Keep Phase 1 metadata for debugging
+        "phase1_metadata": {
+            "source": result.get("source"),
+            "persona_type": result.get("persona_type"),
+            "pattern_override_used": result.get("pattern_override_used"),
+            "search_patterns_enabled": result.get("search_patterns_enabled"),
+            "pattern_count": result.get("pattern_count", 0),
+            "engine_version": result.get("engine_version")
+        }
+    }
+
+
+def _stream_query_response(request: QueryRequest) -> StreamingResponse:
+    """
+    Stream a Phase 1 query as Server-Sent Events.
+
+    Emits `token` events ({"text": ...}) as the LLM generates, then one
+    `done` event with the frontend response (sent after domain_log.md and
+    KCart have been written), or an `error` event.
+    """
+    from core.streaming import sse_event
+
+    domain_id = request.domain or "llm_consciousness"
+
+    # Phase 1 engines are stateless; legacy engines have no streaming path
+    engine = engines.get(domain_id)
+    if not hasattr(engine, "process_query_stream"):
+        engine = Phase1Engine(enable_trace=request.include_trace)
+
+    async def events():
+        await domain_loader.ensure(domain_id)
+        async for event in engine.process_query_stream(
+            query=request.query,
+            domain_name=domain_id,
+            context=request.context,
+            search_patterns=request.search_patterns,
+            show_thinking=request.show_thinking or False
+        ):
+            if event["type"] == "done":
+                event = {"type": "done", "response": _phase1_frontend_response(event["response"], request.include_trace)}
+            yield sse_event(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/query/confirm-llm")
 async def confirm_llm_fallback(request: ConfirmLLMRequest) -> Response:
     """
@@ -1241,6 +1386,7 @@ async def _process_query_impl(
         raise HTTPException(status_code=404, detail=f"Domain '{domain_id}' not found")
 
     engine = engines[domain_id]
+    await domain_loader.ensure(domain_id)
 
     try:
         # Extract llm_confirmed from context if present
@@ -1536,7 +1682,7 @@ async def get_traces(domain: Optional[str] = None, limit: int = 20) -> Dict[str,
 @app.get("/api/traces/log")
 async def get_traces_from_log(limit: int = 50) -> Dict[str, Any]:
     """Get recent query traces from log file (historical)."""
-    traces = GenericAssistantEngine.get_trace_from_log(limit)
+    traces = await asyncio.to_thread(GenericAssistantEngine.get_trace_from_log, limit)
 
     return {
         "count": len(traces),
@@ -1547,7 +1693,7 @@ async def get_traces_from_log(limit: int = 50) -> Dict[str, Any]:
 @app.get("/api/traces/{query_id}")
 async def get_trace_detail(query_id: str) -> Dict[str, Any]:
     """Get detailed trace for a specific query."""
-    trace = GenericAssistantEngine.get_trace_for_query(query_id)
+    trace = await asyncio.to_thread(GenericAssistantEngine.get_trace_for_query, query_id)
 
     if not trace:
         raise HTTPException(status_code=404, detail=f"Query trace '{query_id}' not found")
@@ -1583,22 +1729,12 @@ async def get_state_traces(
     """
     events = []
     try:
-        if STATE_MACHINE_LOG_PATH.exists():
-            with open(STATE_MACHINE_LOG_PATH, 'r') as f:
-                lines = f.readlines()[-limit:]  # Get last N lines
-                for line in reversed(lines):  # Most recent first
-                    try:
-                        event = json.loads(line.strip())
-                        # Apply filters
-                        if domain and event.get('data', {}).get('domain') != domain:
-                            continue
-                        if state and event.get('to_state') != state:
-                            continue
-                        events.append(event)
-                        if len(events) >= limit:
-                            break
-                    except json.JSONDecodeError:
-                        continue
+        # Buffered transitions must reach the log before it is read
+        await asyncio.to_thread(flush_event_writers)
+        # Indexed lookup: filters apply before the limit, newest first
+        events = await asyncio.to_thread(
+            get_trace_store(STATE_MACHINE_LOG_PATH).recent, limit, domain=domain, state=state
+        )
     except Exception as e:
         logger.error(f"Error reading state machine log: {e}")
 
@@ -1629,15 +1765,8 @@ async def get_state_trace_for_query(query_id: str) -> Dict[str, Any]:
     """
     events = []
     try:
-        if STATE_MACHINE_LOG_PATH.exists():
-            with open(STATE_MACHINE_LOG_PATH, 'r') as f:
-                for line in f:
-                    try:
-                        event = json.loads(line.strip())
-                        if event.get('query_id') == query_id:
-                            events.append(event)
-                    except json.JSONDecodeError:
-                        continue
+        await asyncio.to_thread(flush_event_writers)
+        events = await asyncio.to_thread(get_trace_store(STATE_MACHINE_LOG_PATH).events_for_query, query_id)
     except Exception as e:
         logger.error(f"Error reading state machine log: {e}")
 
@@ -1647,54 +1776,7 @@ async def get_state_trace_for_query(query_id: str) -> Dict[str, Any]:
             detail=f"Query '{query_id}' not found in state machine logs"
         )
 
-    # Calculate summary statistics
-    first_event = events[0]
-    last_event = events[-1]
-
-    # Calculate total duration
-    total_duration_ms = None
-    if len(events) >= 2:
-        first_time = datetime.fromisoformat(first_event['timestamp'].replace('Z', ''))
-        last_time = datetime.fromisoformat(last_event['timestamp'].replace('Z', ''))
-        total_duration_ms = int((last_time - first_time).total_seconds() * 1000)
-
-    # Extract unique states
-    unique_states = list(set(e['to_state'] for e in events))
-
-    # Check for errors
-    has_error = any(e['to_state'] == 'ERROR' for e in events)
-
-    # Extract components used
-    components_used = []
-    for event in events:
-        if 'component' in event.get('data', {}):
-            components_used.append(event['data']['component'])
-        elif 'enricher' in event.get('data', {}):
-            components_used.append(event['data']['enricher'])
-        elif 'formatter' in event.get('data', {}):
-            components_used.append(event['data']['formatter'])
-
-    # Count state transitions
-    state_counts = {}
-    for event in events:
-        to_state = event['to_state']
-        state_counts[to_state] = state_counts.get(to_state, 0) + 1
-
-    return {
-        "query_id": query_id,
-        "summary": {
-            "total_events": len(events),
-            "unique_states": unique_states,
-            "total_duration_ms": total_duration_ms,
-            "has_error": has_error,
-            "components_used": components_used,
-            "domain": events[0].get('data', {}).get('domain'),
-            "first_state": first_event.get('to_state'),
-            "final_state": last_event.get('to_state'),
-            "state_counts": state_counts
-        },
-        "events": events
-    }
+    return summarize_query_events(query_id, events)
 
 
 @app.get("/api/state-traces/summary")
@@ -1721,15 +1803,8 @@ async def get_state_traces_summary(
     """
     events = []
     try:
-        if STATE_MACHINE_LOG_PATH.exists():
-            with open(STATE_MACHINE_LOG_PATH, 'r') as f:
-                lines = f.readlines()[-limit:]
-                for line in lines:
-                    try:
-                        event = json.loads(line.strip())
-                        events.append(event)
-                    except json.JSONDecodeError:
-                        continue
+        await asyncio.to_thread(flush_event_writers)
+        events = list(reversed(await asyncio.to_thread(get_trace_store(STATE_MACHINE_LOG_PATH).recent, limit)))
     except Exception as e:
         logger.error(f"Error reading state machine log: {e}")
 
@@ -2885,29 +2960,33 @@ async def diagnostics_no_results(
 
 @app.get("/api/diagnostics/patterns/health")
 async def diagnostics_pattern_health(
-    domain_id: str
+    domain_id: str,
+    duplicate_threshold: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Get pattern health report for a domain.
 
     Query params:
         domain_id: Domain ID to analyze
+        duplicate_threshold: Content similarity above which patterns are duplicates (default: 0.9)
     """
     analyzer = get_pattern_analyzer_instance()
 
-    report = analyzer.analyze_domain(domain_id)
+    report = analyzer.analyze_domain(domain_id, duplicate_threshold)
     return report.to_dict()
 
 
 @app.get("/api/diagnostics/patterns/health/all")
 async def diagnostics_all_pattern_health(
-    domain_ids: Optional[str] = None
+    domain_ids: Optional[str] = None,
+    duplicate_threshold: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Get pattern health for all domains.
 
     Query params:
         domain_ids: Comma-separated domain IDs (default: all)
+        duplicate_threshold: Content similarity above which patterns are duplicates (default: 0.9)
     """
     analyzer = get_pattern_analyzer_instance()
 
@@ -2918,7 +2997,7 @@ async def diagnostics_all_pattern_health(
         pattern_path = Path(get_storage_path("dummy")).parent.parent
         domains = [d.name for d in pattern_path.iterdir() if d.is_dir()]
 
-    reports = analyzer.analyze_universe(domains)
+    reports = analyzer.analyze_universe(domains, duplicate_threshold)
 
     return {
         domain_id: report.to_dict()
@@ -2967,6 +3046,23 @@ async def diagnostics_summary() -> Dict[str, Any]:
     }
 
 
+@app.get("/api/diagnostics/cache")
+async def diagnostics_cache() -> Dict[str, Any]:
+    """
+    Get domain artifact and response cache statistics.
+
+    Reports hit/miss counters per artifact kind (domain_config, patterns,
+    vector_store) for the process-wide parsed-file cache, plus hit rates of
+    the per-domain semantic response caches under "response_cache".
+    """
+    from core.domain_cache import get_domain_cache
+    from core.response_cache import response_cache_stats
+
+    stats = get_domain_cache().stats()
+    stats["response_cache"] = response_cache_stats()
+    return stats
+
+
 @app.post("/api/diagnostics/self-test")
 async def run_self_test(
     background_tasks: BackgroundTasks
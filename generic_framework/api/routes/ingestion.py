@@ -33,6 +33,8 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+from .knowledge import graph_pattern_saved
+
 router = APIRouter(prefix="/ingestion", tags=["ingestion"])
 
 
@@ -119,6 +121,7 @@ async def ingest_from_text(request: TextIngestionRequest):
         pattern_file = patterns_dir / f"{pattern_data['id']}.json"
         with open(pattern_file, 'w') as f:
             json.dump(pattern_data, f, indent=2)
+        graph_pattern_saved(request.domain, pattern_data)
         
         return {
             "status": "created",
@@ -149,6 +152,7 @@ async def ingest_from_json(request: JsonIngestionRequest):
         pattern_file = patterns_dir / f"{pattern_data['id']}.json"
         with open(pattern_file, 'w') as f:
             json.dump(pattern_data, f, indent=2)
+        graph_pattern_saved(request.domain, pattern_data)
         
         return {
             "status": "created",
@@ -211,6 +215,7 @@ async def process_batch(job_id: str, files: List[Dict[str, Any]], domain: str):
             pattern_file = patterns_dir / f"{file_data['id']}.json"
             with open(pattern_file, 'w') as f:
                 json.dump(file_data, f, indent=2)
+            graph_pattern_saved(domain, file_data)
             
             job.processed += 1
         except Exception as e:
@@ -321,6 +326,7 @@ async def process_inbox_files(job_id: str, files: List[Path], domain: str):
             pattern_file = patterns_dir / f"{pattern_data['id']}.json"
             with open(pattern_file, 'w') as f:
                 json.dump(pattern_data, f, indent=2)
+            graph_pattern_saved(domain, pattern_data)
             
             # Move processed file to archive
             archive_dir = Path("pattern-inbox/processed")
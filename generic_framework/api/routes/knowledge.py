@@ -24,7 +24,9 @@ Migrated from Expertise Scanner.
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from collections import deque
 import json
+import threading
 from pathlib import Path
 
 router = APIRouter(prefix="/knowledge", tags=["knowledge"])
@@ -56,6 +58,7 @@ class GraphQuery(BaseModel):
 
 # Knowledge graph storage
 KNOWLEDGE_GRAPH_DIR = Path("data/knowledge_graph")
+PATTERNS_DIR = Path("data/patterns")
 
 
 def load_graph() -> Dict[str, Any]:
@@ -78,107 +81,249 @@ def save_graph(graph: Dict[str, Any]) -> None:
         json.dump(graph, f, indent=2)
 
 
+def pattern_to_graph(domain: str, pattern: Dict[str, Any], pattern_id: Optional[str] = None) -> tuple:
+    """Node and relationship edges for one pattern."""
+    pattern_id = pattern.get("id", pattern_id)
+    node = {
+        "id": pattern_id,
+        "label": pattern.get("name", "Unknown"),
+        "type": "pattern",
+        "domain": domain,
+        "metadata": {
+            "pattern_type": pattern.get("pattern_type"),
+            "confidence": pattern.get("confidence", 0.5),
+            "category": pattern.get("category"),
+        },
+    }
+
+    edges = []
+    for related_id in pattern.get("related_patterns", []):
+        edges.append({"source": pattern_id, "target": related_id, "relationship": "related", "weight": 1.0})
+    for prereq_id in pattern.get("prerequisites", []):
+        edges.append({"source": prereq_id, "target": pattern_id, "relationship": "prerequisite", "weight": 1.0})
+    for alt_id in pattern.get("alternatives", []):
+        edges.append({"source": pattern_id, "target": alt_id, "relationship": "alternative", "weight": 0.5})
+
+    return node, edges
+
+
 def build_graph_from_patterns() -> Dict[str, Any]:
     """Build knowledge graph from patterns."""
     graph = {"nodes": [], "edges": []}
-    patterns_dir = Path("data/patterns")
-    
-    if not patterns_dir.exists():
+
+    if not PATTERNS_DIR.exists():
         return graph
-    
+
     # Load all patterns and create nodes
     node_ids = set()
-    for domain_dir in patterns_dir.glob("*/"):
+    for domain_dir in PATTERNS_DIR.glob("*/"):
         if not domain_dir.is_dir():
             continue
-        
-        domain = domain_dir.name
-        
+
         for pattern_file in domain_dir.glob("*.json"):
             try:
                 with open(pattern_file) as f:
                     pattern = json.load(f)
-                
-                pattern_id = pattern.get("id", pattern_file.stem)
-                
-                if pattern_id not in node_ids:
-                    node = {
-                        "id": pattern_id,
-                        "label": pattern.get("name", "Unknown"),
-                        "type": "pattern",
-                        "domain": domain,
-                        "metadata": {
-                            "pattern_type": pattern.get("pattern_type"),
-                            "confidence": pattern.get("confidence", 0.5),
-                            "category": pattern.get("category"),
-                        },
-                    }
+
+                node, edges = pattern_to_graph(domain_dir.name, pattern, pattern_file.stem)
+                if node["id"] not in node_ids:
                     graph["nodes"].append(node)
-                    node_ids.add(pattern_id)
-                
-                # Create edges for relationships
-                for related_id in pattern.get("related_patterns", []):
-                    edge = {
-                        "source": pattern_id,
-                        "target": related_id,
-                        "relationship": "related",
-                        "weight": 1.0,
-                    }
-                    graph["edges"].append(edge)
-                
-                for prereq_id in pattern.get("prerequisites", []):
-                    edge = {
-                        "source": prereq_id,
-                        "target": pattern_id,
-                        "relationship": "prerequisite",
-                        "weight": 1.0,
-                    }
-                    graph["edges"].append(edge)
-                
-                for alt_id in pattern.get("alternatives", []):
-                    edge = {
-                        "source": pattern_id,
-                        "target": alt_id,
-                        "relationship": "alternative",
-                        "weight": 0.5,
-                    }
-                    graph["edges"].append(edge)
+                    node_ids.add(node["id"])
+                graph["edges"].extend(edges)
             except Exception:
                 continue
-    
+
     return graph
 
 
+class KnowledgeGraph:
+    """
+    In-memory knowledge graph with id and adjacency indexes.
+
+    Nodes are keyed by id and every edge is listed under both of its
+    endpoints, so neighbour lookups are O(degree) instead of scans of the
+    edge and node lists. Edges are also grouped by the pattern whose file
+    declares them (the target of a prerequisite edge, the source
+    otherwise), which lets a pattern write replace just that pattern's node
+    and edges. Domain/relationship counts are maintained as the graph
+    changes so stats are O(1).
+    """
+
+    def __init__(self, graph: Optional[Dict[str, Any]] = None):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self._adjacent: Dict[str, List[Dict[str, Any]]] = {}
+        self._owned: Dict[str, List[Dict[str, Any]]] = {}
+        self._domain_counts: Dict[str, int] = {}
+        self._relationship_counts: Dict[str, int] = {}
+        self._edge_count = 0
+
+        graph = graph or {"nodes": [], "edges": []}
+        for node in graph["nodes"]:
+            if node["id"] not in self.nodes:
+                self._add_node(node)
+        for edge in graph["edges"]:
+            self._add_edge(edge)
+
+    @staticmethod
+    def edge_owner(edge: Dict[str, Any]) -> str:
+        """Id of the pattern that declares an edge."""
+        return edge["target"] if edge.get("relationship") == "prerequisite" else edge["source"]
+
+    def set_pattern(self, domain: str, pattern: Dict[str, Any], pattern_id: Optional[str] = None) -> None:
+        """Add or replace a pattern's node and the edges it declares."""
+        node, edges = pattern_to_graph(domain, pattern, pattern_id)
+        self.remove_pattern(node["id"])
+        self._add_node(node)
+        for edge in edges:
+            self._add_edge(edge)
+
+    def remove_pattern(self, pattern_id: str) -> None:
+        """Remove a pattern's node and the edges it declares."""
+        node = self.nodes.pop(pattern_id, None)
+        if node is not None:
+            self._count(self._domain_counts, node.get("domain", "unknown"), -1)
+        for edge in self._owned.pop(pattern_id, []):
+            for endpoint in {edge["source"], edge["target"]}:
+                self._adjacent[endpoint] = [e for e in self._adjacent[endpoint] if e is not edge]
+                if not self._adjacent[endpoint]:
+                    del self._adjacent[endpoint]
+            self._count(self._relationship_counts, edge.get("relationship", "unknown"), -1)
+            self._edge_count -= 1
+
+    def neighbours(self, node_id: str) -> List[Dict[str, Any]]:
+        """Edges with node_id as source or target."""
+        return self._adjacent.get(node_id, [])
+
+    def query(
+        self,
+        start_node: str,
+        max_depth: int,
+        relationship_types: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Breadth-first traversal from start_node.
+
+        Args:
+            start_node: Node to start from
+            max_depth: Maximum hops from start_node
+            relationship_types: Only follow edges of these types
+
+        Returns:
+            Dictionary with reached 'nodes' and traversed 'edges'
+        """
+        allowed = set(relationship_types) if relationship_types else None
+        result_nodes = [self.nodes[start_node]]
+        result_edges = []
+        seen = {start_node}
+        queue = deque([(start_node, 0)])
+
+        while queue:
+            current_id, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+
+            for edge in self.neighbours(current_id):
+                if allowed is not None and edge["relationship"] not in allowed:
+                    continue
+                other_id = edge["target"] if edge["source"] == current_id else edge["source"]
+                if other_id in seen or other_id not in self.nodes:
+                    continue
+                seen.add(other_id)
+                result_nodes.append(self.nodes[other_id])
+                result_edges.append(edge)
+                queue.append((other_id, depth + 1))
+
+        return {"nodes": result_nodes, "edges": result_edges}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": list(self.nodes.values()),
+            "edges": [edge for edges in self._owned.values() for edge in edges],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total_nodes": len(self.nodes),
+            "total_edges": self._edge_count,
+            "domains": dict(self._domain_counts),
+            "relationships": dict(self._relationship_counts),
+            "avg_degree": self._edge_count * 2 / len(self.nodes) if self.nodes else 0,
+        }
+
+    def _add_node(self, node: Dict[str, Any]) -> None:
+        self.nodes[node["id"]] = node
+        self._count(self._domain_counts, node.get("domain", "unknown"), 1)
+
+    def _add_edge(self, edge: Dict[str, Any]) -> None:
+        self._owned.setdefault(self.edge_owner(edge), []).append(edge)
+        for endpoint in {edge["source"], edge["target"]}:
+            self._adjacent.setdefault(endpoint, []).append(edge)
+        self._count(self._relationship_counts, edge.get("relationship", "unknown"), 1)
+        self._edge_count += 1
+
+    @staticmethod
+    def _count(counts: Dict[str, int], key: str, delta: int) -> None:
+        counts[key] = counts.get(key, 0) + delta
+        if counts[key] <= 0:
+            del counts[key]
+
+
+# Graph cache, built on first use and kept current by pattern writes
+_graph: Optional[KnowledgeGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_knowledge_graph(rebuild: bool = False) -> KnowledgeGraph:
+    """
+    Get the cached graph, loading graph.json (or building it from patterns) on first use.
+
+    Args:
+        rebuild: Rebuild from the pattern files and save graph.json
+    """
+    global _graph
+    with _graph_lock:
+        if _graph is None or rebuild:
+            graph = None if rebuild else load_graph()
+            if not graph or not graph["nodes"]:
+                graph = build_graph_from_patterns()
+                save_graph(graph)
+            _graph = KnowledgeGraph(graph)
+        return _graph
+
+
+def graph_pattern_saved(domain: str, pattern: Dict[str, Any], pattern_id: Optional[str] = None) -> None:
+    """Update the cached graph after a pattern file is written."""
+    with _graph_lock:
+        if _graph is not None:
+            _graph.set_pattern(domain, pattern, pattern_id)
+
+
+def graph_pattern_deleted(pattern_id: str) -> None:
+    """Update the cached graph after a pattern file is deleted."""
+    with _graph_lock:
+        if _graph is not None:
+            _graph.remove_pattern(pattern_id)
+
+
 @router.get("/graph", response_model=Dict[str, Any])
 async def get_graph(
     domain: Optional[str] = Query(None),
     rebuild: bool = Query(False),
 ):
     """Get the knowledge graph."""
-    if rebuild:
-        # Rebuild from patterns
-        graph = build_graph_from_patterns()
-        save_graph(graph)
-    else:
-        # Load from disk
-        graph = load_graph()
-        
-        # If empty, build from patterns
-        if not graph["nodes"]:
-            graph = build_graph_from_patterns()
-            save_graph(graph)
-    
+    graph = get_knowledge_graph(rebuild=rebuild).to_dict()
+
     # Filter by domain if specified
     if domain:
         filtered_nodes = [n for n in graph["nodes"] if n.get("domain") == domain]
         node_ids = {n["id"] for n in filtered_nodes}
         filtered_edges = [e for e in graph["edges"] if e["source"] in node_ids and e["target"] in node_ids]
-        
+
         return {
             "nodes": filtered_nodes,
             "edges": filtered_edges,
         }
-    
+
     return graph
 
 
@@ -188,21 +333,16 @@ async def get_graph_nodes(
     node_type: Optional[str] = Query(None),
 ):
     """Get all nodes in the knowledge graph."""
-    graph = load_graph()
-    
-    if not graph["nodes"]:
-        graph = build_graph_from_patterns()
-    
-    nodes = graph["nodes"]
-    
+    nodes = list(get_knowledge_graph().nodes.values())
+
     # Filter by domain
     if domain:
         nodes = [n for n in nodes if n.get("domain") == domain]
-    
+
     # Filter by type
     if node_type:
         nodes = [n for n in nodes if n.get("type") == node_type]
-    
+
     return [GraphNode(**n) for n in nodes]
 
 
@@ -211,86 +351,29 @@ async def get_graph_edges(
     relationship: Optional[str] = Query(None),
 ):
     """Get all edges in the knowledge graph."""
-    graph = load_graph()
-    
-    if not graph["edges"]:
-        graph = build_graph_from_patterns()
-    
-    edges = graph["edges"]
-    
+    edges = get_knowledge_graph().to_dict()["edges"]
+
     # Filter by relationship type
     if relationship:
         edges = [e for e in edges if e.get("relationship") == relationship]
-    
+
     return [GraphEdge(**e) for e in edges]
 
 
 @router.post("/graph/query", response_model=Dict[str, Any])
 async def query_graph(query: GraphQuery):
     """Query the knowledge graph."""
-    graph = load_graph()
-    
-    if not graph["nodes"]:
-        graph = build_graph_from_patterns()
-    
-    # Find start node
-    start_node = None
-    for node in graph["nodes"]:
-        if node["id"] == query.start_node:
-            start_node = node
-            break
-    
-    if not start_node:
+    graph = get_knowledge_graph()
+
+    if query.start_node not in graph.nodes:
         raise HTTPException(status_code=404, detail=f"Node {query.start_node} not found")
-    
-    # BFS to find connected nodes
-    visited = set()
-    queue = [(query.start_node, 0)]
-    result_nodes = [start_node]
-    result_edges = []
-    
-    while queue:
-        current_id, depth = queue.pop(0)
-        
-        if current_id in visited or depth >= query.max_depth:
-            continue
-        
-        visited.add(current_id)
-        
-        # Find connected edges
-        for edge in graph["edges"]:
-            # Check relationship type filter
-            if query.relationship_types and edge["relationship"] not in query.relationship_types:
-                continue
-            
-            if edge["source"] == current_id:
-                target_id = edge["target"]
-                
-                if target_id not in visited:
-                    # Find target node
-                    for node in graph["nodes"]:
-                        if node["id"] == target_id:
-                            result_nodes.append(node)
-                            result_edges.append(edge)
-                            queue.append((target_id, depth + 1))
-                            break
-            
-            elif edge["target"] == current_id:
-                source_id = edge["source"]
-                
-                if source_id not in visited:
-                    # Find source node
-                    for node in graph["nodes"]:
-                        if node["id"] == source_id:
-                            result_nodes.append(node)
-                            result_edges.append(edge)
-                            queue.append((source_id, depth + 1))
-                            break
-    
+
+    result = graph.query(query.start_node, query.max_depth, query.relationship_types)
+
     return {
         "start_node": query.start_node,
-        "nodes": result_nodes,
-        "edges": result_edges,
+        "nodes": result["nodes"],
+        "edges": result["edges"],
         "depth": query.max_depth,
     }
 
@@ -299,13 +382,12 @@ async def query_graph(query: GraphQuery):
 async def rebuild_graph():
     """Rebuild the knowledge graph from patterns."""
     try:
-        graph = build_graph_from_patterns()
-        save_graph(graph)
-        
+        stats = get_knowledge_graph(rebuild=True).stats()
+
         return {
             "status": "rebuilt",
-            "nodes": len(graph["nodes"]),
-            "edges": len(graph["edges"]),
+            "nodes": stats["total_nodes"],
+            "edges": stats["total_edges"],
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -314,29 +396,4 @@ async def rebuild_graph():
 @router.get("/graph/stats", response_model=Dict[str, Any])
 async def get_graph_stats():
     """Get statistics about the knowledge graph."""
-    graph = load_graph()
-    
-    if not graph["nodes"]:
-        graph = build_graph_from_patterns()
-    
-    # Calculate statistics
-    nodes = graph["nodes"]
-    edges = graph["edges"]
-    
-    domains = {}
-    for node in nodes:
-        domain = node.get("domain", "unknown")
-        domains[domain] = domains.get(domain, 0) + 1
-    
-    relationships = {}
-    for edge in edges:
-        rel_type = edge.get("relationship", "unknown")
-        relationships[rel_type] = relationships.get(rel_type, 0) + 1
-    
-    return {
-        "total_nodes": len(nodes),
-        "total_edges": len(edges),
-        "domains": domains,
-        "relationships": relationships,
-        "avg_degree": len(edges) * 2 / len(nodes) if nodes else 0,
-    }
+    return get_knowledge_graph().stats()
@@ -27,6 +27,8 @@ from pydantic import BaseModel
 import json
 from pathlib import Path
 
+from .knowledge import graph_pattern_saved, graph_pattern_deleted
+
 router = APIRouter(prefix="/patterns", tags=["patterns"])
 
 
@@ -104,6 +106,8 @@ def save_pattern(domain: str, pattern_id: str, data: Dict[str, Any]) -> None:
     with open(path, 'w') as f:
         json.dump(data, f, indent=2)
 
+    graph_pattern_saved(domain, data, pattern_id)
+
 
 @router.get("/", response_model=List[PatternResponse])
 async def list_patterns(
@@ -295,4 +299,6 @@ async def delete_pattern(
         if not found:
             raise HTTPException(status_code=404, detail=f"Pattern {pattern_id} not found")
     
+    graph_pattern_deleted(pattern_id)
+    
     return {"status": "deleted", "pattern_id": pattern_id}
@@ -23,6 +23,7 @@ from datetime import datetime
 import sys
 import json
 import logging
+import logging.handlers
 import os
 from pathlib import Path
 
@@ -33,7 +34,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 TRACE_DIR = Path(__file__).parent.parent / "logs" / "traces"
 TRACE_DIR.mkdir(parents=True, exist_ok=True)
 
-trace_handler = logging.FileHandler(TRACE_DIR / "queries.log")
+# WatchedFileHandler reopens the file after TraceStore rotates it
+trace_handler = logging.handlers.WatchedFileHandler(TRACE_DIR / "queries.log")
 trace_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
 trace_logger = logging.getLogger('query_trace')
 trace_logger.addHandler(trace_handler)
@@ -52,8 +54,11 @@ logger.setLevel(logging.INFO)
 
 from core.domain import Domain
 from core.knowledge_base import KnowledgeBaseConfig
+from core.http_clients import pooled_client
 from knowledge.json_kb import JSONKnowledgeBase
+from state.event_writer import flush_event_writers
 from state.state_machine import QueryState, QueryStateMachine
+from state.trace_store import QueryLogStore, get_trace_store, summarize_query_events
 
 
 class GenericAssistantEngine:
@@ -931,7 +936,7 @@ Question: {actual_query}"""
 
         try:
             timeout = httpx.Timeout(60.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with pooled_client(base_url, timeout=timeout) as client:
                 response = await client.post(endpoint, headers=headers, json=payload)
 
                 if response.status_code != 200:
@@ -1136,7 +1141,7 @@ Return ONLY the JSON, no other text:"""
                 }
 
             timeout = httpx.Timeout(30.0)  # Normal timeout for metadata generation
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with pooled_client(base_url, timeout=timeout) as client:
                 endpoint = f"{base_url.rstrip('/')}/v1/messages" if is_anthropic else f"{base_url.rstrip('/')}/chat/completions"
 
                 response = await client.post(endpoint, headers=headers, json=payload)
@@ -1403,47 +1408,28 @@ Return ONLY the JSON, no other text:"""
 
     @staticmethod
     def get_trace_from_log(limit: int = 50) -> List[Dict[str, Any]]:
-        """Read recent traces from log file."""
-        traces = []
-        log_file = TRACE_DIR / "queries.log"
-
-        if not log_file.exists():
-            return []
-
+        """Read recent traces from the indexed log file, oldest first."""
         try:
-            with open(log_file, 'r') as f:
-                lines = f.readlines()[-limit:]
-
-            for line in lines:
-                # Split timestamp from JSON
-                try:
-                    parts = line.split(' - ', 1)
-                    if len(parts) == 2:
-                        traces.append({
-                            'logged_at': parts[0],
-                            **json.loads(parts[1])
-                        })
-                except (json.JSONDecodeError, ValueError):
-                    continue
-        except Exception:
-            pass
-
-        return traces
+            store = get_trace_store(TRACE_DIR / "queries.log", QueryLogStore)
+            return list(reversed(store.recent(limit)))
+        except Exception as e:
+            logger.warning(f"Failed to read query trace log: {e}")
+            return []
 
     @staticmethod
     def get_trace_for_query(query_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific trace by query ID/timestamp."""
-        traces = GenericAssistantEngine.get_trace_from_log(limit=1000)
-        for trace in traces:
-            if trace.get('start_time') == query_id or trace.get('query') == query_id:
-                return trace
-        return None
+        """Get a specific trace by query ID/timestamp or query text (index lookup)."""
+        try:
+            return get_trace_store(TRACE_DIR / "queries.log", QueryLogStore).find(query_id)
+        except Exception as e:
+            logger.warning(f"Failed to read query trace log: {e}")
+            return None
 
     @staticmethod
     def get_state_machine_trace(query_id: str) -> Optional[Dict[str, Any]]:
         """Get state machine trace for a specific query_id.
 
-        Reads from /app/logs/traces/state_machine.jsonl and returns
+        Looks the query up in the index over state_machine.jsonl and returns
         all state transitions for the given query with summary statistics.
 
         Args:
@@ -1452,72 +1438,14 @@ Return ONLY the JSON, no other text:"""
         Returns:
             Dictionary with 'summary' and 'events' keys, or None if not found
         """
-        state_machine_log_path = TRACE_DIR / "state_machine.jsonl"
-        events = []
-
-        if not state_machine_log_path.exists():
-            return None
-
         try:
-            with open(state_machine_log_path, 'r') as f:
-                for line in f:
-                    try:
-                        event = json.loads(line.strip())
-                        if event.get('query_id') == query_id:
-                            events.append(event)
-                    except json.JSONDecodeError:
-                        continue
+            # Buffered transitions must reach the log before it is read
+            flush_event_writers()
+            events = get_trace_store(TRACE_DIR / "state_machine.jsonl").events_for_query(query_id)
         except Exception:
             return None
 
         if not events:
             return None
 
-        # Calculate summary statistics
-        first_event = events[0]
-        last_event = events[-1]
-
-        # Calculate total duration
-        total_duration_ms = None
-        if len(events) >= 2:
-            first_time = datetime.fromisoformat(first_event['timestamp'].replace('Z', ''))
-            last_time = datetime.fromisoformat(last_event['timestamp'].replace('Z', ''))
-            total_duration_ms = int((last_time - first_time).total_seconds() * 1000)
-
-        # Extract unique states
-        unique_states = list(set(e['to_state'] for e in events))
-
-        # Check for errors
-        has_error = any(e['to_state'] == 'ERROR' for e in events)
-
-        # Extract components used
-        components_used = []
-        for event in events:
-            if 'component' in event.get('data', {}):
-                components_used.append(event['data']['component'])
-            elif 'enricher' in event.get('data', {}):
-                components_used.append(event['data']['enricher'])
-            elif 'formatter' in event.get('data', {}):
-                components_used.append(event['data']['formatter'])
-
-        # Count state transitions
-        state_counts = {}
-        for event in events:
-            to_state = event['to_state']
-            state_counts[to_state] = state_counts.get(to_state, 0) + 1
-
-        return {
-            "query_id": query_id,
-            "summary": {
-                "total_events": len(events),
-                "unique_states": unique_states,
-                "total_duration_ms": total_duration_ms,
-                "has_error": has_error,
-                "components_used": components_used,
-                "domain": events[0].get('data', {}).get('domain'),
-                "first_state": first_event.get('to_state'),
-                "final_state": last_event.get('to_state'),
-                "state_counts": state_counts
-            },
-            "events": events
-        }
+        return summarize_query_events(query_id, events)
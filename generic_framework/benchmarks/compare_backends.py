@@ -20,10 +20,16 @@ Benchmark: JSON vs SQLite Knowledge Base Backends
 
 Compares:
 1. Speed: Search latency, load time, write performance
-2. Security: Injection safety, file permissions
-3. Capability: Query features, filtering, full-text search
+2. Import: patterns.json import throughput at 10k / 100k patterns
+3. Security: Injection safety, file permissions
+4. Capability: Query features, filtering, full-text search
+
+Usage:
+    python compare_backends.py                  # all sections
+    python compare_backends.py --import-sizes 10000   # smaller import run
 """
 
+import argparse
 import asyncio
 import json
 import os
@@ -41,6 +47,13 @@ from knowledge.json_kb import JSONKnowledgeBase
 from knowledge.sqlite_kb import SQLiteKnowledgeBase
 
 
+# Pattern counts for the import throughput section
+IMPORT_SIZES = [10_000, 100_000]
+
+# Patterns inserted one by one (add_pattern) to compare against the bulk path
+PER_ROW_SAMPLE = 1_000
+
+
 # Colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -198,6 +211,53 @@ async def benchmark_write_speed(kb, patterns: List[Dict]) -> Dict[str, Any]:
     }
 
 
+async def benchmark_import_throughput(base_path: Path, count: int) -> Dict[str, Any]:
+    """
+    Benchmark patterns.json import into each backend.
+
+    SQLite imports through bulk_add_patterns (one transaction, FTS rebuilt
+    at the end). For reference, a PER_ROW_SAMPLE of add_pattern calls
+    (one commit each) is timed and reported as patterns/second.
+    """
+    patterns = get_test_patterns(count)
+    results = {}
+
+    for name, kb_class in (("json", JSONKnowledgeBase), ("sqlite", SQLiteKnowledgeBase)):
+        storage_path = base_path / f"import_{name}_{count}"
+        storage_path.mkdir(parents=True, exist_ok=True)
+        with open(storage_path / "patterns.json", 'w') as f:
+            json.dump(patterns, f)
+
+        kb = kb_class(KnowledgeBaseConfig(storage_path=str(storage_path)))
+        start = time.time()
+        await kb.load_patterns()
+        elapsed = time.time() - start
+        results[name] = {
+            "import_s": elapsed,
+            "patterns_per_s": count / elapsed if elapsed > 0 else float("inf"),
+            "pattern_count": kb.get_pattern_count()
+        }
+        if name == "sqlite":
+            await kb.close()
+
+    # Per-row inserts into a fresh database
+    storage_path = base_path / f"import_rows_{count}"
+    kb = SQLiteKnowledgeBase(KnowledgeBaseConfig(storage_path=str(storage_path)))
+    await kb.load_patterns()
+    sample = patterns[:min(count, PER_ROW_SAMPLE)]
+    start = time.time()
+    for pattern in sample:
+        await kb.add_pattern(dict(pattern))
+    elapsed = time.time() - start
+    await kb.close()
+    results["sqlite_per_row"] = {
+        "patterns_per_s": len(sample) / elapsed if elapsed > 0 else float("inf"),
+        "sample": len(sample)
+    }
+
+    return results
+
+
 def check_security(json_path: Path, sqlite_path: Path) -> Dict[str, Dict]:
     """Check security aspects of both backends."""
     results = {
@@ -255,7 +315,7 @@ def check_capability(json_kb: JSONKnowledgeBase, sqlite_kb: SQLiteKnowledgeBase)
     }
 
 
-async def run_benchmarks():
+async def run_benchmarks(import_sizes: List[int] = IMPORT_SIZES):
     """Run all benchmarks and compare backends."""
     print_header("ExFrame Backend Benchmark: JSON vs SQLite")
 
@@ -342,9 +402,25 @@ async def run_benchmarks():
     write_winner = results.compare("avg_write_ms", lower_is_better=True)
     print(f"  {Colors.GREEN}Winner: {write_winner}{Colors.END}")
 
+    # ========== IMPORT THROUGHPUT ==========
+
+    print_section("2. IMPORT THROUGHPUT")
+
+    for count in import_sizes:
+        print(f"\n{Colors.YELLOW}Importing {count:,} patterns from patterns.json...{Colors.END}")
+        imported = await benchmark_import_throughput(base_path, count)
+
+        print_result("JSON - Load", f"{imported['json']['import_s']:.2f}s "
+                     f"({imported['json']['patterns_per_s']:,.0f}", " patterns/s)")
+        print_result("SQLite - Bulk Import", f"{imported['sqlite']['import_s']:.2f}s "
+                     f"({imported['sqlite']['patterns_per_s']:,.0f}", " patterns/s)")
+        print_result(f"SQLite - add_pattern x{imported['sqlite_per_row']['sample']:,}",
+                     f"{imported['sqlite_per_row']['patterns_per_s']:,.0f}", " patterns/s")
+        print_result("SQLite - Patterns Imported", imported['sqlite']['pattern_count'], "")
+
     # ========== SECURITY BENCHMARKS ==========
 
-    print_section("2. SECURITY ASSESSMENT")
+    print_section("3. SECURITY ASSESSMENT")
 
     security = check_security(json_path / "patterns.json", sqlite_path / "patterns.db")
 
@@ -359,7 +435,7 @@ async def run_benchmarks():
 
     # ========== CAPABILITY COMPARISON ==========
 
-    print_section("3. CAPABILITY COMPARISON")
+    print_section("4. CAPABILITY COMPARISON")
 
     capabilities = check_capability(json_kb, sqlite_kb)
 
@@ -386,7 +462,7 @@ async def run_benchmarks():
 
     # ========== SUMMARY ==========
 
-    print_section("4. SUMMARY")
+    print_section("5. SUMMARY")
 
     print(f"\n  {Colors.BOLD}Speed Summary:{Colors.END}")
     print(f"    Load:    {load_winner} wins ({results.json_results['load_time']:.4f}s vs {results.sqlite_results['load_time']:.4f}s)")
@@ -442,4 +518,8 @@ async def run_benchmarks():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_benchmarks())
+    parser = argparse.ArgumentParser(description="Compare JSON and SQLite knowledge base backends")
+    parser.add_argument("--import-sizes", type=int, nargs="*", default=IMPORT_SIZES,
+                        help="Pattern counts for the import throughput section (none to skip)")
+    args = parser.parse_args()
+    asyncio.run(run_benchmarks(import_sizes=args.import_sizes))
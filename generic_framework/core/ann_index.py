@@ -0,0 +1,291 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Approximate Nearest-Neighbour Indexes for VectorStore
+
+Exact search scores the query against every stored vector, which is one
+fast matmul at a few thousand patterns but grows linearly with the domain.
+An ANN index narrows each query to a small candidate set that VectorStore
+then scores exactly.
+
+IVFIndex (inverted file) partitions vectors into ~sqrt(n) clusters with
+spherical k-means; a query scores the cluster centroids and only scans the
+vectors of the nprobe closest clusters. Inserts go to the nearest centroid
+and deletes drop the id from its list, so the store can change without a
+rebuild; the clustering is retrained lazily once the store has doubled
+since the last training.
+
+After each training the index checks its recall@k against exact search on
+a sample of stored vectors and widens nprobe until it reaches min_recall.
+
+Configured per domain (knowledge_base.vector_index in domain.json):
+    "vector_index": {
+        "type": "ivf",        "exact" (default) or "ivf"
+        "min_size": 20000,    Use exact search below this many vectors
+        "nprobe": 8,          Clusters scanned per query (starting value)
+        "nlist": null,        Cluster count (default: sqrt(n))
+        "min_recall": 0.95    Self-check target for recall@10
+    }
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class ANNIndex(ABC):
+    """
+    Abstract approximate index over a VectorStore's rows.
+
+    The index holds only ids and its own routing structures; vectors stay
+    in the store's matrix and candidates are scored exactly by the store.
+    """
+
+    RECALL_SAMPLE = 50
+    RECALL_K = 10
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.min_size = config.get("min_size", 20000)
+        self.min_recall = config.get("min_recall", 0.95)
+        self.recall: Optional[float] = None
+
+    @property
+    @abstractmethod
+    def is_built(self) -> bool:
+        """Whether the index can answer queries."""
+        pass
+
+    @abstractmethod
+    def build(self, ids: List[str], matrix: np.ndarray) -> None:
+        """(Re)build the index from normalized rows."""
+        pass
+
+    @abstractmethod
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        """Index one new or updated normalized vector."""
+        pass
+
+    @abstractmethod
+    def remove(self, item_id: str) -> None:
+        """Drop an id from the index."""
+        pass
+
+    @abstractmethod
+    def candidates(self, query: np.ndarray, top_k: int) -> List[str]:
+        """Ids worth scoring exactly for a normalized query."""
+        pass
+
+    def reset(self) -> None:
+        """Forget everything (the store was cleared or reloaded)."""
+        pass
+
+    def needs_rebuild(self, size: int) -> bool:
+        """Whether the index should be retrained for a store of this size."""
+        return not self.is_built
+
+    def widen(self) -> bool:
+        """Trade speed for recall after a failed self-check; False if already exhaustive."""
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"type": self.__class__.__name__, "built": self.is_built,
+                "min_size": self.min_size, "recall": self.recall}
+
+
+class IVFIndex(ANNIndex):
+    """Inverted-file index: k-means clusters with per-cluster id lists."""
+
+    KMEANS_ITERATIONS = 10
+    TRAINING_POINTS_PER_LIST = 64
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.nprobe = config.get("nprobe", 8)
+        self.nlist = config.get("nlist")
+        self.seed = config.get("seed", 0)
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[Dict[str, None]] = []
+        self._assignment: Dict[str, int] = {}
+        self._trained_size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._centroids is not None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._centroids = None
+            self._lists = []
+            self._assignment = {}
+            self._trained_size = 0
+            self.recall = None
+
+    def needs_rebuild(self, size: int) -> bool:
+        return not self.is_built or size > 2 * self._trained_size
+
+    def build(self, ids: List[str], matrix: np.ndarray) -> None:
+        """Train centroids on a sample of rows and assign every row to a list."""
+        n = len(ids)
+        if n == 0:
+            self.reset()
+            return
+
+        nlist = max(1, min(n, self.nlist or int(math.sqrt(n))))
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(n, nlist * self.TRAINING_POINTS_PER_LIST)
+        sample = matrix[rng.choice(n, size=sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+
+        # Spherical k-means: assign by cosine, re-centre on the normalized mean
+        for _ in range(self.KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+
+        labels = self._nearest(matrix, centroids)
+        lists: List[Dict[str, None]] = [{} for _ in range(nlist)]
+        assignment = {}
+        for item_id, label in zip(ids, labels.tolist()):
+            lists[label][item_id] = None
+            assignment[item_id] = label
+
+        with self._lock:
+            self._centroids = centroids
+            self._lists = lists
+            self._assignment = assignment
+            self._trained_size = n
+
+    @staticmethod
+    def _nearest(matrix: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        """Nearest centroid for each row, in chunks to bound memory."""
+        labels = np.empty(len(matrix), dtype=np.intp)
+        for start in range(0, len(matrix), chunk):
+            labels[start:start + chunk] = np.argmax(matrix[start:start + chunk] @ centroids.T, axis=1)
+        return labels
+
+    def widen(self) -> bool:
+        if self.nprobe >= len(self._lists):
+            return False
+        self.nprobe = min(len(self._lists), self.nprobe * 2)
+        return True
+
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        if not self.is_built:
+            return
+        label = int(np.argmax(self._centroids @ vector))
+        with self._lock:
+            previous = self._assignment.get(item_id)
+            if previous is not None:
+                self._lists[previous].pop(item_id, None)
+            self._lists[label][item_id] = None
+            self._assignment[item_id] = label
+
+    def remove(self, item_id: str) -> None:
+        if not self.is_built:
+            return
+        with self._lock:
+            label = self._assignment.pop(item_id, None)
+            if label is not None:
+                self._lists[label].pop(item_id, None)
+
+    def candidates(self, query: np.ndarray, top_k: int) -> List[str]:
+        with self._lock:
+            centroid_scores = self._centroids @ query
+            nprobe = min(self.nprobe, len(self._lists))
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            ids: List[str] = []
+            for label in probe:
+                ids.extend(self._lists[label])
+            return ids
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        if self.is_built:
+            sizes = [len(ids) for ids in self._lists]
+            stats.update({
+                "nlist": len(self._lists),
+                "nprobe": self.nprobe,
+                "indexed": len(self._assignment),
+                "largest_list": max(sizes)
+            })
+        return stats
+
+
+# Index registry ("exact" means no ANN index)
+ANN_INDEX_TYPES = {
+    "ivf": IVFIndex,
+}
+
+
+def create_ann_index(config: Optional[Dict[str, Any]]) -> Optional[ANNIndex]:
+    """
+    Create an ANN index from a vector_index config.
+
+    Args:
+        config: Config dict with a 'type' field (default "exact")
+
+    Returns:
+        ANNIndex instance, or None for exact search
+    """
+    config = config or {}
+    index_type = config.get("type", "exact")
+    if index_type == "exact":
+        return None
+    if index_type not in ANN_INDEX_TYPES:
+        raise ValueError(f"Unknown vector index type: {index_type}. "
+                         f"Available types: {['exact'] + list(ANN_INDEX_TYPES.keys())}")
+    return ANN_INDEX_TYPES[index_type](config)
+
+
+def measure_recall(
+    exact_search,
+    approximate_search,
+    queries: Iterable[np.ndarray],
+    top_k: int = 10
+) -> float:
+    """
+    Mean recall@k of an approximate search against exact search.
+
+    Args:
+        exact_search: Callable(query, top_k) -> [(id, score), ...]
+        approximate_search: Callable(query, top_k) -> [(id, score), ...]
+        queries: Query vectors
+        top_k: k for recall@k
+
+    Returns:
+        Fraction of exact top-k ids the approximate search also returned
+    """
+    found = 0
+    expected = 0
+    for query in queries:
+        truth = {pid for pid, _ in exact_search(query, top_k)}
+        if not truth:
+            continue
+        got = {pid for pid, _ in approximate_search(query, top_k)}
+        found += len(truth & got)
+        expected += len(truth)
+    return found / expected if expected else 1.0
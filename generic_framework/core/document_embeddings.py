@@ -2,19 +2,39 @@
 Document Embeddings - Vector Store for Documents
 
 Provides semantic search over document libraries using embeddings.
-Stores all embeddings in a single doc_embeddings.json file per domain.
+Vectors are stored in the binary VectorStore format (doc_vectors.*) and
+per-document staleness metadata in a small doc_index.json per domain.
+Legacy doc_embeddings.json files are read and converted on the next save.
+
+Staleness is checked against the stored (size, mtime) first; a document is
+only re-hashed when its stat signature changed. Stale documents are encoded
+in batches of ENCODE_BATCH_SIZE. Keeping the index current in the background
+is done by core/document_indexer.py.
+
+Each document is also split into heading-aware passages of at most
+PASSAGE_CHARS characters (about the 256-token window of the embedding
+model). Passage vectors live in a second store (doc_passages.*) and their
+character offsets in doc_index.json, so search_passages() can return just
+the relevant sections of a library instead of whole files. The document
+vector is the normalized mean of its passage vectors.
 """
 
 import json
+import os
 import hashlib
 import logging
+import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
+from .embeddings import VectorStore
+
 # Optional import - will fail gracefully if not installed
 try:
-    import numpy as np
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
@@ -23,13 +43,105 @@ except ImportError:
 
 logger = logging.getLogger("document_embeddings")
 
+ENCODE_BATCH_SIZE = 32  # Documents per model.encode call
+PASSAGE_CHARS = 1000    # Max characters per passage
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def chunk_markdown(text: str, max_chars: int = PASSAGE_CHARS) -> List[Dict[str, Any]]:
+    """
+    Split markdown into heading-aware passages.
+
+    A passage never spans two sections; within a section, paragraphs are
+    packed until max_chars and oversized paragraphs are cut at whitespace.
+
+    Args:
+        text: Markdown document
+        max_chars: Maximum passage length
+
+    Returns:
+        List of {"start", "end", "heading"} (character offsets into text,
+        heading is the "A > B" path of the enclosing headings)
+    """
+    # Blocks: runs of non-blank lines (blank lines inside code fences don't split);
+    # every heading starts a new section
+    sections: List[Tuple[str, List[Tuple[int, int]]]] = [("", [])]
+    stack: List[Tuple[int, str]] = []
+    in_fence = False
+    block: Optional[List[int]] = None
+    pos = 0
+
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        line_end = pos + len(line.rstrip("\r\n"))
+        match = None if in_fence else _HEADING.match(stripped)
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+
+        if match:
+            level = len(match.group(1))
+            stack = [(lvl, title) for lvl, title in stack if lvl < level] + [(level, match.group(2))]
+            block = [pos, line_end]
+            sections.append((" > ".join(title for _, title in stack), [block]))
+            block = None
+        elif stripped or in_fence:
+            if block is None:
+                block = [pos, line_end]
+                sections[-1][1].append(block)
+            block[1] = line_end
+        else:
+            block = None
+        pos += len(line)
+
+    passages = []
+    for heading, blocks in sections:
+        chunk_start = chunk_end = None
+        for start, end in blocks:
+            if chunk_start is not None and end - chunk_start > max_chars:
+                if heading and (chunk_start, chunk_end) == tuple(blocks[0]):
+                    # Keep a bare heading with the text that follows it
+                    start = chunk_start
+                else:
+                    passages.append({"start": chunk_start, "end": chunk_end, "heading": heading})
+                chunk_start = None
+            while end - start > max_chars:
+                cut = text.rfind(" ", start + max_chars // 2, start + max_chars)
+                cut = cut if cut > start else start + max_chars
+                passages.append({"start": start, "end": cut, "heading": heading})
+                start = cut
+                while start < end and text[start].isspace():
+                    start += 1
+            if chunk_start is None:
+                chunk_start = start
+            chunk_end = end
+        if chunk_start is not None:
+            passages.append({"start": chunk_start, "end": chunk_end, "heading": heading})
+
+    return passages
+
+
+def _passage_text(content: str, passage: Dict[str, Any]) -> str:
+    """Text embedded for a passage: its heading path, then the passage itself."""
+    body = content[passage["start"]:passage["end"]]
+    return f"{passage['heading']}\n{body}" if passage["heading"] else body
+
+
+def _mean_embedding(embeddings: np.ndarray) -> np.ndarray:
+    """Document vector: normalized mean of its passage vectors."""
+    mean = embeddings.mean(axis=0)
+    norm = np.linalg.norm(mean)
+    return mean / norm if norm > 0 else mean
+
 
 class DocumentVectorStore:
     """
     Vector store for document embeddings.
 
-    Stores all document embeddings in a single doc_embeddings.json file.
-    Includes metadata for staleness detection and incremental updates.
+    Stores document vectors in a matrix-backed VectorStore and keeps
+    metadata for staleness detection and incremental updates alongside.
+    Updates and searches are serialized by `lock`, so a background indexer
+    can refresh the store while queries read it.
     """
 
     def __init__(self, domain_name: str, storage_path: Path, model_name: str = "all-MiniLM-L6-v2"):
@@ -38,14 +150,20 @@ class DocumentVectorStore:
 
         Args:
             domain_name: Name of the domain (for logging)
-            storage_path: Path to domain directory (where doc_embeddings.json lives)
+            storage_path: Path to domain directory (where doc embeddings live)
             model_name: SentenceTransformer model name
         """
         self.domain_name = domain_name
         self.storage_path = storage_path
-        self.embeddings_file = storage_path / "doc_embeddings.json"
+        self.vectors = VectorStore(storage_path, name="doc_vectors")
+        self.passages = VectorStore(storage_path, name="doc_passages")
+        self.embeddings_file = self.vectors.embeddings_file
+        self.index_file = storage_path / "doc_index.json"
+        self.legacy_file = storage_path / "doc_embeddings.json"
         self.model_name = model_name
         self.model = None
+        self.lock = threading.RLock()
+        self._index_dirty = False
         self.data = {
             "metadata": {
                 "model": model_name,
@@ -62,37 +180,76 @@ class DocumentVectorStore:
 
     def load(self) -> bool:
         """
-        Load embeddings from doc_embeddings.json.
+        Load the document index and memory-map its vectors.
+
+        Falls back to a legacy doc_embeddings.json (converted on next save).
 
         Returns:
-            True if loaded successfully, False if file doesn't exist
+            True if loaded successfully, False if no embeddings exist
         """
-        if not self.embeddings_file.exists():
-            logger.info(f"[{self.domain_name}] No doc embeddings file at {self.embeddings_file}")
-            return False
+        if self.index_file.exists():
+            try:
+                with open(self.index_file) as f:
+                    self.data = json.load(f)
+                self.vectors.load()
+                self.passages.load()
 
-        try:
-            with open(self.embeddings_file) as f:
-                self.data = json.load(f)
+                doc_count = len(self.data.get("documents", {}))
+                logger.info(f"[{self.domain_name}] Loaded {doc_count} document embeddings")
+                return True
 
-            doc_count = len(self.data.get("documents", {}))
-            logger.info(f"[{self.domain_name}] Loaded {doc_count} document embeddings")
-            return True
+            except Exception as e:
+                logger.error(f"[{self.domain_name}] Error loading doc embeddings: {e}")
+                return False
+
+        if self.legacy_file.exists():
+            return self._load_legacy()
+
+        logger.info(f"[{self.domain_name}] No doc embeddings file at {self.index_file}")
+        return False
 
+    def _load_legacy(self) -> bool:
+        """Read a legacy doc_embeddings.json ({metadata, documents{path: {code, ...}}})."""
+        try:
+            with open(self.legacy_file) as f:
+                legacy = json.load(f)
         except Exception as e:
-            logger.error(f"[{self.domain_name}] Error loading doc embeddings: {e}")
+            logger.error(f"[{self.domain_name}] Error loading legacy doc embeddings: {e}")
             return False
 
+        self.vectors.clear()
+        self.passages.clear()
+        self.data = {
+            "metadata": legacy.get("metadata", self.data["metadata"]),
+            "documents": {}
+        }
+        for doc_path, doc_data in legacy.get("documents", {}).items():
+            code = doc_data.pop("code", None)
+            if code is None:
+                continue
+            self.vectors.set(doc_path, np.asarray(code, dtype=np.float32))
+            self.data["documents"][doc_path] = doc_data
+
+        logger.info(f"[{self.domain_name}] Loaded {len(self.vectors)} document embeddings "
+                    f"from legacy {self.legacy_file.name}")
+        return True
+
     def save(self) -> None:
-        """Save all embeddings to doc_embeddings.json."""
+        """Persist changed vectors and rewrite the (vector-free) document index."""
         self.data["metadata"]["generated"] = datetime.utcnow().isoformat()
         self.data["metadata"]["document_count"] = len(self.data["documents"])
 
         # Ensure directory exists
         self.storage_path.mkdir(parents=True, exist_ok=True)
 
-        with open(self.embeddings_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        self.vectors.save()
+        self.passages.save()
+
+        tmp = self.index_file.with_suffix(".json.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.index_file)
+        self._index_dirty = False
 
         logger.info(f"[{self.domain_name}] Saved {len(self.data['documents'])} embeddings to {self.embeddings_file.name}")
 
@@ -109,6 +266,10 @@ class DocumentVectorStore:
         """
         Check if embedding is stale (document changed or missing).
 
+        Unchanged (size, mtime) means current without reading the file; a
+        changed signature falls back to comparing content hashes (a touched
+        but identical file just gets its signature refreshed).
+
         Args:
             doc_path: Absolute path to document
 
@@ -116,19 +277,33 @@ class DocumentVectorStore:
             True if embedding needs regeneration
         """
         # No embedding exists
-        if doc_path not in self.data["documents"]:
+        if doc_path not in self.data["documents"] or not self.vectors.has(doc_path):
             return True
 
         # Check if file still exists
-        if not Path(doc_path).exists():
+        try:
+            st = os.stat(doc_path)
+        except OSError:
             logger.warning(f"[{self.domain_name}] Document no longer exists: {doc_path}")
             return False  # Don't try to regenerate missing files
 
+        doc_data = self.data["documents"][doc_path]
+        if "passages" not in doc_data:
+            return True  # Indexed before passage retrieval existed
+
+        if doc_data.get("size") == st.st_size and doc_data.get("modified") == st.st_mtime:
+            return False
+
         # Compare file hash
-        stored_hash = self.data["documents"][doc_path].get("hash", "")
+        stored_hash = doc_data.get("hash", "")
         current_hash = self._hash_file(Path(doc_path))
+        if stored_hash and stored_hash == current_hash:
+            doc_data["size"] = st.st_size
+            doc_data["modified"] = st.st_mtime
+            self._index_dirty = True
+            return False
 
-        return stored_hash != current_hash
+        return True
 
     def get_stale_documents(self, doc_paths: List[str]) -> List[str]:
         """
@@ -160,28 +335,50 @@ class DocumentVectorStore:
         Returns:
             Embedding as numpy array, or None if not found
         """
-        doc_data = self.data["documents"].get(doc_path)
-        if doc_data and "code" in doc_data:
-            return np.array(doc_data["code"])
-        return None
+        return self.vectors.get(doc_path)
 
-    def set_embedding(self, doc_path: str, embedding: np.ndarray) -> None:
+    def set_embedding(
+        self,
+        doc_path: str,
+        embedding: np.ndarray,
+        file_hash: Optional[str] = None,
+        stat: Optional[os.stat_result] = None,
+        passages: Optional[List[Dict[str, Any]]] = None,
+        passage_embeddings: Optional[np.ndarray] = None
+    ) -> None:
         """
         Store embedding for a document.
 
         Args:
             doc_path: Path to document
             embedding: Embedding vector
+            file_hash: SHA256 of the embedded content (computed if omitted)
+            stat: os.stat of the document when it was read (taken if omitted)
+            passages: Passage offsets from chunk_markdown()
+            passage_embeddings: One vector per passage
         """
         path = Path(doc_path)
+        if stat is None and path.exists():
+            stat = path.stat()
 
+        self._remove_passages(doc_path)
+        self.vectors.set(doc_path, embedding)
         self.data["documents"][doc_path] = {
-            "code": embedding.tolist(),
-            "hash": self._hash_file(path),
-            "size": path.stat().st_size if path.exists() else 0,
-            "modified": path.stat().st_mtime if path.exists() else 0
+            "hash": file_hash if file_hash is not None else self._hash_file(path),
+            "size": stat.st_size if stat else 0,
+            "modified": stat.st_mtime if stat else 0
         }
 
+        if passages is not None and passage_embeddings is not None:
+            for i, passage_embedding in enumerate(passage_embeddings):
+                self.passages.set(f"{doc_path}#{i}", passage_embedding)
+            self.data["documents"][doc_path]["passages"] = passages
+
+    def _remove_passages(self, doc_path: str) -> None:
+        doc_data = self.data["documents"].get(doc_path) or {}
+        for i in range(len(doc_data.get("passages", []))):
+            self.passages.remove(f"{doc_path}#{i}")
+
     def _load_model(self) -> None:
         """Lazy load the SentenceTransformer model."""
         if self.model is None:
@@ -212,44 +409,71 @@ class DocumentVectorStore:
         Returns:
             Number of embeddings generated
         """
-        # Load model if needed
-        self._load_model()
-
         # Find which documents need embedding
-        if force:
-            to_embed = doc_paths
-            logger.info(f"[{self.domain_name}] Force regenerating {len(to_embed)} embeddings")
-        else:
-            to_embed = self.get_stale_documents(doc_paths)
+        with self.lock:
+            if force:
+                to_embed = list(doc_paths)
+                logger.info(f"[{self.domain_name}] Force regenerating {len(to_embed)} embeddings")
+            else:
+                to_embed = self.get_stale_documents(doc_paths)
+
+            if not to_embed:
+                if self._index_dirty:
+                    self.save()
+                logger.debug(f"[{self.domain_name}] All embeddings current!")
+                return 0
 
-        if not to_embed:
-            logger.info(f"[{self.domain_name}] All embeddings current!")
-            return 0
+        # Load model if needed
+        self._load_model()
 
-        # Generate embeddings
+        # Generate embeddings in batches (encoding runs outside the lock so searches continue)
         generated = 0
-        for i, doc_path in enumerate(to_embed):
-            try:
-                logger.info(f"[{self.domain_name}] [{i+1}/{len(to_embed)}] Embedding {Path(doc_path).name}...")
-
-                # Read document
-                with open(doc_path, encoding='utf-8') as f:
-                    content = f.read()
-
-                # Generate embedding
-                embedding = self.model.encode(content)
+        for start in range(0, len(to_embed), ENCODE_BATCH_SIZE):
+            batch = []
+            for doc_path in to_embed[start:start + ENCODE_BATCH_SIZE]:
+                try:
+                    stat = os.stat(doc_path)
+                    with open(doc_path, 'rb') as f:
+                        raw = f.read()
+                    batch.append((doc_path, raw.decode('utf-8'), hashlib.sha256(raw).hexdigest(), stat))
+                except Exception as e:
+                    logger.error(f"[{self.domain_name}] Error reading {doc_path}: {e}")
+
+            if not batch:
+                continue
 
-                # Store
-                self.set_embedding(doc_path, embedding)
-                generated += 1
+            # One encode call for every passage of every document in the batch
+            chunked = []
+            texts = []
+            for _, content, _, _ in batch:
+                passages = chunk_markdown(content) or [{"start": 0, "end": len(content), "heading": ""}]
+                chunked.append(passages)
+                texts.extend(_passage_text(content, p) for p in passages)
 
+            logger.info(f"[{self.domain_name}] [{start + len(batch)}/{len(to_embed)}] "
+                        f"Embedding {len(batch)} documents ({len(texts)} passages)...")
+            try:
+                embeddings = np.asarray(self.model.encode(texts, batch_size=ENCODE_BATCH_SIZE), dtype=np.float32)
             except Exception as e:
-                logger.error(f"[{self.domain_name}] Error embedding {doc_path}: {e}")
+                logger.error(f"[{self.domain_name}] Error embedding batch: {e}")
                 continue
 
+            with self.lock:
+                offset = 0
+                for (doc_path, _, file_hash, stat), passages in zip(batch, chunked):
+                    passage_embeddings = embeddings[offset:offset + len(passages)]
+                    offset += len(passages)
+                    self.set_embedding(
+                        doc_path, _mean_embedding(passage_embeddings),
+                        file_hash=file_hash, stat=stat,
+                        passages=passages, passage_embeddings=passage_embeddings
+                    )
+                generated += len(batch)
+
         # Save to disk
-        if generated > 0:
-            self.save()
+        with self.lock:
+            if generated > 0 or self._index_dirty:
+                self.save()
 
         logger.info(f"[{self.domain_name}] Generated {generated} new embeddings")
         return generated
@@ -271,7 +495,7 @@ class DocumentVectorStore:
         Returns:
             List of (doc_path, similarity_score) sorted by relevance (descending)
         """
-        if not self.data["documents"]:
+        if not len(self.vectors):
             logger.warning(f"[{self.domain_name}] No document embeddings available for search")
             return []
 
@@ -281,29 +505,98 @@ class DocumentVectorStore:
         # Generate query embedding
         query_emb = self.model.encode(query)
 
-        # Compute similarities
-        similarities = []
-        for doc_path, doc_data in self.data["documents"].items():
-            # Skip if no code stored
-            if "code" not in doc_data:
-                continue
+        # One matmul over the document matrix, top-k above threshold
+        with self.lock:
+            similarities = self.vectors.search(query_emb, top_k=top_k, threshold=min_similarity)
 
-            doc_emb = np.array(doc_data["code"])
+        logger.info(f"[{self.domain_name}] Found {len(similarities)} documents above {min_similarity} similarity")
 
-            # Cosine similarity
-            similarity = np.dot(query_emb, doc_emb) / (
-                np.linalg.norm(query_emb) * np.linalg.norm(doc_emb)
-            )
+        return similarities
 
-            if similarity >= min_similarity:
-                similarities.append((doc_path, float(similarity)))
+    def search_passages(
+        self,
+        query: str,
+        top_k: int = 8,
+        min_similarity: float = 0.3,
+        max_chars: int = 6000
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for the most relevant passages within a character budget.
 
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Passages are taken in similarity order until top_k passages or
+        max_chars characters; passages of documents modified since they
+        were indexed are skipped (the indexer refreshes them shortly).
 
-        logger.info(f"[{self.domain_name}] Found {len(similarities)} documents above {min_similarity} similarity")
+        Args:
+            query: Search query text
+            top_k: Maximum passages to return
+            min_similarity: Minimum similarity threshold (0-1)
+            max_chars: Total character budget for returned passage text
+
+        Returns:
+            List of {"path", "name", "heading", "start", "end", "content",
+            "similarity_score"}, most relevant first
+        """
+        if not len(self.passages):
+            logger.warning(f"[{self.domain_name}] No passage embeddings available for search")
+            return []
+
+        self._load_model()
+        query_emb = self.model.encode(query)
 
-        return similarities[:top_k]
+        with self.lock:
+            # Over-fetch so passages that don't fit the budget can be skipped
+            candidates = self.passages.search(query_emb, top_k=top_k * 4, threshold=min_similarity)
+            located = []
+            for passage_id, similarity in candidates:
+                doc_path, _, index = passage_id.rpartition("#")
+                doc_data = self.data["documents"].get(doc_path)
+                if doc_data and int(index) < len(doc_data.get("passages", [])):
+                    located.append((doc_path, dict(doc_data), doc_data["passages"][int(index)], similarity))
+
+        results = []
+        used = 0
+        texts: Dict[str, Optional[str]] = {}
+        for doc_path, doc_data, passage, similarity in located:
+            if len(results) >= top_k:
+                break
+            length = passage["end"] - passage["start"]
+            if used + length > max_chars:
+                continue
+
+            if doc_path not in texts:
+                texts[doc_path] = self._read_if_unchanged(doc_path, doc_data)
+            text = texts[doc_path]
+            if text is None:
+                continue
+
+            name = Path(doc_path).name
+            results.append({
+                "path": doc_path,
+                "name": f"{name} > {passage['heading']}" if passage["heading"] else name,
+                "heading": passage["heading"],
+                "start": passage["start"],
+                "end": passage["end"],
+                "content": text[passage["start"]:passage["end"]],
+                "similarity_score": similarity
+            })
+            used += length
+
+        logger.info(f"[{self.domain_name}] Selected {len(results)} passages ({used} chars) "
+                    f"from {len(candidates)} above {min_similarity} similarity")
+        return results
+
+    @staticmethod
+    def _read_if_unchanged(doc_path: str, doc_data: Dict[str, Any]) -> Optional[str]:
+        """Document text, or None if it changed since indexing (offsets would be off)."""
+        try:
+            st = os.stat(doc_path)
+            if st.st_size != doc_data.get("size") or st.st_mtime != doc_data.get("modified"):
+                return None
+            with open(doc_path, encoding='utf-8') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
 
     def remove_missing_documents(self, valid_doc_paths: List[str]) -> int:
         """
@@ -316,17 +609,20 @@ class DocumentVectorStore:
             Number of embeddings removed
         """
         valid_set = set(valid_doc_paths)
-        to_remove = [
-            doc_path for doc_path in self.data["documents"].keys()
-            if doc_path not in valid_set
-        ]
+        with self.lock:
+            to_remove = [
+                doc_path for doc_path in self.data["documents"].keys()
+                if doc_path not in valid_set
+            ]
 
-        for doc_path in to_remove:
-            del self.data["documents"][doc_path]
+            for doc_path in to_remove:
+                self._remove_passages(doc_path)
+                del self.data["documents"][doc_path]
+                self.vectors.remove(doc_path)
 
-        if to_remove:
-            logger.info(f"[{self.domain_name}] Removed {len(to_remove)} stale embeddings")
-            self.save()
+            if to_remove:
+                logger.info(f"[{self.domain_name}] Removed {len(to_remove)} stale embeddings")
+                self.save()
 
         return len(to_remove)
 
@@ -334,6 +630,7 @@ class DocumentVectorStore:
         """Get statistics about the document embeddings."""
         return {
             "total_documents": len(self.data["documents"]),
+            "total_passages": len(self.passages),
             "model": self.data["metadata"]["model"],
             "last_generated": self.data["metadata"].get("generated"),
             "embeddings_file": str(self.embeddings_file),
@@ -341,6 +638,34 @@ class DocumentVectorStore:
         }
 
 
+def migrate_document_embeddings(domain_name: str, storage_path: Path, force: bool = False) -> Optional[int]:
+    """
+    One-shot conversion of a legacy doc_embeddings.json to the binary format.
+
+    Existing binary files are never overwritten unless force is set, since
+    they may hold vectors written after the JSON file was last updated.
+
+    Args:
+        domain_name: Name of the domain (for logging)
+        storage_path: Path to domain directory
+        force: Rebuild the binary files from the JSON even if they exist
+
+    Returns:
+        Number of document embeddings migrated (0 if there was no legacy
+        file, None if the binary files already exist)
+    """
+    store = DocumentVectorStore(domain_name, storage_path)
+    if not store.legacy_file.exists():
+        return 0
+    if not force and (store.index_file.exists() or store.embeddings_file.exists()):
+        return None
+    if not store._load_legacy():
+        return 0
+
+    store.save()
+    return len(store.vectors)
+
+
 # Singleton cache for document stores per domain
 _document_stores: Dict[str, DocumentVectorStore] = {}
 
@@ -0,0 +1,263 @@
+"""
+Document Indexer - keeps library document embeddings current in the background.
+
+Semantic document search used to list the library, check every file for
+staleness and embed changed files inline on each query. A DocumentIndexer
+does that work on a polling thread instead: every index_poll_seconds it
+lists the library's markdown files (honouring ignored.md), embeds new or
+changed ones in batches and drops embeddings of deleted files. Queries only
+read the store, and until the thread has loaded the stored embeddings (or,
+on a cold start, finished its first scan) the indexer is not ready and
+queries fall back to filesystem document search.
+
+Polling is used rather than inotify so the indexer works the same on bind
+mounts and network filesystems; a poll costs one stat() per document.
+
+Configured per domain under "document_search":
+    auto_generate_embeddings   Run the indexer (default true)
+    index_poll_seconds         Seconds between library scans (default 30)
+"""
+
+import glob
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+from .document_embeddings import DocumentVectorStore, get_document_store
+
+logger = logging.getLogger("document_indexer")
+
+DEFAULT_POLL_SECONDS = 30.0
+IGNORE_FILENAME = "ignored.md"
+
+
+def load_ignore_patterns(base_dir: Path) -> List[str]:
+    """Read substring patterns (one per line, # comments) from the library's ignored.md."""
+    ignore_patterns = []
+    ignored_file = base_dir / IGNORE_FILENAME
+    if ignored_file.exists():
+        try:
+            with open(ignored_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        ignore_patterns.append(line)
+        except Exception as e:
+            logger.warning(f"Could not read {IGNORE_FILENAME}: {e}")
+    return ignore_patterns
+
+
+def list_library_files(base_dir: Path, ignore_patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    List markdown documents under base_dir, excluding ignored paths.
+
+    Args:
+        base_dir: Library root
+        ignore_patterns: Substrings of relative paths to skip (default: from ignored.md)
+
+    Returns:
+        Sorted file paths
+    """
+    if ignore_patterns is None:
+        ignore_patterns = load_ignore_patterns(base_dir)
+
+    files = []
+    for file_path in glob.glob(str(base_dir / "**/*.md"), recursive=True):
+        rel_path = str(Path(file_path).relative_to(base_dir))
+
+        # Skip ignored.md itself
+        if rel_path == IGNORE_FILENAME:
+            continue
+
+        if any(pattern in rel_path for pattern in ignore_patterns):
+            continue
+
+        files.append(file_path)
+
+    return sorted(files)
+
+
+class DocumentIndexer:
+    """Polling indexer that keeps one domain's DocumentVectorStore in sync with its library."""
+
+    def __init__(self, domain_name: str, base_dir: Path, store: DocumentVectorStore,
+                 poll_seconds: float = DEFAULT_POLL_SECONDS):
+        """
+        Initialize the indexer (call start() to begin polling).
+
+        Args:
+            domain_name: Domain name (for logging)
+            base_dir: Library root (library_base_path)
+            store: Document store to keep current
+            poll_seconds: Seconds between library scans
+        """
+        self.domain_name = domain_name
+        self.base_dir = Path(base_dir)
+        self.store = store
+        self.poll_seconds = poll_seconds
+
+        self._files: List[str] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._refresh_lock = threading.Lock()
+        self._ready = threading.Event()
+
+        self.scans = 0
+        self.embedded = 0
+        self.removed = 0
+        self.last_scan: Optional[float] = None
+        self.last_scan_ms: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the store holds something worth searching (loaded or scanned once)."""
+        return self._ready.is_set()
+
+    @property
+    def files(self) -> List[str]:
+        """Documents found by the last scan."""
+        return list(self._files)
+
+    def refresh(self) -> int:
+        """
+        Scan the library once and bring the store up to date.
+
+        Returns:
+            Number of documents (re-)embedded
+        """
+        with self._refresh_lock:
+            t0 = time.time()
+            files = list_library_files(self.base_dir)
+            self._files = files
+
+            generated = self.store.generate_embeddings(files, force=False)
+            removed = self.store.remove_missing_documents(files)
+
+            self.scans += 1
+            self.embedded += generated
+            self.removed += removed
+            self.last_scan = time.time()
+            self.last_scan_ms = (self.last_scan - t0) * 1000
+
+            self._ready.set()
+            if generated or removed:
+                logger.info(f"[{self.domain_name}] Indexed {generated} documents, removed {removed} "
+                            f"({len(files)} in library, {self.last_scan_ms:.0f}ms)")
+            return generated
+
+    def start(self, scan: bool = True) -> None:
+        """
+        Start the background thread (no-op if already running).
+
+        The thread loads the stored embeddings and, when scan is set, then
+        polls the library every poll_seconds.
+
+        Args:
+            scan: Keep the store current (False only loads it)
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(scan,), name=f"doc-indexer-{self.domain_name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop polling and wait for an in-progress scan to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "library": str(self.base_dir),
+            "documents": len(self._files),
+            "embedded": len(self.store.vectors),
+            "scans": self.scans,
+            "last_scan": self.last_scan,
+            "last_scan_ms": self.last_scan_ms,
+            "ready": self.ready,
+            "running": bool(self._thread and self._thread.is_alive())
+        }
+
+    def _run(self, scan: bool) -> None:
+        try:
+            self.store.load()
+        except Exception as e:
+            logger.error(f"[{self.domain_name}] Could not load document embeddings: {e}")
+        if len(self.store.vectors) or not scan:
+            # Answer from the stored embeddings while the first scan runs
+            self._ready.set()
+        if not scan:
+            return
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"[{self.domain_name}] Document indexing failed: {e}")
+            if self._stop.wait(self.poll_seconds):
+                return
+
+
+# Per-domain indexers
+_indexers: Dict[str, DocumentIndexer] = {}
+_indexers_lock = threading.Lock()
+
+
+def get_document_indexer(
+    domain_name: str,
+    base_dir: Path,
+    domain_path: Path,
+    doc_search_config: Optional[Dict[str, Any]] = None
+) -> Optional[DocumentIndexer]:
+    """
+    Get the indexer for a domain's library, starting it on first use.
+
+    Loading and scanning happen on the indexer's thread; callers should
+    check indexer.ready and fall back to another search until it is.
+
+    Args:
+        domain_name: Domain name
+        base_dir: Library root (library_base_path)
+        domain_path: Domain directory holding the document embeddings
+        doc_search_config: The domain's "document_search" config
+
+    Returns:
+        DocumentIndexer, or None if sentence-transformers is not installed
+    """
+    config = doc_search_config or {}
+    key = f"{domain_name}:{Path(base_dir).resolve()}"
+
+    with _indexers_lock:
+        indexer = _indexers.get(key)
+        if indexer is not None:
+            return indexer
+
+        store = get_document_store(domain_name, domain_path)
+        if not store:
+            return None
+
+        indexer = DocumentIndexer(
+            domain_name,
+            base_dir,
+            store,
+            poll_seconds=config.get("index_poll_seconds", DEFAULT_POLL_SECONDS)
+        )
+        _indexers[key] = indexer
+
+    indexer.start(scan=config.get("auto_generate_embeddings", True))
+
+    return indexer
+
+
+def stop_document_indexers() -> None:
+    """Stop every polling indexer (application shutdown)."""
+    with _indexers_lock:
+        indexers = list(_indexers.values())
+        _indexers.clear()
+    for indexer in indexers:
+        indexer.stop()
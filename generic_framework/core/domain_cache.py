@@ -0,0 +1,196 @@
+"""
+Domain Artifact Cache - process-wide cache of parsed domain files.
+
+Query handling reads the same domain.json, patterns.json and embedding
+files on every request. This cache keeps the parsed result keyed by path
+and re-validates it with a single os.stat() per file: an entry is reused
+while (mtime_ns, size, inode) of every backing file is unchanged, and
+reloaded as soon as any of them differs (including atomic replaces, which
+change the inode).
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+import json
+import os
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger("domain_cache")
+
+
+FileSignature = Optional[Tuple[int, int, int]]
+
+
+def _signature(path: Path) -> FileSignature:
+    """Stat-based identity of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class _CacheEntry:
+    """A cached value and the file signatures it was loaded from."""
+
+    __slots__ = ("signatures", "value")
+
+    def __init__(self, signatures: Tuple[FileSignature, ...], value: Any):
+        self.signatures = signatures
+        self.value = value
+
+
+class DomainArtifactCache:
+    """
+    Stat-validated cache for parsed domain artifacts.
+
+    Entries are keyed by (kind, primary path). Hit/miss counters are kept
+    per kind ("domain_config", "patterns", "vector_store", ...).
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], _CacheEntry] = {}
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def get(
+        self,
+        kind: str,
+        paths: Sequence[Path],
+        loader: Callable[[], Any]
+    ) -> Any:
+        """
+        Return the cached value for paths, reloading if any file changed.
+
+        Args:
+            kind: Artifact kind (used for the key and the counters)
+            paths: Backing files; the first one is the cache key
+            loader: Zero-argument callable producing the value on a miss
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        key = (kind, str(paths[0]))
+        signatures = tuple(_signature(Path(p)) for p in paths)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signatures == signatures:
+                self._hits[kind] = self._hits.get(kind, 0) + 1
+                return entry.value
+            self._misses[kind] = self._misses.get(kind, 0) + 1
+
+        # Load outside the lock; a concurrent miss on the same key just loads twice
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = _CacheEntry(signatures, value)
+
+        logger.debug(f"Loaded {kind} from {paths[0]}")
+        return value
+
+    def load_json(self, path: Path, kind: str = "json") -> Any:
+        """Parse a JSON file through the cache."""
+        path = Path(path)
+
+        def _load():
+            with open(path, 'r') as f:
+                return json.load(f)
+
+        return self.get(kind, [path], _load)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop entries for a path (all kinds), or everything if path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path_str = str(path)
+            for key in [k for k in self._entries if k[1] == path_str]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per kind plus totals."""
+        with self._lock:
+            kinds = sorted(set(self._hits) | set(self._misses))
+            by_kind = {}
+            for kind in kinds:
+                hits = self._hits.get(kind, 0)
+                misses = self._misses.get(kind, 0)
+                by_kind[kind] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0
+                }
+
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            return {
+                "entries": len(self._entries),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "by_kind": by_kind
+            }
+
+
+def load_patterns_file(path: Path) -> Optional[list]:
+    """
+    Read a patterns.json file through the cache.
+
+    Accepts both the list format and the {"patterns": [...]} format.
+
+    Returns:
+        The (shared, read-only) pattern list, or None for an unknown format
+    """
+    def _load():
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and 'patterns' in data:
+            return data['patterns']
+        if isinstance(data, list):
+            return data
+        return None
+
+    return get_domain_cache().get("patterns", [Path(path)], _load)
+
+
+def load_vector_store(storage_path: Path):
+    """
+    Get a loaded VectorStore for a domain directory through the cache.
+
+    The store is keyed on all of its backing files, so writes by other
+    VectorStore instances (e.g. background journal embedding) are picked up
+    on the next call. Callers must not mutate the returned store.
+    """
+    from .embeddings import VectorStore
+
+    storage_path = Path(storage_path)
+    probe = VectorStore(storage_path)
+
+    def _load():
+        store = VectorStore(storage_path)
+        store.load()
+        return store
+
+    return get_domain_cache().get(
+        "vector_store",
+        [probe.embeddings_file, probe.ids_file, probe.meta_file, probe.legacy_file],
+        _load
+    )
+
+
+# Singleton instance
+_domain_cache: Optional[DomainArtifactCache] = None
+
+
+def get_domain_cache() -> DomainArtifactCache:
+    """Get the process-wide domain artifact cache."""
+    global _domain_cache
+    if _domain_cache is None:
+        _domain_cache = DomainArtifactCache()
+    return _domain_cache
@@ -0,0 +1,174 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Domain Loader - concurrent, optionally lazy domain activation.
+
+Domains used to be loaded one after another, so cold start grew with the
+number of domains. A DomainLoader is given one load coroutine factory per
+domain and runs them with at most max_concurrency in flight. In lazy mode
+nothing is loaded up front; each domain is loaded by the first caller of
+ensure() (concurrent callers share the same load).
+
+Load functions should keep blocking work (file reads, JSON parsing) off
+the event loop, e.g. with asyncio.to_thread, so loads actually overlap.
+
+Each domain's state (pending, loading, ready, error), timing and error is
+kept for readiness reporting.
+
+The default concurrency can be set with DOMAIN_LOAD_CONCURRENCY.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("domain_loader")
+
+DEFAULT_LOAD_CONCURRENCY = int(os.getenv("DOMAIN_LOAD_CONCURRENCY", "4"))
+
+
+class DomainLoadState(Enum):
+    """Load state of a single domain."""
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    ERROR = "error"
+
+
+class DomainLoader:
+    """Runs per-domain load functions with bounded parallelism and tracks their state."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, lazy: bool = False):
+        """
+        Initialize the loader.
+
+        Args:
+            max_concurrency: Maximum domains loading at once (default: DOMAIN_LOAD_CONCURRENCY)
+            lazy: Load domains on first use instead of in load_all()
+        """
+        self.max_concurrency = max(1, max_concurrency or DEFAULT_LOAD_CONCURRENCY)
+        self.lazy = lazy
+
+        self._loaders: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def register(self, domain_id: str, load: Callable[[], Awaitable[Any]]) -> None:
+        """Register (or replace) a domain's load function; the domain becomes pending."""
+        self._loaders[domain_id] = load
+        self._tasks.pop(domain_id, None)
+        self._status[domain_id] = {
+            'state': DomainLoadState.PENDING.value,
+            'error': None,
+            'load_ms': None,
+            'loaded_at': None,
+        }
+
+    def unregister(self, domain_id: str) -> None:
+        """Forget a domain (cancelling an in-flight load)."""
+        self._loaders.pop(domain_id, None)
+        self._status.pop(domain_id, None)
+        task = self._tasks.pop(domain_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def state(self, domain_id: str) -> Optional[DomainLoadState]:
+        """Current state of a domain, or None if it is not registered."""
+        status = self._status.get(domain_id)
+        return DomainLoadState(status['state']) if status else None
+
+    async def ensure(self, domain_id: str) -> bool:
+        """
+        Load a domain if it has not been loaded yet.
+
+        Concurrent callers wait for the same load. A failed load is not
+        retried until the domain is registered again.
+
+        Returns:
+            True if the domain is ready
+        """
+        if domain_id not in self._loaders:
+            return False
+        task = self._tasks.get(domain_id)
+        if task is None:
+            task = self._tasks[domain_id] = asyncio.ensure_future(self._run(domain_id))
+        await asyncio.shield(task)
+        return self.state(domain_id) == DomainLoadState.READY
+
+    async def load_all(self) -> Dict[str, Any]:
+        """Load every registered domain, max_concurrency at a time."""
+        start = time.time()
+        await asyncio.gather(*(self.ensure(domain_id) for domain_id in list(self._loaders)))
+        summary = self.summary()
+        logger.info(
+            f"Loaded {summary['counts'].get('ready', 0)}/{len(self._loaders)} domains "
+            f"in {time.time() - start:.2f}s (concurrency {self.max_concurrency})"
+        )
+        return summary
+
+    async def _run(self, domain_id: str) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        status = self._status[domain_id]
+
+        async with self._semaphore:
+            status['state'] = DomainLoadState.LOADING.value
+            start = time.time()
+            try:
+                await self._loaders[domain_id]()
+                status['state'] = DomainLoadState.READY.value
+                status['loaded_at'] = time.time()
+            except Exception as e:
+                status['state'] = DomainLoadState.ERROR.value
+                status['error'] = str(e)
+                logger.error(f"  ✗ Failed to load domain {domain_id}: {e}")
+            finally:
+                status['load_ms'] = round((time.time() - start) * 1000, 1)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-domain load state."""
+        return {domain_id: dict(status) for domain_id, status in self._status.items()}
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Readiness summary.
+
+        Ready means nothing is loading and, unless lazy, nothing is pending.
+        """
+        counts: Dict[str, int] = {}
+        for status in self._status.values():
+            counts[status['state']] = counts.get(status['state'], 0) + 1
+
+        ready = not counts.get(DomainLoadState.LOADING.value) and (
+            self.lazy or not counts.get(DomainLoadState.PENDING.value)
+        )
+        return {
+            'ready': ready,
+            'lazy': self.lazy,
+            'max_concurrency': self.max_concurrency,
+            'counts': counts,
+            'domains': self.status(),
+        }
+
+    def clear(self) -> None:
+        """Forget all domains (cancelling in-flight loads)."""
+        for domain_id in list(self._loaders):
+            self.unregister(domain_id)
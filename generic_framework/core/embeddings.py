@@ -22,12 +22,17 @@ using SentenceTransformers for semantic search.
 """
 
 import json
+import os
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import asyncio
+import threading
+import time
 from functools import lru_cache
 
+from .ann_index import create_ann_index, measure_recall
+
 # Optional import - will fail gracefully if not installed
 try:
     from sentence_transformers import SentenceTransformer
@@ -276,71 +281,643 @@ class EmbeddingService:
 
 class VectorStore:
     """
-    Simple vector store for pattern embeddings.
-
-    Stores embeddings in memory with persistence to JSON.
+    Matrix-backed vector store for pattern embeddings.
+
+    Embeddings are kept L2-normalized in a single contiguous float32 matrix
+    with an id <-> row index, so scoring a query against every pattern is one
+    matrix-vector product and top-k selection is an argpartition.
+    Rows are appended into spare capacity and removed by swapping the last
+    row into the freed slot, so set/remove are O(dim).
+
+    On disk the matrix is a raw little-endian float32 file ({name}.f32) with
+    a newline-delimited id sidecar ({name}.ids) and a small header
+    ({name}.meta.json). Both files are append-only logs: save() appends a
+    row and an id line for each new or changed embedding and a
+    {"deleted": id} tombstone line for each removal, so a save costs I/O
+    proportional to the change and never touches rows another store may
+    have memory-mapped. The latest row for an id wins. Once dead rows
+    outnumber live ones, save() compacts by writing fresh files and swapping
+    them in with os.replace. load() memory-maps the matrix (copying just the
+    live rows when dead ones are present). A legacy {name}.json file is read
+    when no binary files exist and is converted on the next save.
+
+    An optional ANN index (see core/ann_index.py) narrows unrestricted
+    searches to a candidate set once the store reaches the index's min_size;
+    smaller stores, and searches restricted to pattern_ids, stay exact. The
+    index is trained on a background thread (started by load() or the first
+    search that needs it) and searches stay exact until it is built.
     """
 
-    def __init__(self, storage_path: Path):
+    INITIAL_CAPACITY = 64
+    DTYPE = np.dtype('<f4')
+    FORMAT_VERSION = 2  # 2: the id sidecar may contain {"deleted": id} tombstones
+
+    def __init__(self, storage_path: Path, name: str = "embeddings",
+                 index_config: Optional[Dict[str, Any]] = None):
         self.storage_path = storage_path
-        self.embeddings_file = storage_path / "embeddings.json"
-        self._embeddings: Dict[str, List[float]] = {}
-        self._numpy_embeddings: Dict[str, np.ndarray] = {}
+        self.name = name
+        self.embeddings_file = storage_path / f"{name}.f32"
+        self.ids_file = storage_path / f"{name}.ids"
+        self.meta_file = storage_path / f"{name}.meta.json"
+        self.legacy_file = storage_path / f"{name}.json"
+        self._matrix: Optional[np.ndarray] = None  # (capacity, dim), rows [0, len) are live
+        self._ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+
+        # Incremental persistence bookkeeping: ids set or removed since the
+        # last save, and the size of the on-disk logs this store last saw
+        self._dirty_ids: set = set()
+        self._removed_ids: set = set()
+        self._file_rows = 0
+        self._ids_bytes = 0
+        self._rewrite = True
+
+        self.ann = create_ann_index(index_config)
+        self._ann_lock = threading.Lock()
+        self._ann_thread: Optional[threading.Thread] = None
+        self._ann_pending: Optional[set] = None  # ids changed while a build runs
+        self._ann_generation = 0
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Embedding dimension, or None if the store has never held a vector."""
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    @property
+    def ids(self) -> List[str]:
+        """Pattern IDs in row order."""
+        return list(self._ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Live rows of the normalized embedding matrix (read-only view)."""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        view = self._matrix[:len(self._ids)]
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector or each row of a matrix (zero rows stay zero)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load_rows(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Replace store contents with the given ids and (n, dim) vectors."""
+        self.clear()
+        if not ids:
+            return
+        capacity = max(self.INITIAL_CAPACITY, len(ids))
+        self._matrix = np.zeros((capacity, vectors.shape[1]), dtype=np.float32)
+        self._matrix[:len(ids)] = self._normalize(vectors)
+        self._ids = list(ids)
+        self._id_to_row = {pid: row for row, pid in enumerate(self._ids)}
+
+    def load_matrix(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Replace the store's contents with ids and their (n, dim) vectors in one copy."""
+        self._load_rows(list(ids), np.asarray(vectors, dtype=np.float32))
+
+    def _detach(self) -> None:
+        """Copy a memory-mapped matrix into RAM before the first mutation."""
+        if isinstance(self._matrix, np.memmap):
+            count = len(self._ids)
+            detached = np.zeros((max(self.INITIAL_CAPACITY, count * 2), self._matrix.shape[1]), dtype=np.float32)
+            detached[:count] = self._matrix[:count]
+            self._matrix = detached
+
+    def _ensure_capacity(self, dim: int) -> None:
+        """Make room for one more row, doubling the matrix when full."""
+        self._detach()
+        if self._matrix is None:
+            self._matrix = np.zeros((self.INITIAL_CAPACITY, dim), dtype=np.float32)
+            return
+
+        if dim != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension mismatch: store has {self._matrix.shape[1]}, got {dim}"
+            )
+
+        if len(self._ids) == self._matrix.shape[0]:
+            grown = np.zeros((self._matrix.shape[0] * 2, dim), dtype=np.float32)
+            grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+            self._matrix = grown
 
     def load(self) -> None:
-        """Load embeddings from disk."""
-        if not self.embeddings_file.exists():
+        """Load embeddings from disk (memory-mapped, no parsing)."""
+        if self.embeddings_file.exists() and self.meta_file.exists() and self.ids_file.exists():
+            self._load_binary()
+        elif self.legacy_file.exists():
+            self._load_legacy_json()
+        else:
             print(f"[VECTOR] No existing embeddings file at {self.embeddings_file}")
             return
 
-        with open(self.embeddings_file, 'r') as f:
-            self._embeddings = json.load(f)
+        if self.ann_active:
+            self.build_ann_index()
+
+    def _load_binary(self) -> None:
+        """Memory-map the float32 matrix and replay the id sidecar."""
+        with open(self.meta_file, 'r') as f:
+            meta = json.load(f)
+        dim = int(meta["dim"])
+
+        with open(self.ids_file, 'rb') as f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1  # A partial last line is a torn write
+
+        row_bytes = dim * self.DTYPE.itemsize
+        rows = self.embeddings_file.stat().st_size // row_bytes if row_bytes else 0
+
+        # Replay the log: id lines map to consecutive rows, later rows and
+        # tombstones supersede earlier ones
+        live: Dict[str, int] = {}
+        count = 0
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                live.pop(record.get("deleted"), None)
+                continue
+            if count >= rows:
+                break
+            live.pop(record, None)
+            live[record] = count
+            count += 1
+
+        self.clear()
+        if live:
+            mapped = np.memmap(self.embeddings_file, dtype=self.DTYPE, mode='r', shape=(count, dim))
+            if len(live) == count:
+                self._matrix = mapped
+            else:
+                self._matrix = np.array(mapped[np.fromiter(live.values(), dtype=np.intp, count=len(live))])
+            self._ids = list(live)
+            self._id_to_row = {pid: row for row, pid in enumerate(self._ids)}
+
+        self._file_rows = count
+        self._ids_bytes = complete
+        # A torn write (ids and rows disagree) is repaired by the next save;
+        # an empty store is rewritten so the header picks up the real dim
+        torn = complete != len(data) or count != rows
+        self._rewrite = torn or not live
+        if torn:
+            print(f"[VECTOR] WARNING: {self.ids_file.name} covers {count} of {rows} rows; keeping {len(live)}")
 
-        # Convert to numpy for computation
-        self._numpy_embeddings = {
-            k: np.array(v) for k, v in self._embeddings.items()
-        }
+        print(f"[VECTOR] Mapped {len(live)} embeddings ({count - len(live)} superseded) from {self.embeddings_file}")
 
-        print(f"[VECTOR] Loaded {len(self._embeddings)} embeddings")
+    def _load_legacy_json(self) -> None:
+        """Read a legacy {id: [floats]} JSON file; the next save converts it."""
+        with open(self.legacy_file, 'r') as f:
+            raw = json.load(f)
+
+        ids = list(raw.keys())
+        vectors = np.asarray([raw[pid] for pid in ids], dtype=np.float32) if ids else None
+        self._load_rows(ids, vectors)
+
+        print(f"[VECTOR] Loaded {len(self._ids)} embeddings from legacy {self.legacy_file.name}")
 
     def save(self) -> None:
-        """Save embeddings to disk."""
-        self.embeddings_file.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Persist changes since the last save.
+
+        New and changed embeddings are appended as rows, removals as
+        tombstones; nothing already on disk is rewritten, so stores that have
+        embeddings.f32 memory-mapped keep a consistent snapshot. A full
+        rewrite (fresh files swapped in with os.replace) happens when dead
+        rows would outnumber live ones, or when the files changed since this
+        store last read or wrote them.
+        """
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+
+        if (self._rewrite or self._matrix is None
+                or not self.embeddings_file.exists() or not self.ids_file.exists()):
+            self._write_full()
+            return
 
-        with open(self.embeddings_file, 'w') as f:
-            json.dump(self._embeddings, f)
+        row_bytes = self._matrix.shape[1] * self.DTYPE.itemsize
+        if (self.embeddings_file.stat().st_size != self._file_rows * row_bytes
+                or self.ids_file.stat().st_size != self._ids_bytes):
+            # Another writer changed the files since we loaded them
+            self._write_full()
+            return
+
+        changed = sorted((pid for pid in self._dirty_ids if pid in self._id_to_row), key=self._id_to_row.get)
+        removed = [pid for pid in self._removed_ids if pid not in self._id_to_row]
+        if not changed and not removed:
+            self._mark_clean()
+            return
 
-        print(f"[VECTOR] Saved {len(self._embeddings)} embeddings to {self.embeddings_file}")
+        live = len(self._ids)
+        if self._file_rows + len(changed) - live > live:
+            self._write_full()  # Compact
+            return
+
+        lines = "".join(json.dumps(pid) + "\n" for pid in changed)
+        lines += "".join(json.dumps({"deleted": pid}) + "\n" for pid in removed)
+        encoded = lines.encode('utf-8')
+        if changed:
+            rows = np.fromiter((self._id_to_row[pid] for pid in changed), dtype=np.intp, count=len(changed))
+            with open(self.embeddings_file, 'ab') as f:
+                f.write(self._matrix[rows].astype(self.DTYPE, copy=False).tobytes())
+        with open(self.ids_file, 'ab') as f:
+            f.write(encoded)
+
+        self._file_rows += len(changed)
+        self._ids_bytes += len(encoded)
+        self._mark_clean()
+        print(f"[VECTOR] Appended {len(changed)} embeddings and {len(removed)} removals "
+              f"({live} total) to {self.embeddings_file}")
+
+    def _row_bytes(self, start: int, stop: int) -> bytes:
+        """Serialize matrix rows [start, stop) in the on-disk dtype."""
+        return self._matrix[start:stop].astype(self.DTYPE, copy=False).tobytes()
+
+    def _write_ids(self) -> int:
+        """Atomically rewrite the id sidecar (live ids only); returns its size."""
+        data = "".join(json.dumps(pid) + "\n" for pid in self._ids).encode('utf-8')
+        tmp = self.ids_file.with_suffix(self.ids_file.suffix + ".tmp")
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self.ids_file)
+        return len(data)
+
+    def _write_full(self) -> None:
+        """Rewrite matrix, ids and header from scratch (atomic per file)."""
+        count = len(self._ids)
+        dim = self.dim or 0
+
+        tmp = self.embeddings_file.with_suffix(self.embeddings_file.suffix + ".tmp")
+        with open(tmp, 'wb') as f:
+            if count:
+                f.write(self._row_bytes(0, count))
+        os.replace(tmp, self.embeddings_file)
+
+        ids_bytes = self._write_ids()
+
+        tmp = self.meta_file.with_suffix(self.meta_file.suffix + ".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({
+                "format": "float32-rows",
+                "version": self.FORMAT_VERSION,
+                "dim": dim,
+                "dtype": self.DTYPE.str,
+                "normalized": True
+            }, f)
+        os.replace(tmp, self.meta_file)
+
+        self._file_rows = count
+        self._ids_bytes = ids_bytes
+        self._mark_clean()
+        print(f"[VECTOR] Saved {count} embeddings to {self.embeddings_file}")
+
+    def _mark_clean(self) -> None:
+        self._dirty_ids.clear()
+        self._removed_ids.clear()
+        self._rewrite = False
 
     def set(self, pattern_id: str, embedding: np.ndarray) -> None:
-        """Store an embedding for a pattern."""
-        self._embeddings[pattern_id] = embedding.tolist()
-        self._numpy_embeddings[pattern_id] = embedding
+        """Store an embedding for a pattern (overwrites in place if present)."""
+        vector = self._normalize(np.ravel(embedding))
+
+        row = self._id_to_row.get(pattern_id)
+        if row is None:
+            self._ensure_capacity(vector.shape[0])
+            row = len(self._ids)
+            self._ids.append(pattern_id)
+            self._id_to_row[pattern_id] = row
+        elif vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension mismatch: store has {self._matrix.shape[1]}, got {vector.shape[0]}"
+            )
+        else:
+            self._detach()
+
+        self._matrix[row] = vector
+        self._dirty_ids.add(pattern_id)
+        self._removed_ids.discard(pattern_id)
+        if self.ann:
+            self._ann_touch(pattern_id)
+            self.ann.add(pattern_id, vector)
 
     def get(self, pattern_id: str) -> Optional[np.ndarray]:
-        """Get an embedding for a pattern."""
-        return self._numpy_embeddings.get(pattern_id)
+        """Get the (normalized) embedding for a pattern."""
+        row = self._id_to_row.get(pattern_id)
+        if row is None:
+            return None
+        return self._matrix[row].copy()
 
     def get_all(self) -> Dict[str, np.ndarray]:
         """Get all embeddings as numpy arrays."""
-        return self._numpy_embeddings.copy()
+        return {pid: self._matrix[row].copy() for pid, row in self._id_to_row.items()}
 
     def has(self, pattern_id: str) -> bool:
         """Check if an embedding exists for a pattern."""
-        return pattern_id in self._numpy_embeddings
+        return pattern_id in self._id_to_row
 
     def remove(self, pattern_id: str) -> None:
-        """Remove an embedding."""
-        self._embeddings.pop(pattern_id, None)
-        self._numpy_embeddings.pop(pattern_id, None)
+        """Remove an embedding (the last row is moved into the freed slot)."""
+        row = self._id_to_row.pop(pattern_id, None)
+        if row is None:
+            return
+
+        self._detach()
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._id_to_row[moved_id] = row
+            if self.ann:
+                self._ann_touch(moved_id)
+        self._ids.pop()
+        self._dirty_ids.discard(pattern_id)
+        self._removed_ids.add(pattern_id)
+        if self.ann:
+            self._ann_touch(pattern_id)
+            self.ann.remove(pattern_id)
 
     def clear(self) -> None:
         """Clear all embeddings."""
-        self._embeddings.clear()
-        self._numpy_embeddings.clear()
+        self._matrix = None
+        self._ids = []
+        self._id_to_row = {}
+        self._dirty_ids.clear()
+        self._removed_ids.clear()
+        self._file_rows = 0
+        self._ids_bytes = 0
+        self._rewrite = True
+        if self.ann:
+            with self._ann_lock:
+                self._ann_generation += 1
+            self.ann.reset()
+
+    def rows_for(self, pattern_ids) -> Tuple[List[str], np.ndarray]:
+        """
+        Resolve pattern IDs to matrix rows, skipping IDs without embeddings.
+
+        Returns:
+            (ids, rows) where ids[i] is stored at matrix row rows[i]
+        """
+        found = [(pid, self._id_to_row[pid]) for pid in pattern_ids if pid in self._id_to_row]
+        if not found:
+            return [], np.empty(0, dtype=np.intp)
+        ids, rows = zip(*found)
+        return list(ids), np.fromiter(rows, dtype=np.intp, count=len(rows))
+
+    def similarities(
+        self,
+        query_embedding: np.ndarray,
+        pattern_ids=None
+    ) -> Dict[str, float]:
+        """
+        Cosine similarity between a query and stored patterns in one matmul.
+
+        Args:
+            query_embedding: Query vector (need not be normalized)
+            pattern_ids: Optional iterable restricting which patterns are scored
+
+        Returns:
+            Dict of pattern_id -> similarity score
+        """
+        ids, scores = self._score(query_embedding, pattern_ids)
+        return dict(zip(ids, scores.tolist()))
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 10,
+        threshold: Optional[float] = None,
+        pattern_ids=None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k nearest patterns by cosine similarity.
+
+        Args:
+            query_embedding: Query vector (need not be normalized)
+            top_k: Number of results to return
+            threshold: Optional minimum similarity score
+            pattern_ids: Optional iterable restricting the candidate set
+
+        Returns:
+            List of (pattern_id, score) tuples, highest score first
+        """
+        if pattern_ids is None and self.ann_active:
+            pattern_ids = self._ann_candidates(query_embedding, top_k)  # None until built
+        return self._top_k(query_embedding, top_k, threshold, pattern_ids)
+
+    def _top_k(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        threshold: Optional[float] = None,
+        pattern_ids=None
+    ) -> List[Tuple[str, float]]:
+        """Exact top-k over all rows, or only rows for pattern_ids."""
+        ids, scores = self._score(query_embedding, pattern_ids)
+        if not ids or top_k <= 0:
+            return []
+
+        if threshold is not None:
+            keep = np.flatnonzero(scores >= threshold)
+            ids = [ids[i] for i in keep]
+            scores = scores[keep]
+            if not ids:
+                return []
+
+        top = self.top_k_indices(scores, top_k)
+        return [(ids[i], float(scores[i])) for i in top]
+
+    @property
+    def ann_active(self) -> bool:
+        """Whether unrestricted searches go through the ANN index."""
+        return self.ann is not None and len(self._ids) >= self.ann.min_size
+
+    def _ann_candidates(self, query_embedding: np.ndarray, top_k: int) -> Optional[List[str]]:
+        """Candidate ids from the ANN index, or None while it has not been built yet."""
+        if self.ann.needs_rebuild(len(self._ids)):
+            self.build_ann_index()
+        if not self.ann.is_built:
+            return None
+        return self.ann.candidates(self._normalize(np.ravel(query_embedding)), top_k)
+
+    def build_ann_index(self, wait: bool = False) -> None:
+        """
+        (Re)train the ANN index on a background thread.
+
+        Searches keep using exact search (or the previous index) until the
+        build finishes. Does nothing if a build is already running.
+
+        Args:
+            wait: Block until the build has finished
+        """
+        if self.ann is None:
+            return
+        with self._ann_lock:
+            if self._ann_thread is None or not self._ann_thread.is_alive():
+                self._ann_pending = set()
+                self._ann_thread = threading.Thread(
+                    target=self._build_ann, args=(self._ann_generation,),
+                    name=f"ann-build-{self.name}", daemon=True
+                )
+                self._ann_thread.start()
+            thread = self._ann_thread
+        if wait:
+            thread.join()
+
+    def _ann_touch(self, pattern_id: str) -> None:
+        """Remember an id changed during a build so it is re-indexed afterwards."""
+        with self._ann_lock:
+            if self._ann_pending is not None:
+                self._ann_pending.add(pattern_id)
+
+    def _build_ann(self, generation: int) -> None:
+        """Build thread: train on a snapshot, self-check recall, then catch up on changes."""
+        t0 = time.time()
+        try:
+            ids = list(self._ids)
+            matrix = np.array(self._matrix[:len(ids)]) if ids else None
+            if not ids:
+                return
+            self.ann.build(ids, matrix)
+            self._check_recall_on(ids, matrix)
+        except Exception as e:
+            print(f"[VECTOR] WARNING: ANN index build failed: {e}")
+            return
+        finally:
+            with self._ann_lock:
+                pending, self._ann_pending = self._ann_pending or set(), None
+                stale = generation != self._ann_generation
+
+        if stale:
+            self.ann.reset()
+            return
+        for pattern_id in pending:
+            row = self._id_to_row.get(pattern_id)
+            if row is None:
+                self.ann.remove(pattern_id)
+            else:
+                self.ann.add(pattern_id, self._matrix[row].copy())
+
+        print(f"[VECTOR] Built {self.ann.__class__.__name__} over {len(ids)} embeddings "
+              f"in {(time.time() - t0) * 1000:.0f}ms (recall@{self.ann.RECALL_K}={self.ann.recall:.3f})")
+
+    def check_recall(self, sample: Optional[int] = None, top_k: Optional[int] = None) -> float:
+        """
+        Self-check the ANN index against exact search on stored vectors.
+
+        Widens the index (e.g. more IVF probes) until recall@k reaches the
+        index's min_recall or the index cannot widen further. Runs in the
+        caller's thread (building the index first if needed).
+
+        Args:
+            sample: Number of stored vectors used as queries
+            top_k: k for recall@k
+
+        Returns:
+            Measured recall@k (1.0 without an index)
+        """
+        if self.ann is None or not self._ids:
+            return 1.0
+        ids = list(self._ids)
+        matrix = self._matrix[:len(ids)]
+        if not self.ann.is_built:
+            self.ann.build(ids, matrix)
+        return self._check_recall_on(ids, matrix, sample, top_k)
+
+    def _check_recall_on(
+        self,
+        ids: List[str],
+        matrix: np.ndarray,
+        sample: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> float:
+        """check_recall against a fixed (ids, matrix) snapshot."""
+        sample = sample or self.ann.RECALL_SAMPLE
+        top_k = top_k or self.ann.RECALL_K
+        row_of = {pid: row for row, pid in enumerate(ids)}
+        rng = np.random.default_rng(0)
+        queries = [matrix[row] for row in rng.choice(len(ids), size=min(sample, len(ids)), replace=False)]
+
+        def ranked(query, k, candidate_ids, rows):
+            scores = matrix[rows] @ query
+            return [(candidate_ids[i], float(scores[i])) for i in self.top_k_indices(scores, k)]
+
+        def exact(query, k):
+            return ranked(query, k, ids, slice(None))
+
+        def approximate(query, k):
+            found = [pid for pid in self.ann.candidates(query, k) if pid in row_of]
+            return ranked(query, k, found, [row_of[pid] for pid in found]) if found else []
+
+        while True:
+            self.ann.recall = measure_recall(exact, approximate, queries, top_k)
+            if self.ann.recall >= self.ann.min_recall or not self.ann.widen():
+                return self.ann.recall
+
+    def index_stats(self) -> Dict[str, Any]:
+        """Describe the search index (exact or ANN)."""
+        if self.ann is None:
+            return {"type": "exact", "size": len(self._ids)}
+        return {**self.ann.stats(), "size": len(self._ids), "active": self.ann_active}
+
+    @staticmethod
+    def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the top_k highest scores, sorted descending."""
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+    def _score(self, query_embedding: np.ndarray, pattern_ids=None) -> Tuple[List[str], np.ndarray]:
+        """Score the query against all rows, or only rows for pattern_ids."""
+        if self._matrix is None or not self._ids:
+            return [], np.empty(0, dtype=np.float32)
+
+        query = self._normalize(np.ravel(query_embedding))
+
+        if pattern_ids is None:
+            return list(self._ids), self._matrix[:len(self._ids)] @ query
+
+        ids, rows = self.rows_for(pattern_ids)
+        if not ids:
+            return [], np.empty(0, dtype=np.float32)
+        return ids, self._matrix[rows] @ query
 
     def __len__(self) -> int:
-        return len(self._embeddings)
+        return len(self._ids)
+
+
+def migrate_json_embeddings(storage_path: Path, name: str = "embeddings", force: bool = False) -> Optional[int]:
+    """
+    One-shot conversion of a legacy {name}.json file to the binary format.
+
+    The JSON file is left in place; binary files take precedence on load.
+    Existing binary files are never overwritten unless force is set, since
+    they may hold vectors written after the JSON file was last updated.
+
+    Args:
+        storage_path: Directory containing {name}.json
+        name: Store name (file stem)
+        force: Rebuild the binary files from the JSON even if they exist
+
+    Returns:
+        Number of embeddings migrated (0 if there was no legacy file,
+        None if the binary files already exist)
+    """
+    store = VectorStore(storage_path, name)
+    if not store.legacy_file.exists():
+        return 0
+    if not force and (store.embeddings_file.exists() or store.ids_file.exists()):
+        return None
+
+    store._load_legacy_json()
+    store.save()
+    return len(store)
 
 
 # Singleton instance
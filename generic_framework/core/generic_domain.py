@@ -194,7 +194,8 @@ class GenericDomain(Domain):
                     storage_path=self.config.pattern_storage_path,
                     pattern_format=self.config.pattern_format,
                     pattern_schema=self.config.pattern_schema,
-                    similarity_threshold=kb_config_spec.get("similarity_threshold", 0.5)
+                    similarity_threshold=kb_config_spec.get("similarity_threshold", 0.5),
+                    vector_index=kb_config_spec.get("vector_index", {})
                 )
 
                 # Instantiate plugin with additional config if provided
@@ -214,7 +215,8 @@ class GenericDomain(Domain):
             storage_path=self.config.pattern_storage_path,
             pattern_format=self.config.pattern_format,
             pattern_schema=self.config.pattern_schema,
-            similarity_threshold=kb_config_spec.get("similarity_threshold", 0.5)
+            similarity_threshold=kb_config_spec.get("similarity_threshold", 0.5),
+            vector_index=kb_config_spec.get("vector_index", {})
         )
         self._knowledge_base = JSONKnowledgeBase(kb_config)
         await self._knowledge_base.load_patterns()
@@ -0,0 +1,183 @@
+"""
+HTTP Client Registry - shared, pooled httpx.AsyncClient instances.
+
+Building an httpx.AsyncClient per request pays TCP (and TLS) setup on every
+LLM call. The registry keeps one long-lived client per origin (scheme, host,
+port) so connections to the model runner are reused via keep-alive, using
+HTTP/2 when the optional `h2` package is installed (httpx[http2]).
+
+Pool limits come from environment variables:
+    HTTP_MAX_CONNECTIONS    Max open connections per client (default 100)
+    HTTP_MAX_KEEPALIVE      Max idle keep-alive connections (default 20)
+    HTTP_KEEPALIVE_EXPIRY   Idle connection lifetime in seconds (default 30)
+    HTTP_HTTP2              "false" to disable HTTP/2 (default: on if h2 is installed)
+
+Clients are bound to the event loop they were created on; a different loop
+(e.g. a script calling asyncio.run() repeatedly) gets its own clients.
+Call close_http_clients() on application shutdown.
+
+Usage:
+    async with pooled_client(base_url, timeout=httpx.Timeout(60.0)) as client:
+        response = await client.post(endpoint, json=payload)
+"""
+
+import asyncio
+import os
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger("http_clients")
+
+DEFAULT_KEY = "default"
+
+
+def _http2_available() -> bool:
+    if os.getenv("HTTP_HTTP2", "true").lower() in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _origin(base_url: Optional[str]) -> str:
+    """Registry key for a base URL: scheme://host:port, or the default client."""
+    if not base_url:
+        return DEFAULT_KEY
+    url = httpx.URL(base_url)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    return f"{url.scheme}://{url.host}:{port}"
+
+
+class PooledSession:
+    """
+    Thin view over a shared client that applies per-call defaults.
+
+    Exposes the request methods used by call sites (get/post/request/stream)
+    and never closes the underlying client.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, timeout: Any = None, follow_redirects: bool = False):
+        self._client = client
+        self._defaults: Dict[str, Any] = {"follow_redirects": follow_redirects}
+        if timeout is not None:
+            self._defaults["timeout"] = timeout
+
+    def _merge(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {**self._defaults, **kwargs}
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self._client.request(method, url, **self._merge(kwargs))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self._client.get(url, **self._merge(kwargs))
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self._client.post(url, **self._merge(kwargs))
+
+    def stream(self, method: str, url: str, **kwargs):
+        """Streaming request (async context manager yielding the response)."""
+        return self._client.stream(method, url, **self._merge(kwargs))
+
+
+class HTTPClientRegistry:
+    """Application-scoped registry of pooled async HTTP clients."""
+
+    def __init__(self):
+        self.http2 = _http2_available()
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        )
+        self._clients: Dict[Tuple[str, int], Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._created = 0
+
+    def get(self, base_url: Optional[str] = None) -> httpx.AsyncClient:
+        """
+        Get the shared client for base_url's origin on the running event loop.
+
+        Args:
+            base_url: Base URL of the service, or None for the general-purpose
+                client (arbitrary web pages)
+
+        Returns:
+            A pooled httpx.AsyncClient (do not close it)
+        """
+        loop = asyncio.get_running_loop()
+        key = (_origin(base_url), id(loop))
+        client, _ = self._clients.get(key, (None, None))
+        if client is None or client.is_closed:
+            self._prune()
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=httpx.Timeout(60.0)
+            )
+            self._clients[key] = (client, loop)
+            self._created += 1
+            logger.info(f"Created pooled HTTP client for {key[0]} (http2={self.http2})")
+        return client
+
+    def _prune(self) -> None:
+        """Forget clients whose event loop has been closed."""
+        for key in [k for k, (_, loop) in self._clients.items() if loop.is_closed()]:
+            del self._clients[key]
+
+    @asynccontextmanager
+    async def session(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Any = None,
+        follow_redirects: bool = False
+    ):
+        """Borrow the shared client for base_url with per-call defaults."""
+        yield PooledSession(self.get(base_url), timeout=timeout, follow_redirects=follow_redirects)
+
+    async def aclose(self) -> None:
+        """Close every client owned by the running event loop and forget the rest."""
+        running = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        for (origin, _), (client, loop) in clients.items():
+            if loop is not running:
+                continue
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client for {origin}: {e}")
+        logger.info(f"Closed {len(clients)} pooled HTTP client(s)")
+
+    def stats(self) -> Dict[str, Any]:
+        """Open clients by origin."""
+        return {
+            "http2": self.http2,
+            "clients": sorted(origin for origin, _ in self._clients),
+            "created": self._created
+        }
+
+
+# Singleton instance
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_clients() -> HTTPClientRegistry:
+    """Get the application-scoped HTTP client registry."""
+    global _registry
+    if _registry is None:
+        _registry = HTTPClientRegistry()
+    return _registry
+
+
+def pooled_client(base_url: Optional[str] = None, timeout: Any = None, follow_redirects: bool = False):
+    """Borrow a pooled client: `async with pooled_client(url, timeout=...) as client`."""
+    return get_http_clients().session(base_url, timeout=timeout, follow_redirects=follow_redirects)
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients (FastAPI shutdown hook)."""
+    if _registry is not None:
+        await _registry.aclose()
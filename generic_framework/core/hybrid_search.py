@@ -93,8 +93,17 @@ class HybridSearcher:
 
     Scores are combined using weighted average:
     combined = (semantic_score * semantic_weight) + (normalized_keyword_score * keyword_weight)
+
+    When the vector store has an active ANN index and the search covers the
+    whole store, only the ANN candidates (top_k * ANN_OVERFETCH, at least
+    ANN_MIN_CANDIDATES) are scored semantically; other patterns compete on
+    keyword score alone. Searches over a subset (category filters,
+    exact_only) score every pattern in the subset exactly.
     """
 
+    ANN_OVERFETCH = 10
+    ANN_MIN_CANDIDATES = 100
+
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService],
@@ -141,76 +150,75 @@ class HybridSearcher:
         """
         # Build pattern lookup
         pattern_map = {p.get('id', p.get('pattern_id', p.get('name', ''))): p for p in patterns}
+        pattern_ids = list(pattern_map.keys())
 
-        # Get semantic scores if available
-        semantic_scores: Dict[str, float] = {}
-        if self.semantic_available and self.embedding_service:
+        # Get semantic scores if available (one matmul over the store)
+        semantic = np.zeros(len(pattern_ids), dtype=np.float32)
+        if self.semantic_available and self.embedding_service and pattern_ids:
             query_emb = self.embedding_service.encode(query)
-            embeddings = self.vector_store.get_all()
+            if self.vector_store.ann_active and len(pattern_ids) >= len(self.vector_store):
+                # Large store, unfiltered: only ANN candidates get a semantic score
+                semantic_scores = dict(self.vector_store.search(
+                    query_emb, top_k=max(top_k * self.ANN_OVERFETCH, self.ANN_MIN_CANDIDATES)
+                ))
+            else:
+                semantic_scores = self.vector_store.similarities(query_emb, pattern_ids)
+            semantic = np.fromiter(
+                (semantic_scores.get(pid, 0.0) for pid in pattern_ids),
+                dtype=np.float32,
+                count=len(pattern_ids)
+            )
 
-            for pattern_id, pattern_emb in embeddings.items():
-                if pattern_id in pattern_map:
-                    semantic_scores[pattern_id] = self.embedding_service.cosine_similarity(
-                        query_emb, pattern_emb
-                    )
+        keyword = np.fromiter(
+            (keyword_scores.get(pid, 0) for pid in pattern_ids),
+            dtype=np.float32,
+            count=len(pattern_ids)
+        )
 
         # Calculate max keyword score for normalization
         max_keyword = max(keyword_scores.values()) if keyword_scores else 1
         if max_keyword == 0:
             max_keyword = 1
 
-        # Combine scores
-        results = []
-
-        for pattern_id, pattern in pattern_map.items():
-            # Get scores
-            keyword_score = keyword_scores.get(pattern_id, 0)
-            semantic_score = semantic_scores.get(pattern_id, 0.0)
-
-            # Apply minimum thresholds
-            if keyword_score < self.config.min_keyword_score:
-                if semantic_score < self.config.min_semantic_score:
-                    continue  # Below both thresholds, skip
-
-            if semantic_score < self.config.min_semantic_score:
-                if keyword_score < self.config.min_keyword_score:
-                    continue  # Below both thresholds, skip
-
-            # Normalize keyword score to 0-1 range
-            normalized_keyword = keyword_score / max_keyword if max_keyword > 0 else 0
-
-            # Combine with weights
-            combined_score = (
-                semantic_score * self.config.semantic_weight +
-                normalized_keyword * self.config.keyword_weight
+        # Apply minimum thresholds: skip only if below both
+        keep = (keyword >= self.config.min_keyword_score) | (semantic >= self.config.min_semantic_score)
+
+        # Combine with weights (keyword normalized to 0-1 range)
+        combined = (
+            semantic * self.config.semantic_weight +
+            (keyword / max_keyword) * self.config.keyword_weight
+        )
+
+        kept = np.flatnonzero(keep)
+        matched_count = len(kept)
+        top = kept[VectorStore.top_k_indices(combined[kept], top_k)]
+
+        results = [
+            HybridSearchResult(
+                pattern=pattern_map[pattern_ids[i]],
+                keyword_score=keyword_scores.get(pattern_ids[i], 0),
+                semantic_score=float(semantic[i]),
+                combined_score=float(combined[i])
             )
-
-            results.append(HybridSearchResult(
-                pattern=pattern,
-                keyword_score=keyword_score,
-                semantic_score=semantic_score,
-                combined_score=combined_score
-            ))
-
-        # Sort by combined score (descending)
-        results.sort(key=lambda r: r.combined_score, reverse=True)
+            for i in top
+        ]
 
         # Log results - simplified for pure semantic search
         print(f"[SEMANTIC] Query: '{query[:50]}...'")
         if self.config.semantic_weight == 1.0:
             # Pure semantic search - cleaner output
             print(f"[SEMANTIC] Mode: PURE SEMANTIC (100% semantic similarity)")
-            print(f"[SEMANTIC] Results: {len(results)} patterns matched")
+            print(f"[SEMANTIC] Results: {matched_count} patterns matched")
             for i, r in enumerate(results[:5], 1):
                 print(f"  {i}. {r.pattern.get('name', '?')[:35]}... (similarity={r.semantic_score:.4f})")
         else:
             # Hybrid mode - show both scores
             print(f"[SEMANTIC] Mode: HYBRID (semantic={self.config.semantic_weight:.0%}, keyword={self.config.keyword_weight:.0%})")
-            print(f"[SEMANTIC] Results: {len(results)} patterns matched")
+            print(f"[SEMANTIC] Results: {matched_count} patterns matched")
             for i, r in enumerate(results[:5], 1):
                 print(f"  {i}. {r.pattern.get('name', '?')[:30]}... (combined={r.combined_score:.3f}, sem={r.semantic_score:.3f})")
 
-        return results[:top_k]
+        return results
 
     def search_exact(
         self,
@@ -242,15 +250,17 @@ class HybridSearcher:
         exact_results = []
         other_results = []
 
-        for pattern_id, pattern in {p.get('id', p.get('pattern_id', p.get('name', ''))): p for p in patterns}.items():
-            keyword_score = keyword_scores.get(pattern_id, 0)
-            semantic_score = 0.0
+        pattern_map = {p.get('id', p.get('pattern_id', p.get('name', ''))): p for p in patterns}
 
-            if self.semantic_available and pattern_id in self.vector_store.get_all():
-                query_emb = self.embedding_service.encode(query)
-                pattern_emb = self.vector_store.get(pattern_id)
-                if pattern_emb is not None:
-                    semantic_score = self.embedding_service.cosine_similarity(query_emb, pattern_emb)
+        # Encode the query once and score every candidate in a single matmul
+        semantic_scores: Dict[str, float] = {}
+        if self.semantic_available and self.embedding_service and pattern_map:
+            query_emb = self.embedding_service.encode(query)
+            semantic_scores = self.vector_store.similarities(query_emb, pattern_map.keys())
+
+        for pattern_id, pattern in pattern_map.items():
+            keyword_score = keyword_scores.get(pattern_id, 0)
+            semantic_score = semantic_scores.get(pattern_id, 0.0)
 
             # Exact matches get maximum scores
             if pattern_id in exact_set:
@@ -36,6 +36,7 @@ class KnowledgeBaseConfig:
     search_algorithm: str = "keyword"  # "keyword", "semantic", "hybrid"
     similarity_threshold: float = 0.5
     max_results: int = 10
+    vector_index: Dict[str, Any] = field(default_factory=dict)  # see core/ann_index.py
 
     # Learning settings
     enable_learning: bool = True
@@ -4,17 +4,20 @@ Knowledge Cartography (KCart) - Dialectical Knowledge Mapping
 Stores and analyzes all query/response pairs to build a personal knowledge map.
 Implements compressed storage, context loading, and basic analytics.
 
+History is kept in an append-only segment log (see tao/storage/history_log.py):
+saving a pair costs O(1) and recent context is read from the log tail.
+
 See: kcart.md for full design documentation
 """
 
-import gzip
-import json
 import os
 from datetime import datetime
 import zoneinfo
 from typing import List, Dict, Any, Optional
 import logging
 
+from tao.storage.history_log import HistoryLog, SEGMENT_ENTRIES, COMPACT_AFTER_SEGMENTS
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,8 +43,15 @@ class KnowledgeCartography:
         self.store_evoked_questions = self.config.get("store_evoked_questions", True)
         self.extract_concepts = self.config.get("extract_concepts", False)
 
-        # File paths
-        self.history_file = os.path.join(domain_path, "query_history.json.gz")
+        # Storage: append-only segment log (legacy single-file history is imported on first save)
+        self.log = HistoryLog(
+            domain_path,
+            segment_entries=self.config.get("segment_entries", SEGMENT_ENTRIES),
+            max_entries=self.max_entries,
+            compact_after_segments=self.config.get("compact_after_segments", COMPACT_AFTER_SEGMENTS)
+        )
+        self.history_file = self.log.legacy_file
+        self.log_dir = self.log.log_dir
 
         logger.info(f"KCart initialized for {domain_path} (enabled={self.enabled}, "
                    f"context_window={self.context_window})")
@@ -67,9 +77,6 @@ class KnowledgeCartography:
             return False
 
         try:
-            # Load existing history
-            history = self._load_history_raw()
-
             # Get timezone-aware timestamp
             tz_name = os.getenv("APP_TIMEZONE", "America/Vancouver")
             try:
@@ -81,7 +88,7 @@ class KnowledgeCartography:
 
             # Create new entry
             entry = {
-                "id": len(history) + 1,
+                "id": None,  # Assigned by the log
                 "timestamp": timestamp,
                 "query": query,
                 "response": response,
@@ -94,19 +101,10 @@ class KnowledgeCartography:
                 if evoked:
                     entry["evoked_questions"] = evoked
 
-            # Append to history
-            history.append(entry)
-
-            # Apply max_entries limit if set
-            if self.max_entries and len(history) > self.max_entries:
-                # Keep only the most recent max_entries
-                history = history[-self.max_entries:]
-                logger.info(f"Trimmed history to {self.max_entries} entries")
-
-            # Save compressed
-            self._save_history_raw(history)
+            # Append to history (max_entries is applied when the log compacts)
+            self.log.append(entry)
 
-            logger.debug(f"Saved Q/R pair #{entry['id']} to {self.history_file}")
+            logger.debug(f"Saved Q/R pair #{entry['id']} to {self.log_dir}")
             return True
 
         except Exception as e:
@@ -134,15 +132,14 @@ class KnowledgeCartography:
         limit = limit or self.context_window
 
         try:
-            # Load full history
-            history = self._load_history_raw()
+            # Read only the last N entries from the log tail
+            if self.max_entries:
+                limit = min(limit, self.max_entries)
+            recent = self.log.tail(limit)
 
-            if not history:
+            if not recent:
                 return []
 
-            # Get last N entries
-            recent = history[-limit:] if len(history) > limit else history
-
             # Format as conversation messages
             context = []
             for entry in recent:
@@ -170,28 +167,23 @@ class KnowledgeCartography:
             Dict with summary info (count, date range, avg confidence, etc.)
         """
         try:
-            history = self._load_history_raw()
+            # Running totals are kept in the log index; no history scan needed
+            stats = self.log.stats()
 
-            if not history:
+            if not stats["count"]:
                 return {
                     "count": 0,
                     "enabled": self.enabled
                 }
 
-            # Calculate statistics
-            confidences = [
-                entry["metadata"].get("confidence", 0.0)
-                for entry in history
-                if "metadata" in entry
-            ]
-
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            confidence_count = stats["confidence_count"]
+            avg_confidence = stats["confidence_sum"] / confidence_count if confidence_count else 0.0
 
             return {
-                "count": len(history),
+                "count": stats["count"],
                 "enabled": self.enabled,
-                "first_query": history[0]["timestamp"] if history else None,
-                "last_query": history[-1]["timestamp"] if history else None,
+                "first_query": stats["first_timestamp"],
+                "last_query": stats["last_timestamp"],
                 "avg_confidence": round(avg_confidence, 3),
                 "context_window": self.context_window,
                 "compression": self.compression
@@ -201,31 +193,33 @@ class KnowledgeCartography:
             logger.error(f"Failed to get history summary: {e}", exc_info=True)
             return {"count": 0, "enabled": self.enabled, "error": str(e)}
 
-    def _load_history_raw(self) -> List[Dict]:
-        """Load raw history from compressed file."""
-        if not os.path.exists(self.history_file):
-            return []
+    def compact(self) -> int:
+        """
+        Compact the history log (merge segments, apply max_entries).
+
+        Returns:
+            Number of entries kept
+        """
+        return self.log.compact(self.max_entries)
 
+    def _load_history_raw(self) -> List[Dict]:
+        """Load the full history (all segments)."""
         try:
-            with gzip.open(self.history_file, 'rt', encoding='utf-8') as f:
-                history = json.load(f)
-            return history
+            history = self.log.read_all()
         except Exception as e:
-            logger.error(f"Failed to load history from {self.history_file}: {e}")
+            logger.error(f"Failed to load history from {self.log_dir}: {e}")
             return []
 
+        if self.max_entries and len(history) > self.max_entries:
+            history = history[-self.max_entries:]
+        return history
+
     def _save_history_raw(self, history: List[Dict]):
-        """Save raw history to compressed file."""
+        """Replace the full history."""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-
-            # Write compressed
-            with gzip.open(self.history_file, 'wt', encoding='utf-8') as f:
-                json.dump(history, f, indent=2, ensure_ascii=False)
-
+            self.log.rewrite(history)
         except Exception as e:
-            logger.error(f"Failed to save history to {self.history_file}: {e}")
+            logger.error(f"Failed to save history to {self.log_dir}: {e}")
             raise
 
 
@@ -8,7 +8,7 @@ A persona is a configured LLM responder that either:
 That's the entire decision tree. No more conditionals.
 """
 
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, AsyncIterator, Tuple
 import logging
 
 
@@ -121,8 +121,12 @@ class Persona:
         context = context or {}
         show_thinking = context.get("show_thinking", self.show_thinking)
 
+        # Fit content, memory and KCart history into the domain's token budget
+        context, content, memory_prefix, budget_allocation = self._apply_prompt_budget(
+            query, content, context
+        )
+
         # Check for conversation memory prefix (previous conversations)
-        memory_prefix = context.get("memory_prefix", "")
         if memory_prefix:
             if self.trace:
                 self.logger.info(f"[{self.name}] Using conversation memory prefix ({len(memory_prefix)} chars)")
@@ -151,7 +155,7 @@ class Persona:
             # Debug: Check trace status
             trace_data = []
             if self.trace:
-                trace_data = self._extract_trace_data(llm_result, llm_time_ms)
+                trace_data = self._budget_trace_step(budget_allocation) + self._extract_trace_data(llm_result, llm_time_ms)
                 self.logger.info(f"[{self.name}] Trace data: {len(trace_data)} steps")
 
             response = {
@@ -161,6 +165,7 @@ class Persona:
                 "query": query,
                 "show_thinking": show_thinking,
                 "pattern_count": len(override_patterns) if override_patterns else 0,
+                "prompt_budget": budget_allocation,
                 "trace": trace_data
             }
 
@@ -175,7 +180,7 @@ class Persona:
             # Debug: Check trace status
             trace_data = []
             if self.trace:
-                trace_data = self._extract_trace_data(llm_result, llm_time_ms)
+                trace_data = self._budget_trace_step(budget_allocation) + self._extract_trace_data(llm_result, llm_time_ms)
                 self.logger.info(f"[{self.name}] Trace data: {len(trace_data)} steps (string path)")
 
             return {
@@ -185,9 +190,42 @@ class Persona:
                 "query": query,
                 "show_thinking": show_thinking,
                 "pattern_count": len(override_patterns) if override_patterns else 0,
+                "prompt_budget": budget_allocation,
                 "trace": trace_data
             }
 
+    async def respond_stream(
+        self,
+        query: str,
+        override_patterns: Optional[List[Dict]] = None,
+        context: Optional[Dict] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of respond().
+
+        Yields {"type": "token", "text": ...} events as the LLM generates,
+        then {"type": "done", "response": ...} with the same dict respond()
+        returns. Answers that are not generated token by token (Brave direct
+        answers, tool-calling web search) arrive only in the done event.
+
+        Args:
+            query: User query
+            override_patterns: Optional patterns to override data source
+            context: Optional context dict
+
+        Yields:
+            Stream event dicts (see core/streaming.py)
+        """
+        from .streaming import stream_events, TOKEN_SINK_KEY
+
+        def run(sink):
+            stream_context = dict(context or {})
+            stream_context[TOKEN_SINK_KEY] = sink
+            return self.respond(query, override_patterns=override_patterns, context=stream_context)
+
+        async for event in stream_events(run):
+            yield event
+
     async def _get_data_source_content(self, query: str, context: Optional[Dict] = None) -> Optional[str]:
         """
         Get content from persona's configured data source.
@@ -325,6 +363,58 @@ class Persona:
 
         return "\n".join(formatted)
 
+    def _apply_prompt_budget(
+        self,
+        query: str,
+        content: Optional[str],
+        context: Dict
+    ) -> Tuple[Dict, Optional[str], str, Dict[str, Any]]:
+        """
+        Trim context sources to the domain's prompt budget (see core/prompt_budget.py).
+
+        Args:
+            query: User query
+            content: Patterns / documents / web results for the prompt
+            context: Context dict (prompt_budget, role_context, memory_prefix, kcart_history)
+
+        Returns:
+            (context, content, memory_prefix, allocation); context is a copy
+            carrying the trimmed kcart_history
+        """
+        from .prompt_budget import PromptBudget
+
+        budget = context.get("prompt_budget") or PromptBudget()
+        fixed = {
+            "role_context": context.get("role_context", "You are a helpful assistant."),
+            "date": "Current date and time: 0000-00-00 00:00:00",
+            "query": query
+        }
+        content, memory_prefix, history, allocation = budget.fit(
+            fixed,
+            content=content,
+            memory=context.get("memory_prefix", ""),
+            history=context.get("kcart_history", [])
+        )
+
+        context = dict(context)
+        context["kcart_history"] = history
+        return context, content, memory_prefix or "", allocation
+
+    def _budget_trace_step(self, allocation: Dict[str, Any]) -> List[Dict]:
+        """Describe the prompt budget allocation as a trace step."""
+        from datetime import datetime
+
+        sources = ", ".join(
+            f"{name} {s['allocated']}/{s['tokens']}" for name, s in allocation["sources"].items()
+        )
+        limit = allocation["max_tokens"] or "unlimited"
+        return [{
+            "step": f"Step 0: Prompt Budget ({allocation['total_tokens']} of {limit} tokens)",
+            "action": f"Allocated tokens (granted/requested): {sources}",
+            "allocation": allocation,
+            "timestamp": datetime.now().isoformat()
+        }]
+
     def _build_prompt(self, query: str, content: Optional[str], show_thinking: bool = False) -> str:
         """
         Build LLM prompt.
@@ -415,6 +505,69 @@ class Persona:
         self.logger.info(f"[{self.name}] Returning {len(trace_steps)} trace steps")
         return trace_steps
 
+    async def _stream_completion(
+        self,
+        client,
+        endpoint: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        token_sink
+    ) -> str:
+        """
+        Request a streamed completion and forward each text delta to token_sink.
+
+        Args:
+            client: Pooled HTTP client
+            endpoint: Completion endpoint URL
+            headers: Request headers
+            payload: Request payload (sent with stream=True)
+            token_sink: Callable receiving each text delta
+
+        Returns:
+            The full answer text
+        """
+        import time
+        from .streaming import parse_sse_delta
+
+        t_start = time.time()
+        parts = []
+        self.logger.info(f"⏱ Starting streaming HTTP request to {endpoint}")
+
+        async with client.stream("POST", endpoint, headers=headers, json={**payload, "stream": True}) as response:
+            if response.status_code >= 400:
+                await response.aread()  # Make the body available to the error handler
+            response.raise_for_status()
+
+            # Server ignored stream=true: deliver the whole answer as one chunk
+            if "text/event-stream" not in response.headers.get("content-type", ""):
+                await response.aread()
+                data = response.json()
+                if "choices" in data:
+                    text = data["choices"][0]["message"].get("content") or ""
+                elif isinstance(data.get("content"), list):
+                    text = data["content"][0].get("text", "")
+                else:
+                    text = str(data.get("content", ""))
+                if text:
+                    token_sink(text)
+                return text
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                text = parse_sse_delta(data)
+                if text:
+                    if not parts:
+                        self.logger.info(f"⏱ First token: {(time.time() - t_start) * 1000:.1f}ms")
+                    parts.append(text)
+                    token_sink(text)
+
+        self.logger.info(f"⏱ Stream completed: {(time.time() - t_start) * 1000:.1f}ms, {len(parts)} chunks")
+        return "".join(parts)
+
     async def _call_llm(self, prompt: str, context: Dict) -> str:
         """
         Call LLM with prompt.
@@ -428,6 +581,8 @@ class Persona:
         """
         import os
         import httpx
+        from .http_clients import pooled_client
+        from .streaming import TOKEN_SINK_KEY
 
         # Get API credentials - per-domain llm_config overrides global env vars
         llm_config = context.get("llm_config", {})
@@ -601,8 +756,15 @@ class Persona:
         import time
         t_http_start = time.time()
         timeout = httpx.Timeout(timeout=180.0, connect=60.0, pool=60.0)  # Increased timeout
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        # Shared keep-alive pool per LLM endpoint (see core/http_clients.py)
+        async with pooled_client(base_url, timeout=timeout) as client:
             try:
+                # Streaming mode: forward text deltas to the caller's token sink.
+                # Tool-calling requests (GLM web search) need the complete message, so they stay non-streaming.
+                token_sink = context.get(TOKEN_SINK_KEY)
+                if token_sink and "tools" not in payload:
+                    return await self._stream_completion(client, endpoint, headers, payload, token_sink)
+
                 self.logger.info(f"⏱ Starting HTTP request to {endpoint}")
                 response = await client.post(
                     endpoint,
@@ -755,8 +917,8 @@ class Persona:
 
                                         self.logger.info(f"Fetching full content for top {fetch_limit} results...")
 
-                                        # Create a separate client for web page fetching (different from LLM client)
-                                        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as web_client:
+                                        # Use the general-purpose pooled client for web pages (separate from the LLM pool)
+                                        async with pooled_client(timeout=15.0, follow_redirects=True) as web_client:
                                             for i, result in enumerate(search_results[:fetch_limit], 1):
                                                 title = result.metadata.get('title', 'Untitled')
                                                 url = result.metadata.get('url', '')
@@ -12,7 +12,7 @@ Usage:
     response = await engine.process_query("How to cook rice", "cooking")
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -20,6 +20,8 @@ import json
 
 from .query_processor import process_query
 from .personas import get_persona, list_personas
+from .domain_cache import load_patterns_file
+from .streaming import stream_events, TOKEN_SINK_KEY
 
 
 logger = logging.getLogger("phase1_engine")
@@ -118,6 +120,32 @@ class Phase1Engine:
                 'engine_version': 'phase1'
             }
 
+    async def process_query_stream(
+        self,
+        query: str,
+        domain_name: str,
+        context: Optional[Dict] = None,
+        search_patterns: Optional[bool] = None,
+        show_thinking: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of process_query().
+
+        Yields token events while the persona's LLM generates, then a done
+        event carrying the same response dict process_query() returns. The
+        done event is emitted only after domain_log.md and KCart are written.
+
+        Yields:
+            Stream event dicts (see core/streaming.py)
+        """
+        def run(sink):
+            stream_context = dict(context or {})
+            stream_context[TOKEN_SINK_KEY] = sink
+            return self.process_query(query, domain_name, stream_context, search_patterns, show_thinking)
+
+        async for event in stream_events(run):
+            yield event
+
     async def get_domain_status(self, domain_name: str = None) -> Dict[str, Any]:
         """
         Get domain status information.
@@ -143,9 +171,7 @@ class Phase1Engine:
             # Load domain config
             config = _load_domain_config(domain_name)
 
-            # Count patterns
-            from pathlib import Path
-            import json
+            # Count patterns (parsed list is cached until patterns.json changes)
             import os
 
             domains_base = os.getenv("DOMAINS_BASE", "/app/domains")
@@ -153,9 +179,8 @@ class Phase1Engine:
 
             pattern_count = 0
             if patterns_file.exists():
-                with open(patterns_file, 'r') as f:
-                    patterns = json.load(f)
-                    pattern_count = len(patterns) if isinstance(patterns, list) else 0
+                patterns = load_patterns_file(patterns_file)
+                pattern_count = len(patterns) if patterns else 0
 
             return {
                 'domain': domain_name,
@@ -0,0 +1,277 @@
+"""
+Prompt Budget - fits prompt context into a per-domain token budget.
+
+Persona.respond assembles a prompt from several context sources: the role
+context and date line, the patterns / library documents / web results it
+was given, the conversation memory prefix from domain_log.md and up to 20
+KCart turns of full query/response pairs. None of these had a size limit,
+so prompts could overflow a local model's context window.
+
+A PromptBudget measures every source with a local token estimate and hands
+out the available tokens in priority order. Sources that do not fit are
+trimmed the way that loses least:
+
+    content   Cut at the last paragraph break that fits (head is kept)
+    memory    domain_log.md is chronological, so the oldest text is cut
+    history   Long assistant turns are clipped first, then the oldest
+              query/response pairs are dropped
+
+The role context, date line and query are never trimmed. The resulting
+allocation is recorded on the response ("prompt_budget") and in the trace.
+
+Configured per domain in domain.json:
+    "prompt_budget": {
+        "max_tokens": 8192,                   Model context window
+        "reserve_for_answer": 1024,           Tokens left for the completion
+        "priority": ["content", "memory", "history"],
+        "max_history_response_tokens": 400    Clip each past answer to this
+    }
+
+Without a max_tokens the budget only measures (nothing is trimmed).
+tiktoken is used for counting when installed; otherwise a word/punctuation
+estimate that tracks BPE tokenizers closely enough for budgeting.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger("prompt_budget")
+
+DEFAULT_RESERVE_FOR_ANSWER = 1024
+DEFAULT_MAX_HISTORY_RESPONSE_TOKENS = 400
+DEFAULT_PRIORITY = ["content", "memory", "history"]
+
+# Tokens of framing each message adds in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRUNCATION_MARKER = "\n[... trimmed to fit prompt budget]\n"
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+    TOKENIZER = "tiktoken"
+except Exception:
+    _ENCODING = None
+    TOKENIZER = "estimate"
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Estimate the number of tokens in text.
+
+    Uses tiktoken when available. The fallback counts words and punctuation,
+    charging one token per 4 characters of long words.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return sum(math.ceil(len(w) / 4) for w in _WORD.findall(text))
+
+
+def _tokens_to_chars(text: str, tokens: int, from_end: bool = False) -> int:
+    """Largest character count of text (head, or tail if from_end) within a token allowance."""
+    total = estimate_tokens(text)
+    if total <= tokens:
+        return len(text)
+    chars = int(len(text) * tokens / total)
+    # The proportional guess can overshoot where token density varies
+    while chars > 0:
+        part = text[len(text) - chars:] if from_end else text[:chars]
+        if estimate_tokens(part) <= tokens:
+            break
+        chars = int(chars * 0.9)
+    return chars
+
+
+def truncate_head(text: str, max_tokens: int) -> str:
+    """Keep the beginning of text, cut at a paragraph or line break that fits."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    if budget <= 0:
+        return ""
+    chars = _tokens_to_chars(text, budget)
+    cut = text[:chars]
+    for sep in ("\n\n", "\n"):
+        idx = cut.rfind(sep)
+        if idx > chars // 2:
+            cut = cut[:idx]
+            break
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def truncate_tail(text: str, max_tokens: int) -> str:
+    """Keep the end of text, cut at a paragraph or line break that fits."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    if budget <= 0:
+        return ""
+    chars = _tokens_to_chars(text, budget, from_end=True)
+    cut = text[len(text) - chars:]
+    for sep in ("\n\n", "\n"):
+        idx = cut.find(sep)
+        if 0 <= idx < chars // 2:
+            cut = cut[idx + len(sep):]
+            break
+    return TRUNCATION_MARKER + cut.lstrip()
+
+
+def _history_tokens(history: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in history)
+
+
+class PromptBudget:
+    """Allocates a token budget across prompt context sources by priority."""
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        reserve_for_answer: int = DEFAULT_RESERVE_FOR_ANSWER,
+        priority: Optional[List[str]] = None,
+        max_history_response_tokens: int = DEFAULT_MAX_HISTORY_RESPONSE_TOKENS
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            max_tokens: Model context window (None = measure only)
+            reserve_for_answer: Tokens kept free for the completion
+            priority: Trimmable sources, highest priority first
+            max_history_response_tokens: Per-turn cap for past answers when trimming
+        """
+        self.max_tokens = max_tokens
+        self.reserve_for_answer = reserve_for_answer
+        self.priority = priority or list(DEFAULT_PRIORITY)
+        self.max_history_response_tokens = max_history_response_tokens
+
+        unknown = set(self.priority) - set(DEFAULT_PRIORITY)
+        if unknown:
+            raise ValueError(f"Unknown prompt budget sources: {sorted(unknown)}")
+        # Sources left out of the priority list come last, in default order
+        self.priority += [s for s in DEFAULT_PRIORITY if s not in self.priority]
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "PromptBudget":
+        """Build a budget from a domain's "prompt_budget" config."""
+        config = config or {}
+        return cls(
+            max_tokens=config.get("max_tokens"),
+            reserve_for_answer=config.get("reserve_for_answer", DEFAULT_RESERVE_FOR_ANSWER),
+            priority=config.get("priority"),
+            max_history_response_tokens=config.get(
+                "max_history_response_tokens", DEFAULT_MAX_HISTORY_RESPONSE_TOKENS
+            )
+        )
+
+    def fit(
+        self,
+        fixed: Dict[str, str],
+        content: Optional[str] = None,
+        memory: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Tuple[Optional[str], Optional[str], List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Fit the trimmable sources into what the fixed parts leave over.
+
+        Args:
+            fixed: Never-trimmed parts by name (e.g. role_context, date, query)
+            content: Patterns / library documents / web results
+            memory: Conversation memory prefix (domain_log.md tail)
+            history: KCart messages [{"role", "content"}, ...], oldest first
+
+        Returns:
+            (content, memory, history, allocation) with the trimmed sources and
+            a dict describing tokens requested and granted per source
+        """
+        history = list(history or [])
+        sources: Dict[str, Dict[str, Any]] = {}
+
+        fixed_tokens = 0
+        for name, text in fixed.items():
+            tokens = estimate_tokens(text)
+            fixed_tokens += tokens
+            sources[name] = {"tokens": tokens, "allocated": tokens, "trimmed": False}
+
+        requested = {
+            "content": estimate_tokens(content),
+            "memory": estimate_tokens(memory),
+            "history": _history_tokens(history)
+        }
+
+        if self.max_tokens is None:
+            available = None
+            remaining = None
+        else:
+            available = max(0, self.max_tokens - self.reserve_for_answer - fixed_tokens)
+            remaining = available
+
+        fitted = {"content": content, "memory": memory, "history": history}
+        for name in self.priority:
+            need = requested[name]
+            if remaining is None or need <= remaining:
+                granted = need
+            else:
+                fitted[name] = self._trim(name, fitted[name], remaining)
+                granted = (
+                    _history_tokens(fitted[name]) if name == "history"
+                    else estimate_tokens(fitted[name])
+                )
+            if remaining is not None:
+                remaining = max(0, remaining - granted)
+
+            entry = {"tokens": need, "allocated": granted, "trimmed": granted < need}
+            if name == "history":
+                entry["turns"] = len(history) // 2
+                entry["turns_kept"] = len(fitted["history"]) // 2
+            sources[name] = entry
+
+        total = fixed_tokens + sum(sources[name]["allocated"] for name in self.priority)
+        allocation = {
+            "tokenizer": TOKENIZER,
+            "max_tokens": self.max_tokens,
+            "reserve_for_answer": self.reserve_for_answer if self.max_tokens is not None else None,
+            "available": available,
+            "total_tokens": total,
+            "trimmed": any(s["trimmed"] for s in sources.values()),
+            "sources": sources
+        }
+
+        if allocation["trimmed"]:
+            trimmed = ", ".join(
+                f"{name} {s['tokens']}->{s['allocated']}"
+                for name, s in sources.items() if s["trimmed"]
+            )
+            logger.info(f"Prompt budget {self.max_tokens} tokens: trimmed {trimmed}")
+
+        return fitted["content"] or None, fitted["memory"] or None, fitted["history"], allocation
+
+    def _trim(self, name: str, value: Any, tokens: int) -> Any:
+        if name == "content":
+            return truncate_head(value, tokens) if value else value
+        if name == "memory":
+            return truncate_tail(value, tokens) if value else value
+        return self._trim_history(value, tokens)
+
+    def _trim_history(self, history: List[Dict[str, str]], tokens: int) -> List[Dict[str, str]]:
+        """Clip long assistant turns, then drop the oldest pairs until history fits."""
+        clipped = [
+            {**m, "content": truncate_head(m.get("content", ""), self.max_history_response_tokens)}
+            if m.get("role") == "assistant" else m
+            for m in history
+        ]
+        while clipped and _history_tokens(clipped) > tokens:
+            # Drop a whole query/response pair so roles keep alternating
+            del clipped[:2 if len(clipped) > 1 and clipped[1].get("role") == "assistant" else 1]
+        return clipped
@@ -11,6 +11,10 @@ from typing import Dict, Any, Optional, List
 import logging
 from pathlib import Path
 from .personas import get_persona
+from .domain_cache import get_domain_cache, load_patterns_file, load_vector_store
+from .response_cache import get_response_cache
+from .prompt_budget import PromptBudget
+from .streaming import TOKEN_SINK_KEY
 from tao.storage import get_kcart
 
 
@@ -295,6 +299,21 @@ async def process_query(
         return response
     # ==================== END SIMPLE ECHO ====================
 
+    # ==================== SEMANTIC RESPONSE CACHE (opt-in) ====================
+    # Near-duplicate questions reuse an earlier answer instead of calling the LLM.
+    # Configurable via domain config: "response_cache": {"enabled": true, ...}
+    # ** and // queries always bypass the cache (see core/response_cache.py)
+    cached_response = None
+    query_embedding = None
+    response_cache = get_response_cache(domain_name, domain_path, domain_config)
+    if response_cache:
+        t_cache = time.time()
+        # Encoding the query (and loading the model) must not block the event loop
+        import asyncio
+        cached_response, query_embedding = await asyncio.to_thread(response_cache.lookup, query, kcart)
+        logger.info(f"⏱ Response cache lookup: {(time.time()-t_cache)*1000:.1f}ms (hit={cached_response is not None})")
+    # ==================== END RESPONSE CACHE ====================
+
     # ==================== KCART CONVERSATIONAL CONTEXT ====================
     # Load recent query/response pairs for conversational memory
     # This gives personas context of recent interactions (last 20 turns by default)
@@ -312,6 +331,9 @@ async def process_query(
     context = context or {}
     context["show_thinking"] = show_thinking
 
+    # Per-domain prompt token budget (measure only unless max_tokens is set)
+    context["prompt_budget"] = PromptBudget.from_config(domain_config.get("prompt_budget"))
+
     # If memory content exists, inject it into the prompt
     if memory_content:
         # Add staleness warning if there are web search results
@@ -326,7 +348,14 @@ async def process_query(
         logger.info("Injected conversation memory into prompt")
 
     t2 = time.time()
-    if patterns and len(patterns) > 0:
+    if cached_response is not None:
+        # Cache hit: replay the earlier answer (and stream it if requested)
+        response = cached_response
+        response["persona"] = persona.name
+        token_sink = context.get(TOKEN_SINK_KEY)
+        if token_sink:
+            token_sink(response["answer"])
+    elif patterns and len(patterns) > 0:
         # Use patterns (override)
         response = await persona.respond(
             query,
@@ -348,6 +377,9 @@ async def process_query(
         response = await persona.respond(query, context=context)
     logger.info(f"⏱ LLM call (persona.respond): {(time.time()-t2)*1000:.1f}ms")
 
+    if response_cache and query_embedding is not None and cached_response is None:
+        response_cache.store(query, query_embedding, response)
+
     # ==================== LOGGING (Single Log File) ====================
     # Universal Logging: Always append query/response to domain_log.md
     # Web search results are logged WITH TIMESTAMP to indicate freshness
@@ -426,7 +458,8 @@ async def process_query(
             "source": response.get("source", "unknown"),
             "confidence": response.get("confidence", 0.0),
             "patterns_used": response.get("patterns_used", []),
-            "evoked_questions": response.get("evoked_questions", [])
+            "evoked_questions": response.get("evoked_questions", []),
+            "cache_hit": cached_response is not None
         }
     )
     # ==================== END KCART SAVE ====================
@@ -443,13 +476,15 @@ def _load_domain_config(domain_name: str) -> Dict[str, Any]:
     """
     Load domain configuration from domain.json file.
 
+    Parsed configs are served from the domain artifact cache and only
+    re-read when domain.json changes on disk.
+
     Args:
         domain_name: Domain name
 
     Returns:
-        Domain config dict
+        Domain config dict (a shallow copy; safe to add top-level keys)
     """
-    import json
     from pathlib import Path
 
     # Try standard domains paths
@@ -465,8 +500,7 @@ def _load_domain_config(domain_name: str) -> Dict[str, Any]:
         try:
             config_path = Path(path)
             if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
+                config = dict(get_domain_cache().load_json(config_path, kind="domain_config"))
 
                 logger.info(f"Loaded config from {path}")
 
@@ -506,8 +540,8 @@ def _search_domain_patterns(
     """
     Search domain for patterns matching query.
 
-    Simple implementation for Phase 1: just reads patterns.json
-    and returns first N patterns (no scoring yet).
+    Simple implementation for Phase 1: reads patterns.json (through the
+    domain artifact cache) and returns first N patterns (no scoring yet).
 
     Args:
         domain_name: Domain name
@@ -517,7 +551,6 @@ def _search_domain_patterns(
     Returns:
         List of pattern dicts or None
     """
-    import json
     from pathlib import Path
 
     # Try common universe paths for patterns.json
@@ -531,15 +564,8 @@ def _search_domain_patterns(
         try:
             patterns_path = Path(path)
             if patterns_path.exists():
-                with open(patterns_path, 'r') as f:
-                    data = json.load(f)
-
-                # Extract patterns array
-                if isinstance(data, dict) and 'patterns' in data:
-                    patterns = data['patterns']
-                elif isinstance(data, list):
-                    patterns = data
-                else:
+                patterns = load_patterns_file(patterns_path)
+                if patterns is None:
                     logger.warning(f"Unexpected patterns format in {path}")
                     continue
 
@@ -731,8 +757,12 @@ def _search_domain_documents_semantic(
     """
     Search domain for documents using semantic similarity (Phase 2).
 
-    Uses DocumentVectorStore to rank documents by relevance to query.
-    Only loads the most relevant documents.
+    Uses DocumentVectorStore to rank passages (default) or whole documents
+    by relevance to query. document_search config:
+        retrieval           "passages" (default) or "documents"
+        max_passages        Passages to return (default 8)
+        max_context_chars   Character budget for all passages (default 6000)
+        max_documents       Documents to return in "documents" mode (default 10)
 
     Args:
         domain_name: Domain name
@@ -742,9 +772,8 @@ def _search_domain_documents_semantic(
     Returns:
         List of document dicts ordered by relevance, or None
     """
-    import glob
     from pathlib import Path
-    from .document_embeddings import get_document_store
+    from .document_indexer import get_document_indexer
 
     logger.info(f"[SEMANTIC] Searching documents for {domain_name}")
 
@@ -767,50 +796,6 @@ def _search_domain_documents_semantic(
         max_docs = doc_search_config.get("max_documents", 10)  # Semantic: default 10 (not 50)
         min_similarity = doc_search_config.get("min_similarity", 0.3)
         max_chars_per_doc = domain_config.get("max_chars_per_document", 50000)
-        auto_generate = doc_search_config.get("auto_generate_embeddings", True)
-
-        # Load ignore patterns from ignored.md
-        ignore_patterns = []
-        ignored_file = base_dir / "ignored.md"
-        if ignored_file.exists():
-            try:
-                with open(ignored_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            ignore_patterns.append(line)
-                logger.info(f"[SEMANTIC] Loaded {len(ignore_patterns)} ignore patterns")
-            except Exception as e:
-                logger.warning(f"Could not read ignored.md: {e}")
-
-        # Find all markdown files
-        all_files = glob.glob(str(base_dir / "**/*.md"), recursive=True)
-
-        # Filter out ignored patterns
-        filtered_files = []
-        for file_path in all_files:
-            rel_path = str(Path(file_path).relative_to(base_dir))
-
-            # Skip ignored.md itself
-            if rel_path == "ignored.md":
-                continue
-
-            # Check against ignore patterns
-            excluded = False
-            for pattern in ignore_patterns:
-                if pattern in rel_path:
-                    excluded = True
-                    logger.debug(f"[SEMANTIC] Excluding {rel_path} (matches pattern: {pattern})")
-                    break
-
-            if not excluded:
-                filtered_files.append(file_path)
-
-        if not filtered_files:
-            logger.info("[SEMANTIC] No documents found")
-            return None
-
-        logger.info(f"[SEMANTIC] Found {len(filtered_files)} documents (after filtering)")
 
         # Get or create document store
         # Store in domain directory (same place as pattern embeddings)
@@ -819,22 +804,33 @@ def _search_domain_documents_semantic(
             logger.warning(f"[SEMANTIC] Could not find domain path for {domain_name}")
             return None
 
-        doc_store = get_document_store(domain_name, domain_path)
-        if not doc_store:
+        # Listing the library (ignored.md filtering) and embedding new/changed
+        # documents happens on the indexer's background thread, not per query
+        indexer = get_document_indexer(domain_name, base_dir, domain_path, doc_search_config)
+        if not indexer:
             logger.warning(f"[SEMANTIC] Document store not available (sentence-transformers not installed)")
             return None
+        if not indexer.ready:
+            logger.info(f"[SEMANTIC] Document index for {domain_name} is still being built")
+            return None
+        doc_store = indexer.store
+
+        # Passage retrieval (default): only the best sections, within a char budget
+        if doc_search_config.get("retrieval", "passages") == "passages":
+            passages = doc_store.search_passages(
+                query=query,
+                top_k=doc_search_config.get("max_passages", 8),
+                min_similarity=min_similarity,
+                max_chars=doc_search_config.get("max_context_chars", 6000)
+            )
+            if not passages:
+                logger.info(f"[SEMANTIC] No relevant passages found above {min_similarity} similarity")
+                return None
+            for passage in passages:
+                logger.info(f"[SEMANTIC]   {passage['name']}: {passage['similarity_score']:.3f}")
+            return passages
 
-        # Load existing embeddings
-        doc_store.load()
-
-        # Generate embeddings if needed
-        if auto_generate:
-            doc_store.generate_embeddings(filtered_files, force=False)
-
-            # Clean up embeddings for documents that no longer exist
-            doc_store.remove_missing_documents(filtered_files)
-
-        # Search for relevant documents
+        # Whole-document retrieval ("retrieval": "documents")
         results = doc_store.search(
             query=query,
             top_k=max_docs,
@@ -1183,8 +1179,7 @@ def _search_journal_patterns(
     Returns:
         List of matching pattern dicts or None
     """
-    import json
-    from .embeddings import get_embedding_service, VectorStore
+    from .embeddings import get_embedding_service
 
     domain_path = _get_domain_path(domain_name)
     if not domain_path:
@@ -1198,14 +1193,8 @@ def _search_journal_patterns(
         return None
 
     try:
-        with open(patterns_path, 'r') as f:
-            data = json.load(f)
-
-        if isinstance(data, dict) and 'patterns' in data:
-            all_patterns = data['patterns']
-        elif isinstance(data, list):
-            all_patterns = data
-        else:
+        all_patterns = load_patterns_file(patterns_path)
+        if all_patterns is None:
             return None
 
         journal_patterns = [p for p in all_patterns if p.get("pattern_type") == "journal_entry"]
@@ -1222,30 +1211,21 @@ def _search_journal_patterns(
         # Try semantic search with embeddings (should be pre-loaded at startup)
         service = get_embedding_service()
         if service and service.is_available and service.is_loaded:
-            store = VectorStore(domain_path)
-            store.load()
-
-            all_embeddings = store.get_all()
-
-            # Filter to only journal pattern embeddings
-            journal_embeddings = {
-                pid: emb for pid, emb in all_embeddings.items()
-                if pid in pattern_data
-            }
+            store = load_vector_store(domain_path)
 
-            if journal_embeddings:
-                results = service.find_most_similar(
-                    query=query,
-                    pattern_embeddings=journal_embeddings,
-                    pattern_data=pattern_data,
+            # Restrict the matrix search to journal pattern rows
+            if any(store.has(pid) for pid in pattern_data):
+                results = store.search(
+                    service.encode(query),
                     top_k=max_results,
-                    threshold=threshold
+                    threshold=threshold,
+                    pattern_ids=pattern_data.keys()
                 )
 
                 if results:
-                    matched = [pattern for pattern, score in results]
-                    for pattern, score in results:
-                        logger.info(f"  Journal match: {pattern.get('id')} (score: {score:.3f})")
+                    matched = [pattern_data[pid] for pid, score in results]
+                    for pid, score in results:
+                        logger.info(f"  Journal match: {pid} (score: {score:.3f})")
                     return matched
 
                 logger.info("Semantic search returned no results above threshold")
@@ -22,11 +22,14 @@ Searches through local documents using vector embeddings.
 
 import os
 import asyncio
+import hashlib
+import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
 from .base import ResearchStrategy, SearchResult
+from ..embeddings import VectorStore, get_embedding_service
 
 
 class DocumentResearchStrategy(ResearchStrategy):
@@ -67,12 +70,11 @@ class DocumentResearchStrategy(ResearchStrategy):
         if self._initialized:
             return
 
-        # Auto-discover markdown files if enabled
-        if self.auto_discover:
-            await self._auto_discover_documents()
-        elif not self.documents:
-            # If no documents specified and auto_discover is off, enable it by default
-            print(f"  [DocumentResearchStrategy] No documents specified, enabling auto-discovery")
+        # Auto-discover markdown files if enabled (discovery also loads them)
+        if self.auto_discover or not self.documents:
+            if not self.auto_discover:
+                # If no documents specified and auto_discover is off, enable it by default
+                print(f"  [DocumentResearchStrategy] No documents specified, enabling auto-discovery")
             await self._auto_discover_documents()
             self._initialized = True
             return
@@ -387,31 +389,185 @@ class DocumentResearchStrategy(ResearchStrategy):
 
 class VectorDocumentResearchStrategy(DocumentResearchStrategy):
     """
-    Enhanced document research strategy using vector embeddings.
+    Document research strategy using vector embeddings.
+
+    Documents are always chunked (see _chunk_text) and every chunk is
+    embedded into an on-disk VectorStore, built once at initialize() and
+    reused across queries. A manifest next to the vectors records a content
+    hash per file, so a restart re-embeds only files whose chunks changed and
+    drops vectors of files that disappeared.
 
-    This version uses semantic search with embeddings for better results.
-    Requires ChromaDB or similar vector database.
+    Config (in addition to DocumentResearchStrategy's):
+        index_path       Directory for the index (default: {base_path}/.vector_index)
+        collection_name  Index file stem (default: documents)
+        min_similarity   Minimum cosine similarity for a chunk (default: 0.3)
 
-    TODO: Implement vector embedding and storage
+    Falls back to keyword search when sentence-transformers is not installed.
     """
 
+    INDEX_DIRNAME = '.vector_index'
+    ENCODE_BATCH_SIZE = 32
+
     def __init__(self, config: Dict[str, Any]):
+        config = dict(config)
+        config['use_chunking'] = True
         super().__init__(config)
-        # Vector DB client (ChromaDB, Weaviate, etc.)
-        self._vector_db = None
         self._collection_name = config.get('collection_name', 'documents')
+        self.min_similarity = config.get('min_similarity', 0.3)
+        self.index_path = Path(config.get('index_path') or Path(self.base_path) / self.INDEX_DIRNAME)
+        if self.INDEX_DIRNAME not in self.exclude_patterns:
+            self.exclude_patterns = list(self.exclude_patterns) + [self.INDEX_DIRNAME]
 
-    async def initialize(self) -> None:
-        """Initialize vector database and index documents."""
-        # TODO: Set up ChromaDB or similar
-        # await self._setup_vector_db()
-        # await self._index_documents()
+        self._embedder = None
+        self._vector_db: Optional[VectorStore] = None
+        self._chunk_index: Dict[str, Dict[str, Any]] = {}
+        self.manifest_file = self.index_path / f"{self._collection_name}.manifest.json"
 
-        # Fall back to parent implementation for now
+    async def initialize(self) -> None:
+        """Load and chunk documents, then bring the vector index up to date."""
+        if self._initialized:
+            return
         await super().initialize()
 
+        self._chunk_index = {chunk['id']: chunk for chunk in self._chunks}
+        if self._embedder is None:
+            self._embedder = get_embedding_service()
+        if self._embedder is None:
+            print("  [VectorDocumentResearchStrategy] Embeddings unavailable, using keyword search")
+            return
+
+        try:
+            await asyncio.to_thread(self._index_documents)
+        except Exception as e:
+            print(f"  [VectorDocumentResearchStrategy] Indexing failed, using keyword search: {e}")
+            self._vector_db = None
+
+    def _index_settings(self) -> Dict[str, Any]:
+        """Settings that invalidate every stored vector when they change."""
+        model = getattr(getattr(self._embedder, 'config', None), 'model_name', None)
+        return {'model': model, 'chunk_size': self.chunk_size, 'chunk_overlap': self.chunk_overlap}
+
+    @staticmethod
+    def _hash_chunks(chunks: List[Dict[str, Any]]) -> str:
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk['text'].encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _index_documents(self) -> int:
+        """
+        Embed chunks of new or changed files and persist the index.
+
+        Returns:
+            Number of chunks embedded
+        """
+        store = VectorStore(self.index_path, name=self._collection_name)
+        manifest = {'settings': None, 'files': {}}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file) as f:
+                    manifest = json.load(f)
+                store.load()
+            except Exception as e:
+                print(f"  [VectorDocumentResearchStrategy] Could not load index, rebuilding: {e}")
+                manifest = {'settings': None, 'files': {}}
+
+        settings = self._index_settings()
+        if manifest.get('settings') != settings:
+            store.clear()
+            manifest = {'settings': settings, 'files': {}}
+
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in self._chunks:
+            by_source.setdefault(chunk['source'], []).append(chunk)
+
+        # Forget files that were deleted
+        files = manifest['files']
+        for source in [s for s in files if s not in by_source]:
+            for chunk_id in files.pop(source)['chunks']:
+                store.remove(chunk_id)
+
+        stale = []
+        for source, chunks in by_source.items():
+            file_hash = self._hash_chunks(chunks)
+            entry = files.get(source)
+            if entry and entry['hash'] == file_hash and all(store.has(c['id']) for c in chunks):
+                continue
+            if entry:
+                for chunk_id in entry['chunks']:
+                    store.remove(chunk_id)
+            files[source] = {'hash': file_hash, 'chunks': [c['id'] for c in chunks]}
+            stale.extend(chunks)
+
+        for start in range(0, len(stale), self.ENCODE_BATCH_SIZE):
+            batch = stale[start:start + self.ENCODE_BATCH_SIZE]
+            embeddings = self._embedder.encode_batch([c['text'] for c in batch])
+            for chunk, embedding in zip(batch, embeddings):
+                store.set(chunk['id'], embedding)
+
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        store.save()
+        tmp = self.manifest_file.with_suffix('.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest_file)
+
+        self._vector_db = store
+        print(f"  [VectorDocumentResearchStrategy] Indexed {len(store)} chunks "
+              f"({len(stale)} embedded, {len(by_source) - len({c['source'] for c in stale})} files unchanged)")
+        return len(stale)
+
     async def search(self, query: str, limit: int = 5) -> List[SearchResult]:
-        """Search using vector embeddings."""
-        # TODO: Implement vector search
-        # For now, fall back to keyword search
-        return await super().search(query, limit)
+        """
+        Search chunks by cosine similarity to the query.
+
+        Args:
+            query: The search query
+            limit: Maximum number of chunks to return
+
+        Returns:
+            List of search results, most similar first
+        """
+        if not self._initialized:
+            await self.initialize()
+        if self._vector_db is None:
+            return await super().search(query, limit)
+
+        query_embedding = await asyncio.to_thread(self._embedder.encode, query)
+        hits = self._vector_db.search(query_embedding, top_k=limit, threshold=self.min_similarity)
+
+        results = []
+        for chunk_id, score in hits:
+            chunk = self._chunk_index.get(chunk_id)
+            if chunk is None:
+                continue
+            results.append(SearchResult(
+                content=chunk['text'],
+                source=chunk['source'],
+                relevance_score=score,
+                metadata={
+                    'chunk_id': chunk['chunk_id'],
+                    'chunk_text': chunk['text'],
+                    'full_document': False,
+                    'total_files': len(self._chunks),  # For citation prompt
+                    'total_chunks_searched': len(self._vector_db),
+                    'search_type': 'vector'
+                }
+            ))
+
+        print(f"  [VectorDocumentResearchStrategy] Found {len(results)} chunks for query: {query}")
+        self._search_metadata = {
+            'total_files': len(self._chunks),
+            'query': query,
+            'use_chunking': True,
+            'matches': len(results),
+            'total_chunks': len(self._vector_db)
+        }
+        return results
+
+    async def cleanup(self) -> None:
+        """Release the in-memory index (the on-disk index is kept)."""
+        await super().cleanup()
+        self._chunk_index.clear()
+        self._vector_db = None
@@ -28,7 +28,8 @@ from typing import List, Dict, Any
 from dataclasses import dataclass
 
 try:
-    import httpx
+    # http_clients imports httpx, so this also checks that httpx is installed
+    from ..http_clients import pooled_client
     HAS_HTTPX = True
 except ImportError:
     HAS_HTTPX = False
@@ -118,7 +119,7 @@ class InternetResearchStrategy(ResearchStrategy):
             encoded_query = urllib.parse.quote(query)
             ddg_url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with pooled_client(timeout=10.0) as client:
                 response = await client.get(ddg_url, headers={
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 })
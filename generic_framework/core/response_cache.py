@@ -0,0 +1,280 @@
+"""
+Semantic Response Cache - reuse earlier answers for near-duplicate queries.
+
+Opt-in per domain via domain.json:
+
+    "response_cache": {
+        "enabled": true,
+        "similarity_threshold": 0.95,     # cosine similarity needed for a hit
+        "ttl_seconds": 86400,             # max age of a reused answer
+        "web_search_ttl_seconds": 3600,   # max age of web search answers
+        "max_entries": 500                # most recent answers kept
+    }
+
+The cache is warmed from the domain's KCart history (the last max_entries
+answered queries, embedded in one batch) and then updated with every new
+LLM answer, so there is no separate cache file. Warm-up runs on a
+background thread started by the first lookup; lookups made before it
+finishes are misses. Answers that came from web search ([WEB_SEARCH]
+entries in domain_log.md) expire after web_search_ttl_seconds instead of
+ttl_seconds.
+
+Queries starting with a bypass prefix ("**" journal search, "//" explicit
+web search by default) are never served from the cache.
+"""
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from .embeddings import VectorStore, get_embedding_service
+
+logger = logging.getLogger("response_cache")
+
+DEFAULT_BYPASS_PREFIXES = ("**", "//")
+WEB_SEARCH_SOURCES = {"internet", "brave-search"}
+UNCACHEABLE_SOURCES = {"simple_echo", "response_cache"}
+
+
+def _is_web_search(source: str, answer: str) -> bool:
+    return source in WEB_SEARCH_SOURCES or "[WEB_SEARCH" in answer
+
+
+def _is_cacheable(source: str, answer: str) -> bool:
+    """Skip echoes, cache replays and error strings."""
+    if not answer or source in UNCACHEABLE_SOURCES:
+        return False
+    return not answer.startswith(("[LLM", "Error processing query"))
+
+
+def _parse_timestamp(value: Optional[str]) -> float:
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SemanticResponseCache:
+    """Per-domain cache of answers keyed by query embedding."""
+
+    def __init__(self, domain_name: str, domain_path: Path, config: Dict[str, Any]):
+        """
+        Initialize the cache for a domain.
+
+        Args:
+            domain_name: Domain name
+            domain_path: Domain directory (used only to name the in-memory store)
+            config: The domain's "response_cache" config
+        """
+        self.domain_name = domain_name
+        self.config = dict(config)
+        self.similarity_threshold = config.get("similarity_threshold", 0.95)
+        self.ttl_seconds = config.get("ttl_seconds", 86400)
+        self.web_search_ttl_seconds = config.get("web_search_ttl_seconds", 3600)
+        self.max_entries = config.get("max_entries", 500)
+        self.bypass_prefixes = tuple(config.get("bypass_prefixes", DEFAULT_BYPASS_PREFIXES))
+
+        # In-memory only: never saved, rebuilt from KCart on first use
+        self.vectors = VectorStore(Path(domain_path), name="response_cache")
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()  # Guards vectors/entries (warm-up thread vs. lookups)
+        self._warmed = threading.Event()
+        self._warm_thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+
+    def lookup(self, query: str, kcart=None) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Look up a fresh cached answer for query.
+
+        Args:
+            query: User query
+            kcart: KnowledgeCartography used to warm the cache on first use
+
+        Returns:
+            (response dict or None, query embedding or None). The embedding is
+            None when the query bypasses the cache, embeddings are unavailable
+            or the cache is still warming; pass it back to store() after
+            answering a miss.
+
+        Encodes the query, so call it from a worker thread in async code.
+        """
+        if query.strip().startswith(self.bypass_prefixes):
+            self.bypassed += 1
+            return None, None
+
+        service = get_embedding_service()
+        if service is None:
+            return None, None
+
+        if kcart is not None and not self._warmed.is_set():
+            self._start_warm(kcart, service)
+            self.misses += 1
+            return None, None
+
+        embedding = service.encode(query)
+        now = time.time()
+
+        with self._lock:
+            hit = None
+            for entry_id, similarity in self.vectors.search(embedding, top_k=3, threshold=self.similarity_threshold):
+                entry = self.entries[entry_id]
+                if now - entry["created_at"] > self._ttl(entry):
+                    self._remove(entry_id)
+                    self.expired += 1
+                    continue
+                hit = entry, similarity
+                break
+
+        if hit is not None:
+            entry, similarity = hit
+            self.hits += 1
+            logger.info(f"Response cache hit ({similarity:.3f}) for '{query[:50]}' ← '{entry['query'][:50]}'")
+            return {
+                "answer": entry["answer"],
+                "source": "response_cache",
+                "confidence": entry["confidence"],
+                "patterns_used": [],
+                "trace": [],
+                "cache": {
+                    "hit": True,
+                    "similarity": round(similarity, 4),
+                    "cached_query": entry["query"],
+                    "cached_source": entry["source"],
+                    "age_seconds": int(now - entry["created_at"])
+                }
+            }, embedding
+
+        self.misses += 1
+        return None, embedding
+
+    def store(self, query: str, embedding: np.ndarray, response: Dict[str, Any]) -> None:
+        """Cache a freshly generated answer."""
+        answer = response.get("answer", "") or ""
+        source = response.get("source", "") or ""
+        if not _is_cacheable(source, answer):
+            return
+        with self._lock:
+            self._add(query, embedding, answer, source, response.get("confidence", 0.0), time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "similarity_threshold": self.similarity_threshold
+        }
+
+    def _start_warm(self, kcart, service) -> None:
+        """Start the warm-up thread once."""
+        with self._lock:
+            if self._warm_thread is not None:
+                return
+            self._warm_thread = threading.Thread(
+                target=self._warm, args=(kcart, service),
+                name=f"response-cache-warm-{self.domain_name}", daemon=True
+            )
+        self._warm_thread.start()
+
+    def _warm(self, kcart, service) -> None:
+        """Embed the most recent cacheable KCart answers in one batch (warm-up thread)."""
+        try:
+            self._load_history(kcart, service)
+        except Exception as e:
+            logger.warning(f"Response cache warm-up failed for {self.domain_name}: {e}")
+        finally:
+            self._warmed.set()
+
+    def _load_history(self, kcart, service) -> None:
+        history = kcart.log.tail(self.max_entries)
+
+        now = time.time()
+        candidates: List[Dict[str, Any]] = []
+        for entry in history:
+            metadata = entry.get("metadata") or {}
+            source = metadata.get("source", "")
+            answer = entry.get("response", "") or ""
+            if metadata.get("cache_hit") or not _is_cacheable(source, answer):
+                continue
+            created_at = _parse_timestamp(entry.get("timestamp"))
+            item = {"created_at": created_at, "source": source, "answer": answer}
+            if now - created_at > self._ttl(item):
+                continue
+            candidates.append(dict(item, query=entry.get("query", ""), confidence=metadata.get("confidence", 0.0)))
+
+        if not candidates:
+            return
+
+        embeddings = service.encode_batch([c["query"] for c in candidates])
+        with self._lock:
+            for candidate, embedding in zip(candidates, embeddings):
+                self._add(candidate["query"], embedding, candidate["answer"], candidate["source"],
+                          candidate["confidence"], candidate["created_at"])
+        logger.info(f"Response cache for {self.domain_name} warmed with {len(candidates)} answers")
+
+    def _ttl(self, entry: Dict[str, Any]) -> float:
+        if _is_web_search(entry["source"], entry["answer"]):
+            return self.web_search_ttl_seconds
+        return self.ttl_seconds
+
+    def _add(self, query: str, embedding, answer: str, source: str, confidence: float, created_at: float) -> None:
+        entry_id = str(self._next_id)
+        self._next_id += 1
+        self.vectors.set(entry_id, embedding)
+        self.entries[entry_id] = {
+            "query": query,
+            "answer": answer,
+            "source": source,
+            "confidence": confidence,
+            "created_at": created_at
+        }
+        if len(self.entries) > self.max_entries:
+            oldest = min(self.entries, key=lambda k: self.entries[k]["created_at"])
+            self._remove(oldest)
+
+    def _remove(self, entry_id: str) -> None:
+        self.vectors.remove(entry_id)
+        self.entries.pop(entry_id, None)
+
+
+# Per-domain instances
+_caches: Dict[str, SemanticResponseCache] = {}
+
+
+def get_response_cache(
+    domain_name: str,
+    domain_path: Path,
+    domain_config: Dict[str, Any]
+) -> Optional[SemanticResponseCache]:
+    """
+    Get the response cache for a domain, or None if it is not enabled.
+
+    The cache is rebuilt when the domain's response_cache config changes.
+    """
+    config = domain_config.get("response_cache") or {}
+    if not config.get("enabled", False):
+        _caches.pop(domain_name, None)
+        return None
+
+    cache = _caches.get(domain_name)
+    if cache is None or cache.config != config:
+        cache = _caches[domain_name] = SemanticResponseCache(domain_name, domain_path, config)
+    return cache
+
+
+def response_cache_stats() -> Dict[str, Any]:
+    """Hit/miss statistics for every domain with an active response cache."""
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
@@ -0,0 +1,86 @@
+"""
+Streaming helpers - token streaming from the LLM to the client.
+
+Streaming is threaded through the normal (non-streaming) pipeline with a
+token sink: a callable placed in the query context under TOKEN_SINK_KEY.
+When Persona._call_llm finds a sink it requests a streamed completion and
+pushes each text delta into it, while still returning the full answer so
+logging, KCart and the response dict work exactly as before.
+
+stream_events() runs such a pipeline as a task and turns the sink into an
+async generator of events:
+
+    {"type": "token", "text": "..."}      one per text delta
+    {"type": "done", "response": {...}}   once the pipeline has finished
+                                          (after domain_log.md / KCart writes)
+    {"type": "error", "detail": "..."}    if the pipeline raised
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+TOKEN_SINK_KEY = "token_sink"
+
+TokenSink = Callable[[str], None]
+
+
+async def stream_events(
+    run: Callable[[TokenSink], Awaitable[Dict[str, Any]]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a pipeline with a token sink and yield its events as they happen.
+
+    Args:
+        run: Callable taking the sink and returning the pipeline coroutine
+
+    Yields:
+        token events, then a single done (or error) event
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.ensure_future(run(queue.put_nowait))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    try:
+        while True:
+            text = await queue.get()
+            if text is None:
+                break
+            yield {"type": "token", "text": text}
+
+        try:
+            yield {"type": "done", "response": task.result()}
+        except Exception as e:
+            yield {"type": "error", "detail": str(e)}
+    finally:
+        # Client went away mid-stream: stop the pipeline
+        if not task.done():
+            task.cancel()
+
+
+def sse_event(event: Dict[str, Any]) -> str:
+    """Format an event dict as a Server-Sent Events message."""
+    payload = {k: v for k, v in event.items() if k != "type"}
+    return f"event: {event['type']}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def parse_sse_delta(data: str) -> str:
+    """
+    Extract the text delta from one SSE `data:` payload of an LLM stream.
+
+    Handles OpenAI-style chunks (choices[0].delta.content) and
+    Anthropic-style content_block_delta events. Returns "" for anything else.
+    """
+    try:
+        chunk = json.loads(data)
+    except ValueError:
+        return ""
+
+    if "choices" in chunk and chunk["choices"]:
+        delta = chunk["choices"][0].get("delta") or {}
+        return delta.get("content") or ""
+
+    if chunk.get("type") == "content_block_delta":
+        return (chunk.get("delta") or {}).get("text") or ""
+
+    return ""
@@ -38,6 +38,7 @@ import logging
 from .domain import Domain, DomainConfig
 from .generic_domain import GenericDomain
 from .factory import DomainFactory
+from .domain_loader import DomainLoader
 from assist.engine import GenericAssistantEngine
 
 
@@ -81,6 +82,7 @@ class UniverseConfig:
     # Runtime behavior
     load_on_startup: bool = False
     is_default: bool = False
+    max_concurrent_loads: Optional[int] = None   # Domains loading at once (default: DOMAIN_LOAD_CONCURRENCY)
 
     # Universe-level defaults
     defaults: Dict[str, Any] = field(default_factory=dict)
@@ -225,6 +227,9 @@ class Universe:
         self.domains: Dict[str, Domain] = {}
         self.engines: Dict[str, GenericAssistantEngine] = {}
 
+        # Concurrent domain loading with per-domain state
+        self.loader = DomainLoader(config.max_concurrent_loads)
+
         # Lock for thread safety
         self._lock = asyncio.Lock()
 
@@ -245,6 +250,7 @@ class Universe:
         Load the universe - discover and initialize all enabled domains.
 
         This is called on-demand or at startup if load_on_startup is True.
+        Domains load concurrently (up to max_concurrent_loads at a time).
         """
         async with self._lock:
             if self._state != UniverseState.UNLOADED:
@@ -258,15 +264,14 @@ class Universe:
                 # Ensure domains directory exists
                 self.domains_path.mkdir(parents=True, exist_ok=True)
 
-                # Load domains based on configuration
-                for domain_id, domain_config in self.config.domains.items():
-                    if domain_config.enabled:
-                        await self._load_domain(domain_id, domain_config)
-                    else:
-                        logger.debug(f"Skipping disabled domain: {domain_id}")
+                # Register configured and auto-discovered domains
+                for domain_id, domain_config in self._discover_domains().items():
+                    self.loader.register(
+                        domain_id,
+                        lambda domain_id=domain_id, domain_config=domain_config: self._load_domain(domain_id, domain_config)
+                    )
 
-                # Auto-discover any domains not in config
-                await self._auto_discover_domains()
+                await self.loader.load_all()
 
                 self._state = UniverseState.LOADED
                 self._loaded_at = datetime.now().isoformat()
@@ -281,78 +286,73 @@ class Universe:
                 logger.error(f"Failed to load universe '{self.universe_id}': {e}")
                 raise
 
-    async def _load_domain(self, domain_id: str, domain_config: DomainUniverseConfig) -> None:
-        """Load a single domain into the universe."""
-        domain_path = self.domains_path / domain_id
-
-        if not domain_path.exists():
-            logger.warning(f"Domain path does not exist: {domain_path}")
-            return
-
-        try:
-            # Create domain config with overrides
-            base_config = DomainConfig(
-                domain_id=domain_id,
-                domain_name=f"{self.universe_id}:{domain_id}",
-                version="1.0.0",
-                description=f"Domain {domain_id} in universe {self.universe_id}",
-                pattern_storage_path=str(domain_path),
-                pattern_format="json",
-                pattern_schema={},
-                domain_type=None,
-                temperature=None
-            )
-
-            # Apply universe-level overrides
-            if domain_config.config_override:
-                for key, value in domain_config.config_override.items():
-                    setattr(base_config, key, value)
-
-            # Create domain using universe factory
-            domain = self.factory.create_domain(domain_id, base_config)
-            await domain.initialize()
-
-            # Create engine
-            engine = GenericAssistantEngine(domain)
-            await engine.initialize()
-
-            # Store in universe
-            self.domains[domain_id] = domain
-            self.engines[domain_id] = engine
-
-            pattern_count = len(domain.knowledge_base._patterns) if hasattr(domain, 'knowledge_base') and domain.knowledge_base else 0
-            logger.info(f"  ✓ Loaded domain: {domain_id} ({pattern_count} patterns)")
-
-        except Exception as e:
-            logger.error(f"  ✗ Failed to load domain {domain_id}: {e}")
-
-    async def _auto_discover_domains(self) -> None:
-        """Auto-discover domains from filesystem that aren't in config."""
-        for domain_dir in self.domains_path.iterdir():
-            if not domain_dir.is_dir():
-                continue
+    def _discover_domains(self) -> Dict[str, DomainUniverseConfig]:
+        """Enabled domains from the config, then domains found on disk that aren't in it."""
+        domains = {}
+        for domain_id, domain_config in self.config.domains.items():
+            if domain_config.enabled:
+                domains[domain_id] = domain_config
+            else:
+                logger.debug(f"Skipping disabled domain: {domain_id}")
 
+        # Auto-discover any domains not in config
+        for domain_dir in sorted(self.domains_path.iterdir()):
             domain_id = domain_dir.name
-
-            # Skip if already loaded
-            if domain_id in self.domains:
+            if not domain_dir.is_dir() or domain_id in self.config.domains:
                 continue
 
             # Check for patterns.json
-            patterns_file = domain_dir / "patterns.json"
-            if not patterns_file.exists():
+            if not (domain_dir / "patterns.json").exists():
                 continue
 
             logger.info(f"Auto-discovering domain: {domain_id}")
-
-            # Create minimal config
-            domain_config = DomainUniverseConfig(
+            domains[domain_id] = DomainUniverseConfig(
                 domain_id=domain_id,
                 enabled=True,
                 priority=0
             )
 
-            await self._load_domain(domain_id, domain_config)
+        return domains
+
+    async def _load_domain(self, domain_id: str, domain_config: DomainUniverseConfig) -> None:
+        """Load a single domain into the universe (raises on failure)."""
+        domain_path = self.domains_path / domain_id
+
+        if not domain_path.exists():
+            raise FileNotFoundError(f"Domain path does not exist: {domain_path}")
+
+        # Create domain config with overrides
+        base_config = DomainConfig(
+            domain_id=domain_id,
+            domain_name=f"{self.universe_id}:{domain_id}",
+            version="1.0.0",
+            description=f"Domain {domain_id} in universe {self.universe_id}",
+            pattern_storage_path=str(domain_path),
+            pattern_format="json",
+            pattern_schema={},
+            domain_type=None,
+            temperature=None
+        )
+
+        # Apply universe-level overrides
+        if domain_config.config_override:
+            for key, value in domain_config.config_override.items():
+                setattr(base_config, key, value)
+
+        # Create domain using universe factory
+        domain = self.factory.create_domain(domain_id, base_config)
+        await domain.initialize()
+
+        # Create engine
+        engine = GenericAssistantEngine(domain)
+        await engine.initialize()
+
+        # Store in universe
+        self.domains[domain_id] = domain
+        self.engines[domain_id] = engine
+
+        pattern_count = len(domain.knowledge_base._patterns) if hasattr(domain, 'knowledge_base') and domain.knowledge_base else 0
+        logger.info(f"  ✓ Loaded domain: {domain_id} ({pattern_count} patterns)")
 
     async def activate(self) -> None:
         """Mark universe as active for serving queries."""
@@ -381,6 +381,7 @@ class Universe:
 
             self.domains.clear()
             self.engines.clear()
+            self.loader.clear()
             self._state = UniverseState.UNLOADED
             self._loaded_at = None
 
@@ -394,6 +395,14 @@ class Universe:
         """Get an engine by domain ID."""
         return self.engines.get(domain_id)
 
+    def get_domain_status(self) -> Dict[str, Any]:
+        """Per-domain load state and overall readiness."""
+        return {
+            'universe_id': self.universe_id,
+            'state': self._state.value,
+            **self.loader.summary()
+        }
+
     def list_domains(self) -> List[str]:
         """List loaded domain IDs."""
         return list(self.domains.keys())
@@ -0,0 +1,196 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Near-Duplicate Detection
+
+Finds clusters of patterns whose content is nearly identical without
+comparing every pair.
+
+Each text is reduced to its set of character shingles (hashed k-grams of
+the lowercased, whitespace-normalized text) and a MinHash signature of
+that set. Signatures are cut into bands; texts sharing any band are
+candidate pairs (LSH). Only candidates are verified with
+difflib.SequenceMatcher against the similarity threshold, and verified
+pairs are merged into clusters with union-find.
+
+Shingling and signatures are vectorized over all texts at once, so the
+cost is roughly linear in total text length plus the verified candidates.
+Small inputs skip the LSH step and verify every pair.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 4        # Characters per shingle
+NUM_BANDS = 32          # LSH bands...
+BAND_ROWS = 4           # ...of this many MinHash values (signature length = bands * rows)
+EXACT_MAX_TEXTS = 200   # Below this, verify all pairs
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace."""
+    return _WHITESPACE.sub(' ', text.lower()).strip()
+
+
+def shingle_sets(texts: List[str], size: int = SHINGLE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distinct 32-bit hashes of every text's character k-grams.
+
+    Texts shorter than size are a single shingle of themselves.
+
+    Returns:
+        (hashes, starts): the hashes of all texts concatenated, each text's
+        sorted, and the offset where each text's hashes begin
+    """
+    encoded = [text.encode('utf-8').ljust(size, b'\0') for text in texts]
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(texts), dtype=np.uint64), [len(e) for e in encoded])
+
+    # Polynomial hash of every window, keeping windows inside a single text
+    windows = len(data) - size + 1
+    hashes = np.zeros(windows, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * np.uint64(1000003) + data[offset:offset + windows]
+    inside = owner[:windows] == owner[size - 1:]
+
+    # (text, hash) keys sort by text, so one sort dedupes every text
+    keys = np.sort((owner[:windows][inside] << np.uint64(32)) | (hashes[inside] & np.uint64(0xFFFFFFFF)))
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    starts = np.searchsorted(keys >> np.uint64(32), np.arange(len(texts), dtype=np.uint64))
+    return (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32), starts
+
+
+def minhash_signatures(texts: List[str], num_perm: int, seed: int = 1) -> np.ndarray:
+    """
+    MinHash signatures for a list of (normalized) texts.
+
+    The permutations are x -> (a * x + b) mod 2^32 with odd a, computed in
+    place over the shingle hashes of all texts at once.
+
+    Returns:
+        uint32 array of shape (len(texts), num_perm)
+    """
+    flat, starts = shingle_sets(texts)
+
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64) | np.uint64(1)).astype(np.uint32)
+    b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64).astype(np.uint32)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    permuted = np.empty_like(flat)
+    for i in range(num_perm):
+        np.multiply(flat, a[i], out=permuted)
+        np.add(permuted, b[i], out=permuted)
+        signatures[:, i] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+
+def _candidate_groups(texts: List[str], bands: int, rows: int) -> List[List[int]]:
+    """Groups of text indexes that share at least one signature band."""
+    signatures = minhash_signatures(texts, bands * rows).astype(np.uint64)
+    groups = []
+    for band in range(bands):
+        # Fold the band's values into one key; colliding keys are only extra candidates
+        keys = np.zeros(len(texts), dtype=np.uint64)
+        for column in range(band * rows, (band + 1) * rows):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) + signatures[:, column]
+
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        bounds = np.flatnonzero(np.diff(sorted_keys)) + 1
+        run_starts = np.concatenate([[0], bounds])
+        run_ends = np.concatenate([bounds, [len(texts)]])
+        for start, end in zip(run_starts, run_ends):
+            if end - start > 1:
+                groups.append(order[start:end].tolist())
+    return groups
+
+
+def is_near_duplicate(text1: str, text2: str, threshold: float) -> bool:
+    """
+    SequenceMatcher ratio above threshold, checking the cheap upper bounds first.
+
+    autojunk is off: with it, texts of 200+ characters treat every common
+    letter as junk and a copy shifted by a few characters scores near 0.
+    """
+    matcher = SequenceMatcher(None, text1, text2, autojunk=False)
+    return (
+        matcher.real_quick_ratio() > threshold
+        and matcher.quick_ratio() > threshold
+        and matcher.ratio() > threshold
+    )
+
+
+def find_duplicate_clusters(
+    contents: Dict[str, str],
+    threshold: float = 0.9,
+    bands: int = NUM_BANDS,
+    rows: int = BAND_ROWS,
+    exact_max: Optional[int] = EXACT_MAX_TEXTS
+) -> List[List[str]]:
+    """
+    Cluster ids whose contents are near-duplicates.
+
+    Args:
+        contents: Map of id to text
+        threshold: Minimum SequenceMatcher ratio (exclusive) for a duplicate
+        bands: LSH bands
+        rows: MinHash values per band
+        exact_max: Verify all pairs when there are at most this many texts
+
+    Returns:
+        Clusters of two or more ids, each and overall in input order
+    """
+    ids = list(contents)
+    texts = [normalize_text(contents[pid]) for pid in ids]
+    parent = list(range(len(ids)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    if exact_max is not None and len(ids) <= exact_max:
+        groups = [list(range(len(ids)))]
+    else:
+        groups = _candidate_groups(texts, bands, rows)
+
+    for group in groups:
+        # Compare each member with one member of every cluster already in the group
+        representatives: List[int] = []
+        for index in group:
+            root = find(index)
+            for other in representatives:
+                other_root = find(other)
+                if other_root == root:
+                    break
+                if is_near_duplicate(texts[other], texts[index], threshold):
+                    parent[max(root, other_root)] = min(root, other_root)
+                    break
+            else:
+                representatives.append(index)
+
+    clusters: Dict[int, List[str]] = {}
+    for index, pid in enumerate(ids):
+        clusters.setdefault(find(index), []).append(pid)
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
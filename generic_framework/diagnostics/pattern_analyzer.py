@@ -30,7 +30,8 @@ from datetime import datetime
 from pathlib import Path
 import re
 import json
-from difflib import SequenceMatcher
+
+from .near_duplicates import find_duplicate_clusters
 
 
 @dataclass
@@ -139,21 +140,27 @@ class PatternAnalyzer:
         'distribution', 'signed_arithmetic'
     }
 
-    def __init__(self, pattern_storage_path: Path):
+    # Content similarity (SequenceMatcher ratio) above which patterns are duplicates
+    DUPLICATE_THRESHOLD = 0.9
+
+    def __init__(self, pattern_storage_path: Path, duplicate_threshold: float = DUPLICATE_THRESHOLD):
         """
         Initialize pattern analyzer.
 
         Args:
             pattern_storage_path: Base path for pattern storage
+            duplicate_threshold: Default similarity above which patterns are duplicates
         """
         self.pattern_storage_path = pattern_storage_path
+        self.duplicate_threshold = duplicate_threshold
 
-    def analyze_domain(self, domain_id: str) -> PatternHealthReport:
+    def analyze_domain(self, domain_id: str, duplicate_threshold: Optional[float] = None) -> PatternHealthReport:
         """
         Analyze all patterns in a domain.
 
         Args:
             domain_id: Domain to analyze
+            duplicate_threshold: Override the analyzer's duplicate threshold
 
         Returns:
             PatternHealthReport with findings
@@ -250,9 +257,10 @@ class PatternAnalyzer:
                     },
                 ))
 
-        # Check for duplicates
-        duplicates = self._find_duplicates(pattern_contents)
-        for pid, duplicate_pids in duplicates.items():
+        # Check for duplicates (one issue per cluster, on its first pattern)
+        threshold = self.duplicate_threshold if duplicate_threshold is None else duplicate_threshold
+        for cluster in self._find_duplicates(pattern_contents, threshold):
+            pid, duplicate_pids = cluster[0], cluster[1:]
             report.duplicate_patterns += len(duplicate_pids)
             report.warning_issues += len(duplicate_pids)
             report.issues.append(PatternIssue(
@@ -260,7 +268,7 @@ class PatternAnalyzer:
                 issue_type='duplicate',
                 severity='warning',
                 description=f'Pattern has {len(duplicate_pids)} duplicate(s)',
-                details={'duplicates': duplicate_pids},
+                details={'duplicates': duplicate_pids, 'cluster': cluster, 'threshold': threshold},
             ))
 
         # Skip orphaned pattern check - EEFrame stores all patterns in JSON only
@@ -310,60 +318,40 @@ class PatternAnalyzer:
 
         return report
 
-    def _find_duplicates(self, pattern_contents: Dict[str, str]) -> Dict[str, List[str]]:
+    def _find_duplicates(self, pattern_contents: Dict[str, str], threshold: float) -> List[List[str]]:
         """
-        Find duplicate patterns based on content similarity.
+        Find clusters of duplicate patterns based on content similarity.
+
+        Candidates come from MinHash/LSH blocking, so large domains are not
+        compared pair by pair (see near_duplicates).
 
         Args:
             pattern_contents: Map of pattern ID to content
+            threshold: Similarity above which patterns are duplicates
 
         Returns:
-            Dict mapping pattern IDs to list of duplicate IDs
+            Clusters of duplicate pattern IDs, in pattern order
         """
-        duplicates = {}
-        checked = set()
-
-        pids = list(pattern_contents.keys())
-        for i, pid1 in enumerate(pids):
-            if pid1 in checked:
-                continue
-
-            content1 = pattern_contents[pid1].lower()
-            duplicate_pids = []
-
-            for pid2 in pids[i + 1:]:
-                if pid2 in checked:
-                    continue
+        return find_duplicate_clusters(pattern_contents, threshold=threshold)
 
-                content2 = pattern_contents[pid2].lower()
-
-                # Calculate similarity
-                similarity = SequenceMatcher(None, content1, content2).ratio()
-
-                # Consider duplicate if >90% similar
-                if similarity > 0.9:
-                    duplicate_pids.append(pid2)
-                    checked.add(pid2)
-
-            if duplicate_pids:
-                duplicates[pid1] = duplicate_pids
-                checked.add(pid1)
-
-        return duplicates
-
-    def analyze_universe(self, domain_ids: List[str]) -> Dict[str, PatternHealthReport]:
+    def analyze_universe(
+        self,
+        domain_ids: List[str],
+        duplicate_threshold: Optional[float] = None
+    ) -> Dict[str, PatternHealthReport]:
         """
         Analyze all domains in a universe.
 
         Args:
             domain_ids: List of domain IDs to analyze
+            duplicate_threshold: Override the analyzer's duplicate threshold
 
         Returns:
             Dict mapping domain IDs to health reports
         """
         reports = {}
         for domain_id in domain_ids:
-            reports[domain_id] = self.analyze_domain(domain_id)
+            reports[domain_id] = self.analyze_domain(domain_id, duplicate_threshold)
         return reports
 
     def get_low_confidence_patterns(
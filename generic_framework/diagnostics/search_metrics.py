@@ -19,13 +19,32 @@ Search Metrics and Quality Analysis
 
 Tracks search performance, quality metrics, and provides diagnostics
 for understanding search behavior and identifying issues.
+
+Aggregates come from rollups: every recorded search is folded into a
+per-minute and a per-hour bucket (per domain) holding counts, sums,
+confidence and latency histograms and pattern usage counters, so metrics
+for any window are a merge of a few dozen buckets. Minute buckets are
+kept for MINUTE_RETENTION_HOURS and hour buckets for HOUR_RETENTION_DAYS.
+Rollups are saved to rollups.json at most once a minute, together with
+the trace log position they cover; on startup only traces recorded after
+that position are replayed.
+
+Raw traces are appended to traces.jsonl, which rotates into numbered
+segments (traces.000001.jsonl, ...) past max_segment_bytes; the oldest
+segments beyond max_segments are deleted. Trace listings stream the
+segments on demand instead of keeping every trace in memory.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+import heapq
 import json
+import math
+import os
+import re
+import threading
 from pathlib import Path
 
 
@@ -135,6 +154,9 @@ class QualityMetrics:
     p95_duration_ms: float = 0.0
     p99_duration_ms: float = 0.0
 
+    # Searches per confidence decile (0.0-0.1, ..., 0.9-1.0)
+    confidence_histogram: List[int] = field(default_factory=lambda: [0] * 10)
+
     def success_rate(self) -> float:
         """Calculate success rate."""
         if self.total_searches == 0:
@@ -171,9 +193,148 @@ class QualityMetrics:
             'p50_duration_ms': round(self.p50_duration_ms, 2),
             'p95_duration_ms': round(self.p95_duration_ms, 2),
             'p99_duration_ms': round(self.p99_duration_ms, 2),
+            'confidence_histogram': self.confidence_histogram,
         }
 
 
+# Latency histogram bins grow geometrically by this ratio (~12% resolution)
+LATENCY_BIN_RATIO = 1.25
+CONFIDENCE_BINS = 10
+
+
+@dataclass
+class MetricsRollup:
+    """Aggregated search counters for one time bucket (or a merge of buckets)."""
+    total_searches: int = 0
+    successful_searches: int = 0
+    no_results_searches: int = 0
+    error_searches: int = 0
+    llm_used: int = 0
+
+    # Sums over successful searches (for averages)
+    success_confidence: float = 0.0
+    success_duration_ms: float = 0.0
+    success_patterns_found: int = 0
+    success_patterns_used: int = 0
+
+    # Latency bin index -> count, over searches with a duration
+    latency_histogram: Dict[int, int] = field(default_factory=dict)
+    min_duration_ms: Optional[float] = None
+    max_duration_ms: Optional[float] = None
+
+    confidence_histogram: List[int] = field(default_factory=lambda: [0] * CONFIDENCE_BINS)
+
+    # Pattern ID -> [match count, relevance sum]
+    pattern_usage: Dict[str, List[float]] = field(default_factory=dict)
+
+    def add(self, trace: SearchTrace) -> None:
+        """Fold one search into the bucket."""
+        self.total_searches += 1
+        if trace.outcome == SearchOutcome.SUCCESS_HIGH_CONFIDENCE:
+            self.successful_searches += 1
+            self.success_confidence += trace.confidence
+            self.success_duration_ms += trace.duration_ms or 0
+            self.success_patterns_found += trace.patterns_found
+            self.success_patterns_used += trace.patterns_used
+        elif trace.outcome == SearchOutcome.NO_RESULTS:
+            self.no_results_searches += 1
+        elif trace.outcome == SearchOutcome.ERROR:
+            self.error_searches += 1
+        if trace.llm_used:
+            self.llm_used += 1
+
+        if trace.duration_ms:
+            bin_index = math.floor(math.log(trace.duration_ms, LATENCY_BIN_RATIO)) if trace.duration_ms > 0 else 0
+            self.latency_histogram[bin_index] = self.latency_histogram.get(bin_index, 0) + 1
+            self.min_duration_ms = trace.duration_ms if self.min_duration_ms is None else min(self.min_duration_ms, trace.duration_ms)
+            self.max_duration_ms = trace.duration_ms if self.max_duration_ms is None else max(self.max_duration_ms, trace.duration_ms)
+
+        confidence_bin = min(max(int(trace.confidence * CONFIDENCE_BINS), 0), CONFIDENCE_BINS - 1)
+        self.confidence_histogram[confidence_bin] += 1
+
+        for pattern in trace.patterns_matched:
+            pid = pattern.get('id')
+            if pid:
+                usage = self.pattern_usage.setdefault(pid, [0, 0.0])
+                usage[0] += 1
+                usage[1] += pattern.get('relevance', 0)
+
+    def merge(self, other: 'MetricsRollup') -> None:
+        """Add another bucket's counters to this one."""
+        for name in ('total_searches', 'successful_searches', 'no_results_searches', 'error_searches',
+                     'llm_used', 'success_confidence', 'success_duration_ms',
+                     'success_patterns_found', 'success_patterns_used'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for bin_index, count in other.latency_histogram.items():
+            self.latency_histogram[bin_index] = self.latency_histogram.get(bin_index, 0) + count
+        if other.min_duration_ms is not None:
+            self.min_duration_ms = other.min_duration_ms if self.min_duration_ms is None else min(self.min_duration_ms, other.min_duration_ms)
+            self.max_duration_ms = other.max_duration_ms if self.max_duration_ms is None else max(self.max_duration_ms, other.max_duration_ms)
+        self.confidence_histogram = [a + b for a, b in zip(self.confidence_histogram, other.confidence_histogram)]
+        for pid, (count, relevance) in other.pattern_usage.items():
+            usage = self.pattern_usage.setdefault(pid, [0, 0.0])
+            usage[0] += count
+            usage[1] += relevance
+
+    def duration_percentile(self, fraction: float) -> float:
+        """Approximate duration at a percentile, from the latency histogram."""
+        count = sum(self.latency_histogram.values())
+        if count == 0:
+            return 0.0
+        rank = int(count * fraction)
+        seen = 0
+        for bin_index in sorted(self.latency_histogram):
+            seen += self.latency_histogram[bin_index]
+            if seen > rank:
+                # Geometric middle of the bin, clamped to the observed range
+                estimate = LATENCY_BIN_RATIO ** (bin_index + 0.5)
+                return min(max(estimate, self.min_duration_ms), self.max_duration_ms)
+        return self.max_duration_ms
+
+    def to_metrics(self) -> QualityMetrics:
+        """Quality metrics for the searches in this bucket."""
+        if self.total_searches == 0:
+            return QualityMetrics()
+
+        metrics = QualityMetrics(
+            total_searches=self.total_searches,
+            successful_searches=self.successful_searches,
+            no_results_searches=self.no_results_searches,
+            error_searches=self.error_searches,
+            llm_fallback_rate=(self.llm_used / self.total_searches) * 100,
+            p50_duration_ms=self.duration_percentile(0.5),
+            p95_duration_ms=self.duration_percentile(0.95),
+            p99_duration_ms=self.duration_percentile(0.99),
+            confidence_histogram=list(self.confidence_histogram),
+        )
+        if self.successful_searches:
+            metrics.avg_confidence = self.success_confidence / self.successful_searches
+            metrics.avg_duration_ms = self.success_duration_ms / self.successful_searches
+            metrics.avg_patterns_found = self.success_patterns_found / self.successful_searches
+            metrics.avg_patterns_used = self.success_patterns_used / self.successful_searches
+        return metrics
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        data = dict(self.__dict__)
+        data['latency_histogram'] = {str(k): v for k, v in self.latency_histogram.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricsRollup':
+        """Create from dictionary."""
+        data = dict(data)
+        data['latency_histogram'] = {int(k): v for k, v in data.get('latency_histogram', {}).items()}
+        return cls(**data)
+
+
+def _epoch_seconds(timestamp: datetime) -> int:
+    """Seconds since the epoch, treating naive timestamps as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp())
+
+
 class SearchMetrics:
     """
     Search metrics collector and analyzer.
@@ -182,32 +343,54 @@ class SearchMetrics:
     and identifies search issues.
     """
 
-    def __init__(self, storage_path: Optional[Path] = None):
+    MINUTE = 60
+    HOUR = 3600
+
+    TRACE_FILE = "traces.jsonl"
+    ROLLUP_FILE = "rollups.json"
+    SEGMENT_PATTERN = re.compile(r'^traces\.(\d{6})\.jsonl$')
+
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        max_segment_bytes: int = int(float(os.getenv("SEARCH_METRICS_SEGMENT_MB", "16")) * 1024 * 1024),
+        max_segments: int = int(os.getenv("SEARCH_METRICS_MAX_SEGMENTS", "10")),
+        minute_retention_hours: float = float(os.getenv("SEARCH_METRICS_MINUTE_RETENTION_HOURS", "48")),
+        hour_retention_days: float = float(os.getenv("SEARCH_METRICS_HOUR_RETENTION_DAYS", "90"))
+    ):
         """
         Initialize search metrics.
 
         Args:
             storage_path: Path to store trace logs
+            max_segment_bytes: Rotate traces.jsonl past this size
+            max_segments: Rotated trace segments to keep
+            minute_retention_hours: How long per-minute rollups are kept
+            hour_retention_days: How long per-hour rollups are kept
         """
         self.storage_path = storage_path or Path.cwd() / "logs" / "search_metrics"
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max(1, max_segments)
+        self.minute_retention = int(minute_retention_hours * 3600)
+        self.hour_retention = int(hour_retention_days * 86400)
+
+        self._lock = threading.RLock()
 
-        self.traces: List[SearchTrace] = []
-        self._load_traces()
-
-    def _load_traces(self) -> None:
-        """Load existing traces from storage."""
-        trace_file = self.storage_path / "traces.jsonl"
-        if trace_file.exists():
-            with open(trace_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            data = json.loads(line)
-                            trace = SearchTrace.from_dict(data)
-                            self.traces.append(trace)
-                        except Exception as e:
-                            print(f"Warning: Failed to load trace: {e}")
+        # granularity (seconds) -> domain -> bucket start (epoch seconds) -> rollup
+        self._rollups: Dict[int, Dict[str, Dict[int, MetricsRollup]]] = {self.MINUTE: {}, self.HOUR: {}}
+        # All-time pattern usage: pattern ID -> [match count, relevance sum]
+        self._pattern_usage: Dict[str, List[float]] = {}
+
+        self._trace_file = self.storage_path / self.TRACE_FILE
+        self._rollup_file = self.storage_path / self.ROLLUP_FILE
+        segments = self._segment_numbers()
+        self._next_segment = (segments[-1] + 1) if segments else 1
+        self._current_minute: Optional[int] = None
+
+        self._load_rollups()
+
+    # ========== Recording ==========
 
     def record_search(self, trace: SearchTrace) -> None:
         """
@@ -216,12 +399,217 @@ class SearchMetrics:
         Args:
             trace: Search trace to record
         """
-        self.traces.append(trace)
+        with self._lock:
+            self._apply(trace)
+
+            # Append to trace file
+            with open(self._trace_file, 'a') as f:
+                f.write(json.dumps(trace.to_dict()) + '\n')
+                size = f.tell()
+
+            if size >= self.max_segment_bytes:
+                self._rotate()
+
+            # Save rollups (and prune old buckets) when a new minute starts
+            minute = _epoch_seconds(datetime.utcnow()) // self.MINUTE
+            if minute != self._current_minute:
+                self._current_minute = minute
+                self._prune_rollups()
+                self.save_rollups()
+
+    def _apply(self, trace: SearchTrace) -> None:
+        """Fold a trace into its minute and hour rollups and the pattern totals."""
+        ts = _epoch_seconds(trace.timestamp)
+        for granularity in (self.MINUTE, self.HOUR):
+            buckets = self._rollups[granularity].setdefault(trace.domain_id, {})
+            start = ts - ts % granularity
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = MetricsRollup()
+            bucket.add(trace)
+
+        for pattern in trace.patterns_matched:
+            pid = pattern.get('id')
+            if pid:
+                usage = self._pattern_usage.setdefault(pid, [0, 0.0])
+                usage[0] += 1
+                usage[1] += pattern.get('relevance', 0)
+
+    def _prune_rollups(self) -> None:
+        now = _epoch_seconds(datetime.utcnow())
+        for granularity, retention in ((self.MINUTE, self.minute_retention), (self.HOUR, self.hour_retention)):
+            cutoff = now - retention
+            for domain_id, buckets in list(self._rollups[granularity].items()):
+                for start in [start for start in buckets if start + granularity <= cutoff]:
+                    del buckets[start]
+                if not buckets:
+                    del self._rollups[granularity][domain_id]
+
+    # ========== Persistence ==========
+
+    def save_rollups(self) -> None:
+        """Write rollups and the trace log position they cover to rollups.json."""
+        with self._lock:
+            offset = self._trace_file.stat().st_size if self._trace_file.exists() else 0
+            data = {
+                'version': 1,
+                'position': {'segment': self._next_segment, 'offset': offset},
+                'pattern_usage': self._pattern_usage,
+                'rollups': {
+                    str(granularity): {
+                        domain_id: {str(start): bucket.to_dict() for start, bucket in buckets.items()}
+                        for domain_id, buckets in domains.items()
+                    }
+                    for granularity, domains in self._rollups.items()
+                },
+            }
+            tmp = self._rollup_file.with_suffix('.json.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self._rollup_file)
+
+    def _load_rollups(self) -> None:
+        """Load saved rollups, then replay traces recorded after they were saved."""
+        position = {'segment': 0, 'offset': 0}
+        if self._rollup_file.exists():
+            try:
+                with open(self._rollup_file, 'r') as f:
+                    data = json.load(f)
+                for granularity, domains in data.get('rollups', {}).items():
+                    self._rollups[int(granularity)] = {
+                        domain_id: {int(start): MetricsRollup.from_dict(bucket) for start, bucket in buckets.items()}
+                        for domain_id, buckets in domains.items()
+                    }
+                self._pattern_usage = data.get('pattern_usage', {})
+                position = data.get('position', position)
+            except Exception as e:
+                print(f"Warning: Failed to load search metric rollups: {e}")
+                self._rollups = {self.MINUTE: {}, self.HOUR: {}}
+                self._pattern_usage = {}
+
+        # The live file saved at position['segment'] has since been rotated to that number
+        replay = []
+        for number in self._segment_numbers():
+            if number > position['segment']:
+                replay.append((self._segment_path(number), 0))
+            elif number == position['segment']:
+                replay.append((self._segment_path(number), position['offset']))
+        live_offset = position['offset'] if position['segment'] == self._next_segment else 0
+        replay.append((self._trace_file, live_offset))
+
+        for path, offset in replay:
+            for trace in self._read_segment(path, offset):
+                self._apply(trace)
+        self._prune_rollups()
+
+    # ========== Raw trace segments ==========
+
+    def _segment_path(self, number: int) -> Path:
+        return self.storage_path / f"traces.{number:06d}.jsonl"
+
+    def _segment_numbers(self) -> List[int]:
+        """Rotated segment numbers, oldest first."""
+        numbers = []
+        for path in self.storage_path.iterdir():
+            match = self.SEGMENT_PATTERN.match(path.name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _rotate(self) -> None:
+        """Move traces.jsonl to the next numbered segment and drop the oldest ones."""
+        os.replace(self._trace_file, self._segment_path(self._next_segment))
+        self._next_segment += 1
+        for number in self._segment_numbers()[:-self.max_segments]:
+            try:
+                self._segment_path(number).unlink()
+            except OSError:
+                pass
+        self.save_rollups()
+
+    def _read_segment(self, path: Path, offset: int = 0) -> Iterator[SearchTrace]:
+        """Traces in a segment file from a byte offset, oldest first."""
+        try:
+            f = open(path, 'r')
+        except OSError:
+            return
+        with f:
+            f.seek(offset)
+            for line in f:
+                if line.strip():
+                    try:
+                        yield SearchTrace.from_dict(json.loads(line))
+                    except Exception as e:
+                        print(f"Warning: Failed to load trace: {e}")
+
+    def iter_traces(self, newest_first: bool = False) -> Iterator[SearchTrace]:
+        """
+        Stream retained raw traces, one segment in memory at a time.
 
-        # Append to trace file
-        trace_file = self.storage_path / "traces.jsonl"
-        with open(trace_file, 'a') as f:
-            f.write(json.dumps(trace.to_dict()) + '\n')
+        Args:
+            newest_first: Yield the most recently recorded traces first
+        """
+        with self._lock:
+            paths = [self._segment_path(number) for number in self._segment_numbers()] + [self._trace_file]
+        if not newest_first:
+            for path in paths:
+                yield from self._read_segment(path)
+            return
+        for path in reversed(paths):
+            yield from reversed(list(self._read_segment(path)))
+
+    # ========== Aggregates (rollups only) ==========
+
+    def rollup(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        domain_id: Optional[str] = None
+    ) -> MetricsRollup:
+        """
+        Merge the rollup buckets covering a time window.
+
+        Whole hours inside the window use hour buckets and the partial hours
+        at its edges use minute buckets (or the hour bucket once minute
+        buckets have expired), so the window is resolved to the minute.
+
+        Args:
+            start_time: Start of time window
+            end_time: End of time window
+            domain_id: Filter by domain
+
+        Returns:
+            MetricsRollup with the merged counters
+        """
+        start = _epoch_seconds(start_time)
+        end = _epoch_seconds(end_time)
+        minute_cutoff = _epoch_seconds(datetime.utcnow()) - self.minute_retention
+        merged = MetricsRollup()
+
+        with self._lock:
+            hours = self._rollups[self.HOUR]
+            minutes = self._rollups[self.MINUTE]
+            domains = [domain_id] if domain_id is not None else list(hours)
+
+            for domain in domains:
+                hour_buckets = hours.get(domain, {})
+                minute_buckets = minutes.get(domain, {})
+                hour = start - start % self.HOUR
+                while hour <= end:
+                    bucket = hour_buckets.get(hour)
+                    if bucket is not None:
+                        whole = start <= hour and hour + self.HOUR - 1 <= end
+                        if whole or hour < minute_cutoff:
+                            merged.merge(bucket)
+                        else:
+                            first = max(hour, start - start % self.MINUTE)
+                            for minute in range(first, min(hour + self.HOUR, end + 1), self.MINUTE):
+                                minute_bucket = minute_buckets.get(minute)
+                                if minute_bucket is not None:
+                                    merged.merge(minute_bucket)
+                    hour += self.HOUR
+
+        return merged
 
     def calculate_metrics(
         self,
@@ -245,46 +633,7 @@ class SearchMetrics:
         if start_time is None:
             start_time = end_time - timedelta(hours=24)
 
-        # Filter traces
-        filtered = [
-            t for t in self.traces
-            if start_time <= t.timestamp <= end_time
-            and (domain_id is None or t.domain_id == domain_id)
-        ]
-
-        if not filtered:
-            return QualityMetrics()
-
-        # Calculate metrics
-        metrics = QualityMetrics(total_searches=len(filtered))
-
-        successful = [t for t in filtered if t.outcome == SearchOutcome.SUCCESS_HIGH_CONFIDENCE]
-        no_results = [t for t in filtered if t.outcome == SearchOutcome.NO_RESULTS]
-        errors = [t for t in filtered if t.outcome == SearchOutcome.ERROR]
-
-        metrics.successful_searches = len(successful)
-        metrics.no_results_searches = len(no_results)
-        metrics.error_searches = len(errors)
-
-        if successful:
-            metrics.avg_confidence = sum(t.confidence for t in successful) / len(successful)
-            metrics.avg_duration_ms = sum(t.duration_ms or 0 for t in successful) / len(successful)
-            metrics.avg_patterns_found = sum(t.patterns_found for t in successful) / len(successful)
-            metrics.avg_patterns_used = sum(t.patterns_used for t in successful) / len(successful)
-
-        if filtered:
-            llm_used_count = sum(1 for t in filtered if t.llm_used)
-            metrics.llm_fallback_rate = (llm_used_count / len(filtered)) * 100
-
-            # Calculate percentiles for duration
-            durations = sorted([t.duration_ms or 0 for t in filtered if t.duration_ms])
-            if durations:
-                n = len(durations)
-                metrics.p50_duration_ms = durations[int(n * 0.5)]
-                metrics.p95_duration_ms = durations[int(n * 0.95)]
-                metrics.p99_duration_ms = durations[int(n * 0.99)]
-
-        return metrics
+        return self.rollup(start_time, end_time, domain_id).to_metrics()
 
     def identify_low_confidence_searches(
         self,
@@ -301,12 +650,12 @@ class SearchMetrics:
         Returns:
             List of low-confidence search traces
         """
-        low_conf = [
-            t for t in self.traces
+        low_conf = (
+            t for t in self.iter_traces()
             if t.outcome == SearchOutcome.SUCCESS_LOW_CONFIDENCE
             or (t.confidence < threshold and t.outcome != SearchOutcome.ERROR)
-        ]
-        return sorted(low_conf, key=lambda x: x.confidence)[:limit]
+        )
+        return heapq.nsmallest(limit, low_conf, key=lambda x: x.confidence)
 
     def identify_no_results_searches(
         self,
@@ -319,13 +668,15 @@ class SearchMetrics:
             limit: Maximum results to return
 
         Returns:
-            List of no-results search traces
+            List of no-results search traces, most recent first
         """
-        no_results = [
-            t for t in self.traces
-            if t.outcome == SearchOutcome.NO_RESULTS
-        ]
-        return no_results[:limit]
+        no_results = []
+        for trace in self.iter_traces(newest_first=True):
+            if len(no_results) >= limit:
+                break
+            if trace.outcome == SearchOutcome.NO_RESULTS:
+                no_results.append(trace)
+        return no_results
 
     def identify_slow_searches(
         self,
@@ -342,11 +693,11 @@ class SearchMetrics:
         Returns:
             List of slow search traces
         """
-        slow = [
-            t for t in self.traces
+        slow = (
+            t for t in self.iter_traces()
             if t.duration_ms and t.duration_ms > threshold_ms
-        ]
-        return sorted(slow, key=lambda x: x.duration_ms or 0, reverse=True)[:limit]
+        )
+        return heapq.nlargest(limit, slow, key=lambda x: x.duration_ms or 0)
 
     def get_pattern_usage_stats(
         self,
@@ -361,25 +712,16 @@ class SearchMetrics:
         Returns:
             Dictionary with usage statistics
         """
-        pattern_counts: Dict[str, int] = {}
-        pattern_avg_confidence: Dict[str, List[float]] = {}
-
-        for trace in self.traces:
-            for pattern in trace.patterns_matched:
-                pid = pattern.get('id')
-                if pid:
-                    pattern_counts[pid] = pattern_counts.get(pid, 0) + 1
-                    if pid not in pattern_avg_confidence:
-                        pattern_avg_confidence[pid] = []
-                    pattern_avg_confidence[pid].append(pattern.get('relevance', 0))
+        with self._lock:
+            usage = {pid: tuple(counts) for pid, counts in self._pattern_usage.items()}
 
         # Calculate averages
         pattern_stats = {}
-        for pid, count in pattern_counts.items():
+        for pid, (count, relevance) in usage.items():
             if pattern_id is None or pid == pattern_id:
                 pattern_stats[pid] = {
                     'match_count': count,
-                    'avg_confidence': sum(pattern_avg_confidence[pid]) / len(pattern_avg_confidence[pid]),
+                    'avg_confidence': relevance / count,
                 }
 
         if pattern_id:
@@ -403,8 +745,10 @@ class SearchMetrics:
         Returns:
             List of recent traces
         """
-        traces = self.traces
-        if domain_id:
-            traces = [t for t in traces if t.domain_id == domain_id]
-
-        return sorted(traces, key=lambda x: x.timestamp, reverse=True)[:limit]
+        traces = []
+        for trace in self.iter_traces(newest_first=True):
+            if len(traces) >= limit:
+                break
+            if domain_id is None or trace.domain_id == domain_id:
+                traces.append(trace)
+        return traces
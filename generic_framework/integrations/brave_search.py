@@ -2,7 +2,8 @@
 Brave Search API Integration
 
 Provides AI-grounded web search using Brave Answers API.
-OpenAI SDK compatible for easy integration.
+OpenAI SDK compatible for easy integration. Uses the async client so a
+search never blocks the event loop while waiting on Brave.
 
 See: BRAVE_SEARCH_INTEGRATION.md for full documentation
 """
@@ -10,14 +11,14 @@ See: BRAVE_SEARCH_INTEGRATION.md for full documentation
 import os
 import logging
 from typing import Dict, Any, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 logger = logging.getLogger("brave_search")
 
 
 class BraveSearch:
     """
-    Brave Search API client using OpenAI SDK.
+    Brave Search API client using the async OpenAI SDK.
 
     Supports two modes:
     - single: Fast single-search (~3s)
@@ -38,7 +39,7 @@ class BraveSearch:
         if not self.api_key:
             raise ValueError("BRAVE_API_KEY not set in environment or constructor")
 
-        self.client = OpenAI(
+        self.client = AsyncOpenAI(
             base_url="https://api.search.brave.com/res/v1",
             api_key=self.api_key,
         )
@@ -81,7 +82,7 @@ class BraveSearch:
             logger.info(f"Brave search: query='{query[:50]}...', mode={search_mode}, stream={stream}")
 
             # Execute search - query passed as-is, user controls prompt
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="brave",
                 messages=[{"role": "user", "content": query}],
                 stream=stream,
@@ -91,7 +92,7 @@ class BraveSearch:
             elapsed_ms = (time.time() - start_time) * 1000
 
             if stream:
-                # Return streaming generator
+                # Return async streaming generator
                 return self._handle_stream(response, search_mode, start_time)
             else:
                 # Return complete response
@@ -120,9 +121,9 @@ class BraveSearch:
             logger.error(f"Brave search failed: {e}", exc_info=True)
             raise
 
-    def _handle_stream(self, stream, mode: str, start_time: float):
-        """Handle streaming response."""
-        for chunk in stream:
+    async def _handle_stream(self, stream, mode: str, start_time: float):
+        """Handle streaming response (async generator of chunks)."""
+        async for chunk in stream:
             if chunk.choices[0].delta.content:
                 yield {
                     "chunk": chunk.choices[0].delta.content,
@@ -130,6 +131,10 @@ class BraveSearch:
                     "source": "brave-answers"
                 }
 
+    async def close(self) -> None:
+        """Close the underlying HTTP connections."""
+        await self.client.close()
+
     def is_available(self) -> bool:
         """Check if Brave Search is configured and available."""
         return bool(self.api_key)
@@ -164,7 +169,10 @@ async def brave_search(query: str, mode: str = "single") -> Dict[str, Any]:
         ValueError: If BRAVE_API_KEY not configured
     """
     client = BraveSearch(mode=mode)
-    return await client.search(query)
+    try:
+        return await client.search(query)
+    finally:
+        await client.close()
 
 
 # Example usage
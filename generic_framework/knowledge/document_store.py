@@ -130,9 +130,9 @@ class ExFrameInstanceStore(DocumentStorePlugin):
         
         try:
             import httpx
-            import asyncio
+            from core.http_clients import pooled_client
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client(self.remote_url, timeout=self.timeout) as client:
                 # Search remote instance
                 url = f"{self.remote_url.rstrip('/')}/api/query"
                 payload = {
@@ -198,9 +198,9 @@ class ExFrameInstanceStore(DocumentStorePlugin):
         
         try:
             import httpx
-            import asyncio
+            from core.http_clients import pooled_client
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client(self.remote_url, timeout=self.timeout) as client:
                 # Get pattern from remote instance
                 url = f"{self.remote_url.rstrip('/')}/api/domains/exframe/patterns/{doc_id}"
                 
@@ -260,9 +260,9 @@ class ExFrameInstanceStore(DocumentStorePlugin):
         
         try:
             import httpx
-            import asyncio
+            from core.http_clients import pooled_client
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client(self.remote_url, timeout=self.timeout) as client:
                 # Add pattern to remote instance
                 url = f"{self.remote_url.rstrip('/')}/api/patterns"
                 
@@ -320,9 +320,9 @@ class ExFrameInstanceStore(DocumentStorePlugin):
         
         try:
             import httpx
-            import asyncio
+            from core.http_clients import pooled_client
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client(self.remote_url, timeout=self.timeout) as client:
                 url = f"{self.remote_url.rstrip('/')}/health"
                 
                 logger.info(f"[EXFRAME_DOC_STORE] Checking health of remote instance: {url}")
@@ -21,6 +21,7 @@ Implements the KnowledgeBasePlugin interface for JSON file storage.
 Supports hybrid search combining keyword matching and semantic similarity.
 """
 
+import asyncio
 import json
 import re
 import random
@@ -36,6 +37,7 @@ from core.knowledge_base_plugin import KnowledgeBasePlugin
 from core.knowledge_base import KnowledgeBaseConfig
 from core.embeddings import EmbeddingService, VectorStore, get_embedding_service
 from core.hybrid_search import HybridSearcher, HybridSearchConfig
+from .keyword_index import KeywordIndex, ORIGIN_QUERY_BIT, pattern_key
 
 
 def weighted_random_select(scored_patterns: List[Tuple[Dict, int]], count: int = 10) -> List[Dict]:
@@ -122,9 +124,12 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
         self._pattern_index = {}
         self._loaded = False
 
+        # Inverted keyword index (token -> pattern ids), kept in step with _patterns
+        self._keyword_index = KeywordIndex()
+
         # Hybrid search components
         storage_path = Path(config.storage_path)
-        self.vector_store = VectorStore(storage_path)
+        self.vector_store = VectorStore(storage_path, index_config=config.vector_index)
         self.vector_store.load()
 
         # Initialize embedding service (may be None if not available)
@@ -310,7 +315,9 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
             'needs_embeddings': needs_embedding,
             'coverage_percent': round(embedded / total * 100, 1) if total > 0 else 0,
             'semantic_available': self.embedding_service is not None and self.embedding_service.is_available,
-            'hybrid_enabled': self._hybrid_searcher is not None
+            'hybrid_enabled': self._hybrid_searcher is not None,
+            'vector_index': self.vector_store.index_stats(),
+            'keyword_index': self._keyword_index.stats()
         }
 
     def _ensure_storage_exists(self) -> None:
@@ -323,27 +330,39 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
                 json.dump([], f)
 
     async def load_patterns(self) -> None:
-        """Load all patterns from JSON file."""
+        """Load all patterns from JSON file.
+
+        Reading, parsing and indexing run in a worker thread so several
+        domains can load at once without blocking the event loop.
+        """
+        patterns, pattern_index, keyword_index = await asyncio.to_thread(self._read_patterns)
+        self._patterns = patterns
+        self._pattern_index = pattern_index
+        self._keyword_index = keyword_index
+        self._loaded = True
+
+    def _read_patterns(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], KeywordIndex]:
+        """Parse the patterns file and build its lookup and keyword indexes."""
         try:
             with open(self.storage_file, 'r') as f:
-                self._patterns = json.load(f)
-
-            # Build index
-            self._pattern_index = {}
-            for p in self._patterns:
-                # Use pattern_id if available, otherwise fallback to id or name
-                key = p.get('pattern_id') or p.get('id') or p.get('name', '')
-                if key:
-                    self._pattern_index[key] = p
-
-            self._loaded = True
+                patterns = json.load(f)
         except FileNotFoundError:
-            self._patterns = []
-            self._pattern_index = {}
-            self._loaded = True
+            patterns = []
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in patterns file: {e}")
 
+        # Build index
+        pattern_index = {}
+        for p in patterns:
+            # Use pattern_id if available, otherwise fallback to id or name
+            key = p.get('pattern_id') or p.get('id') or p.get('name', '')
+            if key:
+                pattern_index[key] = p
+
+        keyword_index = KeywordIndex(self._keyword_index.field_weights)
+        keyword_index.build(patterns)
+        return patterns, pattern_index, keyword_index
+
     async def save_pattern(self, pattern: Dict[str, Any]) -> None:
         """Save a pattern to the JSON file and generate embedding."""
         self._patterns.append(pattern)
@@ -351,6 +370,7 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
         key = pattern.get('pattern_id') or pattern.get('id') or pattern.get('name', '')
         if key:
             self._pattern_index[key] = pattern
+            self._keyword_index.add(pattern)
         await self._persist()
 
         # Auto-embed: Generate embedding for the new pattern
@@ -395,75 +415,55 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
 
         # Check if hybrid search is available
         hybrid_searcher = self._get_hybrid_searcher()
+        use_hybrid = bool(hybrid_searcher and self.hybrid_config.semantic_weight > 0)
 
-        # Step 1: Filter by category and collect keyword scores
-        filtered_patterns = []
-        keyword_scores: Dict[str, int] = {}
-        exact_match_ids = []
+        # Step 1: Score keyword candidates from the inverted index.
+        # Only patterns with a posting for a query word (or an exact match)
+        # can have a non-zero keyword score.
+        query_words = [w for w in query_lower.split() if w not in self.STOP_WORDS and len(w) > 2]
+        field_masks = self._keyword_index.match_masks(query_words) if query_words else {}
+        origin_masks = self._keyword_index.match_masks(content_words) if content_words else {}
+        exact_match_set = self._keyword_index.exact_matches(query_lower)
 
-        for pattern in self._patterns:
-            # Filter by category if specified
-            if category:
-                pattern_cats = pattern.get('category', pattern.get('pattern_type', ''))
-                pattern_tags = pattern.get('tags', [])
-                if category != pattern_cats and category not in pattern_tags:
-                    continue
+        allowed = self._keyword_index.category_keys(category) if category else None
 
-            pattern_id = pattern.get('pattern_id') or pattern.get('id') or pattern.get('name', '')
-            if not pattern_id:
+        keyword_scores: Dict[str, int] = {}
+        for pattern_id in set(field_masks) | exact_match_set | {
+            k for k, mask in origin_masks.items() if mask & ORIGIN_QUERY_BIT
+        }:
+            if allowed is not None and pattern_id not in allowed:
                 continue
-
-            # Check for exact match
-            has_exact_match = False
-            has_origin_word_match = False
-            origin_query = pattern.get('origin_query', '').lower()
-
-            if origin_query == query_lower:
-                has_exact_match = True
-            elif content_words:
-                for word in content_words:
-                    if word in origin_query:
-                        has_origin_word_match = True
-                        break
-
-            if not has_exact_match:
-                examples = pattern.get('examples', [])
-                if examples and query_lower in [str(ex).lower() for ex in examples]:
-                    has_exact_match = True
-
+            has_exact_match = pattern_id in exact_match_set
             if exact_only and not has_exact_match:
                 continue
 
-            # Calculate keyword score
-            match_count = self._count_matching_fields(pattern, query_lower)
-
+            match_count = self._keyword_index.score_mask(field_masks.get(pattern_id, 0))
             if has_exact_match:
                 match_count += 100
-                exact_match_ids.append(pattern_id)
-            elif has_origin_word_match:
+            elif origin_masks.get(pattern_id, 0) & ORIGIN_QUERY_BIT:
                 match_count += 30
-
-            # Store keyword score for all patterns (0 if no matches)
             keyword_scores[pattern_id] = match_count
 
-            # For keyword-only search: only include patterns with matches
-            # For hybrid search: include all patterns (semantic can find relevance)
-            if hybrid_searcher and self.hybrid_config.semantic_weight > 0:
-                # Include all patterns for hybrid search
-                filtered_patterns.append(pattern)
+        if use_hybrid:
+            # Include all (category-filtered) patterns - semantic can find relevance
+            if exact_only:
+                candidate_ids = self._keyword_index.ordered(keyword_scores)
+            elif allowed is not None:
+                candidate_ids = self._keyword_index.ordered(allowed)
             else:
-                # Only include patterns with keyword matches for keyword-only search
-                base_score = match_count
-                if has_origin_word_match:
-                    base_score -= 30
-                if has_exact_match:
-                    base_score -= 100
-
-                if match_count > 0 and (base_score > 0 or has_origin_word_match or has_exact_match):
-                    filtered_patterns.append(pattern)
+                candidate_ids = None
+            if candidate_ids is None:
+                filtered_patterns = [p for p in self._patterns if pattern_key(p)]
+            else:
+                filtered_patterns = [self._pattern_index[k] for k in candidate_ids]
+        else:
+            # Keyword-only search: only patterns with matches
+            filtered_patterns = [
+                self._pattern_index[k] for k in self._keyword_index.ordered(keyword_scores)
+            ]
 
         # Step 2: Use hybrid search if available, otherwise keyword-only
-        if hybrid_searcher and self.hybrid_config.semantic_weight > 0:
+        if use_hybrid:
             print(f"  [SEARCH] Using hybrid search (semantic enabled)")
             results = hybrid_searcher.search(
                 query=query,
@@ -562,6 +562,7 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
         key = pattern.get('pattern_id') or pattern.get('id') or pattern.get('name', '')
         if key:
             self._pattern_index[key] = pattern
+            self._keyword_index.add(pattern)
         await self._persist()
 
     async def find_similar(
@@ -614,6 +615,9 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
         # Update fields
         pattern.update(updates)
         pattern['updated_at'] = datetime.utcnow().isoformat()
+        if pattern_key(pattern) != pattern_id:
+            self._keyword_index.remove(pattern_id)
+        self._keyword_index.add(pattern)
 
         await self._persist()
 
@@ -628,6 +632,7 @@ class JSONKnowledgeBase(KnowledgeBasePlugin):
 
         self._patterns.remove(pattern)
         del self._pattern_index[pattern_id]
+        self._keyword_index.remove(pattern_id)
         await self._persist()
 
         # Auto-embed: Remove embedding for the deleted pattern
@@ -0,0 +1,263 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Keyword Index - inverted index over pattern text fields.
+
+JSONKnowledgeBase.search used to lowercase and substring-scan every field
+of every pattern for each query. KeywordIndex keeps, per lowercased
+whitespace token, the ids of patterns containing it and a bitmask of the
+fields it occurs in. Because query words never contain whitespace,
+"word in field" holds exactly when the word is a substring of one of the
+field's tokens, so resolving a query word against the (much smaller)
+vocabulary gives the same matches as the old scan while only touching the
+postings of matching tokens. The vocabulary itself is indexed by character
+trigram, so a query word of three or more characters is resolved by
+intersecting the trigram sets of its tokens rather than scanning every
+token.
+
+Exact matches (origin_query or an example equal to the query) and
+category/tag filters are answered from precomputed maps.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+# Searchable fields in bit order
+FIELDS = ['name', 'description', 'problem', 'solution', 'origin_query', 'tags', 'examples']
+FIELD_BITS = {name: 1 << i for i, name in enumerate(FIELDS)}
+ORIGIN_QUERY_BIT = FIELD_BITS['origin_query']
+
+# Score contributed by each field with at least one matching word
+DEFAULT_FIELD_WEIGHTS = {name: 1 for name in FIELDS}
+
+
+def pattern_key(pattern: Dict[str, Any]) -> str:
+    """Key patterns the way JSONKnowledgeBase does: pattern_id -> id -> name."""
+    return pattern.get('pattern_id') or pattern.get('id') or pattern.get('name', '')
+
+
+def _field_text(pattern: Dict[str, Any], field: str) -> str:
+    if field == 'tags':
+        return ' '.join(pattern.get('tags', []))
+    if field == 'examples':
+        return ' '.join(str(ex) for ex in pattern.get('examples', []))
+    return pattern.get(field, '') or ''
+
+
+def pattern_categories(pattern: Dict[str, Any]) -> Set[str]:
+    """Values a category filter matches: category (or pattern_type) and tags."""
+    categories = set(pattern.get('tags', []))
+    categories.add(pattern.get('category', pattern.get('pattern_type', '')))
+    return categories
+
+
+class KeywordIndex:
+    """Token -> {pattern key: field bitmask} postings with exact-match and category maps."""
+
+    WORD_CACHE_SIZE = 1024
+    GRAM = 3
+
+    def __init__(self, field_weights: Optional[Dict[str, int]] = None):
+        self.field_weights = dict(DEFAULT_FIELD_WEIGHTS)
+        if field_weights:
+            self.field_weights.update(field_weights)
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._grams: Dict[str, Set[str]] = {}                # trigram -> vocabulary tokens
+        self._terms: Dict[str, Dict[str, int]] = {}          # key -> {token: mask}
+        self._exact: Dict[str, Set[str]] = {}                # lowered origin_query/example -> keys
+        self._exact_terms: Dict[str, Set[str]] = {}          # key -> its exact strings
+        self._categories: Dict[str, Set[str]] = {}           # category/tag -> keys
+        self._category_terms: Dict[str, Set[str]] = {}       # key -> its categories
+        self._order: Dict[str, int] = {}                     # key -> insertion sequence
+        self._seq = 0
+        self._word_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._mask_scores: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._terms
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def build(self, patterns: Iterable[Dict[str, Any]]) -> None:
+        """Index patterns from scratch (later duplicates of a key win)."""
+        self.__init__(self.field_weights)
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: Dict[str, Any]) -> None:
+        """Index a pattern, replacing any earlier version with the same key."""
+        key = pattern_key(pattern)
+        if not key:
+            return
+        order = self._order.get(key)
+        if key in self._terms:
+            self.remove(key)
+
+        terms: Dict[str, int] = {}
+        for field in FIELDS:
+            text = _field_text(pattern, field)
+            if not text:
+                continue
+            bit = FIELD_BITS[field]
+            for token in text.lower().split():
+                terms[token] = terms.get(token, 0) | bit
+
+        for token, mask in terms.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._add_token(token)
+            postings[key] = mask
+        self._terms[key] = terms
+
+        exact = {str(ex).lower() for ex in pattern.get('examples', [])}
+        origin_query = pattern.get('origin_query', '').lower()
+        if origin_query:
+            exact.add(origin_query)
+        for text in exact:
+            self._exact.setdefault(text, set()).add(key)
+        self._exact_terms[key] = exact
+
+        categories = pattern_categories(pattern)
+        for category in categories:
+            self._categories.setdefault(category, set()).add(key)
+        self._category_terms[key] = categories
+
+        if order is None:
+            order = self._seq
+            self._seq += 1
+        self._order[key] = order
+
+    def remove(self, key: str) -> None:
+        """Drop a pattern's postings."""
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        for token in terms:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[token]
+                    self._remove_token(token)
+        for text in self._exact_terms.pop(key, ()):
+            keys = self._exact.get(text)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._exact[text]
+        for category in self._category_terms.pop(key, ()):
+            keys = self._categories.get(category)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._categories[category]
+        self._order.pop(key, None)
+
+    def _grams_of(self, text: str) -> Set[str]:
+        return {text[i:i + self.GRAM] for i in range(len(text) - self.GRAM + 1)}
+
+    def _add_token(self, token: str) -> None:
+        """Register a new vocabulary token."""
+        for gram in self._grams_of(token):
+            self._grams.setdefault(gram, set()).add(token)
+        self._invalidate_words(token)
+
+    def _remove_token(self, token: str) -> None:
+        """Forget a vocabulary token that no longer has postings."""
+        for gram in self._grams_of(token):
+            tokens = self._grams.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._grams[gram]
+        self._invalidate_words(token)
+
+    def _invalidate_words(self, token: str) -> None:
+        """Drop cached words whose match list the token belongs in."""
+        stale = [word for word in self._word_cache if word in token]
+        for word in stale:
+            del self._word_cache[word]
+
+    def _tokens_for(self, word: str) -> List[str]:
+        """Vocabulary tokens containing word as a substring (cached)."""
+        tokens = self._word_cache.get(word)
+        if tokens is None:
+            if len(word) < self.GRAM:
+                tokens = [token for token in self._postings if word in token]
+            else:
+                gram_sets = sorted((self._grams.get(g, set()) for g in self._grams_of(word)), key=len)
+                candidates = set.intersection(*gram_sets) if gram_sets[0] else set()
+                tokens = [token for token in candidates if word in token]
+            self._word_cache[word] = tokens
+            if len(self._word_cache) > self.WORD_CACHE_SIZE:
+                self._word_cache.popitem(last=False)
+        else:
+            self._word_cache.move_to_end(word)
+        return tokens
+
+    def match_masks(self, words: Iterable[str]) -> Dict[str, int]:
+        """
+        Fields matched by any of the words, per pattern.
+
+        Args:
+            words: Lowercased query words (no whitespace)
+
+        Returns:
+            Dict of pattern key -> bitmask of fields containing a word
+        """
+        masks: Dict[str, int] = {}
+        for word in set(words):
+            for token in self._tokens_for(word):
+                for key, mask in self._postings[token].items():
+                    masks[key] = masks.get(key, 0) | mask
+        return masks
+
+    def score_mask(self, mask: int) -> int:
+        """Weighted count of the fields set in a mask."""
+        score = self._mask_scores.get(mask)
+        if score is None:
+            score = sum(self.field_weights[f] for f in FIELDS if mask & FIELD_BITS[f])
+            self._mask_scores[mask] = score
+        return score
+
+    def exact_matches(self, query_lower: str) -> Set[str]:
+        """Patterns whose origin_query or one of whose examples equals the query."""
+        return set(self._exact.get(query_lower, ()))
+
+    def category_keys(self, category: str) -> Set[str]:
+        """Patterns whose category/pattern_type or tags include category."""
+        return set(self._categories.get(category, ()))
+
+    def ordered(self, keys: Iterable[str]) -> List[str]:
+        """Keys in pattern insertion order."""
+        return sorted(keys, key=self._order.__getitem__)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'patterns': len(self._terms),
+            'vocabulary': len(self._postings),
+            'trigrams': len(self._grams),
+            'postings': sum(len(p) for p in self._postings.values()),
+            'categories': len(self._categories)
+        }
@@ -23,17 +23,23 @@ Implements the KnowledgeBasePlugin interface using SQLite with:
 - Proper indexing for fast lookups
 - ACID transactions for data integrity
 - Async support via aiosqlite
+- Semantic search: pattern embeddings stored as float32 BLOBs, cached in a
+  matrix-backed VectorStore and fused with bm25() ranks
 """
 
 import asyncio
 import json
 import logging
+import queue
 import re
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
 import aiosqlite
+import numpy as np
 
 # Add parent directory to path for imports
 import sys
@@ -41,6 +47,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.knowledge_base_plugin import KnowledgeBasePlugin
 from core.knowledge_base import KnowledgeBaseConfig
+from core.embeddings import VectorStore, get_embedding_service
 
 
 logger = logging.getLogger(__name__)
@@ -55,7 +62,20 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
     - Indexed searches on status, confidence, domain
     - JSON blob storage for flexible schema
     - Thread-safe async operations
-    - Automatic migration from JSON files
+    - Automatic migration from JSON files (patterns and their embeddings),
+      bulk-loaded in one transaction
+    - Pooled read connections for the synchronous helpers
+    - Hybrid search: bm25() full-text ranks fused with embedding similarity
+
+    Hybrid search:
+        Pattern embeddings live in the pattern_embeddings table as
+        little-endian float32 BLOBs. On the first semantic search they are
+        loaded into one in-memory float32 matrix (a VectorStore, optionally
+        with the ANN index from config.vector_index), which is kept in step
+        with add/update/delete and reloaded when another connection commits.
+        FTS and semantic candidate lists are merged with reciprocal-rank
+        fusion (FUSION = "rrf") or a weighted sum of normalized scores
+        (FUSION = "weighted"). Without an embedding model search is FTS-only.
 
     Configuration:
         storage_path: Path to database directory (will create .db file)
@@ -117,27 +137,68 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         tokenize='porter'
     );
 
-    -- Triggers to keep FTS in sync
-    CREATE TRIGGER IF NOT EXISTS patterns_ai AFTER INSERT ON patterns BEGIN
-        INSERT INTO patterns_fts(rowid, name, problem, solution, description)
-        VALUES (new.rowid, new.name, new.problem, new.solution, new.description);
+    -- Triggers to keep FTS in sync (patterns_ai: see FTS_INSERT_TRIGGER)
+    CREATE TRIGGER IF NOT EXISTS patterns_ad AFTER DELETE ON patterns BEGIN
+        INSERT INTO patterns_fts(patterns_fts, rowid, name, problem, solution, description)
+        VALUES ('delete', old.rowid, old.name, old.problem, old.solution, old.description);
     END;
 
-    CREATE TRIGGER IF NOT EXISTS patterns_ad AFTER DELETE ON patterns BEGIN
+    -- External-content FTS5 tables must be updated with a delete + insert
+    DROP TRIGGER IF EXISTS patterns_au;
+    CREATE TRIGGER patterns_au AFTER UPDATE ON patterns BEGIN
         INSERT INTO patterns_fts(patterns_fts, rowid, name, problem, solution, description)
         VALUES ('delete', old.rowid, old.name, old.problem, old.solution, old.description);
+        INSERT INTO patterns_fts(rowid, name, problem, solution, description)
+        VALUES (new.rowid, new.name, new.problem, new.solution, new.description);
     END;
 
-    CREATE TRIGGER IF NOT EXISTS patterns_au AFTER UPDATE ON patterns BEGIN
-        UPDATE patterns_fts
-        SET name = new.name,
-            problem = new.problem,
-            solution = new.solution,
-            description = new.description
-        WHERE rowid = new.rowid;
+    -- Pattern embeddings (float32 little-endian BLOBs)
+    CREATE TABLE IF NOT EXISTS pattern_embeddings (
+        pattern_id TEXT PRIMARY KEY,
+        dim INTEGER NOT NULL,
+        model TEXT,
+        vector BLOB NOT NULL,
+        updated_at TEXT
+    );
+
+    CREATE TRIGGER IF NOT EXISTS patterns_embeddings_ad AFTER DELETE ON patterns BEGIN
+        DELETE FROM pattern_embeddings WHERE pattern_id = old.id;
     END;
     """
 
+    # Suspended during bulk_add_patterns
+    FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS patterns_ai AFTER INSERT ON patterns BEGIN
+        INSERT INTO patterns_fts(rowid, name, problem, solution, description)
+        VALUES (new.rowid, new.name, new.problem, new.solution, new.description);
+    END;
+    """
+
+    # Hybrid search tuning
+    FUSION = "rrf"                           # "rrf" or "weighted"
+    RRF_K = 60                               # Reciprocal-rank fusion constant
+    SEMANTIC_WEIGHT = 0.5                    # Share of the semantic list in the fused score
+    CANDIDATE_MULTIPLIER = 5                 # Candidates per list = limit * this (min 50)
+    BM25_WEIGHTS = (10.0, 5.0, 1.0, 2.0)     # name, problem, solution, description
+    EMBEDDING_DTYPE = np.dtype('<f4')
+
+    # Bulk import / connection pool
+    BULK_BATCH_SIZE = 5000                   # Rows per executemany call
+    READ_POOL_SIZE = 4                       # Idle sync read connections kept open
+
+    # Pattern columns in INSERT order (see _pattern_params)
+    INSERT_SQL = """
+        INSERT{conflict} INTO patterns (
+            id, status, confidence, domain_id, origin_query,
+            pattern_type, name, problem, solution, description,
+            tags, examples, conditions, related_patterns, prerequisites,
+            alternatives, sources, created_at, updated_at,
+            times_accessed, user_rating, reviewed_by, reviewed_at,
+            review_notes, generated_by, generated_at, usage_count,
+            llm_generated
+        ) VALUES ({placeholders})
+    """.format(conflict="{conflict}", placeholders=", ".join(["?"] * 28))
+
     def __init__(self, config: KnowledgeBaseConfig):
         """
         Initialize SQLite knowledge base.
@@ -159,6 +220,16 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         # Lock for database operations
         self._lock = asyncio.Lock()
 
+        # Read-only connections for the synchronous helpers
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=self.READ_POOL_SIZE)
+
+        # Semantic search: embedding model and in-memory matrix cache
+        self.embedding_service = get_embedding_service()
+        self.use_hybrid_search = True
+        self._vectors: Optional[VectorStore] = None
+        self._data_version: Optional[int] = None
+        self._model_lock = asyncio.Lock()
+
         logger.info(f"SQLite KB initialized at {self.db_path}")
 
     async def _get_db(self) -> aiosqlite.Connection:
@@ -175,16 +246,49 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         return self._db
 
     async def close(self) -> None:
-        """Close database connection."""
+        """Close database connections."""
         if self._db:
             await self._db.close()
             self._db = None
+        self._close_read_pool()
+
+    @contextmanager
+    def _read_connection(self):
+        """
+        Borrow a synchronous read connection from the pool.
+
+        Sync callers (get_pattern_count, get_patterns_by_category, ...) used
+        to open and close a new sqlite3 connection per call. Connections are
+        now reused; at most READ_POOL_SIZE idle ones are kept, extra ones
+        opened under concurrency are closed on return. In WAL mode each
+        statement sees the latest committed data.
+        """
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+        try:
+            yield conn
+        finally:
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _close_read_pool(self) -> None:
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                return
 
     async def _ensure_database(self) -> None:
         """Create database schema if it doesn't exist."""
         async with self._lock:
             db = await self._get_db()
-            await db.executescript(self.SCHEMA)
+            await db.executescript(self.SCHEMA + self.FTS_INSERT_TRIGGER)
             await db.commit()
 
     async def load_patterns(self) -> None:
@@ -226,31 +330,111 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         with open(json_file, 'r') as f:
             patterns = json.load(f)
 
-        imported = 0
+        patterns = [p for p in patterns if p.get('id') or p.get('pattern_id')]
+
+        # Embeddings the JSON backend already computed are copied, not re-encoded
+        stored = VectorStore(self.storage_path)
+        stored.load()
+        embeddings = {}
         for pattern in patterns:
             pattern_id = pattern.get('id') or pattern.get('pattern_id')
-            if not pattern_id:
-                continue
+            embedding = stored.get(pattern_id)
+            if embedding is not None:
+                embeddings[pattern_id] = embedding
+
+        start = datetime.now()
+        imported = await self.bulk_add_patterns(patterns, embeddings=embeddings)
+        elapsed = (datetime.now() - start).total_seconds()
+
+        logger.info(f"Imported {imported} patterns from JSON ({len(embeddings)} with embeddings) "
+                    f"in {elapsed:.2f}s")
+
+    async def bulk_add_patterns(
+        self,
+        patterns: List[Dict[str, Any]],
+        embeddings: Optional[Dict[str, np.ndarray]] = None
+    ) -> int:
+        """
+        Insert many patterns in a single transaction.
+
+        Rows go in with executemany in batches of BULK_BATCH_SIZE while the
+        FTS insert trigger is suspended, and the FTS index is rebuilt once
+        at the end, which is much faster than per-row inserts, trigger
+        updates and commits. Patterns keep their own created_at/updated_at
+        when present; a pattern whose ID already exists replaces it.
+        Patterns are not embedded here; pass precomputed vectors in
+        embeddings or run generate_embeddings() afterwards.
+
+        Args:
+            patterns: Pattern dictionaries
+            embeddings: Optional pattern_id -> embedding vectors to store
+
+        Returns:
+            Number of patterns written
+        """
+        db = await self._get_db()
+        count = await self.async_get_pattern_count()
+        now = datetime.now(timezone.utc).isoformat()
+        model = getattr(getattr(self.embedding_service, 'config', None), 'model_name', None)
+        insert_sql = self.INSERT_SQL.format(conflict=" OR REPLACE")
+        embeddings = embeddings or {}
+
+        async with self._lock:
+            await db.execute("BEGIN")
+            try:
+                await db.execute("DROP TRIGGER IF EXISTS patterns_ai")
+
+                written = 0
+                for start in range(0, len(patterns), self.BULK_BATCH_SIZE):
+                    rows = []
+                    for pattern in patterns[start:start + self.BULK_BATCH_SIZE]:
+                        pattern_id = pattern.get('id') or pattern.get('pattern_id')
+                        if not pattern_id:
+                            domain = pattern.get('domain', 'unknown')
+                            pattern_id = f"{domain}_sqlite_{count + written + 1:05d}"
+                        rows.append(self._pattern_params(
+                            {**pattern, 'id': pattern_id,
+                             'created_at': pattern.get('created_at') or now,
+                             'updated_at': pattern.get('updated_at') or now}
+                        ))
+                        written += 1
+                    await db.executemany(insert_sql, rows)
+
+                vectors = []
+                for pattern_id, embedding in embeddings.items():
+                    vector = np.ascontiguousarray(np.ravel(embedding), dtype=self.EMBEDDING_DTYPE)
+                    vectors.append((pattern_id, vector.shape[0], model, vector.tobytes(), now))
+                if vectors:
+                    await db.executemany(
+                        """INSERT OR REPLACE INTO pattern_embeddings
+                           (pattern_id, dim, model, vector, updated_at) VALUES (?, ?, ?, ?, ?)""",
+                        vectors
+                    )
 
-            await self.add_pattern(pattern)
-            imported += 1
+                # Re-index all rows once, then restore per-row FTS sync
+                await db.execute("INSERT INTO patterns_fts(patterns_fts) VALUES ('rebuild')")
+                await db.execute(self.FTS_INSERT_TRIGGER)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                await db.execute(self.FTS_INSERT_TRIGGER)
+                await db.commit()
+                raise
 
-        logger.info(f"Imported {imported} patterns from JSON")
+        # Cached matrix no longer matches the table
+        self._vectors = None
+        return written
 
     def get_pattern_count(self) -> int:
         """
         Get total number of patterns (synchronous).
 
-        Note: This uses a synchronous connection for compatibility.
+        Note: This uses a pooled synchronous connection for compatibility.
         For async contexts, the internal methods use async_get_pattern_count.
         """
-        import sqlite3
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.execute("SELECT COUNT(*) as count FROM patterns")
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
+            with self._read_connection() as conn:
+                return conn.execute("SELECT COUNT(*) as count FROM patterns").fetchone()[0]
         except Exception:
             return 0
 
@@ -269,10 +453,12 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         **filters
     ) -> List[Dict[str, Any]]:
         """
-        Search patterns using full-text search.
+        Search patterns using full-text and semantic search.
 
-        Uses FTS5 for relevance-ranked full-text search on
-        name, problem, and solution fields.
+        FTS5 candidates are ranked by bm25() over name, problem, solution
+        and description. When pattern embeddings and an embedding model are
+        available, the nearest patterns by cosine similarity are fused with
+        them (see FUSION); otherwise the bm25 order is returned as-is.
 
         Args:
             query: Search query text
@@ -288,27 +474,118 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
 
         # Extract search terms
         query_terms = self._extract_terms(query)
+        query_embedding = await self._encode_query(query)
 
-        if not query_terms:
+        if not query_terms and query_embedding is None:
             # No valid search terms, return recent patterns
             return await self._get_recent_patterns(limit)
 
+        candidate_limit = max(limit * self.CANDIDATE_MULTIPLIER, 50)
+        fts_hits = await self._fts_candidates(query_terms, category, filters, candidate_limit)
+
+        if query_embedding is None:
+            # FTS-only: bm25 order, relevance from the bm25 score
+            rows = await self._fetch_patterns([pid for pid, _ in fts_hits[:limit]])
+            results = []
+            for pattern_id, bm25 in fts_hits[:limit]:
+                pattern = rows.get(pattern_id)
+                if pattern is None:
+                    continue
+                pattern['fts_rank'] = bm25
+                pattern['_bm25_score'] = bm25
+                pattern['_relevance_source'] = 'keyword'
+                pattern['confidence'] = await self._calculate_relevance(pattern, query, query_terms)
+                results.append(pattern)
+            return results
+
+        semantic_hits = await self._semantic_candidates(query_embedding, category, filters, candidate_limit)
+        fused = self._fuse(fts_hits, semantic_hits)[:limit]
+
+        rows = await self._fetch_patterns([pid for pid, _, _, _ in fused])
+        results = []
+        for pattern_id, score, bm25, similarity in fused:
+            pattern = rows.get(pattern_id)
+            if pattern is None:
+                continue
+            base_confidence = pattern.get('confidence', 0.5)
+            pattern['_fused_score'] = score
+            pattern['_bm25_score'] = bm25
+            pattern['_semantic_score'] = similarity
+            if bm25 is not None and similarity is not None:
+                pattern['_relevance_source'] = 'hybrid'
+            else:
+                pattern['_relevance_source'] = 'keyword' if bm25 is not None else 'semantic'
+            # Same 70/30 blend as FTS-only relevance
+            pattern['confidence'] = (score * 0.7) + (base_confidence * 0.3)
+            results.append(pattern)
+
+        return results
+
+    async def _fts_candidates(
+        self,
+        query_terms: List[str],
+        category: Optional[str],
+        filters: Dict[str, Any],
+        limit: int
+    ) -> List[Tuple[str, float]]:
+        """
+        Full-text candidates as (pattern_id, bm25) pairs, best first.
+
+        Terms are OR-ed so partial matches are still candidates; bm25()
+        ranks patterns matching more (and rarer) terms first. bm25() is
+        lower for better matches.
+        """
+        if not query_terms:
+            return []
+
         db = await self._get_db()
+        fts_query = " OR ".join(f'"{term}"' for term in query_terms)
+        weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
 
-        # Build FTS5 search query
-        fts_query = " ".join(query_terms)
+        filter_sql, filter_params = self._filter_clauses(category, filters)
+        sql = f"""
+            SELECT p.id, bm25(patterns_fts, {weights}) AS score
+            FROM patterns_fts
+            JOIN patterns p ON p.rowid = patterns_fts.rowid
+            WHERE patterns_fts MATCH ?{filter_sql}
+            ORDER BY score ASC, p.confidence DESC
+            LIMIT ?
+        """
+        async with db.execute(sql, [fts_query, *filter_params, limit]) as cursor:
+            rows = await cursor.fetchall()
+        return [(row[0], row[1]) for row in rows]
 
-        # Build SQL query with filters
-        sql = """
-            SELECT
-                p.*,
-                fts.rank as fts_rank
-            FROM patterns p
-            JOIN patterns_fts fts ON p.rowid = fts.rowid
-            WHERE patterns_fts MATCH ?
+    async def _semantic_candidates(
+        self,
+        query_embedding: np.ndarray,
+        category: Optional[str],
+        filters: Dict[str, Any],
+        limit: int
+    ) -> List[Tuple[str, float]]:
         """
+        Nearest patterns by cosine similarity as (pattern_id, similarity), best first.
 
-        params = [fts_query]
+        With filters set, the search is restricted to the patterns that pass
+        them, so a filtered search still gets its top `limit` semantic hits.
+        """
+        vectors = await self._vector_cache()
+        filter_sql, filter_params = self._filter_clauses(category, filters)
+        if not filter_sql:
+            return vectors.search(query_embedding, top_k=limit)
+
+        # Apply the same filters as the FTS query
+        db = await self._get_db()
+        async with db.execute(f"SELECT p.id FROM patterns p WHERE 1 = 1{filter_sql}", filter_params) as cursor:
+            allowed = [row[0] for row in await cursor.fetchall()]
+        if not allowed:
+            return []
+        return vectors.search(query_embedding, top_k=limit, pattern_ids=allowed)
+
+    @staticmethod
+    def _filter_clauses(category: Optional[str], filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """SQL AND-clauses (on alias p) for the category/status/confidence filters."""
+        sql = ""
+        params: List[Any] = []
 
         # Add category filter
         if category:
@@ -325,22 +602,69 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
             sql += " AND p.confidence >= ?"
             params.append(filters['confidence_min'])
 
-        # Order by FTS rank and confidence
-        sql += " ORDER BY fts.rank DESC, p.confidence DESC LIMIT ?"
-        params.append(limit)
+        return sql, params
 
-        async with db.execute(sql, params) as cursor:
-            rows = await cursor.fetchall()
+    def _fuse(
+        self,
+        fts_hits: List[Tuple[str, float]],
+        semantic_hits: List[Tuple[str, float]]
+    ) -> List[Tuple[str, float, Optional[float], Optional[float]]]:
+        """
+        Merge the FTS and semantic candidate lists.
 
-        # Convert to dict format
-        results = []
-        for row in rows:
-            pattern = await self._row_to_dict(row)
-            # Calculate combined relevance score
-            pattern['confidence'] = await self._calculate_relevance(pattern, query, query_terms)
-            results.append(pattern)
+        "rrf" sums weight / (RRF_K + rank) over the lists a pattern appears
+        in; "weighted" sums weight * score with bm25 min-max normalized over
+        the candidates and cosine similarity clipped to [0, 1]. Either way
+        the fused score is scaled to 0-1.
 
-        return results
+        Returns:
+            (pattern_id, fused_score, bm25, similarity) tuples, best first;
+            bm25/similarity are None for patterns missing from that list
+        """
+        semantic_weight = self.SEMANTIC_WEIGHT
+        keyword_weight = 1.0 - semantic_weight
+        bm25_scores = dict(fts_hits)
+        similarities = dict(semantic_hits)
+        fused: Dict[str, float] = {}
+
+        if self.FUSION == "rrf":
+            for hits, weight in ((fts_hits, keyword_weight), (semantic_hits, semantic_weight)):
+                for rank, (pattern_id, _) in enumerate(hits, start=1):
+                    fused[pattern_id] = fused.get(pattern_id, 0.0) + weight / (self.RRF_K + rank)
+            # Rank 1 in both lists scores 1.0
+            scale = self.RRF_K + 1
+            fused = {pid: score * scale for pid, score in fused.items()}
+        elif self.FUSION == "weighted":
+            if bm25_scores:
+                best = min(bm25_scores.values())
+                worst = max(bm25_scores.values())
+                spread = worst - best
+                for pattern_id, bm25 in bm25_scores.items():
+                    normalized = (worst - bm25) / spread if spread > 0 else 1.0
+                    fused[pattern_id] = keyword_weight * normalized
+            for pattern_id, similarity in similarities.items():
+                fused[pattern_id] = fused.get(pattern_id, 0.0) + semantic_weight * max(0.0, similarity)
+        else:
+            raise ValueError(f"Unknown fusion method: {self.FUSION}. Available: ['rrf', 'weighted']")
+
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (pattern_id, score, bm25_scores.get(pattern_id), similarities.get(pattern_id))
+            for pattern_id, score in ranked
+        ]
+
+    async def _fetch_patterns(self, pattern_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Patterns by ID in one query."""
+        if not pattern_ids:
+            return {}
+        db = await self._get_db()
+        placeholders = ", ".join("?" * len(pattern_ids))
+        async with db.execute(
+            f"SELECT * FROM patterns WHERE id IN ({placeholders})", pattern_ids
+        ) as cursor:
+            rows = await cursor.fetchall()
+        patterns = [await self._row_to_dict(row) for row in rows]
+        return {pattern['id']: pattern for pattern in patterns}
 
     async def get_by_id(self, pattern_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -390,14 +714,11 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
 
         Note: Synchronous wrapper. Use async version in async contexts.
         """
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.execute(
-            "SELECT DISTINCT pattern_type FROM patterns WHERE pattern_type IS NOT NULL ORDER BY pattern_type"
-        )
-        categories = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return categories
+        with self._read_connection() as conn:
+            cursor = conn.execute(
+                "SELECT DISTINCT pattern_type FROM patterns WHERE pattern_type IS NOT NULL ORDER BY pattern_type"
+            )
+            return [row[0] for row in cursor.fetchall()]
 
     async def async_get_all_categories(self) -> List[str]:
         """Async version of get_all_categories."""
@@ -412,6 +733,9 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         """
         Add a new pattern to the database.
 
+        The pattern is embedded in the same transaction when an embedding
+        model is available.
+
         Args:
             pattern: Pattern dictionary
 
@@ -429,21 +753,23 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         pattern['created_at'] = now
         pattern['updated_at'] = now
 
-        # Build INSERT statement with exactly 28 placeholders
-        placeholders = ", ".join(["?"] * 28)
-        sql = f"""
-            INSERT INTO patterns (
-                id, status, confidence, domain_id, origin_query,
-                pattern_type, name, problem, solution, description,
-                tags, examples, conditions, related_patterns, prerequisites,
-                alternatives, sources, created_at, updated_at,
-                times_accessed, user_rating, reviewed_by, reviewed_at,
-                review_notes, generated_by, generated_at, usage_count,
-                llm_generated
-            ) VALUES ({placeholders})
-        """
-
-        params = (
+        sql = self.INSERT_SQL.format(conflict="")
+        params = self._pattern_params(pattern)
+
+        embedding = await self._encode_pattern(pattern)
+
+        db = await self._get_db()
+        await db.execute(sql, params)
+        if embedding is not None:
+            await self._store_embedding(db, pattern['id'], embedding)
+        await db.commit()
+
+        return pattern['id']
+
+    @staticmethod
+    def _pattern_params(pattern: Dict[str, Any]) -> Tuple:
+        """Column values for INSERT_SQL, with exactly 28 entries."""
+        return (
             pattern.get('id'),
             pattern.get('status', 'candidate'),
             pattern.get('confidence', pattern.get('confidence_score', 0.5)),
@@ -474,12 +800,6 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
             1 if pattern.get('llm_generated') else 0
         )
 
-        db = await self._get_db()
-        await db.execute(sql, params)
-        await db.commit()
-
-        return pattern['id']
-
     async def update_pattern(self, pattern_id: str, updates: Dict[str, Any]) -> None:
         """
         Update an existing pattern.
@@ -517,9 +837,17 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         await db.execute(sql, params)
         await db.commit()
 
+        # Re-embed when text the embedding is built from changed
+        if self.EMBEDDED_FIELDS.intersection(updates):
+            pattern = await self.get_by_id(pattern_id)
+            embedding = await self._encode_pattern(pattern) if pattern else None
+            if embedding is not None:
+                await self._store_embedding(db, pattern_id, embedding)
+                await db.commit()
+
     async def delete_pattern(self, pattern_id: str) -> None:
         """
-        Delete a pattern.
+        Delete a pattern (its embedding row is removed by trigger).
 
         Args:
             pattern_id: Pattern ID to delete
@@ -528,6 +856,195 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         await db.execute("DELETE FROM patterns WHERE id = ?", (pattern_id,))
         await db.commit()
 
+        if self._vectors is not None:
+            self._vectors.remove(pattern_id)
+
+    # ========== Embeddings ==========
+
+    # Pattern fields encode_pattern() reads
+    EMBEDDED_FIELDS = {'name', 'solution', 'description', 'problem', 'origin_query', 'tags'}
+
+    @property
+    def _semantic_available(self) -> bool:
+        return (
+            self.use_hybrid_search
+            and self.embedding_service is not None
+            and self.embedding_service.is_available
+        )
+
+    async def _ensure_model(self) -> None:
+        """Load the embedding model on first use (in a worker thread)."""
+        if not self.embedding_service.is_loaded:
+            async with self._model_lock:
+                if not self.embedding_service.is_loaded:
+                    logger.info("Loading embedding model for SQLite KB")
+                    await asyncio.to_thread(self.embedding_service.load_model)
+
+    async def _encode_pattern(self, pattern: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Embed a pattern, or None if no model is available or encoding fails."""
+        if not self._semantic_available:
+            return None
+        try:
+            await self._ensure_model()
+            return await asyncio.to_thread(self.embedding_service.encode_pattern, pattern)
+        except Exception as e:
+            # Don't fail the pattern operation if embedding fails
+            logger.warning(f"Failed to embed pattern {pattern.get('id')}: {e}")
+            return None
+
+    async def _encode_query(self, query: str) -> Optional[np.ndarray]:
+        """Embed a search query, or None if there is nothing to compare it with."""
+        if not self._semantic_available or not query.strip():
+            return None
+        vectors = await self._vector_cache()
+        if len(vectors) == 0:
+            return None
+        try:
+            await self._ensure_model()
+            return await asyncio.to_thread(self.embedding_service.encode, query)
+        except Exception as e:
+            logger.warning(f"Failed to embed query, using full-text search only: {e}")
+            return None
+
+    async def _store_embedding(self, db: aiosqlite.Connection, pattern_id: str, embedding: np.ndarray) -> None:
+        """Write an embedding BLOB (caller commits) and update the matrix cache."""
+        vector = np.ascontiguousarray(np.ravel(embedding), dtype=self.EMBEDDING_DTYPE)
+        model = getattr(getattr(self.embedding_service, 'config', None), 'model_name', None)
+        await db.execute(
+            """INSERT OR REPLACE INTO pattern_embeddings (pattern_id, dim, model, vector, updated_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (pattern_id, vector.shape[0], model, vector.tobytes(),
+             datetime.now(timezone.utc).isoformat())
+        )
+        if self._vectors is not None:
+            try:
+                self._vectors.set(pattern_id, vector)
+            except ValueError:
+                # Model dimension changed; rebuild from the table on next search
+                self._vectors = None
+
+    async def _vector_cache(self) -> VectorStore:
+        """
+        The embedding matrix cache, (re)loaded from pattern_embeddings when needed.
+
+        PRAGMA data_version changes when another connection commits to the
+        database, so writes from other processes trigger a reload; writes
+        through this instance update the cache directly.
+        """
+        db = await self._get_db()
+        async with db.execute("PRAGMA data_version") as cursor:
+            version = (await cursor.fetchone())[0]
+
+        if self._vectors is None or version != self._data_version:
+            self._vectors = await self._load_vectors(db)
+            self._data_version = version
+        return self._vectors
+
+    async def _load_vectors(self, db: aiosqlite.Connection) -> VectorStore:
+        """
+        Read every embedding BLOB into one float32 matrix.
+
+        Rows are copied straight into a preallocated matrix while streaming
+        the cursor, so memory is bounded by n x dim x 4 bytes. Only vectors
+        with the dimension of the newest embedding are loaded (older rows
+        from a previous model are skipped until regenerated).
+        """
+        vectors = VectorStore(self.storage_path, name="sqlite_embeddings",
+                              index_config=self.config.vector_index)
+
+        async with db.execute(
+            "SELECT dim FROM pattern_embeddings ORDER BY updated_at DESC LIMIT 1"
+        ) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return vectors
+        dim = row[0]
+
+        async with db.execute(
+            "SELECT COUNT(*) FROM pattern_embeddings WHERE dim = ?", (dim,)
+        ) as cursor:
+            count = (await cursor.fetchone())[0]
+
+        matrix = np.empty((count, dim), dtype=np.float32)
+        ids: List[str] = []
+        async with db.execute(
+            "SELECT pattern_id, vector FROM pattern_embeddings WHERE dim = ?", (dim,)
+        ) as cursor:
+            async for pattern_id, blob in cursor:
+                if len(ids) == count:
+                    break
+                matrix[len(ids)] = np.frombuffer(blob, dtype=self.EMBEDDING_DTYPE, count=dim)
+                ids.append(pattern_id)
+
+        vectors.load_matrix(ids, matrix[:len(ids)])
+        logger.info(f"Loaded {len(ids)} pattern embeddings ({dim}-dim) into the search cache")
+        return vectors
+
+    async def generate_embeddings(self) -> Dict[str, Any]:
+        """
+        Generate embeddings for all patterns that don't have them.
+
+        Returns:
+            Dict with status: {'generated': int, 'skipped': int, 'failed': int, 'total': int}
+        """
+        if not self.embedding_service or not self.embedding_service.is_available:
+            return {'error': 'Embedding service not available'}
+
+        if not self._loaded:
+            await self.load_patterns()
+        await self._ensure_model()
+
+        db = await self._get_db()
+        async with db.execute(
+            """SELECT p.* FROM patterns p
+               LEFT JOIN pattern_embeddings e ON e.pattern_id = p.id
+               WHERE e.pattern_id IS NULL"""
+        ) as cursor:
+            missing = [await self._row_to_dict(row) for row in await cursor.fetchall()]
+        total = await self.async_get_pattern_count()
+
+        generated = 0
+        failed = 0
+        for pattern in missing:
+            try:
+                embedding = await asyncio.to_thread(self.embedding_service.encode_pattern, pattern)
+                await self._store_embedding(db, pattern['id'], embedding)
+                generated += 1
+            except Exception as e:
+                logger.warning(f"Failed to generate embedding for {pattern['id']}: {e}")
+                failed += 1
+        await db.commit()
+
+        result = {
+            'generated': generated,
+            'skipped': total - len(missing),
+            'failed': failed,
+            'total': total
+        }
+        logger.info(f"Embedding generation complete: {result}")
+        return result
+
+    def get_embedding_status(self) -> Dict[str, Any]:
+        """
+        Get status of embeddings for patterns (synchronous, like get_pattern_count).
+        """
+        try:
+            with self._read_connection() as conn:
+                total = conn.execute("SELECT COUNT(*) FROM patterns").fetchone()[0]
+                embedded = conn.execute("SELECT COUNT(*) FROM pattern_embeddings").fetchone()[0]
+        except Exception:
+            return {'error': 'Database not initialized'}
+
+        return {
+            'total_patterns': total,
+            'has_embeddings': embedded,
+            'needs_embeddings': total - embedded,
+            'coverage_percent': round(embedded / total * 100, 1) if total > 0 else 0,
+            'semantic_available': self._semantic_available,
+            'fusion': self.FUSION,
+            'vector_index': self._vectors.index_stats() if self._vectors is not None else None
+        }
+
     async def record_feedback(
         self,
         pattern_id: str,
@@ -580,22 +1097,21 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         Returns:
             List of patterns
         """
-        import sqlite3
-        conn = sqlite3.connect(self.db_path)
-
-        if category:
-            cursor = conn.execute(
-                "SELECT * FROM patterns WHERE pattern_type = ? ORDER BY confidence DESC",
-                (category,)
-            )
-        else:
-            cursor = conn.execute(
-                "SELECT * FROM patterns ORDER BY pattern_type, confidence DESC"
-            )
+        with self._read_connection() as conn:
+            if category:
+                cursor = conn.execute(
+                    "SELECT * FROM patterns WHERE pattern_type = ? ORDER BY confidence DESC",
+                    (category,)
+                )
+            else:
+                cursor = conn.execute(
+                    "SELECT * FROM patterns ORDER BY pattern_type, confidence DESC"
+                )
+            rows = cursor.fetchall()
 
-        # Convert to dicts synchronously
+        # Convert to dicts synchronously (pooled connections return sqlite3.Row)
         patterns = []
-        for row in cursor.fetchall():
+        for row in rows:
             pattern = dict(row)
             # Parse JSON fields
             for field in ['tags', 'examples', 'conditions', 'related_patterns',
@@ -607,7 +1123,6 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
                         pattern[field] = []
             patterns.append(pattern)
 
-        conn.close()
         return patterns
 
     async def find_similar(
@@ -705,14 +1220,11 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
         # Start with base confidence
         base_confidence = pattern.get('confidence', 0.5)
 
-        # FTS rank (higher is better in FTS5, but we normalize)
-        fts_rank = pattern.get('fts_rank', 0)
+        # bm25() score (negative, lower is better), normalized below
+        fts_rank = pattern.get('fts_rank') or 0.0
 
-        # Normalize FTS rank to 0-1 range
-        if fts_rank < 0:
-            fts_score = 1.0 / (1.0 + abs(fts_rank))
-        else:
-            fts_score = 1.0
+        # Normalize FTS rank to 0-1 range, increasing with match strength
+        fts_score = abs(fts_rank) / (1.0 + abs(fts_rank))
 
         # Combine: 70% FTS relevance, 30% pattern confidence
         return (fts_score * 0.7) + (base_confidence * 0.3)
@@ -782,5 +1294,6 @@ class SQLiteKnowledgeBase(KnowledgeBasePlugin):
             'fts_index_size': fts_count,
             'database_size_mb': round(db_size / (1024 * 1024), 2),
             'categories': await self.async_get_all_categories(),
+            'embeddings': self.get_embedding_status(),
             'backend': self.name
         }
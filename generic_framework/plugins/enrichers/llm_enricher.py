@@ -33,6 +33,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.enrichment_plugin import EnrichmentPlugin, EnrichmentContext
 from core.research import create_research_strategy, SearchResult
+from core.http_clients import pooled_client
 
 logger = logging.getLogger(__name__)
 
@@ -753,7 +754,7 @@ Your response:"""
             connect=30.0,     # Connection timeout
             pool=30.0          # Pool acquisition timeout
         )
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with pooled_client(self.base_url, timeout=timeout) as client:
             try:
                 # Use correct endpoint based on API type
                 if is_anthropic:
@@ -21,10 +21,15 @@ This specialist implements the three-stage search process:
 1. Research docs (local markdown files) - PRIMARY
 2. Document store (external knowledge) - SECONDARY
 3. Local patterns (cached data) - FALLBACK
+
+All three sources are searched concurrently, each under its own timeout;
+local patterns are only used when the other two return nothing.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import asyncio
 import logging
+import time
 
 from core.specialist_plugin import SpecialistPlugin
 from knowledge.document_store import DocumentStorePlugin, ExFrameInstanceStore
@@ -44,6 +49,9 @@ class ExFrameSpecialistPlugin(SpecialistPlugin):
     
     name: str = "ExFrame Knowledge Specialist"
     specialist_id: str = "exframe_specialist"
+
+    # Seconds each retrieval source may take before its results are dropped
+    DEFAULT_SOURCE_TIMEOUT = 10.0
     
     def __init__(self, knowledge_base, config: Dict[str, Any]):
         """Initialize ExFrame specialist.
@@ -57,6 +65,9 @@ class ExFrameSpecialistPlugin(SpecialistPlugin):
                 - session_tracking: Enable session tracking (default: True)
                 - document_store_config: Configuration for document store
                 - research_strategy: Configuration for document research strategy
+                - source_timeout: Seconds each search source may take (default: 10)
+                - source_timeouts: Per-source overrides keyed by research_strategy,
+                  document_store or local_patterns
         """
         self.domain = knowledge_base  # Store knowledge base as domain for compatibility
         self.config = config
@@ -64,6 +75,8 @@ class ExFrameSpecialistPlugin(SpecialistPlugin):
         self.local_patterns_enabled = config.get("local_patterns_enabled", True)
         self.reply_capture_enabled = config.get("reply_capture_enabled", True)
         self.session_tracking = config.get("session_tracking", True)
+        self.source_timeout = config.get("source_timeout", self.DEFAULT_SOURCE_TIMEOUT)
+        self.source_timeouts = config.get("source_timeouts", {})
 
         # Scope boundary configuration
         self.scope_enabled = config.get("scope", {}).get("enabled", False)
@@ -101,6 +114,7 @@ class ExFrameSpecialistPlugin(SpecialistPlugin):
 
         # Initialize research strategy (PRIMARY document search)
         self.research_strategy = None
+        self._research_init: Optional[asyncio.Task] = None
         research_config = config.get("research_strategy")
 
         if research_config:
@@ -216,62 +230,43 @@ class ExFrameSpecialistPlugin(SpecialistPlugin):
                     "out_of_scope_reason": reason
                 }
 
-        # Stage 1: Research Strategy (PRIMARY - search local documentation files)
-        research_results = []
-        search_metadata = {}  # Track search metadata for citation prompt
+        # Search all sources at once; local patterns are only used if the others find nothing
+        searches = {}
         if self.research_strategy:
-            try:
-                # Initialize research strategy if needed
-                if not hasattr(self.research_strategy, '_initialized') or not self.research_strategy._initialized:
-                    await self.research_strategy.initialize()
-
-                # Search using research strategy
-                search_results = await self.research_strategy.search(query, limit=5)
-
-                # Get search metadata for citation prompt
-                if hasattr(self.research_strategy, 'get_search_metadata'):
-                    search_metadata = self.research_strategy.get_search_metadata()
-
-                # Convert SearchResult objects to document results format
-                for result in search_results:
-                    # SearchResult has: content, source (filename), relevance_score, metadata
-                    research_results.append({
-                        "id": result.source,  # Use source (filename) as ID
-                        "title": result.source,  # Use source (filename) as title
-                        "content": result.content,  # Full document content
-                        "description": result.metadata.get("summary", f"Full document: {result.source}"),
-                        "source": "Research Docs",
-                        "metadata": {
-                            "file": result.source,
-                            "path": result.metadata.get("path", ""),
-                            "relevance": result.relevance_score,
-                            "total_files": result.metadata.get("total_files", 0)
-                        }
-                    })
+            searches["research_strategy"] = lambda: self._search_research(query)
+        if self.document_store_enabled and self.document_store:
+            searches["document_store"] = lambda: self.document_store.search(query, limit=5)
+        if self.local_patterns_enabled:
+            kb = self.domain  # self.domain IS the knowledge_base (passed from generic_domain.py)
+            searches["local_patterns"] = lambda: kb.search(query=query, limit=5)
 
-                logger.info(f"[EXFRAME_SPEC] Research strategy search returned {len(research_results)} results (PRIMARY)")
-            except Exception as e:
-                logger.error(f"[EXFRAME_SPEC] Research strategy search failed: {e}")
+        outcomes = await asyncio.gather(*(
+            self._run_source(source, search) for source, search in searches.items()
+        ))
+        results = dict(zip(searches, (result for result, _ in outcomes)))
+        sources = dict(zip(searches, (info for _, info in outcomes)))
+
+        # Stage 1: Research Strategy (PRIMARY - search local documentation files)
+        research_results, search_metadata = results.get("research_strategy") or ([], {})
+        search_metadata = dict(search_metadata)  # Track search metadata for citation prompt
+        if "research_strategy" in sources:
+            logger.info(f"[EXFRAME_SPEC] Research strategy search returned {len(research_results)} results (PRIMARY)")
 
         # Stage 2: Search document store (external knowledge)
-        document_results = []
-        if self.document_store_enabled and self.document_store:
-            try:
-                document_results = await self.document_store.search(query, limit=5)
-                logger.info(f"[EXFRAME_SPEC] Document store search returned {len(document_results)} results (SECONDARY)")
-            except Exception as e:
-                logger.error(f"[EXFRAME_SPEC] Document store search failed: {e}")
+        document_results = results.get("document_store") or []
+        if "document_store" in sources:
+            logger.info(f"[EXFRAME_SPEC] Document store search returned {len(document_results)} results (SECONDARY)")
 
         # Stage 3: Search local patterns (FALLBACK - only if no research/doc results)
         local_results = []
-        if not research_results and not document_results:
-            if self.local_patterns_enabled:
-                try:
-                    kb = self.domain  # self.domain IS the knowledge_base (passed from generic_domain.py)
-                    local_results = await kb.search(query=query, limit=5)
-                    logger.info(f"[EXFRAME_SPEC] Local pattern search returned {len(local_results)} results (FALLBACK)")
-                except Exception as e:
-                    logger.error(f"[EXFRAME_SPEC] Local pattern search failed: {e}")
+        if "local_patterns" in sources:
+            if not research_results and not document_results:
+                local_results = results.get("local_patterns") or []
+                logger.info(f"[EXFRAME_SPEC] Local pattern search returned {len(local_results)} results (FALLBACK)")
+            else:
+                sources["local_patterns"]["used"] = False
+
+        search_metadata["sources"] = sources
 
         # Combine primary results (research + doc store)
         primary_results = research_results + document_results
@@ -350,6 +345,84 @@ class ExFrameSpecialistPlugin(SpecialistPlugin):
             "search_metadata": search_metadata  # Total files searched, matches, for citation prompt
         }
 
+    async def _search_research(self, query: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Search the research strategy.
+
+        Args:
+            query: User's query
+
+        Returns:
+            Tuple of (research results in document format, search metadata)
+        """
+        # Initialize research strategy if needed (shared by concurrent queries,
+        # and not cancelled when a query's search times out)
+        if not getattr(self.research_strategy, '_initialized', False):
+            if self._research_init is None:
+                self._research_init = asyncio.ensure_future(self.research_strategy.initialize())
+            try:
+                await asyncio.shield(self._research_init)
+            except Exception:
+                self._research_init = None  # Retry on the next query
+                raise
+
+        # Search using research strategy
+        search_results = await self.research_strategy.search(query, limit=5)
+
+        # Get search metadata for citation prompt
+        search_metadata = {}
+        if hasattr(self.research_strategy, 'get_search_metadata'):
+            search_metadata = self.research_strategy.get_search_metadata()
+
+        # Convert SearchResult objects to document results format
+        research_results = []
+        for result in search_results:
+            # SearchResult has: content, source (filename), relevance_score, metadata
+            research_results.append({
+                "id": result.source,  # Use source (filename) as ID
+                "title": result.source,  # Use source (filename) as title
+                "content": result.content,  # Full document content
+                "description": result.metadata.get("summary", f"Full document: {result.source}"),
+                "source": "Research Docs",
+                "metadata": {
+                    "file": result.source,
+                    "path": result.metadata.get("path", ""),
+                    "relevance": result.relevance_score,
+                    "total_files": result.metadata.get("total_files", 0)
+                }
+            })
+
+        return research_results, search_metadata
+
+    async def _run_source(self, source: str, search: Callable[[], Awaitable]) -> Tuple[Any, Dict[str, Any]]:
+        """Await one search source under its timeout.
+
+        A source that fails or times out contributes no results; the others
+        are unaffected.
+
+        Args:
+            source: Source name (research_strategy, document_store, local_patterns)
+            search: Starts the source's search
+
+        Returns:
+            Tuple of (result or None, info with elapsed_ms, timed_out, error)
+        """
+        timeout = self.source_timeouts.get(source, self.source_timeout)
+        info: Dict[str, Any] = {"elapsed_ms": 0.0, "timed_out": False, "error": None, "used": True}
+        start = time.perf_counter()
+        result = None
+        try:
+            result = await asyncio.wait_for(search(), timeout)
+        except asyncio.TimeoutError:
+            info["timed_out"] = True
+            logger.warning(f"[EXFRAME_SPEC] {source} search timed out after {timeout}s")
+        except Exception as e:
+            info["error"] = str(e)
+            logger.error(f"[EXFRAME_SPEC] {source} search failed: {e}")
+        info["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        if result is None:
+            info["used"] = False
+        return result, info
+
     def _form_source_list(self, document_results: List, local_results: List) -> str:
         """Format source list for display at the end of response.
 
@@ -40,11 +40,42 @@ class ResponseAggregator:
 
     Strategies:
     - merge_all: Combine all patterns, re-rank by combined score
-    - first_wins: Use first specialist's response, show others in metadata
+    - first_wins: Use first confident specialist's response, show others in metadata
     - side_by_side: Show each specialist's response separately
     - best_pattern: Select best pattern across all specialists
+
+    Responses can be fed in as they arrive: is_decided() tells the caller
+    when the responses so far already determine the result (first_wins
+    with a confident response), so remaining specialists can be cancelled.
     """
 
+    # Minimum confidence for a first_wins response to end the wait
+    FIRST_WINS_CONFIDENCE = 0.5
+
+    def __init__(self, first_wins_confidence: float = FIRST_WINS_CONFIDENCE):
+        """
+        Initialize the aggregator.
+
+        Args:
+            first_wins_confidence: Minimum confidence for a first_wins response
+        """
+        self.first_wins_confidence = first_wins_confidence
+
+    def is_decided(self, responses: List[SpecialistResponse], strategy: str) -> bool:
+        """
+        Check whether the responses received so far determine the result.
+
+        Args:
+            responses: Responses received so far, in arrival order
+            strategy: Aggregation strategy
+
+        Returns:
+            True if waiting for more responses cannot change the result
+        """
+        if strategy == "first_wins":
+            return any(r.confidence >= self.first_wins_confidence for r in responses)
+        return False
+
     async def aggregate(
         self,
         responses: List[SpecialistResponse],
@@ -136,8 +167,11 @@ class ResponseAggregator:
         }
 
     def _first_wins(self, responses: List[SpecialistResponse], query: str) -> Dict[str, Any]:
-        """Use first specialist's response, include others in metadata."""
-        first = responses[0]
+        """Use first confident specialist's response (else the first), include others in metadata."""
+        first = next(
+            (r for r in responses if r.confidence >= self.first_wins_confidence),
+            responses[0]
+        )
 
         return {
             "query": query,
@@ -147,7 +181,7 @@ class ResponseAggregator:
             "raw_answer": first.raw_answer,
             "aggregation_strategy": "first_wins",
             "responses": [self._response_to_dict(r) for r in responses],
-            "alternative_responses": [self._response_to_dict(r) for r in responses[1:]]
+            "alternative_responses": [self._response_to_dict(r) for r in responses if r is not first]
         }
 
     def _side_by_side(self, responses: List[SpecialistResponse], query: str) -> Dict[str, Any]:
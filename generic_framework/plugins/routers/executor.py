@@ -0,0 +1,205 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Parallel Specialist Execution for Multi-Specialist Routing
+
+Runs the specialists selected by a router concurrently and aggregates
+their responses.
+
+Each specialist's process_query runs as its own task under a deadline;
+a specialist that times out or fails is left out of the aggregate and
+reported in the execution metadata. Responses are handed to the
+ResponseAggregator in arrival order, and as soon as the aggregator says
+the result is decided (first_wins with a confident response) the
+remaining specialists are cancelled.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .aggregator import ResponseAggregator, SpecialistResponse
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelSpecialistExecutor:
+    """
+    Executes selected specialists concurrently under per-specialist deadlines.
+
+    Configuration:
+        deadline: Seconds each specialist may take (default: 30)
+        deadlines: Per-specialist overrides keyed by specialist ID
+    """
+
+    DEFAULT_DEADLINE = 30.0
+
+    def __init__(
+        self,
+        aggregator: Optional[ResponseAggregator] = None,
+        deadline: Optional[float] = DEFAULT_DEADLINE,
+        deadlines: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            aggregator: Aggregator for the responses (default: ResponseAggregator())
+            deadline: Seconds each specialist may take (None = no limit)
+            deadlines: Per-specialist deadline overrides
+        """
+        self.aggregator = aggregator or ResponseAggregator()
+        self.deadline = deadline
+        self.deadlines = deadlines or {}
+
+    async def execute(
+        self,
+        query: str,
+        specialist_ids: List[str],
+        specialists: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+        strategy: str = "merge_all"
+    ) -> Dict[str, Any]:
+        """
+        Run the specialists and aggregate their responses.
+
+        Args:
+            query: The user's query
+            specialist_ids: Specialists to run (e.g. RouteResult.specialist_ids)
+            specialists: Available specialists (id -> SpecialistPlugin)
+            context: Context passed to each specialist
+            strategy: Aggregation strategy
+
+        Returns:
+            Aggregated response_data dict with an "execution" entry holding
+            each specialist's status and elapsed_ms
+        """
+        execution: Dict[str, Dict[str, Any]] = {}
+        responses = []
+        async for response in self.stream(query, specialist_ids, specialists, context, strategy, execution):
+            responses.append(response)
+
+        result = await self.aggregator.aggregate(responses, strategy=strategy, query=query)
+        result["execution"] = execution
+        return result
+
+    async def stream(
+        self,
+        query: str,
+        specialist_ids: List[str],
+        specialists: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+        strategy: str = "merge_all",
+        execution: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> AsyncIterator[SpecialistResponse]:
+        """
+        Yield specialist responses as they complete.
+
+        Stops (cancelling the remaining specialists) once the aggregator
+        considers the responses so far decisive for the strategy.
+
+        Args:
+            query: The user's query
+            specialist_ids: Specialists to run
+            specialists: Available specialists (id -> SpecialistPlugin)
+            context: Context passed to each specialist
+            strategy: Aggregation strategy
+            execution: Optional dict filled with each specialist's status
+
+        Yields:
+            SpecialistResponse objects in arrival order
+        """
+        execution = execution if execution is not None else {}
+        tasks = {}
+        for spec_id in specialist_ids:
+            specialist = specialists.get(spec_id)
+            if specialist is None:
+                execution[spec_id] = {"status": "missing", "elapsed_ms": 0.0}
+                continue
+            execution[spec_id] = {"status": "running", "elapsed_ms": None}
+            task = asyncio.ensure_future(self._run(spec_id, specialist, query, context, execution[spec_id]))
+            tasks[task] = spec_id
+
+        received: List[SpecialistResponse] = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    response = task.result()
+                    if response is not None:
+                        received.append(response)
+                        yield response
+                if self.aggregator.is_decided(received, strategy):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+                execution[tasks[task]]["status"] = "cancelled"
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(
+        self,
+        spec_id: str,
+        specialist: Any,
+        query: str,
+        context: Optional[Dict[str, Any]],
+        status: Dict[str, Any]
+    ) -> Optional[SpecialistResponse]:
+        """Run one specialist under its deadline (None if it timed out or failed)."""
+        deadline = self.deadlines.get(spec_id, self.deadline)
+        start = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(specialist.process_query(query, context), deadline)
+            status["status"] = "ok"
+            return to_specialist_response(spec_id, data)
+        except asyncio.TimeoutError:
+            status["status"] = "timeout"
+            logger.warning(f"[EXECUTOR] Specialist '{spec_id}' missed its {deadline}s deadline")
+            return None
+        except Exception as e:
+            status["status"] = "error"
+            status["error"] = str(e)
+            logger.error(f"[EXECUTOR] Specialist '{spec_id}' failed: {e}")
+            return None
+        finally:
+            status["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def to_specialist_response(spec_id: str, data: Dict[str, Any]) -> SpecialistResponse:
+    """
+    Build a SpecialistResponse from a specialist's process_query result.
+
+    Accepts both the plugin contract (answer, patterns) and the engine
+    style (response, patterns_used); pattern IDs without objects are skipped.
+    """
+    data = data or {}
+    patterns = data.get("patterns")
+    if patterns is None:
+        patterns = data.get("patterns_used", [])
+    return SpecialistResponse(
+        specialist_id=spec_id,
+        confidence=data.get("confidence", 0.0),
+        patterns=[p for p in patterns if isinstance(p, dict)],
+        raw_answer=data.get("answer", data.get("response", "")),
+        metadata={
+            key: value for key, value in data.items()
+            if key not in ("patterns", "patterns_used", "answer", "response", "confidence")
+        }
+    )
@@ -24,12 +24,17 @@ Useful when queries span multiple domains or need multiple perspectives.
 import sys
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
 # Add framework to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.router_plugin import RouterPlugin, RouteResult
+from .aggregator import ResponseAggregator
+from .executor import ParallelSpecialistExecutor
+
+if TYPE_CHECKING:
+    from core.specialist_plugin import SpecialistPlugin
 
 logger = logging.getLogger(__name__)
 
@@ -143,6 +148,16 @@ class ParallelRouter(MultiSpecialistRouter):
 
     All selected specialists process the query simultaneously,
     and their responses are aggregated.
+
+    Execution is opt-in: GenericDomain (and the engine behind /api/query)
+    only calls route(), so specialists run in parallel only for callers
+    that use execute() directly.
+
+    Configuration (in addition to MultiSpecialistRouter's):
+        aggregation: ResponseAggregator strategy (default: 'merge_all')
+        specialist_timeout: Seconds each specialist may take (default: 30)
+        specialist_timeouts: Per-specialist timeout overrides
+        first_wins_confidence: Confidence that ends a first_wins wait (default: 0.5)
     """
 
     name = "Parallel Router"
@@ -165,6 +180,48 @@ class ParallelRouter(MultiSpecialistRouter):
         config["strategy"] = "parallel"
         super().__init__(config)
 
+        self.aggregation = self.config.get("aggregation", "merge_all")
+        self.executor = ParallelSpecialistExecutor(
+            aggregator=ResponseAggregator(
+                self.config.get("first_wins_confidence", ResponseAggregator.FIRST_WINS_CONFIDENCE)
+            ),
+            deadline=self.config.get("specialist_timeout", ParallelSpecialistExecutor.DEFAULT_DEADLINE),
+            deadlines=self.config.get("specialist_timeouts")
+        )
+
+    async def execute(
+        self,
+        query: str,
+        specialists: Dict[str, 'SpecialistPlugin'],
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Route the query and run the selected specialists concurrently.
+
+        Args:
+            query: The user's query
+            specialists: Available specialists
+            context: Additional context (passed to each specialist)
+
+        Returns:
+            Aggregated response_data dict, with the routing decision under
+            "route" and per-specialist status under "execution"
+        """
+        route_result = await self.route(query, specialists, context)
+        result = await self.executor.execute(
+            query,
+            route_result.specialist_ids,
+            specialists,
+            context,
+            strategy=self.aggregation
+        )
+        result["route"] = {
+            "specialist_ids": route_result.specialist_ids,
+            "confidence": route_result.confidence,
+            "reasoning": route_result.reasoning
+        }
+        return result
+
 
 class SequentialRouter(MultiSpecialistRouter):
     """
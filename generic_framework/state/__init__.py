@@ -5,5 +5,11 @@ Provides complete observability of the query-response lifecycle.
 """
 
 from .state_machine import QueryState, QueryStateMachine
+from .trace_store import TraceStore, QueryLogStore, get_trace_store, maintain_periodically, summarize_query_events
+from .event_writer import EventLogWriter, get_event_writer, flush_event_writers, close_event_writers
 
-__all__ = ['QueryState', 'QueryStateMachine']
+__all__ = [
+    'QueryState', 'QueryStateMachine',
+    'TraceStore', 'QueryLogStore', 'get_trace_store', 'maintain_periodically', 'summarize_query_events',
+    'EventLogWriter', 'get_event_writer', 'flush_event_writers', 'close_event_writers'
+]
@@ -0,0 +1,235 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Event Writer - buffered background appends to a JSONL log.
+
+QueryStateMachine used to open state_machine.jsonl and write one line per
+transition, synchronously on the event loop (8-15 transitions per query).
+An EventLogWriter takes already-serialized lines on a queue and a daemon
+thread appends them in batches: it wakes on the first queued line, drains
+whatever else arrived within flush_interval (up to max_batch lines) and
+writes them with a single open/write/close.
+
+Lines are serialized by the caller so later mutation of the event dicts
+cannot change what is logged. Lines reach the file within about
+flush_interval; flush() cuts the current batch short and waits for
+everything queued so far (trace lookups call it before reading), and close()
+(called at interpreter exit and on app shutdown) flushes and stops the
+thread. If the queue is full (the disk cannot keep up) new lines are
+dropped and counted rather than blocking the query.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("event_writer")
+
+# Queue marker that ends the batch being gathered (see EventLogWriter.flush)
+_FLUSH = object()
+
+
+class EventLogWriter:
+    """Queue-backed, batching appender for one log file."""
+
+    FLUSH_INTERVAL = 0.2      # Seconds to gather a batch after the first line
+    MAX_BATCH = 512           # Lines per write
+    MAX_QUEUE = 10000         # Lines buffered before new ones are dropped
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_batch: int = MAX_BATCH,
+        max_queue: int = MAX_QUEUE
+    ):
+        """
+        Initialize the writer (the thread starts on the first write).
+
+        Args:
+            path: File to append to
+            flush_interval: Seconds to gather a batch after the first line
+            max_batch: Maximum lines per write
+            max_queue: Lines buffered before new ones are dropped
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0                      # Queued lines not yet written
+        self._closed = False
+
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def write(self, line: str) -> None:
+        """Queue one line (without trailing newline) for appending."""
+        if self._closed:
+            self._append([line])
+            return
+        self._ensure_thread()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._idle:
+                self._pending -= 1
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Event log queue full, dropped {self.dropped} lines for {self.path}")
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Write every line queued so far now and wait until it is on disk.
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        with self._idle:
+            if self._pending == 0:
+                return True
+        try:
+            self._queue.put_nowait(_FLUSH)
+        except queue.Full:
+            pass  # Full batches are written without waiting anyway
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush queued lines and stop the thread; later writes go straight to the file."""
+        if self._closed:
+            return
+        self._closed = True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "running": bool(self._thread and self._thread.is_alive())
+        }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"event-writer-{self.path.name}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch: List[Any] = [first]
+            if first is not None and first is not _FLUSH:
+                # Gather whatever else arrives shortly, up to max_batch
+                try:
+                    while len(batch) < self.max_batch:
+                        item = self._queue.get(timeout=self.flush_interval)
+                        batch.append(item)
+                        if item is None or item is _FLUSH:
+                            break
+                except queue.Empty:
+                    pass
+
+            stop = batch[-1] is None
+            if stop:
+                # Drain anything queued behind the stop marker
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            lines = [line for line in batch if line is not None and line is not _FLUSH]
+            if lines:
+                self._append(lines)
+                with self._idle:
+                    self._pending -= len(lines)
+                    self._idle.notify_all()
+            if stop:
+                return
+
+    def _append(self, lines: List[str]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            self.written += len(lines)
+            self.batches += 1
+        except Exception as e:
+            # Log but don't fail the query
+            self.errors += 1
+            logger.error(f"Failed to write {len(lines)} events to {self.path}: {e}")
+
+
+# One writer per log file
+_writers: Dict[Path, EventLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_event_writer(path: Path) -> EventLogWriter:
+    """Get the shared writer for a log file, creating it on first use."""
+    path = Path(path)
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None or writer._closed:
+            writer = _writers[path] = EventLogWriter(path)
+        return writer
+
+
+def flush_event_writers(timeout: Optional[float] = 5.0) -> None:
+    """Wait for all writers to write what has been queued so far."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(timeout)
+
+
+def close_event_writers(timeout: Optional[float] = 5.0) -> None:
+    """Flush and stop all writers (app shutdown / interpreter exit)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close(timeout)
+
+
+atexit.register(close_event_writers)
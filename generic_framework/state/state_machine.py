@@ -19,15 +19,62 @@ State Machine Logging System
 
 Provides complete observability of the query-response lifecycle through
 structured state transition logging.
+
+Events are appended to state_machine.jsonl by a background EventLogWriter
+(see event_writer.py), so transitions never do file I/O on the event loop.
 """
 
 import json
 import uuid
 from datetime import datetime
 from enum import Enum
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+from .event_writer import get_event_writer
+
+
+# Size estimation: containers are walked this deep, and only this many
+# items per container are measured (the rest are extrapolated)
+SIZE_ESTIMATE_DEPTH = 3
+SIZE_ESTIMATE_SAMPLE = 32
+
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    """
+    Approximate len(str(value)) without building the string.
+
+    Strings and bytes are measured exactly; dicts and lists are walked to
+    SIZE_ESTIMATE_DEPTH levels, measuring at most SIZE_ESTIMATE_SAMPLE items
+    each and scaling up for the rest. Other values count a fixed amount.
+
+    Args:
+        value: Value to measure
+        depth: Current nesting depth (internal)
+
+    Returns:
+        Estimated size in characters
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return 5
+    if not isinstance(value, (dict, list, tuple, set, frozenset)):
+        return 32
+    if not value:
+        return 2
+    if depth >= SIZE_ESTIMATE_DEPTH:
+        return 16 * len(value)
+
+    if isinstance(value, dict):
+        sample = list(islice(value.items(), SIZE_ESTIMATE_SAMPLE))
+        measured = sum(estimate_size(k, depth + 1) + estimate_size(v, depth + 1) + 4 for k, v in sample)
+    else:
+        sample = list(islice(value, SIZE_ESTIMATE_SAMPLE))
+        measured = sum(estimate_size(v, depth + 1) + 2 for v in sample)
+    return 2 + measured * len(value) // len(sample)
+
 
 class QueryState(Enum):
     """Consolidated query lifecycle states.
@@ -90,15 +137,22 @@ class QueryStateMachine:
         self._last_data_in = None
         self._last_data_out = None
 
-        # Log file path
+        # Log file path (appended to by a shared background writer)
         self.log_path = Path("/app/logs/traces/state_machine.jsonl")
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = get_event_writer(self.log_path)
 
     @staticmethod
     def _generate_id() -> str:
         """Generate unique query ID using UUID."""
         return f"q_{uuid.uuid4().hex[:12]}"
 
+    def _size(self, data: Any) -> int:
+        """Size of data as text: exact in verbose mode, estimated otherwise."""
+        if self._verbose_enabled:
+            return len(str(data))
+        return estimate_size(data)
+
     def _capture_snapshot(self, data: Any, label: str) -> Optional[Dict[str, Any]]:
         """Capture a detailed snapshot of data for verbose logging.
 
@@ -117,7 +171,7 @@ class QueryStateMachine:
 
         snapshot = {
             "type": type(data).__name__,
-            "size_bytes": len(str(data)),
+            "size_bytes": self._size(data),
         }
 
         # For verbose mode, capture EVERYTHING
@@ -290,9 +344,9 @@ class QueryStateMachine:
         if component:
             event_data['component'] = component
         if before is not None:
-            event_data['input_size'] = len(str(before))
+            event_data['input_size'] = self._size(before)
         if after is not None:
-            event_data['output_size'] = len(str(after))
+            event_data['output_size'] = self._size(after)
         if self.domain:
             event_data['domain'] = self.domain
 
@@ -341,8 +395,8 @@ class QueryStateMachine:
 
         event_data = {
             "enricher": enricher_name,
-            "input_size": len(str(before)),
-            "output_size": len(str(after)),
+            "input_size": self._size(before),
+            "output_size": self._size(after),
             "duration_ms": duration_ms,
             "changes": changes
         }
@@ -376,8 +430,8 @@ class QueryStateMachine:
             "format_type": format_type,
             "input_type": type(before).__name__,
             "output_type": type(after).__name__,
-            "input_size": len(str(before)),
-            "output_size": len(str(after)),
+            "input_size": self._size(before),
+            "output_size": self._size(after),
             "duration_ms": duration_ms,
             "changes": changes
         }
@@ -448,7 +502,7 @@ class QueryStateMachine:
         changes["added"] = {
             "formatted_content": {
                 "type": type(after).__name__,
-                "size": len(str(after)),
+                "size": self._size(after),
                 "format_type": format_type
             }
         }
@@ -544,7 +598,7 @@ class QueryStateMachine:
                 "keys_added": list(after_keys - before_keys),
                 "keys_removed": list(before_keys - after_keys),
                 "keys_modified": list(before_keys & after_keys),
-                "size_delta": len(str(after)) - len(str(before))
+                "size_delta": self._size(after) - self._size(before)
             }
 
         # For strings, show length difference
@@ -683,14 +737,16 @@ class QueryStateMachine:
         }
 
     def _write_event(self, event: Dict[str, Any]) -> None:
-        """Write event to log file.
+        """Queue event for the background log writer.
+
+        The event is serialized here, so later changes to its data are not
+        logged; the file write happens on the writer thread.
 
         Args:
             event: The event dictionary to write
         """
         try:
-            with open(self.log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event) + '\n')
+            self._writer.write(json.dumps(event))
         except Exception as e:
             # Log but don't fail the query
             print(f"[StateMachine] Failed to write event: {e}")
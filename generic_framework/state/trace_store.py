@@ -0,0 +1,512 @@
+#
+# Copyright 2025 ExFrame Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Trace Store - indexed lookups over the append-only trace logs.
+
+state_machine.jsonl (one JSON event per line) and queries.log
+("<asctime> - <json>" per line) grow without bound, and every trace lookup
+used to read and parse the whole file.
+
+A TraceStore keeps a SQLite sidecar ({log}.index.db) with the segment,
+byte offset and length of every line, keyed by query_id, domain, state
+and timestamp. Writers keep appending to the log as before. Before each
+lookup the store indexes only the bytes appended since the previous one,
+answers from the B-tree indexes and seeks straight to the matching lines,
+so lookups cost O(log n) plus the new tail, not a scan of the log.
+
+Rotation and retention:
+    When the live log passes max_segment_bytes it is renamed to
+    {stem}.{seq:06d}{suffix} (e.g. state_machine.000001.jsonl); writers
+    create a new live file on their next append. Rotated segments beyond
+    max_segments, or older than max_age_days, are deleted together with
+    their index rows.
+
+    Rotation and pruning happen whenever the store syncs: on lookups and on
+    maintain(). The app runs maintain_periodically() as a background task
+    so logs that are never queried still rotate, and lookups only have a
+    short tail to index. Lookups and maintain() do blocking file and SQLite
+    work; async callers should run them with asyncio.to_thread.
+
+Defaults can be overridden with TRACE_MAX_SEGMENT_MB, TRACE_MAX_SEGMENTS,
+TRACE_MAX_AGE_DAYS and TRACE_MAINTENANCE_INTERVAL (seconds).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MAX_SEGMENT_BYTES = int(float(os.getenv("TRACE_MAX_SEGMENT_MB", "64")) * 1024 * 1024)
+DEFAULT_MAX_SEGMENTS = int(os.getenv("TRACE_MAX_SEGMENTS", "10"))
+DEFAULT_MAX_AGE_DAYS = float(os.getenv("TRACE_MAX_AGE_DAYS", "0")) or None
+DEFAULT_MAINTENANCE_INTERVAL = float(os.getenv("TRACE_MAINTENANCE_INTERVAL", "60"))
+
+logger = logging.getLogger("trace_store")
+
+
+class TraceStore:
+    """
+    Offset index over a JSONL trace log (state_machine.jsonl format).
+
+    Subclasses adapt other line formats by overriding decode() and keys().
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS segments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        path TEXT NOT NULL,
+        live INTEGER NOT NULL DEFAULT 1,
+        inode INTEGER,
+        indexed_bytes INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        segment INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        query_id TEXT,
+        alt_key TEXT,
+        domain TEXT,
+        state TEXT,
+        timestamp TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_entries_query ON entries(query_id);
+    CREATE INDEX IF NOT EXISTS idx_entries_alt_key ON entries(alt_key);
+    CREATE INDEX IF NOT EXISTS idx_entries_domain ON entries(domain, id);
+    CREATE INDEX IF NOT EXISTS idx_entries_state ON entries(state, id);
+    CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_entries_segment ON entries(segment);
+    """
+
+    # Lines indexed per executemany batch while catching up
+    INDEX_BATCH_LINES = 5000
+
+    def __init__(
+        self,
+        log_path: Path,
+        index_path: Optional[Path] = None,
+        max_segment_bytes: Optional[int] = DEFAULT_MAX_SEGMENT_BYTES,
+        max_segments: Optional[int] = DEFAULT_MAX_SEGMENTS,
+        max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            log_path: Live log file the writers append to
+            index_path: Sidecar index database (default: {log}.index.db)
+            max_segment_bytes: Rotate the live log past this size (None = never)
+            max_segments: Rotated segments to keep (None = unlimited)
+            max_age_days: Delete rotated segments older than this (None = keep)
+        """
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path) if index_path else self.log_path.with_name(self.log_path.name + ".index.db")
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self.max_age_days = max_age_days
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ========== Line format ==========
+
+    def decode(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one log line into a record (None for unparseable lines)."""
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    def keys(self, record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Indexed columns for a record."""
+        data = record.get('data') or {}
+        return {
+            'query_id': record.get('query_id'),
+            'alt_key': None,
+            'domain': data.get('domain') if isinstance(data, dict) else None,
+            'state': record.get('to_state'),
+            'timestamp': record.get('timestamp')
+        }
+
+    # ========== Lookups ==========
+
+    def events_for_query(self, query_id: str) -> List[Dict[str, Any]]:
+        """All records for a query_id, oldest first."""
+        return self._select("WHERE query_id = ? ORDER BY id", (query_id,))
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Most recent record whose query_id or alternate key equals key."""
+        records = self._select(
+            "WHERE id = (SELECT MAX(id) FROM entries WHERE query_id = ? OR alt_key = ?)",
+            (key, key)
+        )
+        return records[0] if records else None
+
+    def recent(
+        self,
+        limit: int = 50,
+        domain: Optional[str] = None,
+        state: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Most recent records, newest first.
+
+        Args:
+            limit: Maximum records to return
+            domain: Only records for this domain
+            state: Only records with this state
+
+        Returns:
+            List of records
+        """
+        clauses = []
+        params: List[Any] = []
+        if domain:
+            clauses.append("domain = ?")
+            params.append(domain)
+        if state:
+            clauses.append("state = ?")
+            params.append(state)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._select(f"{where}ORDER BY id DESC LIMIT ?", (*params, limit), newest_first=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed entries and segments."""
+        with self._lock:
+            conn = self._sync()
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            segments = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(indexed_bytes), 0) FROM segments"
+            ).fetchone()
+        return {
+            'log_path': str(self.log_path),
+            'entries': entries,
+            'segments': segments[0],
+            'indexed_bytes': segments[1],
+            'max_segment_bytes': self.max_segment_bytes,
+            'max_segments': self.max_segments,
+            'max_age_days': self.max_age_days
+        }
+
+    def maintain(self) -> None:
+        """Index new lines, rotate the live log if it is too large and prune old segments."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _select(self, where: str, params: tuple, newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Records for index rows matching where, read back from their segments."""
+        with self._lock:
+            conn = self._sync()
+            rows = conn.execute(
+                f"""SELECT e.segment, s.path, e.offset, e.length FROM entries e
+                    JOIN segments s ON s.id = e.segment
+                    WHERE e.id IN (SELECT id FROM entries {where})
+                    ORDER BY e.id""",
+                params
+            ).fetchall()
+
+        records_by_row: Dict[int, Dict[str, Any]] = {}
+        handles: Dict[int, Any] = {}
+        try:
+            for row, (segment, path, offset, length) in enumerate(rows):
+                handle = handles.get(segment)
+                if handle is None:
+                    try:
+                        handle = handles[segment] = open(path, 'rb')
+                    except OSError:
+                        continue
+                handle.seek(offset)
+                record = self.decode(handle.read(length).decode('utf-8', errors='replace'))
+                if record is not None:
+                    records_by_row[row] = record
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        records = [records_by_row[i] for i in sorted(records_by_row)]
+        if newest_first:
+            records.reverse()
+        return records
+
+    # ========== Indexing ==========
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _sync(self) -> sqlite3.Connection:
+        """Index lines appended since the last call, rotating and pruning as configured."""
+        conn = self._connect()
+        # IMMEDIATE serializes indexing across processes sharing the sidecar
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            segment = self._live_segment(conn)
+            if segment is not None:
+                segment_id, indexed = segment
+                indexed = self._index_tail(conn, segment_id, self.log_path, indexed)
+                if self.max_segment_bytes and indexed >= self.max_segment_bytes:
+                    self._rotate(conn, segment_id)
+            self._prune(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return conn
+
+    def _live_segment(self, conn: sqlite3.Connection) -> Optional[tuple]:
+        """(segment id, indexed bytes) for the live log, starting a new segment if it was replaced."""
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        row = conn.execute(
+            "SELECT id, inode, indexed_bytes FROM segments WHERE live = 1 ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+
+        if row is not None:
+            segment_id, inode, indexed = row
+            if stat is not None and stat.st_ino == inode and stat.st_size >= indexed:
+                return segment_id, indexed
+            # Live file deleted, truncated or replaced outside the store: its lines are gone
+            self._drop_segment(conn, segment_id)
+
+        if stat is None:
+            return None
+        cursor = conn.execute(
+            "INSERT INTO segments (path, live, inode, indexed_bytes) VALUES (?, 1, ?, 0)",
+            (str(self.log_path), stat.st_ino)
+        )
+        return cursor.lastrowid, 0
+
+    def _index_tail(self, conn: sqlite3.Connection, segment_id: int, path: Path, start: int) -> int:
+        """Index complete lines of path from byte start; returns the new indexed size."""
+        try:
+            handle = open(path, 'rb')
+        except OSError:
+            return start
+
+        offset = start
+        batch = []
+        with handle:
+            handle.seek(start)
+            for raw in handle:
+                if not raw.endswith(b'\n'):
+                    break  # Partial line still being written
+                record = self.decode(raw.decode('utf-8', errors='replace'))
+                if record is not None:
+                    keys = self.keys(record)
+                    batch.append((segment_id, offset, len(raw), keys['query_id'], keys['alt_key'],
+                                  keys['domain'], keys['state'], keys['timestamp']))
+                    if len(batch) >= self.INDEX_BATCH_LINES:
+                        self._insert(conn, batch)
+                        batch = []
+                offset += len(raw)
+
+        self._insert(conn, batch)
+        conn.execute("UPDATE segments SET indexed_bytes = ? WHERE id = ?", (offset, segment_id))
+        return offset
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        if batch:
+            conn.executemany(
+                """INSERT INTO entries (segment, offset, length, query_id, alt_key, domain, state, timestamp)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                batch
+            )
+
+    def _rotate(self, conn: sqlite3.Connection, segment_id: int) -> None:
+        """Rename the live log to a numbered segment; writers recreate the live file."""
+        rotated = self.log_path.with_name(f"{self.log_path.stem}.{segment_id:06d}{self.log_path.suffix}")
+        try:
+            os.replace(self.log_path, rotated)
+        except OSError:
+            return
+        conn.execute("UPDATE segments SET path = ?, live = 0 WHERE id = ?", (str(rotated), segment_id))
+
+        # Lines appended between the last index pass and the rename
+        indexed = conn.execute("SELECT indexed_bytes FROM segments WHERE id = ?", (segment_id,)).fetchone()[0]
+        self._index_tail(conn, segment_id, rotated, indexed)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Delete rotated segments past max_segments or max_age_days."""
+        rotated = conn.execute("SELECT id, path FROM segments WHERE live = 0 ORDER BY id DESC").fetchall()
+        expired = []
+        if self.max_segments is not None:
+            expired.extend(rotated[self.max_segments:])
+            rotated = rotated[:self.max_segments]
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            for segment_id, path in rotated:
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        expired.append((segment_id, path))
+                except OSError:
+                    expired.append((segment_id, path))
+
+        for segment_id, path in expired:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._drop_segment(conn, segment_id)
+
+    @staticmethod
+    def _drop_segment(conn: sqlite3.Connection, segment_id: int) -> None:
+        conn.execute("DELETE FROM entries WHERE segment = ?", (segment_id,))
+        conn.execute("DELETE FROM segments WHERE id = ?", (segment_id,))
+
+
+class QueryLogStore(TraceStore):
+    """
+    Offset index over queries.log ("<asctime> - <json trace>" lines).
+
+    Traces are found by query_id (or start_time for older traces without
+    one) and by their query text.
+    """
+
+    def decode(self, line: str) -> Optional[Dict[str, Any]]:
+        parts = line.split(' - ', 1)
+        if len(parts) != 2:
+            return None
+        try:
+            return {'logged_at': parts[0], **json.loads(parts[1])}
+        except (json.JSONDecodeError, ValueError, TypeError):
+            return None
+
+    def keys(self, record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        query = record.get('query')
+        return {
+            'query_id': record.get('query_id') or record.get('start_time'),
+            'alt_key': query if isinstance(query, str) else None,
+            'domain': record.get('domain'),
+            'state': record.get('processing_method'),
+            'timestamp': record.get('start_time') or record.get('logged_at')
+        }
+
+
+def summarize_query_events(query_id: str, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the state trace summary returned by the trace APIs.
+
+    Args:
+        query_id: The query ID
+        events: The query's state machine events, oldest first (non-empty)
+
+    Returns:
+        Dictionary with 'query_id', 'summary' and 'events' keys
+    """
+    first_event = events[0]
+    last_event = events[-1]
+
+    # Calculate total duration
+    total_duration_ms = None
+    if len(events) >= 2:
+        first_time = datetime.fromisoformat(first_event['timestamp'].replace('Z', ''))
+        last_time = datetime.fromisoformat(last_event['timestamp'].replace('Z', ''))
+        total_duration_ms = int((last_time - first_time).total_seconds() * 1000)
+
+    # Extract components used
+    components_used = []
+    for event in events:
+        data = event.get('data', {})
+        for key in ('component', 'enricher', 'formatter'):
+            if key in data:
+                components_used.append(data[key])
+                break
+
+    # Count state transitions
+    state_counts: Dict[str, int] = {}
+    for event in events:
+        state_counts[event['to_state']] = state_counts.get(event['to_state'], 0) + 1
+
+    return {
+        "query_id": query_id,
+        "summary": {
+            "total_events": len(events),
+            "unique_states": list(state_counts),
+            "total_duration_ms": total_duration_ms,
+            "has_error": 'ERROR' in state_counts,
+            "components_used": components_used,
+            "domain": first_event.get('data', {}).get('domain'),
+            "first_state": first_event.get('to_state'),
+            "final_state": last_event.get('to_state'),
+            "state_counts": state_counts
+        },
+        "events": events
+    }
+
+
+# One store per log file
+_stores: Dict[Path, TraceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_trace_store(log_path: Path, store_class: type = TraceStore) -> TraceStore:
+    """Get the shared store for a log file, creating it on first use."""
+    log_path = Path(log_path)
+    with _stores_lock:
+        store = _stores.get(log_path)
+        if store is None:
+            store = _stores[log_path] = store_class(log_path)
+        return store
+
+
+async def maintain_periodically(
+    stores: List[TraceStore],
+    interval: float = DEFAULT_MAINTENANCE_INTERVAL
+) -> None:
+    """
+    Run maintain() on each store every interval seconds, off the event loop.
+
+    Meant to run as a background task for the life of the app (cancel it on
+    shutdown). Stores whose log directory does not exist are skipped.
+
+    Args:
+        stores: Trace stores to keep indexed, rotated and pruned
+        interval: Seconds between passes
+    """
+    while True:
+        for store in stores:
+            if not store.log_path.parent.exists():
+                continue
+            try:
+                await asyncio.to_thread(store.maintain)
+            except Exception as e:
+                logger.warning(f"Trace maintenance failed for {store.log_path}: {e}")
+        await asyncio.sleep(interval)
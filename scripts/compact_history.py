@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+History Compactor - compact the query history segment log of each domain
+
+Appends go to small per-entry gzip members; compaction rewrites them into
+larger blocks, applies the domain's query_history.max_entries limit and
+removes old segments. The log also compacts itself as segments accumulate,
+so this is only needed for on-demand maintenance. Domains that still have
+only a legacy query_history.json.gz are imported into the log.
+
+Usage:
+    python3 scripts/compact_history.py [domains_dir ...]
+
+Examples:
+    python3 scripts/compact_history.py
+    python3 scripts/compact_history.py universes/MINE/domains
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tao.storage import HistoryLog
+
+
+DEFAULT_DOMAIN_DIRS = ["universes/MINE/domains", "domains"]
+
+
+def compact_domain(domain_dir: Path) -> None:
+    """Compact the history log of one domain directory."""
+    log = HistoryLog(str(domain_dir))
+    if not log.exists():
+        return
+
+    max_entries = None
+    config_file = domain_dir / "domain.json"
+    if config_file.exists():
+        with open(config_file, 'r') as f:
+            max_entries = json.load(f).get("query_history", {}).get("max_entries")
+
+    count = log.compact(max_entries)
+    print(f"✅ {domain_dir.name}: {count} entries")
+
+
+def main():
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(__doc__)
+        return
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    roots = [Path(a) for a in args] or [Path(d) for d in DEFAULT_DOMAIN_DIRS if Path(d).exists()]
+    if not roots:
+        print("❌ No domains directory found")
+        sys.exit(1)
+
+    for root in roots:
+        for domain_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            try:
+                compact_domain(domain_dir)
+            except Exception as e:
+                print(f"❌ {domain_dir.name}: compaction failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,6 @@ Options:
     --json                Output as JSON
 """
 
-import gzip
 import json
 import sys
 from datetime import datetime, timedelta
@@ -33,16 +32,20 @@ from typing import List, Dict, Any, Optional, Set
 from collections import Counter
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tao.storage import HistoryLog
+
+
 def load_history(domain_name: str) -> List[Dict[str, Any]]:
     """Load query history for a domain."""
-    history_file = Path(f"universes/MINE/domains/{domain_name}/query_history.json.gz")
+    log = HistoryLog(f"universes/MINE/domains/{domain_name}")
 
-    if not history_file.exists():
+    if not log.exists():
         print(f"❌ No query history found for domain '{domain_name}'")
         sys.exit(1)
 
-    with gzip.open(history_file, 'rt', encoding='utf-8') as f:
-        return json.load(f)
+    return log.read_all()
 
 
 def parse_timestamp(iso_timestamp: str) -> datetime:
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Embedding Migrator - convert JSON embedding files to the binary format
+
+Converts every embeddings.json (pattern embeddings) and doc_embeddings.json
+(document embeddings) under the given domain directories into the
+memory-mapped float32 format used by VectorStore. Run once after upgrading;
+the JSON files are kept unless --remove-json is given.
+
+Domains that already have binary files are skipped: they may contain
+vectors written after the JSON was last updated. Use --force to rebuild
+them from the JSON anyway.
+
+Usage:
+    python3 scripts/migrate_embeddings.py [domains_dir ...] [options]
+
+Examples:
+    python3 scripts/migrate_embeddings.py
+    python3 scripts/migrate_embeddings.py universes/MINE/domains
+    python3 scripts/migrate_embeddings.py domains --remove-json
+
+Options:
+    --remove-json    Delete the JSON files after a successful migration
+    --force          Overwrite existing binary files with the JSON contents
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generic_framework.core.embeddings import migrate_json_embeddings
+from generic_framework.core.document_embeddings import migrate_document_embeddings
+
+
+DEFAULT_DOMAIN_DIRS = ["universes/MINE/domains", "domains"]
+
+
+def migrate_domain(domain_dir: Path, remove_json: bool, force: bool = False) -> None:
+    """Migrate pattern and document embeddings for one domain directory."""
+    pattern_json = domain_dir / "embeddings.json"
+    if pattern_json.exists():
+        count = migrate_json_embeddings(domain_dir, force=force)
+        if count is None:
+            print(f"⏭️  {domain_dir.name}: embeddings.f32 already exists, skipped (--force to overwrite)")
+        else:
+            print(f"✅ {domain_dir.name}: {count} pattern embeddings → embeddings.f32")
+        if remove_json:
+            pattern_json.unlink()
+
+    doc_json = domain_dir / "doc_embeddings.json"
+    if doc_json.exists():
+        count = migrate_document_embeddings(domain_dir.name, domain_dir, force=force)
+        if count is None:
+            print(f"⏭️  {domain_dir.name}: doc_vectors.f32 already exists, skipped (--force to overwrite)")
+        else:
+            print(f"✅ {domain_dir.name}: {count} document embeddings → doc_vectors.f32")
+        if remove_json:
+            doc_json.unlink()
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    remove_json = "--remove-json" in sys.argv
+    force = "--force" in sys.argv
+
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(__doc__)
+        return
+
+    roots = [Path(a) for a in args] or [Path(d) for d in DEFAULT_DOMAIN_DIRS if Path(d).exists()]
+    if not roots:
+        print("❌ No domains directory found")
+        sys.exit(1)
+
+    for root in roots:
+        for domain_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            try:
+                migrate_domain(domain_dir, remove_json, force)
+            except Exception as e:
+                print(f"❌ {domain_dir.name}: migration failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,17 @@ Usage:
     python scripts/synthesize_test_candidate.py --candidate-name "Test Engineer"
 """
 
-import json
-import gzip
+import sys
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any
 import argparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tao.storage import HistoryLog
+
 
 # Question templates by sophistication level for each domain
 CLOUD_QUESTIONS = {
@@ -222,17 +225,15 @@ def generate_query_history(
 
 
 def save_query_history(domain: str, history: List[Dict[str, Any]], base_path: Path):
-    """Save query history to compressed JSON file."""
+    """Save query history to the domain's history log."""
 
     domain_path = base_path / domain
     domain_path.mkdir(parents=True, exist_ok=True)
 
-    history_file = domain_path / "query_history.json.gz"
-
-    with gzip.open(history_file, "wt", encoding="utf-8") as f:
-        json.dump(history, f, indent=2)
+    log = HistoryLog(str(domain_path))
+    log.rewrite(history)
 
-    print(f"  ✓ Saved {len(history)} entries to {history_file}")
+    print(f"  ✓ Saved {len(history)} entries to {log.log_dir}")
 
 
 def synthesize_candidate(
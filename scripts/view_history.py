@@ -19,7 +19,6 @@ Options:
     --json                Output as JSON instead of formatted text
 """
 
-import gzip
 import json
 import os
 import sys
@@ -27,20 +26,22 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tao.storage import HistoryLog
+
 
 def load_history(domain_name: str) -> List[Dict[str, Any]]:
     """Load query history for a domain."""
-    history_file = Path(f"universes/MINE/domains/{domain_name}/query_history.json.gz")
+    log = HistoryLog(f"universes/MINE/domains/{domain_name}")
 
-    if not history_file.exists():
+    if not log.exists():
         print(f"❌ No query history found for domain '{domain_name}'")
-        print(f"   Expected: {history_file}")
+        print(f"   Expected: {log.log_dir}")
         sys.exit(1)
 
     try:
-        with gzip.open(history_file, 'rt', encoding='utf-8') as f:
-            history = json.load(f)
-        return history
+        return log.read_all()
     except Exception as e:
         print(f"❌ Error loading history: {e}")
         sys.exit(1)
@@ -64,7 +64,7 @@ python -m tao.cli.trace_chain peter --entry 5
 
 Tao is a standalone subsystem that:
 - Receives Q/R pairs from ExFrame via `save_query_response()`
-- Stores them in compressed format (`query_history.json.gz`)
+- Stores them in an append-only compressed segment log (`query_history/`)
 - Provides multiple analysis views (sessions, concepts, depth, etc.)
 - Exposes both programmatic and web interfaces
 
@@ -8,6 +8,7 @@ Provides analysis functions for query history:
 - concepts: Track concepts across query history
 - depth: Measure exploration depth for topics
 - sophistication: Question level classification and learning velocity
+- classification_queue: Background classification of newly stored questions
 """
 
 from . import sessions
@@ -16,5 +17,6 @@ from . import relations
 from . import concepts
 from . import depth
 from . import sophistication
+from . import classification_queue
 
-__all__ = ["sessions", "chains", "relations", "concepts", "depth", "sophistication"]
+__all__ = ["sessions", "chains", "relations", "concepts", "depth", "sophistication", "classification_queue"]
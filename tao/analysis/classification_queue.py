@@ -0,0 +1,152 @@
+"""
+Classification Queue - question classification off the request path.
+
+KnowledgeCartography.save_query_response stores the query/response pair
+immediately and submits the question here. A daemon worker thread with its
+own event loop drains up to BATCH_SIZE queued questions at a time,
+classifies them with one batched prompt per domain (async HTTP over one
+shared client, see QuestionClassifier.classify_many_async) and backfills
+the question_level* metadata into the history via HistoryLog.annotate_many(),
+so the user never waits on the classifier LLM.
+
+The queue is bounded; when it is full new questions are dropped (and
+counted) rather than slowing down the request that submitted them.
+"""
+
+import asyncio
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import httpx
+
+from .sophistication import QuestionClassifier, BATCH_SIZE
+
+logger = logging.getLogger("tao.analysis.classification_queue")
+
+MAX_PENDING = 1000
+
+
+class ClassificationQueue:
+    """Background worker that classifies questions and annotates history entries."""
+
+    def __init__(self, classifier: Optional[QuestionClassifier] = None, max_pending: int = MAX_PENDING):
+        """
+        Initialize the queue (the worker thread starts on first submit).
+
+        Args:
+            classifier: QuestionClassifier to use (default: env-configured)
+            max_pending: Maximum queued questions before new ones are dropped
+        """
+        self.classifier = classifier or QuestionClassifier()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+
+    def submit(self, log, entry_id: Any, question: str, domain: Optional[str] = None) -> bool:
+        """
+        Queue a question for classification.
+
+        Args:
+            log: HistoryLog holding the entry
+            entry_id: Id of the stored entry to annotate
+            question: Question text
+            domain: Optional domain name passed to the classifier
+
+        Returns:
+            True if queued, False if the queue was full
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((log, entry_id, question, domain))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Classification queue full, skipping entry #{entry_id}")
+            return False
+        self.submitted += 1
+        return True
+
+    def join(self) -> None:
+        """Block until every queued question has been processed."""
+        self._queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self._queue.qsize(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped
+        }
+
+    def _ensure_worker(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="question-classifier", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        client = httpx.AsyncClient(timeout=10.0)
+        try:
+            while True:
+                # Block for one job, then take whatever else is already queued
+                jobs = [self._queue.get()]
+                while len(jobs) < BATCH_SIZE:
+                    try:
+                        jobs.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    loop.run_until_complete(self._process(client, jobs))
+                except Exception as e:
+                    logger.warning(f"Background classification failed: {e}")
+                finally:
+                    for _ in jobs:
+                        self._queue.task_done()
+        finally:
+            loop.run_until_complete(client.aclose())
+            loop.close()
+
+    async def _process(self, client: httpx.AsyncClient, jobs: List[Tuple]) -> None:
+        """Classify a batch of (log, entry_id, question, domain) jobs, one prompt per domain."""
+        by_domain: Dict[Optional[str], List[Tuple]] = {}
+        for job in jobs:
+            by_domain.setdefault(job[3], []).append(job)
+
+        for domain, domain_jobs in by_domain.items():
+            results = await self.classifier.classify_many_async(
+                [question for _, _, question, _ in domain_jobs], domain=domain, client=client
+            )
+
+            # One annotations write per history log
+            patches: Dict[str, Tuple[Any, Dict[Any, Dict[str, Any]]]] = {}
+            for (log, entry_id, _, _), classification in zip(domain_jobs, results):
+                if classification.get("fallback"):
+                    continue  # Leave unlabelled so a later backfill retries it
+                patches.setdefault(log.log_dir, (log, {}))[1][entry_id] = {
+                    "question_level": classification["level"],
+                    "question_level_confidence": classification["confidence"],
+                    "question_level_reasoning": classification["reasoning"]
+                }
+            for log, log_patches in patches.values():
+                log.annotate_many(log_patches)
+
+            self.completed += len(domain_jobs)
+            logger.debug(f"Classified {len(domain_jobs)} queued question(s) for {domain}")
+
+
+# Singleton instance
+_queue_instance: Optional[ClassificationQueue] = None
+
+
+def get_classification_queue() -> ClassificationQueue:
+    """Get the process-wide classification queue."""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = ClassificationQueue()
+    return _queue_instance
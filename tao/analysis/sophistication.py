@@ -13,16 +13,59 @@ Used for:
 - Learning velocity calculation (L1→L4 over time)
 - Tao Index computation (sophistication component)
 - Hiring vetting (question depth metric)
+
+Bulk classification (classify_batch, classify_history) packs BATCH_SIZE
+questions into one prompt, runs up to MAX_CONCURRENCY prompts at once and
+caches labels by normalized question, so re-labelling hundreds of queries
+takes a handful of LLM round-trips.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 import os
 import requests
 import json
 
+import httpx
+
 logger = logging.getLogger("tao.analysis.sophistication")
 
+BATCH_SIZE = 20            # Questions per classification prompt
+MAX_CONCURRENCY = 4        # Classification prompts in flight at once
+BATCH_TIMEOUT = 60.0       # Seconds per batched classification request
+LABEL_CACHE_SIZE = 10000   # Cached labels (by normalized question + domain)
+
+_label_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_label_cache_lock = threading.Lock()
+
+
+def _label_key(question: str, domain: Optional[str]) -> str:
+    """Cache key: hash of the whitespace/case-normalized question and domain."""
+    normalized = " ".join(question.lower().split())
+    return hashlib.sha1(f"{domain or ''}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+def _cached_label(key: str) -> Optional[Dict[str, Any]]:
+    with _label_cache_lock:
+        label = _label_cache.get(key)
+        if label is not None:
+            _label_cache.move_to_end(key)
+            return dict(label)
+    return None
+
+
+def _cache_label(key: str, label: Dict[str, Any]) -> None:
+    with _label_cache_lock:
+        _label_cache[key] = dict(label)
+        _label_cache.move_to_end(key)
+        while len(_label_cache) > LABEL_CACHE_SIZE:
+            _label_cache.popitem(last=False)
+
 
 class QuestionClassifier:
     """Classifies question sophistication using LLM."""
@@ -126,13 +169,138 @@ class QuestionClassifier:
 
         except Exception as e:
             logger.error(f"Failed to classify question: {e}", exc_info=True)
-            # Fallback: return L2 (intermediate) as default
-            return {
-                "level": 2,
-                "confidence": 0.5,
-                "reasoning": f"Classification failed: {str(e)}",
-                "label": "Intermediate"
-            }
+            return self._fallback_result(e)
+
+    async def classify_question_async(
+        self,
+        question: str,
+        domain: Optional[str] = None,
+        context: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of classify_question (never blocks the event loop).
+
+        Args:
+            question: The question text to classify
+            domain: Optional domain name
+            context: Optional additional context
+            client: Optional shared httpx.AsyncClient (a temporary one is used otherwise)
+
+        Returns:
+            Same dict as classify_question
+        """
+        try:
+            prompt = self._build_classification_prompt(question, domain, context)
+            response = await self._call_llm_async(prompt, client)
+            result = self._parse_classification(response)
+            logger.debug(f"Classified question as L{result['level']}: {question[:50]}...")
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to classify question: {e}")
+            return self._fallback_result(e)
+
+    async def classify_many_async(
+        self,
+        questions: List[str],
+        domain: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        batch_size: int = BATCH_SIZE,
+        max_concurrency: int = MAX_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify many questions with batched prompts and bounded concurrency.
+
+        Repeated questions (after normalization) and questions classified
+        earlier in this process are served from the label cache.
+
+        Args:
+            questions: Question texts
+            domain: Optional domain name
+            client: Optional shared httpx.AsyncClient
+            batch_size: Questions per prompt
+            max_concurrency: Prompts in flight at once
+
+        Returns:
+            One classification dict per question, in order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+        pending: Dict[str, List[int]] = {}
+        for i, question in enumerate(questions):
+            key = _label_key(question, domain)
+            cached = _cached_label(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            keys = list(pending)
+            batches = [keys[i:i + batch_size] for i in range(0, len(keys), max(1, batch_size))]
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def run(batch: List[str], http: httpx.AsyncClient) -> None:
+                async with semaphore:
+                    labels = await self._classify_prompt_batch(
+                        [questions[pending[key][0]] for key in batch], domain, http
+                    )
+                for key, label in zip(batch, labels):
+                    if label is None:
+                        label = self._fallback_result(ValueError("no label returned"))
+                    elif not label.get("fallback"):
+                        _cache_label(key, label)
+                    for i in pending[key]:
+                        results[i] = dict(label)
+
+            if client is None:
+                async with httpx.AsyncClient(timeout=BATCH_TIMEOUT) as temp_client:
+                    await asyncio.gather(*(run(batch, temp_client) for batch in batches))
+            else:
+                await asyncio.gather(*(run(batch, client) for batch in batches))
+
+            logger.info(f"Classified {len(pending)} questions in {len(batches)} prompt(s) "
+                        f"({len(questions) - sum(len(v) for v in pending.values())} cached)")
+
+        return results
+
+    async def _classify_prompt_batch(
+        self,
+        questions: List[str],
+        domain: Optional[str],
+        client: httpx.AsyncClient
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Classify questions in one prompt; anything the model skipped is retried alone."""
+        labels: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+        if len(questions) > 1:
+            try:
+                prompt = self._build_batch_prompt(questions, domain)
+                response = await self._call_llm_async(
+                    prompt, client, max_tokens=80 * len(questions) + 100, timeout=BATCH_TIMEOUT
+                )
+                labels = self._parse_batch_classification(response, len(questions))
+            except Exception as e:
+                logger.warning(f"Batched classification failed, classifying individually: {e}")
+
+        for i, label in enumerate(labels):
+            if label is None:
+                try:
+                    prompt = self._build_classification_prompt(questions[i], domain, None)
+                    labels[i] = self._parse_classification(await self._call_llm_async(prompt, client))
+                except Exception as e:
+                    logger.warning(f"Failed to classify question: {e}")
+        return labels
+
+    @staticmethod
+    def _fallback_result(error: Exception) -> Dict[str, Any]:
+        """Fallback: return L2 (intermediate) as default, marked so it is never persisted."""
+        return {
+            "level": 2,
+            "confidence": 0.5,
+            "reasoning": f"Classification failed: {str(error)}",
+            "label": "Intermediate",
+            "fallback": True
+        }
 
     def _build_classification_prompt(
         self,
@@ -142,12 +310,7 @@ class QuestionClassifier:
     ) -> str:
         """Build prompt for LLM classification."""
 
-        levels_desc = "\n\n".join([
-            f"**Level {level}: {info['name']}**\n"
-            f"{info['description']}\n"
-            f"Examples:\n" + "\n".join([f"- {ex}" for ex in info['examples']])
-            for level, info in self.LEVELS.items()
-        ])
+        levels_desc = self._levels_description()
 
         prompt = f"""Classify the sophistication level of this question on a scale of 1-4.
 
@@ -180,31 +343,74 @@ Consider:
 
         return prompt
 
+    def _levels_description(self) -> str:
+        return "\n\n".join([
+            f"**Level {level}: {info['name']}**\n"
+            f"{info['description']}\n"
+            f"Examples:\n" + "\n".join([f"- {ex}" for ex in info['examples']])
+            for level, info in self.LEVELS.items()
+        ])
+
+    def _build_batch_prompt(self, questions: List[str], domain: Optional[str]) -> str:
+        """Build one prompt classifying several numbered questions."""
+        numbered = "\n".join(f'{i}. "{q}"' for i, q in enumerate(questions, 1))
+
+        prompt = f"""Classify the sophistication level of each question below on a scale of 1-4.
+
+{self._levels_description()}
+
+Questions to classify:
+{numbered}
+"""
+
+        if domain:
+            prompt += f"\nDomain: {domain}"
+
+        prompt += """
+
+Respond with a JSON array containing one object per question, in the same order:
+[
+  {"index": 1, "level": 1-4, "confidence": 0.0-1.0, "reasoning": "Brief explanation"},
+  ...
+]
+
+Judge each question on its own: complexity of concepts, depth of understanding
+required, "what" (basic) vs "how/why" (deeper) vs "design/optimize" (expert).
+"""
+
+        return prompt
+
+    def _build_request(self, prompt: str, max_tokens: int = 200) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """URL, headers and payload for a classification chat completion."""
+        url = f"{self.llm_config['base_url']}/chat/completions"
+
+        headers = {
+            "Authorization": f"Bearer {self.llm_config['api_key']}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": self.llm_config["model"],
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert at assessing question sophistication levels. Always respond with valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,  # Low temperature for consistent classification
+            "max_tokens": max_tokens
+        }
+
+        return url, headers, payload
+
     def _call_llm(self, prompt: str) -> str:
         """Call LLM API for classification."""
         try:
-            url = f"{self.llm_config['base_url']}/chat/completions"
-
-            headers = {
-                "Authorization": f"Bearer {self.llm_config['api_key']}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": self.llm_config["model"],
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert at assessing question sophistication levels. Always respond with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.3,  # Low temperature for consistent classification
-                "max_tokens": 200
-            }
+            url, headers, payload = self._build_request(prompt)
 
             response = requests.post(url, headers=headers, json=payload, timeout=10)
             response.raise_for_status()
@@ -216,40 +422,32 @@ Consider:
             logger.error(f"LLM API call failed: {e}")
             raise
 
-    def _parse_classification(self, llm_response: str) -> Dict[str, Any]:
-        """Parse LLM response into structured result."""
-        try:
-            # Try to extract JSON from response
-            # LLM might wrap in markdown code blocks
-            response_text = llm_response.strip()
-
-            if "```json" in response_text:
-                # Extract from markdown code block
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-            elif "```" in response_text:
-                # Generic code block
-                start = response_text.find("```") + 3
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-
-            # Parse JSON
-            data = json.loads(response_text)
+    async def _call_llm_async(
+        self,
+        prompt: str,
+        client: Optional[httpx.AsyncClient] = None,
+        max_tokens: int = 200,
+        timeout: float = 10.0
+    ) -> str:
+        """Call LLM API for classification without blocking."""
+        url, headers, payload = self._build_request(prompt, max_tokens)
 
-            level = int(data.get("level", 2))
-            confidence = float(data.get("confidence", 0.7))
-            reasoning = data.get("reasoning", "No reasoning provided")
+        if client is None:
+            async with httpx.AsyncClient(timeout=timeout) as temp_client:
+                response = await temp_client.post(url, headers=headers, json=payload)
+        else:
+            response = await client.post(url, headers=headers, json=payload, timeout=timeout)
+        response.raise_for_status()
 
-            # Clamp level to valid range
-            level = max(1, min(4, level))
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
 
-            return {
-                "level": level,
-                "confidence": confidence,
-                "reasoning": reasoning,
-                "label": self.LEVELS[level]["name"]
-            }
+    def _parse_classification(self, llm_response: str) -> Dict[str, Any]:
+        """Parse LLM response into structured result (guesses are marked as fallback)."""
+        try:
+            # Parse JSON
+            data = json.loads(self._extract_json(llm_response))
+            return self._result_from_data(data)
 
         except Exception as e:
             logger.warning(f"Failed to parse LLM response: {e}")
@@ -262,7 +460,8 @@ Consider:
                         "level": level,
                         "confidence": 0.6,
                         "reasoning": "Extracted from text response",
-                        "label": self.LEVELS[level]["name"]
+                        "label": self.LEVELS[level]["name"],
+                        "fallback": True
                     }
 
             # Ultimate fallback
@@ -270,34 +469,158 @@ Consider:
                 "level": 2,
                 "confidence": 0.5,
                 "reasoning": "Could not parse response",
-                "label": "Intermediate"
+                "label": "Intermediate",
+                "fallback": True
             }
 
+    def _parse_batch_classification(self, llm_response: str, count: int) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a batched response into one result per question.
+
+        Items are matched by their 1-based "index" (or by position when the
+        model omits it); questions without a usable item are left as None.
+        """
+        data = json.loads(self._extract_json(llm_response))
+        if isinstance(data, dict):
+            data = data.get("results") or data.get("classifications") or []
+
+        labels: List[Optional[Dict[str, Any]]] = [None] * count
+        for position, item in enumerate(data):
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.get("index", position + 1)) - 1
+                if 0 <= index < count:
+                    labels[index] = self._result_from_data(item)
+            except (TypeError, ValueError):
+                continue
+        return labels
+
+    @staticmethod
+    def _extract_json(llm_response: str) -> str:
+        """Strip markdown code fences the LLM might wrap JSON in."""
+        response_text = llm_response.strip()
+
+        if "```json" in response_text:
+            # Extract from markdown code block
+            start = response_text.find("```json") + 7
+            end = response_text.find("```", start)
+            response_text = response_text[start:end].strip()
+        elif "```" in response_text:
+            # Generic code block
+            start = response_text.find("```") + 3
+            end = response_text.find("```", start)
+            response_text = response_text[start:end].strip()
+
+        return response_text
+
+    def _result_from_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        level = int(data.get("level", 2))
+        confidence = float(data.get("confidence", 0.7))
+        reasoning = data.get("reasoning", "No reasoning provided")
+
+        # Clamp level to valid range
+        level = max(1, min(4, level))
+
+        return {
+            "level": level,
+            "confidence": confidence,
+            "reasoning": reasoning,
+            "label": self.LEVELS[level]["name"]
+        }
+
 
 def classify_batch(
     questions: List[str],
     domain: Optional[str] = None,
-    llm_config: Optional[Dict[str, str]] = None
+    llm_config: Optional[Dict[str, str]] = None,
+    batch_size: int = BATCH_SIZE,
+    max_concurrency: int = MAX_CONCURRENCY
 ) -> List[Dict[str, Any]]:
     """
     Classify multiple questions at once.
 
+    Questions are sent batch_size per prompt with up to max_concurrency
+    prompts in flight; cached labels are reused.
+
     Args:
         questions: List of question strings
         domain: Optional domain name
         llm_config: Optional LLM configuration
+        batch_size: Questions per prompt
+        max_concurrency: Prompts in flight at once
 
     Returns:
         List of classification results
     """
     classifier = QuestionClassifier(llm_config)
-    results = []
+    return _run_sync(classifier.classify_many_async(
+        questions, domain, batch_size=batch_size, max_concurrency=max_concurrency
+    ))
 
-    for question in questions:
-        result = classifier.classify_question(question, domain)
-        results.append(result)
 
-    return results
+def classify_history(
+    history: List[Dict],
+    domain: Optional[str] = None,
+    log=None,
+    llm_config: Optional[Dict[str, str]] = None
+) -> int:
+    """
+    Label history entries that have no question_level yet.
+
+    Entries are updated in place; when log (the domain's HistoryLog) is
+    given the labels are also persisted so they are classified only once.
+    Questions the LLM failed to classify are left unlabelled so a later
+    pass retries them.
+
+    Args:
+        history: Query history entries
+        domain: Optional domain name
+        log: Optional HistoryLog to write the labels back to
+        llm_config: Optional LLM configuration
+
+    Returns:
+        Number of entries labelled
+    """
+    missing = [e for e in history if "question_level" not in (e.get("metadata") or {})]
+    if not missing:
+        return 0
+
+    results = classify_batch([e.get("query", "") for e in missing], domain, llm_config)
+
+    patches = {}
+    labelled = 0
+    for entry, classification in zip(missing, results):
+        if classification.get("fallback"):
+            continue
+        labelled += 1
+        fields = {
+            "question_level": classification["level"],
+            "question_level_confidence": classification["confidence"],
+            "question_level_reasoning": classification["reasoning"]
+        }
+        entry["metadata"] = {**(entry.get("metadata") or {}), **fields}
+        if entry.get("id") is not None:
+            patches[entry["id"]] = fields
+
+    if log is not None and patches:
+        log.annotate_many(patches)
+
+    logger.info(f"Backfilled question levels for {labelled}/{len(missing)} entries"
+                + (f" in {domain}" if domain else ""))
+    return labelled
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion from sync code, even under a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Called from a sync helper inside an event loop thread: use a private loop
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
 
 
 def calculate_learning_velocity(
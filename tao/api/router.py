@@ -346,7 +346,7 @@ async def classify_question(
     """
     try:
         classifier = sophistication.QuestionClassifier()
-        result = classifier.classify_question(question, domain)
+        result = await classifier.classify_question_async(question, domain)
         return result
 
     except Exception as e:
@@ -4,6 +4,7 @@ Tao Storage Module
 Provides persistent storage for query/response history with compression.
 """
 
-from .storage import KnowledgeCartography, get_kcart, load_history
+from .storage import KnowledgeCartography, get_kcart, load_history, domain_history_log
+from .history_log import HistoryLog
 
-__all__ = ["KnowledgeCartography", "get_kcart", "load_history"]
+__all__ = ["KnowledgeCartography", "get_kcart", "load_history", "domain_history_log", "HistoryLog"]
@@ -0,0 +1,628 @@
+"""
+History Log - append-only segmented storage for query/response history.
+
+Layout inside a domain directory:
+
+    query_history/
+        index.json          Tail index: counts, segment list, offsets of the last N entries
+        000001.jsonl.gz     Segments: concatenated gzip members, each holding JSON lines
+        000002.jsonl.gz
+        ...
+        annotations.jsonl   Metadata backfilled after an entry was written
+
+Appending writes one small gzip member to the active segment and rewrites
+the (bounded) index, so it costs O(1) regardless of history size. The index
+keeps byte offsets of the most recent entries, so the last N entries are
+read by decompressing only the members that hold them.
+
+Compaction rewrites all entries into blocks of BLOCK_ENTRIES lines per
+member (better compression), applies max_entries trimming and drops the
+old segments. It runs automatically once enough segments accumulate and
+can be run on demand (see scripts/compact_history.py).
+
+Entries are immutable once written. Metadata computed later (e.g. question
+classification, which runs in the background after the response has been
+returned) is appended to annotations.jsonl as {"id", "metadata"} lines;
+readers merge it into the entry's metadata and compaction folds it into
+the segments. The merged patches are cached per process and only lines
+appended since the last read are parsed, so reads stay O(1) in the size
+of the annotations file.
+
+A legacy query_history.json.gz (one JSON array) is read (with annotations
+applied) until the first append, which imports it into the segment log. The legacy file is
+left in place but no longer read once the log exists.
+"""
+
+import gzip
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger("tao.storage")
+
+LEGACY_FILENAME = "query_history.json.gz"
+LOG_DIRNAME = "query_history"
+INDEX_FILENAME = "index.json"
+ANNOTATIONS_FILENAME = "annotations.jsonl"
+INDEX_VERSION = 1
+
+SEGMENT_ENTRIES = 500         # Roll to a new segment after this many entries
+TAIL_SIZE = 64                # Entry offsets kept in the index for tail reads
+BLOCK_ENTRIES = 64            # Entries per gzip member when compacting
+COMPACT_AFTER_SEGMENTS = 8    # Auto-compact once this many segments were appended
+
+ANNOTATION_HEAD_BYTES = 64    # Leading bytes compared to detect a replaced annotations file
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+# Parsed annotations per file: {"lock", "inode", "offset", "head", "patches"}
+_annotation_caches: Dict[str, Dict[str, Any]] = {}
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    """Per-directory lock shared by all HistoryLog instances in this process."""
+    with _thread_locks_guard:
+        lock = _thread_locks.get(path)
+        if lock is None:
+            lock = _thread_locks[path] = threading.Lock()
+        return lock
+
+
+def _gzip_member(entries: List[Dict[str, Any]]) -> bytes:
+    """Encode entries as JSON lines inside a single gzip member."""
+    payload = b"".join(
+        json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+        for entry in entries
+    )
+    return gzip.compress(payload, mtime=0)
+
+
+def _parse_lines(payload: bytes) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in payload.splitlines() if line.strip()]
+
+
+def _iter_members(f, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Yield (offset, length, payload) for each complete gzip member in a file.
+
+    Stops silently at a truncated or corrupt trailing member (e.g. a write
+    interrupted by a crash); callers use the last yielded offset + length
+    as the end of valid data.
+    """
+    f.seek(start)
+    pos = start
+    remaining = None if end is None else end - start
+    buf = b""
+
+    while True:
+        d = zlib.decompressobj(31)
+        out = []
+        consumed = 0
+        try:
+            while not d.eof:
+                if not buf:
+                    size = 65536 if remaining is None else min(65536, remaining)
+                    buf = f.read(size) if size > 0 else b""
+                    if not buf:
+                        return
+                    if remaining is not None:
+                        remaining -= len(buf)
+                out.append(d.decompress(buf))
+                if d.eof:
+                    consumed += len(buf) - len(d.unused_data)
+                    buf = d.unused_data
+                else:
+                    consumed += len(buf)
+                    buf = b""
+        except zlib.error:
+            return
+        yield pos, consumed, b"".join(out)
+        pos += consumed
+
+
+class HistoryLog:
+    """Append-only segmented query history for one domain directory."""
+
+    def __init__(
+        self,
+        domain_path: str,
+        segment_entries: int = SEGMENT_ENTRIES,
+        tail_size: int = TAIL_SIZE,
+        max_entries: Optional[int] = None,
+        compact_after_segments: int = COMPACT_AFTER_SEGMENTS
+    ):
+        """
+        Initialize the history log (no I/O happens until first use).
+
+        Args:
+            domain_path: Path to domain directory
+            segment_entries: Entries per segment before rolling to a new one
+            tail_size: Number of recent entry offsets kept in the index
+            max_entries: Optional cap applied at compaction (and by callers on read)
+            compact_after_segments: Appended segments that trigger auto-compaction
+        """
+        self.domain_path = str(domain_path)
+        self.legacy_file = os.path.join(self.domain_path, LEGACY_FILENAME)
+        self.log_dir = os.path.join(self.domain_path, LOG_DIRNAME)
+        self.index_file = os.path.join(self.log_dir, INDEX_FILENAME)
+        self.annotations_file = os.path.join(self.log_dir, ANNOTATIONS_FILENAME)
+        self.segment_entries = max(1, segment_entries)
+        self.tail_size = max(1, tail_size)
+        self.max_entries = max_entries
+        self.compact_after_segments = compact_after_segments
+
+    # ==================== Reading ====================
+
+    def exists(self) -> bool:
+        """True if any history (log or legacy file) exists."""
+        return os.path.isdir(self.log_dir) or os.path.exists(self.legacy_file)
+
+    def __len__(self) -> int:
+        index = self._snapshot()
+        if index is not None:
+            return index["count"]
+        return len(self._read_legacy())
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """Read every stored entry, oldest first."""
+        for attempt in range(2):
+            index = self._snapshot()
+            if index is None:
+                return self._apply_annotations(self._read_legacy())
+            try:
+                entries = []
+                for seg in index["segments"]:
+                    entries.extend(self._read_segment(seg))
+                return self._apply_annotations(entries)
+            except FileNotFoundError:
+                # A concurrent compaction replaced the segments; retry on the new index
+                if attempt:
+                    raise
+        return []
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Read the last n entries, oldest first.
+
+        Served from the index tail offsets when n <= tail_size, so only the
+        members holding those entries are decompressed.
+        """
+        if n <= 0:
+            return []
+
+        for attempt in range(2):
+            index = self._snapshot()
+            if index is None:
+                return self._apply_annotations(self._read_legacy()[-n:])
+            try:
+                if n <= len(index["tail"]) or len(index["tail"]) == index["count"]:
+                    return self._apply_annotations(self._read_refs(index["tail"][-n:]))
+                return self._apply_annotations(self._read_tail_segments(index, n))
+            except FileNotFoundError:
+                if attempt:
+                    raise
+        return []
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, first/last timestamp and confidence totals from the index."""
+        index = self._snapshot()
+        if index is None:
+            index = self._new_index()
+            for entry in self._read_legacy():
+                self._update_stats(index, entry)
+                index["count"] += 1
+        return dict(index["stats"], count=index["count"])
+
+    def _snapshot(self) -> Optional[Dict[str, Any]]:
+        """Current index for readers; rebuilt in memory if the file is missing."""
+        index = self._read_index()
+        if index is None and self._segment_files():
+            index = self._scan_index()
+        return index
+
+    def _read_legacy(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.legacy_file):
+            return []
+        try:
+            with gzip.open(self.legacy_file, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load history from {self.legacy_file}: {e}")
+            return []
+
+    def _read_annotations(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        Metadata patches by entry id (later lines win).
+
+        The result is shared with other readers and must not be modified.
+        Only lines appended since the previous call are parsed; the cache
+        starts over when the file was replaced (compaction) or truncated.
+        """
+        path = os.path.abspath(self.annotations_file)
+        with _thread_locks_guard:
+            cache = _annotation_caches.get(path)
+            if cache is None:
+                cache = _annotation_caches[path] = {
+                    "lock": threading.Lock(), "inode": None, "offset": 0, "head": b"", "patches": {}
+                }
+
+        with cache["lock"]:
+            try:
+                with open(path, 'rb') as f:
+                    stat = os.fstat(f.fileno())
+                    head = f.read(ANNOTATION_HEAD_BYTES)
+                    if (stat.st_ino != cache["inode"] or stat.st_size < cache["offset"]
+                            or not head.startswith(cache["head"])):
+                        cache.update(inode=stat.st_ino, offset=0, head=b"", patches={})
+                    if stat.st_size > cache["offset"]:
+                        f.seek(cache["offset"])
+                        data = f.read(stat.st_size - cache["offset"])
+                        complete = data.rfind(b"\n") + 1  # A partial last line is read next time
+                        self._parse_annotations(data[:complete], cache["patches"])
+                        cache["offset"] += complete
+                        cache["head"] = head[:min(len(head), cache["offset"])]
+            except FileNotFoundError:
+                cache.update(inode=None, offset=0, head=b"", patches={})
+            return cache["patches"]
+
+    @staticmethod
+    def _parse_annotations(data: bytes, patches: Dict[Any, Dict[str, Any]]) -> None:
+        """Merge complete annotation lines into patches, copying each touched patch."""
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted write
+            patch = dict(patches.get(record["id"]) or {})
+            patch.update(record["metadata"])
+            patches[record["id"]] = patch
+
+    def _apply_annotations(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        patches = self._read_annotations()
+        if patches:
+            for entry in entries:
+                patch = patches.get(entry.get("id"))
+                if patch:
+                    entry["metadata"] = {**(entry.get("metadata") or {}), **patch}
+        return entries
+
+    def _read_segment(self, seg: Dict[str, Any]) -> List[Dict[str, Any]]:
+        entries = []
+        with open(os.path.join(self.log_dir, seg["name"]), 'rb') as f:
+            for _, _, payload in _iter_members(f, 0, seg["bytes"]):
+                entries.extend(_parse_lines(payload))
+        return entries
+
+    def _read_refs(self, refs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Read entries by (segment, offset, length, line), decompressing each member once."""
+        members: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+        entries = []
+        for ref in refs:
+            key = (ref["segment"], ref["offset"])
+            if key not in members:
+                with open(os.path.join(self.log_dir, ref["segment"]), 'rb') as f:
+                    f.seek(ref["offset"])
+                    members[key] = _parse_lines(gzip.decompress(f.read(ref["length"])))
+            entries.append(members[key][ref["line"]])
+        return entries
+
+    def _read_tail_segments(self, index: Dict[str, Any], n: int) -> List[Dict[str, Any]]:
+        """Read whole segments backwards until n entries are collected."""
+        chunks = []
+        collected = 0
+        for seg in reversed(index["segments"]):
+            entries = self._read_segment(seg)
+            chunks.append(entries)
+            collected += len(entries)
+            if collected >= n:
+                break
+        result = [entry for chunk in reversed(chunks) for entry in chunk]
+        return result[-n:]
+
+    # ==================== Writing ====================
+
+    def append(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append one entry. If entry["id"] is missing or None it is assigned
+        the next sequential id.
+
+        Returns:
+            The stored entry
+        """
+        with self._locked():
+            index = self._load_for_write()
+
+            if entry.get("id") is None:
+                entry["id"] = index["last_id"] + 1
+
+            seg = index["segments"][-1] if index["segments"] else None
+            if seg is None or seg["count"] >= self.segment_entries:
+                seg = self._new_segment(index)
+
+            member = _gzip_member([entry])
+            offset = seg["bytes"]
+            with open(os.path.join(self.log_dir, seg["name"]), 'ab') as f:
+                f.write(member)
+            self._record(index, seg, offset, len(member), [entry])
+
+            if self._should_compact(index):
+                self._compact_locked(index)
+            else:
+                self._write_index(index)
+
+        return entry
+
+    def annotate(self, entry_id: Any, metadata: Dict[str, Any]) -> None:
+        """
+        Merge metadata into an already written entry.
+
+        The patch is appended to the annotations file (O(1)); readers see it
+        immediately and the next compaction folds it into the segments.
+        """
+        self.annotate_many({entry_id: metadata})
+
+    def annotate_many(self, patches: Dict[Any, Dict[str, Any]]) -> None:
+        """Merge metadata into several entries ({entry_id: metadata}) in one write."""
+        if not patches:
+            return
+        lines = "".join(
+            json.dumps({"id": entry_id, "metadata": metadata}, ensure_ascii=False) + "\n"
+            for entry_id, metadata in patches.items()
+        )
+        with self._locked():
+            with open(self.annotations_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    def rewrite(self, entries: List[Dict[str, Any]]) -> None:
+        """Replace the whole history with entries (compacted layout)."""
+        with self._locked():
+            index = self._load_for_write()
+            self._replace(index, self._apply_annotations(entries))
+
+    def compact(self, max_entries: Optional[int] = None) -> int:
+        """
+        Rewrite all segments into compact blocks and drop trimmed entries.
+
+        Args:
+            max_entries: Keep only the most recent entries (default: self.max_entries)
+
+        Returns:
+            Number of entries kept
+        """
+        with self._locked():
+            index = self._load_for_write()
+            return self._compact_locked(index, max_entries)
+
+    def _compact_locked(self, index: Dict[str, Any], max_entries: Optional[int] = None) -> int:
+        max_entries = max_entries or self.max_entries
+        entries = []
+        for seg in index["segments"]:
+            entries.extend(self._read_segment(seg))
+        entries = self._apply_annotations(entries)
+        if max_entries and len(entries) > max_entries:
+            logger.info(f"Trimmed history to {max_entries} entries")
+            entries = entries[-max_entries:]
+        self._replace(index, entries)
+        logger.info(f"Compacted history in {self.log_dir} ({len(entries)} entries)")
+        return len(entries)
+
+    def _replace(self, old_index: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        """
+        Write entries into fresh segments, swap the index, delete old segments.
+
+        Callers pass entries with annotations already merged, so the
+        annotations file is dropped along with the old segments.
+        """
+        index = self._new_index()
+        index["next_segment"] = old_index.get("next_segment", 1)
+        self._write_blocks(index, entries)
+        index["compacted_segments"] = len(index["segments"])
+        self._write_index(index)
+
+        keep = {seg["name"] for seg in index["segments"]}
+        stale = [name for name in self._segment_files() if name not in keep]
+        if os.path.exists(self.annotations_file):
+            stale.append(ANNOTATIONS_FILENAME)
+        for name in stale:
+            try:
+                os.remove(os.path.join(self.log_dir, name))
+            except OSError as e:
+                logger.warning(f"Failed to remove old segment {name}: {e}")
+
+    def _write_blocks(self, index: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        for seg_start in range(0, len(entries), self.segment_entries):
+            seg = self._new_segment(index)
+            seg_entries = entries[seg_start:seg_start + self.segment_entries]
+            with open(os.path.join(self.log_dir, seg["name"]), 'wb') as f:
+                for block_start in range(0, len(seg_entries), BLOCK_ENTRIES):
+                    block = seg_entries[block_start:block_start + BLOCK_ENTRIES]
+                    member = _gzip_member(block)
+                    offset = seg["bytes"]
+                    f.write(member)
+                    self._record(index, seg, offset, len(member), block)
+
+    def _should_compact(self, index: Dict[str, Any]) -> bool:
+        appended = len(index["segments"]) - index.get("compacted_segments", 0)
+        if self.compact_after_segments and appended > self.compact_after_segments:
+            return True
+        if self.max_entries and index["count"] - self.max_entries >= self.segment_entries:
+            return True
+        return False
+
+    def _load_for_write(self) -> Dict[str, Any]:
+        """
+        Load the index for an update, repairing it if needed: rebuild from the
+        segments if it is missing, adopt members appended after the last index
+        write, and import a legacy history file on first use.
+        """
+        os.makedirs(self.log_dir, exist_ok=True)
+        index = self._read_index()
+
+        if index is None:
+            if self._segment_files():
+                index = self._scan_index(repair=True)
+                logger.warning(f"Rebuilt history index for {self.log_dir}")
+                self._write_index(index)
+            else:
+                index = self._new_index()
+                legacy = self._read_legacy()
+                if legacy:
+                    self._write_blocks(index, legacy)
+                    index["compacted_segments"] = len(index["segments"])
+                    logger.info(f"Imported {len(legacy)} entries from {self.legacy_file}")
+                self._write_index(index)
+            return index
+
+        if self._segment_files() != [seg["name"] for seg in index["segments"]]:
+            # Segment created (or removed) without a matching index update
+            index = self._scan_index(repair=True)
+            self._write_index(index)
+        elif index["segments"]:
+            seg = index["segments"][-1]
+            path = os.path.join(self.log_dir, seg["name"])
+            size = os.path.getsize(path)
+            if size < seg["bytes"]:
+                index = self._scan_index(repair=True)
+                self._write_index(index)
+            elif size > seg["bytes"]:
+                self._adopt_trailing(index, seg, path)
+                self._write_index(index)
+
+        return index
+
+    def _adopt_trailing(self, index: Dict[str, Any], seg: Dict[str, Any], path: str) -> None:
+        """Index complete members written after the last index update; drop partial ones."""
+        with open(path, 'rb') as f:
+            for offset, length, payload in _iter_members(f, seg["bytes"]):
+                self._record(index, seg, offset, length, _parse_lines(payload))
+        os.truncate(path, seg["bytes"])
+
+    def _scan_index(self, repair: bool = False) -> Dict[str, Any]:
+        """Build an index by scanning every segment file."""
+        index = self._new_index()
+        names = self._segment_files()
+        for name in names:
+            seg = {"name": name, "first_id": None, "count": 0, "bytes": 0}
+            index["segments"].append(seg)
+            path = os.path.join(self.log_dir, name)
+            with open(path, 'rb') as f:
+                for offset, length, payload in _iter_members(f):
+                    self._record(index, seg, offset, length, _parse_lines(payload))
+            if repair and os.path.getsize(path) > seg["bytes"]:
+                os.truncate(path, seg["bytes"])
+        if names:
+            index["next_segment"] = int(names[-1].split(".")[0]) + 1
+        return index
+
+    def _record(
+        self,
+        index: Dict[str, Any],
+        seg: Dict[str, Any],
+        offset: int,
+        length: int,
+        entries: List[Dict[str, Any]]
+    ) -> None:
+        """Account for a member of entries written at offset in seg."""
+        for line, entry in enumerate(entries):
+            entry_id = entry.get("id")
+            if isinstance(entry_id, int):
+                index["last_id"] = max(index["last_id"], entry_id)
+            if seg["first_id"] is None:
+                seg["first_id"] = entry_id
+            seg["count"] += 1
+            index["count"] += 1
+            index["tail"].append({
+                "id": entry_id,
+                "segment": seg["name"],
+                "offset": offset,
+                "length": length,
+                "line": line
+            })
+            self._update_stats(index, entry)
+        seg["bytes"] = offset + length
+        del index["tail"][:-self.tail_size]
+
+    @staticmethod
+    def _update_stats(index: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        stats = index["stats"]
+        timestamp = entry.get("timestamp")
+        if stats["first_timestamp"] is None:
+            stats["first_timestamp"] = timestamp
+        stats["last_timestamp"] = timestamp
+        if "metadata" in entry:
+            stats["confidence_sum"] += float((entry["metadata"] or {}).get("confidence") or 0.0)
+            stats["confidence_count"] += 1
+
+    def _new_segment(self, index: Dict[str, Any]) -> Dict[str, Any]:
+        number = index.get("next_segment", 1)
+        index["next_segment"] = number + 1
+        seg = {"name": f"{number:06d}.jsonl.gz", "first_id": None, "count": 0, "bytes": 0}
+        index["segments"].append(seg)
+        return seg
+
+    @staticmethod
+    def _new_index() -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "count": 0,
+            "last_id": 0,
+            "next_segment": 1,
+            "compacted_segments": 0,
+            "segments": [],
+            "tail": [],
+            "stats": {
+                "first_timestamp": None,
+                "last_timestamp": None,
+                "confidence_sum": 0.0,
+                "confidence_count": 0
+            }
+        }
+
+    def _segment_files(self) -> List[str]:
+        if not os.path.isdir(self.log_dir):
+            return []
+        return sorted(n for n in os.listdir(self.log_dir) if n.endswith(".jsonl.gz"))
+
+    def _read_index(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable history index {self.index_file}: {e}")
+            return None
+        if index.get("version") != INDEX_VERSION:
+            return None
+        return index
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        tmp = self.index_file + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, self.index_file)
+
+    @contextmanager
+    def _locked(self):
+        """Serialize writers across threads and (where supported) processes."""
+        os.makedirs(self.log_dir, exist_ok=True)
+        with _thread_lock(os.path.abspath(self.log_dir)):
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.log_dir, ".lock"), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -4,17 +4,22 @@ Knowledge Cartography (Tao) - Dialectical Knowledge Mapping
 Stores and analyzes all query/response pairs to build a personal knowledge map.
 Implements compressed storage, context loading, and basic analytics.
 
+History is kept in an append-only segment log (see tao/storage/history_log.py):
+saving a pair costs O(1) and recent context is read from the log tail.
+Question classification runs in the background (tao/analysis/classification_queue.py)
+and is backfilled into the entry's metadata once the LLM has answered.
+
 See: KNOWLEDGE_CARTOGRAPHY.md for full design documentation
 """
 
-import gzip
-import json
 import os
 from datetime import datetime
 import zoneinfo
 from typing import List, Dict, Any, Optional
 import logging
 
+from .history_log import HistoryLog, SEGMENT_ENTRIES, COMPACT_AFTER_SEGMENTS
+
 logger = logging.getLogger("tao.storage")
 
 
@@ -41,27 +46,19 @@ class KnowledgeCartography:
         self.extract_concepts = self.config.get("extract_concepts", False)
         self.classify_questions = self.config.get("classify_questions", True)  # NEW: Auto-classify
 
-        # File paths
-        self.history_file = os.path.join(domain_path, "query_history.json.gz")
-
-        # Question classifier (lazy loaded)
-        self._classifier = None
+        # Storage: append-only segment log (legacy single-file history is imported on first save)
+        self.log = HistoryLog(
+            domain_path,
+            segment_entries=self.config.get("segment_entries", SEGMENT_ENTRIES),
+            max_entries=self.max_entries,
+            compact_after_segments=self.config.get("compact_after_segments", COMPACT_AFTER_SEGMENTS)
+        )
+        self.history_file = self.log.legacy_file
+        self.log_dir = self.log.log_dir
 
         logger.info(f"Tao storage initialized for {domain_path} (enabled={self.enabled}, "
                    f"context_window={self.context_window}, classify={self.classify_questions})")
 
-    @property
-    def classifier(self):
-        """Lazy-load question classifier."""
-        if self._classifier is None and self.classify_questions:
-            try:
-                from tao.analysis.sophistication import QuestionClassifier
-                self._classifier = QuestionClassifier()
-                logger.debug("Question classifier loaded")
-            except Exception as e:
-                logger.warning(f"Failed to load question classifier: {e}")
-        return self._classifier
-
     def save_query_response(
         self,
         query: str,
@@ -85,9 +82,6 @@ class KnowledgeCartography:
             return False
 
         try:
-            # Load existing history
-            history = self._load_history_raw()
-
             # Get timezone-aware timestamp
             tz_name = os.getenv("APP_TIMEZONE", "America/Vancouver")
             try:
@@ -98,25 +92,14 @@ class KnowledgeCartography:
                 timestamp = datetime.utcnow().isoformat()
 
             # Auto-detect parent query if not provided (simple heuristic)
-            if parent_query_id is None and len(history) > 0:
-                parent_query_id = self._detect_parent_query(history, query)
+            if parent_query_id is None:
+                parent_query_id = self._detect_parent_query(self.log.tail(1), query)
 
-            # Classify question sophistication if enabled
             metadata = metadata or {}
-            if self.classify_questions and self.classifier:
-                try:
-                    domain_name = os.path.basename(self.domain_path)
-                    classification = self.classifier.classify_question(query, domain=domain_name)
-                    metadata["question_level"] = classification["level"]
-                    metadata["question_level_confidence"] = classification["confidence"]
-                    metadata["question_level_reasoning"] = classification["reasoning"]
-                    logger.debug(f"Classified question as L{classification['level']}: {query[:50]}...")
-                except Exception as e:
-                    logger.warning(f"Question classification failed: {e}")
 
             # Create new entry
             entry = {
-                "id": len(history) + 1,
+                "id": None,  # Assigned by the log
                 "timestamp": timestamp,
                 "query": query,
                 "response": response,
@@ -131,25 +114,28 @@ class KnowledgeCartography:
                 if evoked:
                     entry["evoked_questions"] = evoked
 
-            # Append to history
-            history.append(entry)
-
-            # Apply max_entries limit if set
-            if self.max_entries and len(history) > self.max_entries:
-                # Keep only the most recent max_entries
-                history = history[-self.max_entries:]
-                logger.info(f"Trimmed history to {self.max_entries} entries")
+            # Append to history (max_entries is applied when the log compacts)
+            self.log.append(entry)
 
-            # Save compressed
-            self._save_history_raw(history)
+            # Classify question sophistication in the background (backfills metadata)
+            if self.classify_questions:
+                self._queue_classification(entry)
 
-            logger.debug(f"Saved Q/R pair #{entry['id']} to {self.history_file}")
+            logger.debug(f"Saved Q/R pair #{entry['id']} to {self.log_dir}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to save Q/R pair: {e}", exc_info=True)
             return False
 
+    def _queue_classification(self, entry: Dict[str, Any]) -> None:
+        try:
+            from tao.analysis.classification_queue import get_classification_queue
+            domain_name = os.path.basename(self.domain_path)
+            get_classification_queue().submit(self.log, entry["id"], entry["query"], domain_name)
+        except Exception as e:
+            logger.warning(f"Failed to queue question classification: {e}")
+
     def load_recent_context(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
         """
         Load recent query/response pairs formatted as conversation context.
@@ -171,15 +157,14 @@ class KnowledgeCartography:
         limit = limit or self.context_window
 
         try:
-            # Load full history
-            history = self._load_history_raw()
+            # Read only the last N entries from the log tail
+            if self.max_entries:
+                limit = min(limit, self.max_entries)
+            recent = self.log.tail(limit)
 
-            if not history:
+            if not recent:
                 return []
 
-            # Get last N entries
-            recent = history[-limit:] if len(history) > limit else history
-
             # Format as conversation messages
             context = []
             for entry in recent:
@@ -207,28 +192,23 @@ class KnowledgeCartography:
             Dict with summary info (count, date range, avg confidence, etc.)
         """
         try:
-            history = self._load_history_raw()
+            # Running totals are kept in the log index; no history scan needed
+            stats = self.log.stats()
 
-            if not history:
+            if not stats["count"]:
                 return {
                     "count": 0,
                     "enabled": self.enabled
                 }
 
-            # Calculate statistics
-            confidences = [
-                entry["metadata"].get("confidence", 0.0)
-                for entry in history
-                if "metadata" in entry
-            ]
-
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            confidence_count = stats["confidence_count"]
+            avg_confidence = stats["confidence_sum"] / confidence_count if confidence_count else 0.0
 
             return {
-                "count": len(history),
+                "count": stats["count"],
                 "enabled": self.enabled,
-                "first_query": history[0]["timestamp"] if history else None,
-                "last_query": history[-1]["timestamp"] if history else None,
+                "first_query": stats["first_timestamp"],
+                "last_query": stats["last_timestamp"],
                 "avg_confidence": round(avg_confidence, 3),
                 "context_window": self.context_window,
                 "compression": self.compression
@@ -294,31 +274,33 @@ class KnowledgeCartography:
 
         return None
 
-    def _load_history_raw(self) -> List[Dict]:
-        """Load raw history from compressed file."""
-        if not os.path.exists(self.history_file):
-            return []
+    def compact(self) -> int:
+        """
+        Compact the history log (merge segments, apply max_entries).
+
+        Returns:
+            Number of entries kept
+        """
+        return self.log.compact(self.max_entries)
 
+    def _load_history_raw(self) -> List[Dict]:
+        """Load the full history (all segments)."""
         try:
-            with gzip.open(self.history_file, 'rt', encoding='utf-8') as f:
-                history = json.load(f)
-            return history
+            history = self.log.read_all()
         except Exception as e:
-            logger.error(f"Failed to load history from {self.history_file}: {e}")
+            logger.error(f"Failed to load history from {self.log_dir}: {e}")
             return []
 
+        if self.max_entries and len(history) > self.max_entries:
+            history = history[-self.max_entries:]
+        return history
+
     def _save_history_raw(self, history: List[Dict]):
-        """Save raw history to compressed file."""
+        """Replace the full history."""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-
-            # Write compressed
-            with gzip.open(self.history_file, 'wt', encoding='utf-8') as f:
-                json.dump(history, f, indent=2, ensure_ascii=False)
-
+            self.log.rewrite(history)
         except Exception as e:
-            logger.error(f"Failed to save history to {self.history_file}: {e}")
+            logger.error(f"Failed to save history to {self.log_dir}: {e}")
             raise
 
 
@@ -339,15 +321,15 @@ def get_kcart(domain_path: str, domain_config: Dict) -> KnowledgeCartography:
     return KnowledgeCartography(domain_path, kcart_config)
 
 
-def load_history(domain: str) -> List[Dict]:
+def domain_history_log(domain: str) -> HistoryLog:
     """
-    Utility function to load query history for a domain.
+    HistoryLog for a domain name, resolved against the domains base directory.
 
     Args:
         domain: Domain name
 
     Returns:
-        List of query history entries
+        HistoryLog (which may not exist yet)
     """
     # Determine domains base path
     possible_bases = [
@@ -366,16 +348,27 @@ def load_history(domain: str) -> List[Dict]:
     if not domains_base:
         domains_base = "domains"  # Fallback default
 
-    # Construct history file path
-    history_file = os.path.join(domains_base, domain, "query_history.json.gz")
+    return HistoryLog(os.path.join(domains_base, domain))
+
+
+def load_history(domain: str) -> List[Dict]:
+    """
+    Utility function to load query history for a domain.
+
+    Args:
+        domain: Domain name
+
+    Returns:
+        List of query history entries
+    """
+    log = domain_history_log(domain)
 
-    if not os.path.exists(history_file):
-        logger.warning(f"No history file found at {history_file}")
+    if not log.exists():
+        logger.warning(f"No history found at {log.log_dir}")
         return []
 
     try:
-        with gzip.open(history_file, 'rt', encoding='utf-8') as f:
-            return json.load(f)
+        return log.read_all()
     except Exception as e:
-        logger.error(f"Failed to load history from {history_file}: {e}")
+        logger.error(f"Failed to load history from {log.log_dir}: {e}")
         return []
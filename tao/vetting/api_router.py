@@ -5,6 +5,7 @@ BrainUse API Router - REST endpoints for hiring intelligence.
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel
+import asyncio
 import logging
 
 from .models import Candidate, Assessment, Report
@@ -288,7 +289,8 @@ async def complete_assessment(candidate_id: str):
         Assessment object with calculated metrics
     """
     try:
-        assessment = candidate_manager.complete_assessment(candidate_id)
+        # Classifying the history calls the LLM; keep it off the event loop
+        assessment = await asyncio.to_thread(candidate_manager.complete_assessment, candidate_id)
 
         # Calculate percentile
         candidate = candidate_manager.get_candidate(candidate_id)
@@ -327,7 +329,7 @@ async def get_report(candidate_id: str):
 
         # Get or generate assessment
         # TODO: Store assessments and retrieve if already generated
-        assessment = candidate_manager.complete_assessment(candidate_id)
+        assessment = await asyncio.to_thread(candidate_manager.complete_assessment, candidate_id)
 
         # Generate report
         report = report_generator.generate_report(candidate, assessment)
@@ -204,7 +204,7 @@ class CandidateManager:
 
         Uses Tao analysis modules.
         """
-        from tao.storage import load_history
+        from tao.storage import load_history, domain_history_log
         from tao.analysis import sophistication, depth, concepts
 
         domain_scores = {}
@@ -223,6 +223,9 @@ class CandidateManager:
                 logger.warning(f"No history found for domain {domain}")
                 continue
 
+            # Label unclassified questions (batched; labels are persisted to history)
+            sophistication.classify_history(history, domain, log=domain_history_log(domain))
+
             # Learning velocity
             velocity_result = sophistication.calculate_learning_velocity(
                 history, domain, min_questions=3
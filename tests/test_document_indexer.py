@@ -0,0 +1,169 @@
+"""
+Tests for incremental document indexing
+
+Unchanged files are skipped on (size, mtime) alone, stale documents are
+encoded in batches and the indexer follows library additions and deletions.
+Passage retrieval returns heading-aware sections within a character budget.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from generic_framework.core.document_embeddings import DocumentVectorStore, chunk_markdown
+from generic_framework.core.document_indexer import DocumentIndexer
+
+
+class FakeModel:
+    """Counts encode calls; embeds text by length"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append(len(texts) if isinstance(texts, list) else 1)
+        if isinstance(texts, list):
+            return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+        return np.array([len(texts), 1.0], dtype=np.float32)
+
+
+def _store(tmp_path):
+    store = DocumentVectorStore("docs", tmp_path / "domain")
+    store.model = FakeModel()
+    return store
+
+
+def _library(tmp_path, count):
+    library = tmp_path / "library"
+    library.mkdir()
+    for i in range(count):
+        (library / f"doc{i:02d}.md").write_text(f"# Doc {i}\n" + "text " * i)
+    return library
+
+
+class TestIncrementalIndexing:
+    """Test DocumentVectorStore staleness and batching"""
+
+    def test_batched_encode_and_stat_fast_path(self, tmp_path, monkeypatch):
+        """Stale docs are encoded in batches; unchanged files are not re-hashed"""
+        library = _library(tmp_path, 40)
+        store = _store(tmp_path)
+        files = sorted(str(p) for p in library.glob("*.md"))
+
+        assert store.generate_embeddings(files) == 40
+        assert store.model.calls == [32, 8]
+
+        hashed = []
+        original_hash = store._hash_file
+        monkeypatch.setattr(store, "_hash_file", lambda p: hashed.append(p) or original_hash(p))
+
+        assert store.generate_embeddings(files) == 0
+        assert hashed == []
+
+        # Touched but identical: hashed once, not re-embedded, signature refreshed
+        st = os.stat(files[0])
+        os.utime(files[0], (st.st_atime, st.st_mtime + 10))
+        assert store.generate_embeddings(files) == 0
+        assert len(hashed) == 1
+        assert not store.is_stale(files[0])
+        assert len(hashed) == 1
+
+        with open(files[1], "a") as f:
+            f.write("changed")
+        assert store.generate_embeddings(files) == 1
+
+    def test_indexer_follows_library(self, tmp_path):
+        """refresh() embeds new files, drops deleted ones and honours ignored.md"""
+        library = _library(tmp_path, 3)
+        (library / "ignored.md").write_text("# skip\ndrafts/\n")
+        (library / "drafts").mkdir()
+        (library / "drafts" / "wip.md").write_text("draft")
+
+        indexer = DocumentIndexer("docs", library, _store(tmp_path), poll_seconds=60)
+        assert indexer.refresh() == 3
+        assert [os.path.basename(f) for f in indexer.files] == ["doc00.md", "doc01.md", "doc02.md"]
+
+        os.remove(library / "doc00.md")
+        (library / "doc03.md").write_text("new")
+        assert indexer.refresh() == 1
+        assert sorted(indexer.store.data["documents"]) == sorted(indexer.files)
+        assert indexer.stats()["embedded"] == 3
+
+    def test_cold_start_indexes_in_background(self, tmp_path, monkeypatch):
+        """get_document_indexer returns at once; the first scan runs on the indexer thread"""
+        from generic_framework.core import document_indexer
+
+        library = _library(tmp_path, 3)
+        store = _store(tmp_path)
+        release = threading.Event()
+        encode = store.model.encode
+        store.model.encode = lambda texts, batch_size=32: (release.wait(5), encode(texts, batch_size))[1]
+        monkeypatch.setattr(document_indexer, "get_document_store", lambda name, path: store)
+        monkeypatch.setattr(document_indexer, "_indexers", {})
+
+        t0 = time.time()
+        indexer = document_indexer.get_document_indexer("docs", library, tmp_path / "domain")
+        try:
+            assert time.time() - t0 < 1
+            assert not indexer.ready
+
+            release.set()
+            deadline = time.time() + 5
+            while not indexer.ready and time.time() < deadline:
+                time.sleep(0.01)
+            assert indexer.ready
+            assert indexer.stats()["embedded"] == 3
+        finally:
+            indexer.stop()
+
+
+class KeywordModel:
+    """Embeds text by which topic words it contains"""
+
+    TOPICS = ["yeast", "oven", "knife"]
+
+    def _vector(self, text):
+        return np.array([text.lower().count(t) for t in self.TOPICS] + [0.01], dtype=np.float32)
+
+    def encode(self, texts, batch_size=32):
+        if isinstance(texts, list):
+            return np.stack([self._vector(t) for t in texts])
+        return self._vector(texts)
+
+
+class TestPassageRetrieval:
+    """Test chunk_markdown and DocumentVectorStore.search_passages"""
+
+    def test_chunks_follow_headings(self):
+        """Passages stay within sections and carry the heading path"""
+        text = "# Bread\n\nIntro.\n\n## Yeast\n" + "yeast " * 100 + "\n\n```\n# not a heading\n```\n"
+        passages = chunk_markdown(text, max_chars=250)
+
+        assert passages[0]["heading"] == "Bread"
+        assert {p["heading"] for p in passages[1:]} == {"Bread > Yeast"}
+        assert all(p["end"] - p["start"] <= 250 for p in passages)
+        assert text[passages[1]["start"]:].startswith("## Yeast")
+
+    def test_search_returns_relevant_passages_within_budget(self, tmp_path):
+        """Only matching sections are returned, capped by max_chars"""
+        library = tmp_path / "library"
+        library.mkdir()
+        (library / "baking.md").write_text(
+            "# Baking\n\n## Yeast\nProof the yeast in warm water.\n\n"
+            "## Oven\nPreheat the oven. The oven must be hot.\n"
+        )
+        (library / "knives.md").write_text("# Knives\nA sharp knife is safer.\n")
+
+        store = DocumentVectorStore("docs", tmp_path / "domain")
+        store.model = KeywordModel()
+        store.generate_embeddings(sorted(str(p) for p in library.glob("*.md")))
+        assert store.get_stats()["total_passages"] == 4
+
+        results = store.search_passages("oven temperature", top_k=3, min_similarity=0.5)
+        assert [r["name"] for r in results] == ["baking.md > Baking > Oven"]
+        assert results[0]["content"].startswith("## Oven")
+
+        results = store.search_passages("yeast oven knife", top_k=5, min_similarity=0.1, max_chars=40)
+        assert sum(len(r["content"]) for r in results) <= 40
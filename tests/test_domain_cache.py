@@ -0,0 +1,60 @@
+"""
+Tests for the domain artifact cache
+
+Parsed files are reused until their stat signature changes.
+"""
+
+import json
+import os
+
+from generic_framework.core.domain_cache import DomainArtifactCache
+
+
+class TestDomainArtifactCache:
+    """Test DomainArtifactCache"""
+
+    def test_hit_until_file_changes(self, tmp_path):
+        """Second read is a hit; a rewrite is a miss"""
+        cache = DomainArtifactCache()
+        path = tmp_path / "domain.json"
+        path.write_text(json.dumps({"persona": "poet"}))
+
+        assert cache.load_json(path, kind="domain_config")["persona"] == "poet"
+        assert cache.load_json(path, kind="domain_config")["persona"] == "poet"
+
+        path.write_text(json.dumps({"persona": "librarian!"}))
+        assert cache.load_json(path, kind="domain_config")["persona"] == "librarian!"
+
+        stats = cache.stats()["by_kind"]["domain_config"]
+        assert stats == {"hits": 1, "misses": 2, "hit_rate": 0.333}
+
+    def test_atomic_replace_invalidates(self, tmp_path):
+        """os.replace with identical size/mtime still invalidates via inode"""
+        cache = DomainArtifactCache()
+        path = tmp_path / "patterns.json"
+        path.write_text("[1]")
+        assert cache.load_json(path) == [1]
+
+        tmp = tmp_path / "patterns.json.tmp"
+        tmp.write_text("[2]")
+        st = os.stat(path)
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, path)
+
+        assert cache.load_json(path) == [2]
+
+    def test_missing_file_then_created(self, tmp_path):
+        """Entries keyed on absent files reload once the file appears"""
+        cache = DomainArtifactCache()
+        path = tmp_path / "embeddings.f32"
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return path.exists()
+
+        assert cache.get("vector_store", [path], loader) is False
+        assert cache.get("vector_store", [path], loader) is False
+        path.write_bytes(b"\0" * 4)
+        assert cache.get("vector_store", [path], loader) is True
+        assert len(calls) == 2
@@ -0,0 +1,106 @@
+"""
+Tests for the concurrent domain loader
+
+Domains load with bounded parallelism, lazy domains load once on first
+use, and failures are recorded per domain.
+"""
+
+import asyncio
+
+from generic_framework.core.domain_loader import DomainLoader, DomainLoadState
+
+
+class TestDomainLoader:
+    """Test DomainLoader"""
+
+    def test_loads_overlap_up_to_limit(self):
+        """load_all runs at most max_concurrency loads at once"""
+        in_flight = {"now": 0, "max": 0}
+
+        async def load():
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+
+        async def run():
+            loader = DomainLoader(max_concurrency=3)
+            for i in range(7):
+                loader.register(f"d{i}", load)
+            assert not loader.summary()["ready"]
+            return await loader.load_all()
+
+        summary = asyncio.run(run())
+        assert in_flight["max"] == 3
+        assert summary["ready"]
+        assert summary["counts"] == {"ready": 7}
+
+    def test_lazy_load_is_shared(self):
+        """Concurrent ensure() calls share a single load"""
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            loader = DomainLoader(lazy=True)
+            loader.register("cooking", load)
+            assert loader.summary()["ready"]
+            assert loader.state("cooking") == DomainLoadState.PENDING
+            results = await asyncio.gather(*(loader.ensure("cooking") for _ in range(5)))
+            assert await loader.ensure("missing") is False
+            return loader, results
+
+        loader, results = asyncio.run(run())
+        assert results == [True] * 5
+        assert len(calls) == 1
+        assert loader.state("cooking") == DomainLoadState.READY
+
+    def test_failure_is_recorded(self):
+        """A failing load is marked as error and not retried"""
+        calls = []
+
+        async def broken():
+            calls.append(1)
+            raise ValueError("Invalid JSON in patterns file")
+
+        async def run():
+            loader = DomainLoader()
+            loader.register("broken", broken)
+            await loader.load_all()
+            return loader, await loader.ensure("broken")
+
+        loader, ready = asyncio.run(run())
+        assert ready is False
+        assert len(calls) == 1
+        status = loader.status()["broken"]
+        assert status["state"] == "error"
+        assert "Invalid JSON" in status["error"]
+        assert loader.summary()["ready"]
+
+    def test_background_load_reports_loading(self):
+        """While load_all runs as a task the summary is not ready; clear() cancels it"""
+        started = []
+
+        async def load():
+            started.append(1)
+            await asyncio.sleep(10)
+
+        async def run():
+            loader = DomainLoader(max_concurrency=1)
+            loader.register("a", load)
+            loader.register("b", load)
+            task = asyncio.create_task(loader.load_all())
+            await asyncio.sleep(0.01)
+            summary = loader.summary()
+            task.cancel()
+            loader.clear()
+            await asyncio.gather(task, return_exceptions=True)
+            return summary, loader
+
+        summary, loader = asyncio.run(run())
+        assert not summary["ready"]
+        assert summary["counts"] == {"loading": 1, "pending": 1}
+        assert len(started) == 1
+        assert loader.status() == {}
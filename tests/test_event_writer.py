@@ -0,0 +1,84 @@
+"""
+Tests for the buffered state machine event writer
+
+Transitions queue serialized lines for a background thread that appends
+them in batches; flush/close make everything queued reach the file.
+Non-verbose snapshots estimate sizes instead of serializing payloads.
+"""
+
+import json
+
+from generic_framework.state import event_writer
+from generic_framework.state.event_writer import EventLogWriter, flush_event_writers
+from generic_framework.state.state_machine import QueryState, QueryStateMachine, estimate_size
+
+
+class TestEventLogWriter:
+    """Test EventLogWriter batching and shutdown"""
+
+    def test_batches_and_flushes(self, tmp_path):
+        """Many lines go out in few writes; flush waits for them"""
+        writer = EventLogWriter(tmp_path / "events.jsonl", flush_interval=0.05)
+        for i in range(200):
+            writer.write(json.dumps({"n": i}))
+        assert writer.flush(timeout=5)
+
+        lines = (tmp_path / "events.jsonl").read_text().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == list(range(200))
+        assert writer.batches < 10
+
+    def test_close_drains_queue(self, tmp_path):
+        """close() writes everything queued and later writes still land"""
+        writer = EventLogWriter(tmp_path / "events.jsonl", flush_interval=10)
+        for i in range(5):
+            writer.write(str(i))
+        writer.close()
+        assert not writer.stats()["running"]
+        writer.write("5")
+        assert (tmp_path / "events.jsonl").read_text().split() == [str(i) for i in range(6)]
+
+
+class TestStateMachineLogging:
+    """Test QueryStateMachine's use of the writer"""
+
+    def test_transitions_use_background_writer(self, tmp_path, monkeypatch):
+        """Events are logged as they were at transition time"""
+        sm = QueryStateMachine(domain="cooking")
+        writer = EventLogWriter(tmp_path / "state_machine.jsonl", flush_interval=0.05)
+        monkeypatch.setattr(sm, "_writer", writer)
+
+        data = {"query": "bread"}
+        sm.transition(QueryState.QUERY_RECEIVED, "api_request", data)
+        data["query"] = "changed"
+        sm.complete({"status": "success"})
+        writer.flush()
+
+        events = [json.loads(line) for line in (tmp_path / "state_machine.jsonl").read_text().splitlines()]
+        assert [e["to_state"] for e in events] == ["QUERY_RECEIVED", "COMPLETE"]
+        assert events[0]["data"]["query"] == "bread"
+
+    def test_flush_before_trace_lookup(self, tmp_path, monkeypatch):
+        """A trace read right after the query sees every transition once flushed"""
+        from generic_framework.state.trace_store import TraceStore
+
+        path = tmp_path / "state_machine.jsonl"
+        writer = EventLogWriter(path, flush_interval=10)
+        monkeypatch.setitem(event_writer._writers, path, writer)
+        sm = QueryStateMachine(domain="cooking")
+        monkeypatch.setattr(sm, "_writer", writer)
+
+        sm.transition(QueryState.QUERY_RECEIVED, "api_request", {"query": "bread"})
+        sm.complete({"status": "success"})
+        flush_event_writers()
+
+        events = TraceStore(path).events_for_query(sm.query_id)
+        assert [e["to_state"] for e in events] == ["QUERY_RECEIVED", "COMPLETE"]
+        writer.close()
+
+    def test_size_estimate_tracks_str_length(self):
+        """Estimates stay close to len(str()) for pattern-like payloads"""
+        patterns = [{"id": f"p{i}", "name": "n" * 30, "solution": "s" * 400, "tags": ["a", "b"]}
+                    for i in range(500)]
+        payload = {"patterns": patterns, "query": "how"}
+        assert abs(estimate_size(payload) - len(str(payload))) < 0.1 * len(str(payload))
+        assert estimate_size("abc") == 3
@@ -0,0 +1,98 @@
+"""
+Tests for ExFrameSpecialistPlugin source fan-out
+
+Research docs, the document store and local patterns are searched
+concurrently; a slow or failing source is dropped without holding up
+the others and its timing is reported in search_metadata.
+"""
+
+import asyncio
+import json
+import time
+
+from generic_framework.knowledge.json_kb import JSONKnowledgeBase
+from generic_framework.core.knowledge_base import KnowledgeBaseConfig
+from generic_framework.core.research import SearchResult
+from generic_framework.plugins.exframe.exframe_specialist import ExFrameSpecialistPlugin
+
+
+class SlowResearch:
+    """Research strategy that takes `delay` seconds per search"""
+
+    def __init__(self, delay, results=()):
+        self.delay = delay
+        self.results = list(results)
+        self._initialized = True
+
+    async def search(self, query, limit=5):
+        await asyncio.sleep(self.delay)
+        return self.results
+
+    def get_search_metadata(self):
+        return {"total_files": 3, "matches": len(self.results)}
+
+
+class SlowStore:
+    """Document store that takes `delay` seconds, or raises"""
+
+    def __init__(self, delay, error=None):
+        self.delay = delay
+        self.error = error
+
+    async def search(self, query, limit=5):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{"id": "remote-1", "title": "Remote doc", "source": "Document Store"}]
+
+
+def _specialist(tmp_path, config=None):
+    (tmp_path / "patterns.json").write_text(json.dumps([
+        {"pattern_id": "p1", "name": "Plugins", "solution": "How plugins load", "tags": ["plugins"]}
+    ]))
+    kb = JSONKnowledgeBase(KnowledgeBaseConfig(storage_path=str(tmp_path)))
+    asyncio.run(kb.load_patterns())
+    return ExFrameSpecialistPlugin(kb, config or {})
+
+
+class TestExFrameSpecialistFanOut:
+    """Test ExFrameSpecialistPlugin.process_query source fan-out"""
+
+    def test_sources_run_concurrently(self, tmp_path):
+        """Latency is the slowest source, not the sum"""
+        specialist = _specialist(tmp_path)
+        specialist.research_strategy = SlowResearch(0.2, [
+            SearchResult(content="Plugins are loaded from domain.json", source="PLUGINS.md", relevance_score=0.8, metadata={})
+        ])
+        specialist.document_store = SlowStore(0.2)
+
+        start = time.perf_counter()
+        result = asyncio.run(specialist.process_query("how do plugins load"))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.35
+        assert result["documents_used"] == ["PLUGINS.md", "remote-1"]
+        assert result["local_results"] == []
+
+        sources = result["search_metadata"]["sources"]
+        assert set(sources) == {"research_strategy", "document_store", "local_patterns"}
+        assert sources["document_store"]["elapsed_ms"] >= 150
+        assert sources["local_patterns"]["used"] is False
+        assert result["search_metadata"]["total_files"] == 3
+
+    def test_timeout_and_failure_keep_partial_results(self, tmp_path):
+        """A timed-out and a failing source fall back to local patterns"""
+        specialist = _specialist(tmp_path, {"source_timeouts": {"research_strategy": 0.05}})
+        specialist.research_strategy = SlowResearch(1.0)
+        specialist.document_store = SlowStore(0.0, error=ConnectionError("remote down"))
+
+        start = time.perf_counter()
+        result = asyncio.run(specialist.process_query("plugins"))
+        assert time.perf_counter() - start < 0.5
+
+        sources = result["search_metadata"]["sources"]
+        assert sources["research_strategy"]["timed_out"] is True
+        assert sources["document_store"]["error"] == "remote down"
+        assert sources["local_patterns"]["used"] is True
+        assert [p["pattern_id"] for p in result["local_results"]] == ["p1"]
+        assert result["confidence"] == 0.60
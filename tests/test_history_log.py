@@ -0,0 +1,195 @@
+"""
+Tests for the append-only query history log
+
+Covers O(1) appends with tail reads, legacy import, crash recovery and
+compaction, plus the KnowledgeCartography API on top of it and the
+background question classifier that annotates stored entries.
+"""
+
+import gzip
+import json
+import os
+
+from tao.analysis.classification_queue import ClassificationQueue
+from tao.storage import HistoryLog, KnowledgeCartography, load_history
+
+
+def _entry(i):
+    return {"id": None, "timestamp": f"2026-01-01T00:00:{i:02d}",
+            "query": f"q{i}", "response": f"r{i}", "metadata": {"confidence": 0.5}}
+
+
+class TestHistoryLog:
+    """Test HistoryLog"""
+
+    def test_append_and_tail(self, tmp_path):
+        """Ids are sequential and tail reads match the full history"""
+        log = HistoryLog(str(tmp_path), segment_entries=4, tail_size=3)
+        for i in range(10):
+            log.append(_entry(i))
+
+        history = log.read_all()
+        assert [e["id"] for e in history] == list(range(1, 11))
+        assert log.tail(3) == history[-3:]
+        assert log.tail(7) == history[-7:]
+        assert log.tail(50) == history
+        assert len(log) == 10
+        assert len(os.listdir(log.log_dir)) >= 3
+
+    def test_legacy_file_imported_on_first_append(self, tmp_path):
+        """A legacy query_history.json.gz is read, then imported"""
+        legacy = [dict(_entry(i), id=i + 1) for i in range(5)]
+        with gzip.open(tmp_path / "query_history.json.gz", "wt", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        log = HistoryLog(str(tmp_path))
+        assert log.read_all() == legacy
+        assert log.tail(2) == legacy[-2:]
+
+        stored = log.append(_entry(9))
+        assert stored["id"] == 6
+        assert log.read_all() == legacy + [stored]
+
+    def test_annotations_visible_with_legacy_file_only(self, tmp_path):
+        """Labels written before the first append show up on legacy reads and survive import"""
+        legacy = [dict(_entry(i), id=i + 1) for i in range(3)]
+        with gzip.open(tmp_path / "query_history.json.gz", "wt", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        log = HistoryLog(str(tmp_path))
+        log.annotate_many({1: {"question_level": 2}, 3: {"question_level": 4}})
+
+        assert [e["metadata"].get("question_level") for e in log.read_all()] == [2, None, 4]
+        assert log.tail(1)[0]["metadata"]["question_level"] == 4
+
+        log.append(_entry(9))
+        assert [e["metadata"].get("question_level") for e in log.read_all()] == [2, None, 4, None]
+
+    def test_recovers_unindexed_and_partial_members(self, tmp_path):
+        """Members written after the last index update are adopted; torn writes dropped"""
+        log = HistoryLog(str(tmp_path))
+        log.append(_entry(0))
+        with open(log.index_file) as f:
+            index_before = f.read()
+
+        log.append(_entry(1))
+        with open(log.index_file, "w") as f:
+            f.write(index_before)
+        segment = os.path.join(log.log_dir, "000001.jsonl.gz")
+        with open(segment, "ab") as f:
+            f.write(gzip.compress(b'{"id": 99')[:10])
+
+        stored = log.append(_entry(2))
+
+        assert stored["id"] == 3
+        assert [e["id"] for e in log.read_all()] == [1, 2, 3]
+
+    def test_compaction_trims_and_keeps_ids(self, tmp_path):
+        """compact() applies max_entries and leaves one compact segment"""
+        log = HistoryLog(str(tmp_path), segment_entries=5)
+        for i in range(12):
+            log.append(_entry(i))
+
+        assert log.compact(max_entries=8) == 8
+        assert [e["id"] for e in log.read_all()] == list(range(5, 13))
+        assert log.tail(2)[-1]["id"] == 12
+        assert log.append(_entry(20))["id"] == 13
+
+    def test_annotations_merged_and_folded(self, tmp_path):
+        """annotate() patches metadata on read and survives compaction"""
+        log = HistoryLog(str(tmp_path))
+        for i in range(3):
+            log.append(_entry(i))
+
+        log.annotate(2, {"question_level": 3})
+        assert log.read_all()[1]["metadata"] == {"confidence": 0.5, "question_level": 3}
+        assert log.tail(2)[0]["metadata"]["question_level"] == 3
+
+        log.compact()
+        assert not os.path.exists(log.annotations_file)
+        assert log.read_all()[1]["metadata"]["question_level"] == 3
+
+    def test_annotations_parsed_incrementally(self, tmp_path, monkeypatch):
+        """Reads only parse annotation lines appended since the last read"""
+        log = HistoryLog(str(tmp_path))
+        for i in range(3):
+            log.append(_entry(i))
+        log.annotate(1, {"question_level": 2})
+        log.read_all()
+
+        parsed = []
+        parse = HistoryLog._parse_annotations
+        monkeypatch.setattr(HistoryLog, "_parse_annotations",
+                            staticmethod(lambda data, patches: (parsed.append(data), parse(data, patches))))
+
+        assert log.tail(3)[0]["metadata"]["question_level"] == 2
+        assert parsed == []
+
+        log.annotate(3, {"question_level": 4})
+        with open(log.annotations_file, "a", encoding="utf-8") as f:
+            f.write('{"id": 2, "metad')  # Interrupted write
+        # A second HistoryLog on the same directory shares the cache
+        history = HistoryLog(str(tmp_path)).read_all()
+        assert [e["metadata"].get("question_level") for e in history] == [2, None, 4]
+        assert len(parsed) == 1 and parsed[0].count(b"\n") == 1
+
+        log.compact()
+        log.annotate(2, {"question_level": 1})
+        history = log.read_all()
+        assert [e["metadata"].get("question_level") for e in history] == [2, 1, 4]
+
+    def test_auto_compaction(self, tmp_path):
+        """Segments are merged once compact_after_segments is exceeded"""
+        log = HistoryLog(str(tmp_path), segment_entries=2, compact_after_segments=3)
+        for i in range(20):
+            log.append(_entry(i))
+
+        segments = [n for n in os.listdir(log.log_dir) if n.endswith(".jsonl.gz")]
+        assert len(segments) <= 14
+        assert [e["id"] for e in log.read_all()] == list(range(1, 21))
+
+
+class TestKnowledgeCartography:
+    """Test KnowledgeCartography on the segment log"""
+
+    def test_save_context_and_summary(self, tmp_path, monkeypatch):
+        """save_query_response / load_recent_context / summary / load_history agree"""
+        kcart = KnowledgeCartography(str(tmp_path / "demo"),
+                                     {"classify_questions": False, "context_window": 2})
+        for i in range(3):
+            assert kcart.save_query_response(f"question {i}", f"answer {i}", {"confidence": 1.0})
+
+        context = kcart.load_recent_context()
+        assert [m["content"] for m in context] == ["question 1", "answer 1", "question 2", "answer 2"]
+
+        summary = kcart.get_history_summary()
+        assert summary["count"] == 3
+        assert summary["avg_confidence"] == 1.0
+
+        monkeypatch.setenv("DOMAINS_BASE", str(tmp_path))
+        assert [e["query"] for e in load_history("demo")] == ["question 0", "question 1", "question 2"]
+
+
+class FakeClassifier:
+    async def classify_many_async(self, questions, domain=None, client=None):
+        return [{"level": 4 if "design" in q else 1, "confidence": 0.9, "reasoning": domain, "label": ""}
+                for q in questions]
+
+
+class TestClassificationQueue:
+    """Test background classification of saved questions"""
+
+    def test_save_returns_before_classification_backfill(self, tmp_path, monkeypatch):
+        """Entries are stored unclassified, then annotated by the worker"""
+        queue = ClassificationQueue(FakeClassifier())
+        monkeypatch.setattr("tao.analysis.classification_queue._queue_instance", queue)
+
+        kcart = KnowledgeCartography(str(tmp_path / "demo"))
+        kcart.save_query_response("what is a list", "a sequence")
+        kcart.save_query_response("design a cache", "carefully")
+        queue.join()
+
+        levels = [e["metadata"]["question_level"] for e in kcart.log.read_all()]
+        assert levels == [1, 4]
+        assert kcart.log.read_all()[0]["metadata"]["question_level_reasoning"] == "demo"
+        assert queue.stats()["completed"] == 2
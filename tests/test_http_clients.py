@@ -0,0 +1,67 @@
+"""
+Tests for the pooled HTTP client registry
+
+One client per origin and event loop; closed on shutdown.
+"""
+
+import asyncio
+
+import httpx
+
+from generic_framework.core.http_clients import HTTPClientRegistry
+
+
+class TestHTTPClientRegistry:
+    """Test HTTPClientRegistry"""
+
+    def test_one_client_per_origin(self):
+        """Base URLs on the same origin share a client"""
+        async def run():
+            registry = HTTPClientRegistry()
+            a = registry.get("http://localhost:12434/engines/v1")
+            b = registry.get("http://localhost:12434/v1/")
+            c = registry.get("https://api.openai.com/v1")
+            d = registry.get()
+            assert a is b
+            assert len({id(a), id(c), id(d)}) == 3
+
+            await registry.aclose()
+            assert a.is_closed and c.is_closed and d.is_closed
+            assert registry.get("http://localhost:12434") is not a
+            await registry.aclose()
+
+        asyncio.run(run())
+
+    def test_new_event_loop_gets_new_client(self):
+        """Clients are never reused across event loops"""
+        registry = HTTPClientRegistry()
+
+        async def grab():
+            return registry.get("http://localhost:8000")
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+        assert first is not second
+        assert len(registry.stats()["clients"]) == 1
+
+    def test_session_applies_defaults(self):
+        """PooledSession passes timeout/follow_redirects per request"""
+        seen = {}
+
+        def handler(request):
+            seen["timeout"] = request.extensions["timeout"]
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            registry = HTTPClientRegistry()
+            registry._clients[("default", id(asyncio.get_running_loop()))] = (
+                httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                asyncio.get_running_loop()
+            )
+            async with registry.session(timeout=httpx.Timeout(5.0)) as client:
+                response = await client.post("http://example.test/x", json={})
+            assert response.json() == {"ok": True}
+            await registry.aclose()
+
+        asyncio.run(run())
+        assert seen["timeout"]["read"] == 5.0
@@ -0,0 +1,118 @@
+"""
+Tests for the JSONKnowledgeBase inverted keyword index
+
+Index-driven keyword scores must equal the old per-pattern substring scan,
+and stay correct as patterns are added, updated and deleted.
+"""
+
+import asyncio
+import json
+import random
+import string
+
+from generic_framework.knowledge.json_kb import JSONKnowledgeBase
+from generic_framework.core.knowledge_base import KnowledgeBaseConfig
+from generic_framework.knowledge.keyword_index import FIELD_BITS, KeywordIndex
+
+WORDS = ["bread", "yeast", "oven", "knife", "sharpen", "proofing", "sourdough",
+         "temperature", "python", "decorator", "async", "loops", "c++", "what?"]
+
+
+def _random_pattern(rng, i):
+    def text(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+    return {
+        "id": f"p{i}",
+        "name": text(2).title(),
+        "description": text(5),
+        "solution": text(8),
+        "origin_query": text(3) if rng.random() < 0.7 else "",
+        "tags": rng.sample(WORDS, 2),
+        "examples": [text(3)] if rng.random() < 0.5 else [],
+        "pattern_type": rng.choice(["recipe", "howto"])
+    }
+
+
+def _brute_force_scores(kb, patterns, query, category=None):
+    """The pre-index scoring loop from JSONKnowledgeBase.search"""
+    query_lower = query.lower()
+    content_words = [w.strip(string.punctuation) for w in query_lower.split()
+                     if w.strip(string.punctuation) not in kb.STOP_WORDS
+                     and len(w.strip(string.punctuation)) > 2]
+    scores = {}
+    for pattern in patterns:
+        if category:
+            cats = pattern.get('category', pattern.get('pattern_type', ''))
+            if category != cats and category not in pattern.get('tags', []):
+                continue
+        origin_query = pattern.get('origin_query', '').lower()
+        exact = origin_query == query_lower or query_lower in [str(e).lower() for e in pattern.get('examples', [])]
+        origin_word = not exact and any(w in origin_query for w in content_words)
+        count = kb._count_matching_fields(pattern, query_lower)
+        count += 100 if exact else 30 if origin_word else 0
+        if count > 0:
+            scores[pattern["id"]] = count
+    return scores
+
+
+def _kb(tmp_path, patterns):
+    (tmp_path / "patterns.json").write_text(json.dumps(patterns))
+    kb = JSONKnowledgeBase(KnowledgeBaseConfig(storage_path=str(tmp_path)))
+    kb.use_hybrid_search = False
+    asyncio.run(kb.load_patterns())
+    return kb
+
+
+def _search_scores(kb, query, **kwargs):
+    results = asyncio.run(kb.search(query, limit=10_000, **kwargs))
+    return {p["id"]: p["_keyword_score"] for p in results}
+
+
+class TestKeywordIndex:
+    """Test index-backed keyword scoring"""
+
+    def test_matches_substring_scan(self, tmp_path):
+        rng = random.Random(0)
+        patterns = [_random_pattern(rng, i) for i in range(300)]
+        kb = _kb(tmp_path, patterns)
+
+        queries = ["sourdough oven temperature", "yeast", "sharp knives", "C++ loops", "what?",
+                   patterns[3]["origin_query"], "proof", "nothing relevant here"]
+        for query in queries:
+            assert _search_scores(kb, query) == _brute_force_scores(kb, patterns, query), query
+        assert _search_scores(kb, "bread", category="howto") == \
+            _brute_force_scores(kb, patterns, "bread", category="howto")
+
+    def test_maintained_on_add_update_delete(self, tmp_path):
+        kb = _kb(tmp_path, [])
+        pid = asyncio.run(kb.add_pattern({"domain": "cooking", "name": "Croissant lamination",
+                                          "solution": "Fold butter", "pattern_type": "recipe"}))
+        assert _search_scores(kb, "croissant") == {pid: 1}
+        assert _search_scores(kb, "croissant", category="recipe") == {pid: 1}
+
+        asyncio.run(kb.update_pattern(pid, {"solution": "Fold cold butter into croissant dough",
+                                            "tags": ["pastry"]}))
+        assert _search_scores(kb, "croissant") == {pid: 2}
+        assert _search_scores(kb, "butter", category="pastry") == {pid: 1}
+
+        asyncio.run(kb.delete_pattern(pid))
+        assert _search_scores(kb, "croissant") == {}
+        assert kb.get_embedding_status()["keyword_index"]["vocabulary"] == 0
+
+    def test_word_cache_follows_vocabulary(self):
+        """Cached word lookups pick up new tokens and drop removed ones"""
+        index = KeywordIndex()
+        index.add({"id": "a", "name": "sourdough starter"})
+        assert index.match_masks(["dough"]) == {"a": FIELD_BITS["name"]}
+        assert index.match_masks(["ou"]) == {"a": FIELD_BITS["name"]}
+
+        index.add({"id": "b", "description": "doughnut glaze"})
+        index.add({"id": "c", "description": "unrelated"})
+        assert set(index.match_masks(["dough"])) == {"a", "b"}
+        assert "unrelated" not in index._word_cache.get("dough", [])
+
+        index.remove("a")
+        assert set(index.match_masks(["dough"])) == {"b"}
+        assert index.match_masks(["starter"]) == {}
+        assert index.stats()["trigrams"] == len({g for t in ("doughnut", "glaze", "unrelated")
+                                                  for g in index._grams_of(t)})
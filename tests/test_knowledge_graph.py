@@ -0,0 +1,66 @@
+"""
+Tests for the adjacency-indexed knowledge graph
+
+The graph is built once from the pattern files, traversed through its
+adjacency index, and kept current by pattern writes instead of rebuilds.
+"""
+
+import asyncio
+import json
+
+from generic_framework.api.routes import knowledge
+from generic_framework.api.routes.knowledge import GraphQuery, KnowledgeGraph
+
+
+def _write(patterns_dir, domain, pattern):
+    (patterns_dir / domain).mkdir(parents=True, exist_ok=True)
+    (patterns_dir / domain / f"{pattern['id']}.json").write_text(json.dumps(pattern))
+
+
+class TestKnowledgeGraph:
+    """Test KnowledgeGraph and the cached graph routes"""
+
+    def test_query_and_incremental_updates(self):
+        """Traversal honours depth/type filters; pattern writes replace owned edges"""
+        graph = KnowledgeGraph()
+        graph.set_pattern("cooking", {"id": "a", "name": "A", "related_patterns": ["b"]})
+        graph.set_pattern("cooking", {"id": "b", "name": "B", "alternatives": ["c"]})
+        graph.set_pattern("cooking", {"id": "c", "name": "C", "prerequisites": ["d"]})
+        graph.set_pattern("baking", {"id": "d", "name": "D", "related_patterns": ["missing"]})
+
+        assert [n["id"] for n in graph.query("a", 3)["nodes"]] == ["a", "b", "c", "d"]
+        assert [n["id"] for n in graph.query("a", 1)["nodes"]] == ["a", "b"]
+        assert [n["id"] for n in graph.query("a", 5, ["related"])["nodes"]] == ["a", "b"]
+        assert graph.stats()["relationships"] == {"related": 2, "alternative": 1, "prerequisite": 1}
+
+        # Rewriting b drops its alternative edge but keeps a's edge to it
+        graph.set_pattern("cooking", {"id": "b", "name": "B2"})
+        assert [n["label"] for n in graph.query("a", 3)["nodes"]] == ["A", "B2"]
+        graph.remove_pattern("d")
+        assert graph.stats() == {
+            "total_nodes": 3, "total_edges": 2, "domains": {"cooking": 3},
+            "relationships": {"related": 1, "prerequisite": 1}, "avg_degree": 4 / 3,
+        }
+
+    def test_routes_use_cached_graph(self, tmp_path, monkeypatch):
+        """The graph is built once; pattern writes update the cache"""
+        patterns_dir = tmp_path / "patterns"
+        monkeypatch.setattr(knowledge, "PATTERNS_DIR", patterns_dir)
+        monkeypatch.setattr(knowledge, "KNOWLEDGE_GRAPH_DIR", tmp_path / "graph")
+        monkeypatch.setattr(knowledge, "_graph", None)
+        _write(patterns_dir, "cooking", {"id": "a", "name": "A", "related_patterns": ["b"]})
+        _write(patterns_dir, "cooking", {"id": "b", "name": "B"})
+
+        assert asyncio.run(knowledge.get_graph_stats())["total_edges"] == 1
+        assert (tmp_path / "graph" / "graph.json").exists()
+
+        # New files are not re-read; writes go through graph_pattern_saved
+        _write(patterns_dir, "cooking", {"id": "c", "name": "C"})
+        assert asyncio.run(knowledge.get_graph_stats())["total_nodes"] == 2
+        knowledge.graph_pattern_saved("cooking", {"id": "c", "name": "C", "prerequisites": ["b"]})
+
+        result = asyncio.run(knowledge.query_graph(GraphQuery(start_node="a")))
+        assert [n["id"] for n in result["nodes"]] == ["a", "b", "c"]
+
+        rebuilt = asyncio.run(knowledge.rebuild_graph())
+        assert rebuilt["nodes"] == 3 and rebuilt["edges"] == 1
@@ -0,0 +1,57 @@
+"""
+Tests for near-duplicate pattern detection
+
+Candidates come from MinHash/LSH banding and are verified with
+SequenceMatcher; verified pairs are reported as clusters.
+"""
+
+import json
+import random
+import string
+
+from generic_framework.diagnostics.near_duplicates import find_duplicate_clusters
+from generic_framework.diagnostics.pattern_analyzer import PatternAnalyzer
+
+
+def _text(rng, words=60):
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(words))
+
+
+class TestNearDuplicates:
+    """Test find_duplicate_clusters and PatternAnalyzer duplicate reporting"""
+
+    def test_lsh_finds_planted_clusters(self):
+        """Blocking finds edited copies among unrelated texts"""
+        rng = random.Random(0)
+        contents = {f"p{i}": _text(rng) for i in range(1000)}
+        contents["p10_copy"] = contents["p10"].upper() + "  and a tail"
+        contents["p10_copy2"] = contents["p10"][5:]
+        contents["p500_copy"] = contents["p500"].replace(" ", "  ", 3)
+
+        clusters = find_duplicate_clusters(contents, threshold=0.9, exact_max=0)
+        assert clusters == [["p10", "p10_copy", "p10_copy2"], ["p500", "p500_copy"]]
+
+        # A stricter threshold drops the edited copies
+        assert find_duplicate_clusters(contents, threshold=0.995, exact_max=0) == [["p500", "p500_copy"]]
+
+    def test_analyzer_reports_clusters(self, tmp_path):
+        """One duplicate issue per cluster, with a configurable threshold"""
+        base = "Knead the dough until smooth and elastic, then rest it for an hour before shaping."
+        patterns = [
+            {"id": "a", "name": "A", "pattern_type": "procedure", "solution": base},
+            {"id": "b", "name": "B", "pattern_type": "procedure", "solution": base + "!"},
+            {"id": "c", "name": "C", "pattern_type": "procedure", "solution": base.replace("hour", "half hour")},
+            {"id": "d", "name": "D", "pattern_type": "procedure", "solution": "Sharpen knives on a whetstone at 20 degrees."},
+        ]
+        (tmp_path / "cooking").mkdir()
+        (tmp_path / "cooking" / "patterns.json").write_text(json.dumps(patterns))
+
+        report = PatternAnalyzer(tmp_path).analyze_domain("cooking")
+        duplicates = [i for i in report.issues if i.issue_type == "duplicate"]
+        assert len(duplicates) == 1
+        assert duplicates[0].pattern_id == "a"
+        assert duplicates[0].details["cluster"] == ["a", "b", "c"]
+        assert report.duplicate_patterns == 2
+
+        strict = PatternAnalyzer(tmp_path).analyze_domain("cooking", duplicate_threshold=0.99)
+        assert [i.details["cluster"] for i in strict.issues if i.issue_type == "duplicate"] == [["a", "b"]]
@@ -0,0 +1,86 @@
+"""
+Tests for parallel specialist execution
+
+Selected specialists run concurrently under deadlines; first_wins returns
+on the first confident response and cancels the rest, other strategies
+aggregate whatever finished in time.
+"""
+
+import asyncio
+import time
+
+from generic_framework.plugins.routers.multi_specialist_router import ParallelRouter
+from generic_framework.plugins.routers.executor import ParallelSpecialistExecutor
+
+
+class FakeSpecialist:
+    """Specialist answering after `delay` seconds with a fixed confidence"""
+
+    def __init__(self, delay, confidence, error=None):
+        self.delay = delay
+        self.confidence = confidence
+        self.error = error
+        self.cancelled = False
+
+    def can_handle(self, query):
+        return 0.9
+
+    async def process_query(self, query, context=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return {
+            "answer": f"answer after {self.delay}s",
+            "patterns": [{"pattern_id": f"p{self.delay}", "confidence": 0.8}],
+            "confidence": self.confidence,
+        }
+
+
+class TestParallelSpecialistExecutor:
+    """Test ParallelSpecialistExecutor / ParallelRouter.execute"""
+
+    def test_first_wins_cancels_the_rest(self):
+        """The first confident response ends the wait"""
+        specialists = {
+            "unsure": FakeSpecialist(0.01, 0.2),
+            "fast": FakeSpecialist(0.05, 0.9),
+            "slow": FakeSpecialist(1.0, 0.95),
+        }
+        router = ParallelRouter({"aggregation": "first_wins"})
+
+        start = time.perf_counter()
+        result = asyncio.run(router.execute("question", specialists))
+        assert time.perf_counter() - start < 0.5
+
+        assert result["specialist_id"] == "fast"
+        assert [r["specialist_id"] for r in result["alternative_responses"]] == ["unsure"]
+        assert result["execution"]["slow"]["status"] == "cancelled"
+        assert specialists["slow"].cancelled
+        assert result["route"]["specialist_ids"] == ["unsure", "fast", "slow"]
+
+    def test_merge_all_with_deadline_and_failure(self):
+        """Responses that finish in time are merged; late and failing ones are reported"""
+        specialists = {
+            "a": FakeSpecialist(0.02, 0.7),
+            "b": FakeSpecialist(0.03, 0.8),
+            "late": FakeSpecialist(1.0, 0.9),
+            "broken": FakeSpecialist(0.0, 0.9, error=RuntimeError("boom")),
+        }
+        executor = ParallelSpecialistExecutor(deadline=0.2)
+
+        start = time.perf_counter()
+        result = asyncio.run(executor.execute("question", list(specialists) + ["unknown"], specialists))
+        assert time.perf_counter() - start < 0.5
+
+        assert result["specialist_count"] == 2
+        assert [p["pattern_id"] for p in result["patterns"]] == ["p0.03", "p0.02"]
+        execution = result["execution"]
+        assert execution["late"]["status"] == "timeout"
+        assert execution["broken"]["status"] == "error"
+        assert execution["broken"]["error"] == "boom"
+        assert execution["unknown"]["status"] == "missing"
+        assert execution["a"]["status"] == "ok"
@@ -0,0 +1,105 @@
+"""
+Tests for the token-budgeted prompt assembler
+
+Sources are granted tokens in priority order; content keeps its head,
+memory keeps its tail and KCart history loses its oldest turns first.
+Persona.respond records the allocation on the response.
+"""
+
+import asyncio
+
+from generic_framework.core.persona import Persona
+from generic_framework.core.prompt_budget import PromptBudget, estimate_tokens
+
+
+def _history(turns, answer_words=50):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i}"})
+        history.append({"role": "assistant", "content": f"answer {i} " + "word " * answer_words})
+    return history
+
+
+class TestPromptBudget:
+    """Test PromptBudget.fit"""
+
+    def test_measure_only_without_max_tokens(self):
+        """No max_tokens: nothing is trimmed but every source is measured"""
+        history = _history(5)
+        content, memory, kept, allocation = PromptBudget().fit(
+            {"query": "hello"}, content="doc " * 100, memory="log " * 100, history=history
+        )
+
+        assert kept == history
+        assert not allocation["trimmed"]
+        assert allocation["sources"]["content"]["tokens"] == estimate_tokens("doc " * 100)
+        assert allocation["sources"]["history"]["turns_kept"] == 5
+
+    def test_priority_and_trimming(self):
+        """Higher-priority content is kept whole; memory keeps its tail; old turns drop first"""
+        budget = PromptBudget(max_tokens=600, reserve_for_answer=100, max_history_response_tokens=20)
+        memory = "\n".join(f"entry {i} " + "x " * 10 for i in range(100))
+        content, trimmed_memory, history, allocation = budget.fit(
+            {"query": "what now"},
+            content="Library documents:\n\n" + "fact " * 200,
+            memory=memory,
+            history=_history(20)
+        )
+
+        sources = allocation["sources"]
+        assert not sources["content"]["trimmed"]
+        assert sources["memory"]["trimmed"] and trimmed_memory.rstrip().endswith(memory[-20:].rstrip())
+        assert "entry 0 " not in trimmed_memory
+        assert allocation["total_tokens"] <= 500
+
+        assert history == [] and sources["history"]["turns"] == 20
+
+    def test_history_drops_oldest_turns(self):
+        """Long answers are clipped, then the oldest pairs go; roles keep alternating"""
+        budget = PromptBudget(max_tokens=300, reserve_for_answer=0, max_history_response_tokens=20)
+        _, _, history, allocation = budget.fit({}, history=_history(20))
+
+        assert 0 < len(history) < 40
+        assert history[-2]["content"] == "question 19"
+        assert [m["role"] for m in history] == ["user", "assistant"] * (len(history) // 2)
+        assert all(estimate_tokens(m["content"]) <= 20 for m in history)
+        assert allocation["sources"]["history"]["turns_kept"] == len(history) // 2
+
+    def test_content_truncated_at_paragraph(self):
+        """Content over budget keeps its head up to a paragraph break"""
+        budget = PromptBudget(max_tokens=150, reserve_for_answer=0, priority=["content"])
+        content = "\n\n".join(f"[Document {i}] " + "text " * 20 for i in range(20))
+        fitted, _, _, allocation = budget.fit({}, content=content)
+
+        assert fitted.startswith("[Document 0]")
+        assert "[Document 19]" not in fitted
+        assert "trimmed to fit prompt budget" in fitted
+        assert allocation["sources"]["content"]["allocated"] <= 150
+
+
+class TestPersonaBudget:
+    """Test Persona.respond applies the budget"""
+
+    def test_respond_records_allocation(self, monkeypatch):
+        """History sent to the LLM is trimmed; the caller's context is not"""
+        persona = Persona("poet", "void", trace=True)
+        sent = {}
+
+        async def fake_llm(prompt, context):
+            sent["prompt"] = prompt
+            sent["history"] = context["kcart_history"]
+            return "answer"
+
+        monkeypatch.setattr(persona, "_call_llm", fake_llm)
+        context = {
+            "prompt_budget": PromptBudget(max_tokens=300, reserve_for_answer=50),
+            "memory_prefix": "Previous conversation:\n\n" + "old line\n" * 200,
+            "kcart_history": _history(20)
+        }
+        response = asyncio.run(persona.respond("what is new", context=context))
+
+        allocation = response["prompt_budget"]
+        assert allocation["trimmed"]
+        assert len(sent["history"]) < 40
+        assert len(context["kcart_history"]) == 40
+        assert response["trace"][0]["allocation"] is allocation
@@ -0,0 +1,133 @@
+"""
+Tests for the semantic response cache
+
+Near-duplicate queries reuse earlier answers within the TTL.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from generic_framework.core import response_cache as rc
+from generic_framework.core.response_cache import SemanticResponseCache, get_response_cache
+
+
+class FakeEmbeddings:
+    """Bag-of-words encoder: same words -> same vector"""
+
+    VOCAB = ["bread", "rise", "why", "does", "not", "soup", "salt", "weather"]
+
+    def _vector(self, text):
+        words = text.lower().replace("?", "").split()
+        return np.array([float(w in words) for w in self.VOCAB], dtype=np.float32) + 1e-3
+
+    def encode(self, text):
+        return self._vector(text)
+
+    def encode_batch(self, texts):
+        return np.stack([self._vector(t) for t in texts])
+
+
+class FakeLog:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def tail(self, n):
+        return self.entries[-n:]
+
+
+class FakeKCart:
+    def __init__(self, entries):
+        self.log = FakeLog(entries)
+
+
+def _cache(monkeypatch, tmp_path, **config):
+    monkeypatch.setattr(rc, "get_embedding_service", lambda: FakeEmbeddings())
+    return SemanticResponseCache("cooking", tmp_path, {"enabled": True, **config})
+
+
+class TestSemanticResponseCache:
+    """Test SemanticResponseCache"""
+
+    def test_hit_miss_and_bypass(self, monkeypatch, tmp_path):
+        """Similar queries hit, different ones miss, ** and // bypass"""
+        cache = _cache(monkeypatch, tmp_path, similarity_threshold=0.95)
+
+        response, embedding = cache.lookup("why does bread not rise?")
+        assert response is None
+        cache.store("why does bread not rise?", embedding, {"answer": "Old yeast.", "source": "llm", "confidence": 0.8})
+
+        response, _ = cache.lookup("Why does bread not rise")
+        assert response["answer"] == "Old yeast."
+        assert response["source"] == "response_cache"
+        assert response["cache"]["cached_query"] == "why does bread not rise?"
+
+        assert cache.lookup("salt soup")[0] is None
+        assert cache.lookup("**why does bread not rise?") == (None, None)
+        assert cache.lookup("//why does bread not rise?") == (None, None)
+
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+        assert cache.stats()["bypassed"] == 2
+        assert cache.stats()["hit_rate"] == 0.333
+
+    def test_web_search_answers_expire_sooner(self, monkeypatch, tmp_path):
+        """Web search answers use web_search_ttl_seconds"""
+        cache = _cache(monkeypatch, tmp_path, ttl_seconds=3600, web_search_ttl_seconds=60)
+
+        _, embedding = cache.lookup("weather")
+        cache.store("weather", embedding, {"answer": "Sunny.", "source": "internet"})
+        _, embedding = cache.lookup("salt")
+        cache.store("salt", embedding, {"answer": "Kosher.", "source": "llm"})
+
+        for entry in cache.entries.values():
+            entry["created_at"] = time.time() - 120
+
+        assert cache.lookup("weather")[0] is None
+        assert cache.lookup("salt")[0]["answer"] == "Kosher."
+        assert cache.stats()["expired"] == 1
+
+    def test_warms_from_kcart_and_skips_errors(self, monkeypatch, tmp_path):
+        """Warm-up embeds recent KCart answers, skipping errors and replays"""
+        cache = _cache(monkeypatch, tmp_path)
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        kcart = FakeKCart([
+            {"query": "salt", "response": "Kosher.", "timestamp": now, "metadata": {"source": "llm"}},
+            {"query": "soup", "response": "[LLM Error: 500]", "timestamp": now, "metadata": {"source": "llm"}},
+            {"query": "bread", "response": "Flour.", "timestamp": now, "metadata": {"source": "response_cache", "cache_hit": True}},
+        ])
+
+        # The first lookup only starts warm-up and is a miss
+        assert cache.lookup("salt", kcart) == (None, None)
+        cache._warm_thread.join(5)
+
+        assert cache.lookup("salt", kcart)[0]["answer"] == "Kosher."
+        assert len(cache.entries) == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lookup_does_not_wait_for_warm_up(self, monkeypatch, tmp_path):
+        """A slow warm-up leaves lookups as misses instead of blocking them"""
+        release = threading.Event()
+        cache = _cache(monkeypatch, tmp_path)
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        kcart = FakeKCart([{"query": "salt", "response": "Kosher.", "timestamp": now,
+                            "metadata": {"source": "llm"}}])
+        slow_tail = kcart.log.tail
+        kcart.log.tail = lambda n: (release.wait(5), slow_tail(n))[1]
+
+        t0 = time.time()
+        assert cache.lookup("salt", kcart) == (None, None)
+        assert cache.lookup("salt", kcart) == (None, None)
+        assert time.time() - t0 < 1
+
+        release.set()
+        cache._warm_thread.join(5)
+        assert cache.lookup("salt", kcart)[0]["answer"] == "Kosher."
+
+    def test_registry_is_opt_in(self, monkeypatch, tmp_path):
+        """Domains without response_cache.enabled get no cache"""
+        assert get_response_cache("plain", tmp_path, {}) is None
+        first = get_response_cache("cooking", tmp_path, {"response_cache": {"enabled": True}})
+        assert get_response_cache("cooking", tmp_path, {"response_cache": {"enabled": True}}) is first
+        assert get_response_cache("cooking", tmp_path, {"response_cache": {"enabled": False}}) is None
@@ -0,0 +1,71 @@
+"""
+Tests for SearchMetrics rollups and trace segments
+
+Aggregates are answered from per-minute/per-hour rollups that survive a
+restart; raw traces rotate into numbered segments and are streamed only
+for trace listings.
+"""
+
+from datetime import datetime, timedelta
+
+from generic_framework.diagnostics.search_metrics import SearchMetrics, SearchOutcome, SearchTrace
+
+
+def _trace(i, when, outcome=SearchOutcome.SUCCESS_HIGH_CONFIDENCE, domain="cooking", duration=100.0):
+    return SearchTrace(
+        query_id=f"q{i}", query=f"question {i}", domain_id=domain, timestamp=when, start_time=when,
+        duration_ms=duration, patterns_found=2, patterns_used=1, outcome=outcome, confidence=0.8,
+        patterns_matched=[{"id": "p1", "relevance": 0.5}],
+    )
+
+
+class TestSearchMetrics:
+    """Test SearchMetrics rollups, rotation and reload"""
+
+    def test_window_metrics_from_rollups(self, tmp_path):
+        """Windows combine hour and minute buckets; reload replays unsaved traces"""
+        metrics = SearchMetrics(tmp_path)
+        now = datetime.utcnow().replace(second=30, microsecond=0)
+        for i in range(20):
+            metrics.record_search(_trace(i, now - timedelta(minutes=i * 10), duration=100.0 + i))
+        metrics.record_search(_trace(20, now - timedelta(minutes=5), SearchOutcome.NO_RESULTS, domain="baking"))
+        metrics.record_search(_trace(21, now - timedelta(days=3)))
+
+        day = metrics.calculate_metrics()
+        assert day.total_searches == 21
+        assert day.no_results_searches == 1
+        assert day.avg_duration_ms == sum(100.0 + i for i in range(20)) / 20
+        assert 100 <= day.p50_duration_ms <= 119
+        assert day.confidence_histogram[8] == 21
+
+        # A 35 minute window, resolved to the minute
+        window = metrics.calculate_metrics(now - timedelta(minutes=35), now, domain_id="cooking")
+        assert window.total_searches == 4
+
+        stats = metrics.get_pattern_usage_stats()
+        assert stats["p1"] == {"match_count": 22, "avg_confidence": 0.5}
+
+        # Traces appended after the last rollup save are replayed on load
+        with open(tmp_path / "traces.jsonl", "a") as f:
+            f.write('{"query_id": "late", "query": "q", "domain_id": "cooking", "timestamp": "%s"}\n'
+                    % now.isoformat())
+        reloaded = SearchMetrics(tmp_path)
+        assert reloaded.calculate_metrics().total_searches == 22
+        assert reloaded.get_pattern_usage_stats("p1")["match_count"] == 22
+
+    def test_segments_rotate_and_stream(self, tmp_path):
+        """traces.jsonl rotates; listings stream segments newest first"""
+        metrics = SearchMetrics(tmp_path, max_segment_bytes=2000, max_segments=2)
+        now = datetime.utcnow()
+        for i in range(30):
+            outcome = SearchOutcome.NO_RESULTS if i % 3 == 0 else SearchOutcome.SUCCESS_HIGH_CONFIDENCE
+            metrics.record_search(_trace(i, now, outcome, duration=1000.0 * i))
+
+        assert len(list(tmp_path.glob("traces.0*.jsonl"))) == 2
+        assert [t.query_id for t in metrics.get_recent_traces(limit=3)] == ["q29", "q28", "q27"]
+        assert [t.query_id for t in metrics.identify_no_results_searches(limit=2)] == ["q27", "q24"]
+        assert [t.query_id for t in metrics.identify_slow_searches(threshold_ms=26500)] == ["q29", "q28", "q27"]
+
+        # Rollups still count every search, including pruned segments
+        assert metrics.calculate_metrics().total_searches == 30
+        assert SearchMetrics(tmp_path).calculate_metrics().total_searches == 30
@@ -0,0 +1,144 @@
+"""
+Tests for batched question sophistication classification
+
+Many questions share one prompt, repeats come from the label cache and
+labels are persisted back into history.
+"""
+
+import asyncio
+import json
+import re
+
+import httpx
+
+from tao.analysis import sophistication
+from tao.analysis.sophistication import QuestionClassifier
+from tao.storage import HistoryLog
+
+LLM_CONFIG = {"base_url": "http://llm.test/v1", "model": "test", "api_key": ""}
+
+
+def _mock_llm(calls):
+    """Answer batched prompts with level = number of words in the question (max 4)."""
+    def handler(request):
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        calls.append(prompt)
+        questions = re.findall(r'^(\d+)\. "(.*)"$', prompt, re.M)
+        items = [{"index": int(i), "level": min(4, len(q.split())), "confidence": 0.9, "reasoning": "words"}
+                 for i, q in questions]
+        content = "```json\n" + json.dumps(items) + "\n```"
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+    return httpx.MockTransport(handler)
+
+
+def _classify(questions, calls, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=_mock_llm(calls)) as client:
+            return await QuestionClassifier(LLM_CONFIG).classify_many_async(
+                questions, domain="python", client=client, **kwargs
+            )
+    return asyncio.run(run())
+
+
+class TestBatchClassification:
+    """Test QuestionClassifier.classify_many_async"""
+
+    def setup_method(self):
+        sophistication._label_cache.clear()
+
+    def test_batches_and_caches(self):
+        """Questions are packed batch_size per prompt; normalized repeats are cached"""
+        calls = []
+        questions = [f"question number {'x ' * (i % 3)}{i}" for i in range(45)]
+        results = _classify(questions, calls, batch_size=20)
+
+        assert len(calls) == 3
+        assert [r["level"] for r in results] == [min(4, len(q.split())) for q in questions]
+
+        again = _classify(["  QUESTION number 0 ", questions[1]], calls)
+        assert len(calls) == 3
+        assert [r["level"] for r in again] == [results[0]["level"], results[1]["level"]]
+
+    def test_classify_history_persists_labels(self, tmp_path, monkeypatch):
+        """Unlabelled entries are classified once and written back to the log"""
+        calls = []
+        monkeypatch.setattr(
+            QuestionClassifier, "_get_default_llm_config", lambda self: LLM_CONFIG
+        )
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            sophistication.httpx, "AsyncClient",
+            lambda **kwargs: real_client(transport=_mock_llm(calls))
+        )
+
+        log = HistoryLog(str(tmp_path))
+        for query in ["what is python", "why", "how do decorators work internally"]:
+            log.append({"id": None, "timestamp": "2026-01-01T00:00:00", "query": query,
+                        "response": "", "metadata": {}})
+        log.annotate(2, {"question_level": 3})
+
+        history = log.read_all()
+        assert sophistication.classify_history(history, "python", log=log) == 2
+        assert len(calls) == 1
+
+        levels = [e["metadata"]["question_level"] for e in log.read_all()]
+        assert levels == [3, 3, 4]
+        assert sophistication.classify_history(log.read_all(), "python", log=log) == 0
+
+    def test_failed_classification_is_not_persisted(self, tmp_path, monkeypatch):
+        """Fallback labels from an LLM outage are not written, so a later pass retries"""
+        monkeypatch.setattr(
+            QuestionClassifier, "_get_default_llm_config", lambda self: LLM_CONFIG
+        )
+        real_client = httpx.AsyncClient
+        outage = httpx.MockTransport(lambda request: httpx.Response(503))
+        monkeypatch.setattr(
+            sophistication.httpx, "AsyncClient", lambda **kwargs: real_client(transport=outage)
+        )
+
+        log = HistoryLog(str(tmp_path))
+        for query in ["what is python", "why"]:
+            log.append({"id": None, "timestamp": "2026-01-01T00:00:00", "query": query,
+                        "response": "", "metadata": {}})
+
+        history = log.read_all()
+        assert sophistication.classify_history(history, "python", log=log) == 0
+        assert all("question_level" not in e["metadata"] for e in history + log.read_all())
+
+        calls = []
+        monkeypatch.setattr(
+            sophistication.httpx, "AsyncClient",
+            lambda **kwargs: real_client(transport=_mock_llm(calls))
+        )
+        assert sophistication.classify_history(log.read_all(), "python", log=log) == 2
+        assert [e["metadata"]["question_level"] for e in log.read_all()] == [3, 1]
+
+    def test_unparseable_reply_is_not_cached_or_persisted(self, tmp_path, monkeypatch):
+        """A reply with no JSON yields a fallback label that is neither cached nor written"""
+        monkeypatch.setattr(
+            QuestionClassifier, "_get_default_llm_config", lambda self: LLM_CONFIG
+        )
+        real_client = httpx.AsyncClient
+        garbled = httpx.MockTransport(lambda request: httpx.Response(
+            200, json={"choices": [{"message": {"content": "I am not sure, sorry."}}]}
+        ))
+        monkeypatch.setattr(
+            sophistication.httpx, "AsyncClient", lambda **kwargs: real_client(transport=garbled)
+        )
+
+        log = HistoryLog(str(tmp_path))
+        for query in ["what is python", "why"]:
+            log.append({"id": None, "timestamp": "2026-01-01T00:00:00", "query": query,
+                        "response": "", "metadata": {}})
+
+        history = log.read_all()
+        assert sophistication.classify_history(history, "python", log=log) == 0
+        assert all("question_level" not in e["metadata"] for e in history + log.read_all())
+        assert not sophistication._label_cache
+
+        calls = []
+        monkeypatch.setattr(
+            sophistication.httpx, "AsyncClient",
+            lambda **kwargs: real_client(transport=_mock_llm(calls))
+        )
+        assert sophistication.classify_history(log.read_all(), "python", log=log) == 2
@@ -0,0 +1,175 @@
+"""
+Tests for SQLiteKnowledgeBase hybrid search
+
+Embeddings are stored as float32 BLOBs beside the patterns, cached in a
+matrix and fused with bm25() ranks; without embeddings search falls back
+to full-text only.
+"""
+
+import asyncio
+
+import numpy as np
+
+from generic_framework.core.knowledge_base import KnowledgeBaseConfig
+from generic_framework.knowledge.sqlite_kb import SQLiteKnowledgeBase
+
+
+class TopicEmbeddings:
+    """Embeds text by which topic's words it contains"""
+
+    TOPICS = [
+        ["bread", "dough", "loaf", "yeast", "rise"],
+        ["knife", "blade", "sharpen", "whetstone"],
+        ["oven", "heat", "temperature", "preheat"],
+    ]
+
+    class config:
+        model_name = "topic-test"
+
+    is_available = True
+    is_loaded = True
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, text):
+        text = text.lower()
+        return np.array([sum(w in text for w in words) for words in self.TOPICS] + [0.01],
+                        dtype=np.float32)
+
+    def encode_pattern(self, pattern):
+        self.encoded += 1
+        return self.encode(" ".join(str(pattern.get(f) or "") for f in ("name", "problem", "solution")))
+
+
+PATTERNS = [
+    {"id": "p1", "name": "Proofing dough", "problem": "Dough will not rise",
+     "solution": "Use warm water so the yeast activates", "pattern_type": "baking"},
+    {"id": "p2", "name": "Whetstone care", "problem": "Blade is dull",
+     "solution": "Sharpen at a steady angle", "pattern_type": "tools"},
+    {"id": "p3", "name": "Preheat", "problem": "Uneven baking",
+     "solution": "Preheat the oven to temperature first", "pattern_type": "baking"},
+]
+
+
+def _kb(tmp_path, embeddings):
+    kb = SQLiteKnowledgeBase(KnowledgeBaseConfig(storage_path=str(tmp_path)))
+    kb.embedding_service = embeddings
+
+    async def load():
+        await kb.load_patterns()
+        for pattern in PATTERNS:
+            await kb.add_pattern(dict(pattern))
+
+    asyncio.run(load())
+    return kb
+
+
+def _search(kb, query, **kwargs):
+    async def run():
+        try:
+            return await kb.search(query, **kwargs)
+        finally:
+            await kb.close()
+    return asyncio.run(run())
+
+
+class TestSQLiteHybridSearch:
+    """Test embedding storage and bm25 + semantic fusion"""
+
+    def test_semantic_match_without_shared_words(self, tmp_path):
+        """A pattern sharing no terms with the query is found through its embedding"""
+        kb = _kb(tmp_path, TopicEmbeddings())
+        assert kb.get_embedding_status()["has_embeddings"] == 3
+
+        results = _search(kb, "my loaf came out flat", limit=3)
+        assert results[0]["id"] == "p1"
+        assert results[0]["_relevance_source"] == "semantic"
+        assert 0 < results[0]["confidence"] <= 1
+
+    def test_fusion_and_filters(self, tmp_path):
+        """Matches in both lists rank first; filters apply to semantic hits too"""
+        kb = _kb(tmp_path, TopicEmbeddings())
+        results = _search(kb, "how do I sharpen a knife", limit=3)
+        assert results[0]["id"] == "p2"
+        assert results[0]["_relevance_source"] == "hybrid"
+        assert results[0]["_bm25_score"] < 0
+
+        kb = _kb(tmp_path / "filtered", TopicEmbeddings())
+        results = _search(kb, "how do I sharpen a knife", category="baking", limit=3)
+        assert results and all(r["pattern_type"] == "baking" for r in results)
+
+    def test_cache_tracks_writes(self, tmp_path):
+        """Updates re-embed, deletes drop the BLOB and the cached row"""
+        embeddings = TopicEmbeddings()
+        kb = _kb(tmp_path, embeddings)
+
+        async def run():
+            await kb.search("yeast")
+            await kb.update_pattern("p2", {"solution": "Preheat the oven"})
+            await kb.delete_pattern("p1")
+            results = await kb.search("oven temperature", limit=3)
+            await kb.close()
+            return results
+
+        results = asyncio.run(run())
+        assert embeddings.encoded == 4
+        assert {r["id"] for r in results} == {"p2", "p3"}
+        assert len(kb._vectors) == 2
+        assert kb.get_embedding_status()["has_embeddings"] == 2
+
+    def test_fts_only_without_embeddings(self, tmp_path):
+        """No embedding model: bm25 order with the best match first"""
+        kb = _kb(tmp_path, None)
+        results = _search(kb, "preheat oven blade")
+        assert [r["id"] for r in results] == ["p3", "p2"]
+        assert all(r["_relevance_source"] == "keyword" for r in results)
+
+    def test_fts_only_confidence_follows_rank(self, tmp_path):
+        """FTS-only confidence is highest for the strongest bm25 match"""
+        kb = _kb(tmp_path, None)
+        results = _search(kb, "preheat oven temperature blade baking", limit=3)
+        assert len(results) >= 2
+
+        bm25 = [r["_bm25_score"] for r in results]
+        confidences = [r["confidence"] for r in results]
+        assert bm25 == sorted(bm25)
+        assert confidences == sorted(confidences, reverse=True)
+        assert confidences[0] > confidences[-1]
+
+    def test_filtered_semantic_search_beyond_global_top(self, tmp_path):
+        """A category filter searches its own patterns, not the global top hits"""
+        kb = _kb(tmp_path, TopicEmbeddings())
+
+        async def load():
+            for i in range(60):
+                await kb.add_pattern({"id": f"t{i}", "name": f"Whetstone grit {i}",
+                                      "solution": "Sharpen the blade", "pattern_type": "tools"})
+            await kb.add_pattern({"id": "b1", "name": "Slicing", "problem": "Crushed crumb",
+                                  "solution": "Use a serrated knife on the loaf", "pattern_type": "baking"})
+        asyncio.run(load())
+
+        results = _search(kb, "whetstone", category="baking", limit=3)
+        assert results and results[0]["id"] == "b1"
+        assert results[0]["_relevance_source"] == "semantic"
+
+    def test_model_loads_off_the_event_loop(self, tmp_path):
+        """The embedding model is loaded in a worker thread, once"""
+        import threading
+
+        class LazyEmbeddings(TopicEmbeddings):
+            is_loaded = False
+
+            def __init__(self):
+                super().__init__()
+                self.load_threads = []
+
+            def load_model(self):
+                self.load_threads.append(threading.current_thread())
+                self.is_loaded = True
+
+        embeddings = LazyEmbeddings()
+        kb = _kb(tmp_path, embeddings)
+        assert _search(kb, "my loaf came out flat", limit=1)[0]["id"] == "p1"
+        assert len(embeddings.load_threads) == 1
+        assert embeddings.load_threads[0] is not threading.main_thread()
@@ -0,0 +1,79 @@
+"""
+Tests for SQLiteKnowledgeBase bulk import and pooled sync reads
+
+patterns.json is loaded in one transaction with the FTS index rebuilt at
+the end; synchronous helpers reuse a small set of read connections.
+"""
+
+import asyncio
+import json
+
+import numpy as np
+
+from generic_framework.core.embeddings import VectorStore
+from generic_framework.core.knowledge_base import KnowledgeBaseConfig
+from generic_framework.knowledge.sqlite_kb import SQLiteKnowledgeBase
+
+
+def _patterns(count):
+    return [
+        {"id": f"p{i}", "name": f"Pattern {i}", "problem": f"problem number {i}",
+         "solution": "use a whetstone" if i % 10 == 0 else "use a timer",
+         "pattern_type": "tools" if i % 2 else "baking", "tags": ["bulk"],
+         "created_at": "2025-01-01T00:00:00+00:00"}
+        for i in range(count)
+    ]
+
+
+class TestSQLiteBulkImport:
+    """Test the JSON import path and read connection pool"""
+
+    def test_import_indexes_and_copies_embeddings(self, tmp_path):
+        """Imported rows are searchable, keep timestamps and bring their vectors"""
+        patterns = _patterns(200)
+        patterns.append({"pattern_id": "legacy", "name": "Legacy whetstone", "solution": "soak it"})
+        (tmp_path / "patterns.json").write_text(json.dumps(patterns))
+
+        stored = VectorStore(tmp_path)
+        stored.set("p0", np.ones(4, dtype=np.float32))
+        stored.save()
+
+        kb = SQLiteKnowledgeBase(KnowledgeBaseConfig(storage_path=str(tmp_path)))
+        kb.embedding_service = None
+
+        async def run():
+            await kb.load_patterns()
+            legacy = await kb.get_by_id("legacy")
+            first = await kb.get_by_id("p0")
+            imported = await kb.search("whetstone", limit=50)
+            # The FTS insert trigger is back after the bulk load
+            await kb.add_pattern({"id": "new", "name": "Fresh whetstone", "solution": "flatten it"})
+            after = await kb.search("whetstone", limit=50)
+            await kb.close()
+            return legacy, first, imported, after
+
+        legacy, first, imported, after = asyncio.run(run())
+        assert legacy is not None
+        assert first["created_at"] == "2025-01-01T00:00:00+00:00"
+        assert len(imported) == 21
+        assert {r["id"] for r in after} - {r["id"] for r in imported} == {"new"}
+        assert kb.get_embedding_status()["has_embeddings"] == 1
+
+    def test_sync_reads_reuse_connections(self, tmp_path):
+        """Sync helpers share pooled connections and return parsed rows"""
+        kb = SQLiteKnowledgeBase(KnowledgeBaseConfig(storage_path=str(tmp_path)))
+        kb.embedding_service = None
+
+        async def load():
+            await kb.load_patterns()
+            await kb.bulk_add_patterns(_patterns(20))
+        asyncio.run(load())
+
+        assert kb.get_pattern_count() == 20
+        assert kb.get_all_categories() == ["baking", "tools"]
+        tools = kb.get_patterns_by_category("tools")
+        assert len(tools) == 10 and tools[0]["tags"] == ["bulk"]
+        assert kb._read_pool.qsize() == 1
+
+        asyncio.run(kb.close())
+        assert kb._read_pool.qsize() == 0
@@ -0,0 +1,61 @@
+"""
+Tests for token streaming
+
+Persona.respond_stream forwards LLM deltas as they arrive and finishes with
+the same response dict respond() returns.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from generic_framework.core.http_clients import get_http_clients
+from generic_framework.core.persona import Persona
+from generic_framework.core.streaming import sse_event, parse_sse_delta
+
+
+def _sse_handler(request):
+    body = json.loads(request.content)
+    assert body["stream"] is True
+    chunks = ["Hel", "lo", " world"]
+    lines = [f'data: {json.dumps({"choices": [{"delta": {"content": c}}]})}\n\n' for c in chunks]
+    lines.append("data: [DONE]\n\n")
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content="".join(lines))
+
+
+class TestStreaming:
+    """Test streaming helpers and Persona.respond_stream"""
+
+    def test_parse_sse_delta(self):
+        """OpenAI and Anthropic chunk formats are understood"""
+        assert parse_sse_delta('{"choices": [{"delta": {"content": "a"}}]}') == "a"
+        assert parse_sse_delta('{"type": "content_block_delta", "delta": {"text": "b"}}') == "b"
+        assert parse_sse_delta('{"type": "message_start"}') == ""
+        assert parse_sse_delta("not json") == ""
+
+    def test_sse_event_format(self):
+        """Events are encoded as `event:` / `data:` pairs"""
+        assert sse_event({"type": "token", "text": "hi"}) == 'event: token\ndata: {"text": "hi"}\n\n'
+
+    def test_respond_stream(self, monkeypatch):
+        """Tokens arrive before the done event, which carries the full answer"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://llm.test/v1")
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            registry = get_http_clients()
+            registry._clients[("http://llm.test:80", id(loop))] = (
+                httpx.AsyncClient(transport=httpx.MockTransport(_sse_handler)), loop
+            )
+            persona = Persona("poet", "void")
+            events = [e async for e in persona.respond_stream("Say hello")]
+            await registry.aclose()
+            return events
+
+        events = asyncio.run(run())
+
+        assert [e["text"] for e in events if e["type"] == "token"] == ["Hel", "lo", " world"]
+        assert events[-1]["type"] == "done"
+        assert events[-1]["response"]["answer"] == "Hello world"
@@ -0,0 +1,100 @@
+"""
+Tests for the indexed trace store
+
+Lookups are answered from a byte-offset index that catches up on lines
+appended since the last call; the live log rotates into numbered segments
+and old segments are pruned.
+"""
+
+import asyncio
+import json
+
+from generic_framework.state.trace_store import QueryLogStore, TraceStore, maintain_periodically
+
+
+def _append(path, query_id, state, domain="cooking"):
+    with open(path, "a") as f:
+        f.write(json.dumps({
+            "query_id": query_id, "to_state": state, "trigger": "t",
+            "timestamp": "2025-01-01T00:00:00Z", "data": {"domain": domain}
+        }) + "\n")
+
+
+class TestTraceStore:
+    """Test TraceStore / QueryLogStore"""
+
+    def test_lookups_follow_appends(self, tmp_path):
+        """New lines are indexed on the next lookup; partial lines wait"""
+        log = tmp_path / "state_machine.jsonl"
+        store = TraceStore(log)
+        assert store.recent() == []
+
+        for i in range(5):
+            _append(log, f"q{i}", "QUERY_RECEIVED")
+            _append(log, f"q{i}", "ERROR" if i == 3 else "COMPLETE", domain="gardening" if i % 2 else "cooking")
+        assert [e["to_state"] for e in store.events_for_query("q3")] == ["QUERY_RECEIVED", "ERROR"]
+
+        _append(log, "q9", "QUERY_RECEIVED")
+        with open(log, "a") as f:
+            f.write('{"query_id": "q9", "to_st')
+        assert len(store.events_for_query("q9")) == 1
+        with open(log, "a") as f:
+            f.write('ate": "COMPLETE", "data": {}}\n')
+        assert len(store.events_for_query("q9")) == 2
+
+        recent = store.recent(limit=3, domain="gardening")
+        assert [e["query_id"] for e in recent] == ["q3", "q1"]
+        assert [e["query_id"] for e in store.recent(limit=1, state="ERROR")] == ["q3"]
+        assert store.recent(limit=1)[0]["to_state"] == "COMPLETE"
+
+    def test_rotation_and_retention(self, tmp_path):
+        """The live log rotates past max_segment_bytes; old segments are dropped"""
+        log = tmp_path / "state_machine.jsonl"
+        store = TraceStore(log, max_segment_bytes=1000, max_segments=2)
+
+        for i in range(40):
+            _append(log, f"q{i}", "COMPLETE")
+            store.recent(limit=1)
+
+        segments = sorted(p.name for p in tmp_path.glob("state_machine.0*.jsonl"))
+        assert len(segments) == 2
+        assert store.stats()["segments"] == 2 + log.exists()
+        assert store.events_for_query("q0") == []
+        assert len(store.events_for_query("q39")) == 1
+
+        # Rotated segments are still searchable
+        rotated_ids = [json.loads(line)["query_id"] for line in open(tmp_path / segments[0])]
+        assert store.events_for_query(rotated_ids[0])[0]["query_id"] == rotated_ids[0]
+
+    def test_maintenance_rotates_without_lookups(self, tmp_path):
+        """Periodic maintenance rotates and prunes a log nobody queries"""
+        log = tmp_path / "state_machine.jsonl"
+        store = TraceStore(log, max_segment_bytes=1000, max_segments=1)
+
+        async def run():
+            task = asyncio.create_task(maintain_periodically([store], interval=0.01))
+            for i in range(40):
+                _append(log, f"q{i}", "COMPLETE")
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        asyncio.run(run())
+        assert len(list(tmp_path.glob("state_machine.0*.jsonl"))) == 1
+        assert not log.exists() or log.stat().st_size < 1000 + 200
+        assert len(store.events_for_query("q39")) == 1
+
+    def test_query_log_lookup(self, tmp_path):
+        """queries.log traces are found by start_time or query text"""
+        log = tmp_path / "queries.log"
+        with open(log, "w") as f:
+            for i in range(3):
+                f.write(f"2025-01-01 00:00:0{i},000 - " +
+                        json.dumps({"query": f"question {i}", "start_time": f"t{i}"}) + "\n")
+            f.write("not a trace line\n")
+
+        store = QueryLogStore(log)
+        assert store.find("t1")["query"] == "question 1"
+        assert store.find("question 2")["logged_at"].startswith("2025-01-01 00:00:02")
+        assert store.find("missing") is None
+        assert [t["start_time"] for t in store.recent(limit=2)] == ["t2", "t1"]
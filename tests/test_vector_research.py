@@ -0,0 +1,85 @@
+"""
+Tests for VectorDocumentResearchStrategy
+
+Chunks are embedded into an on-disk index at initialize(); a restart
+re-embeds only files whose content changed and search ranks chunks by
+cosine similarity.
+"""
+
+import asyncio
+
+import numpy as np
+
+from generic_framework.core.research import VectorDocumentResearchStrategy
+
+
+class KeywordEmbedder:
+    """Embeds text by which topic words it contains; counts encoded texts"""
+
+    TOPICS = ["yeast", "oven", "knife"]
+
+    class config:
+        model_name = "keyword-test"
+
+    def __init__(self):
+        self.encoded = 0
+
+    def _vector(self, text):
+        return np.array([text.lower().count(t) for t in self.TOPICS] + [0.01], dtype=np.float32)
+
+    def encode(self, text):
+        return self._vector(text)
+
+    def encode_batch(self, texts):
+        self.encoded += len(texts)
+        return np.stack([self._vector(t) for t in texts])
+
+
+def _strategy(tmp_path, embedder):
+    strategy = VectorDocumentResearchStrategy({
+        "base_path": str(tmp_path / "docs"),
+        "auto_discover": True,
+        "chunk_size": 200,
+        "chunk_overlap": 20
+    })
+    strategy._embedder = embedder
+    asyncio.run(strategy.initialize())
+    return strategy
+
+
+class TestVectorDocumentResearch:
+    """Test the persistent chunk index"""
+
+    def test_index_persists_and_reembeds_only_changed_files(self, tmp_path):
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "bread.md").write_text("Proof the yeast in warm water. " * 10)
+        (docs / "oven.md").write_text("Preheat the oven until the oven is hot. " * 10)
+        (docs / "knives.md").write_text("Keep the knife sharp.")
+
+        first = KeywordEmbedder()
+        strategy = _strategy(tmp_path, first)
+        total = len(strategy._chunks)
+        assert first.encoded == total
+        assert (docs / ".vector_index" / "documents.manifest.json").exists()
+
+        results = asyncio.run(strategy.search("which oven setting", limit=2))
+        assert results and all(r.source.endswith("oven.md") for r in results)
+        assert results[0].metadata["search_type"] == "vector"
+
+        # Restart with nothing changed: nothing is re-embedded, index files are not re-chunked
+        second = KeywordEmbedder()
+        strategy = _strategy(tmp_path, second)
+        assert second.encoded == 0
+        assert len(strategy._chunks) == total
+
+        # One file edited, one deleted
+        (docs / "knives.md").write_text("A sharp knife is a safe knife.")
+        (docs / "bread.md").unlink()
+        third = KeywordEmbedder()
+        strategy = _strategy(tmp_path, third)
+        assert third.encoded == 1
+        assert len(strategy._vector_db) == len(strategy._chunks)
+
+        results = asyncio.run(strategy.search("knife", limit=5))
+        assert [r.source.endswith("knives.md") for r in results] == [True]
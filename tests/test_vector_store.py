@@ -0,0 +1,357 @@
+"""
+Tests for the matrix-backed VectorStore
+
+Verifies the contiguous-matrix store agrees with brute-force cosine scoring
+and that in-place append/remove keep the id <-> row index consistent.
+"""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from generic_framework.core.embeddings import VectorStore
+
+
+def _cosine(a, b):
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(0)
+    s = VectorStore(tmp_path)
+    vectors = {f"p{i}": rng.normal(size=16) for i in range(100)}
+    for pid, vec in vectors.items():
+        s.set(pid, vec)
+    return s, vectors
+
+
+class TestVectorStore:
+    """Test VectorStore"""
+
+    def test_search_matches_brute_force(self, store):
+        """Top-k from the matrix matches a per-pattern cosine loop"""
+        s, vectors = store
+        query = np.random.default_rng(1).normal(size=16)
+
+        expected = sorted(
+            ((pid, _cosine(query, vec)) for pid, vec in vectors.items()),
+            key=lambda x: x[1], reverse=True
+        )[:5]
+        results = s.search(query, top_k=5)
+
+        assert [pid for pid, _ in results] == [pid for pid, _ in expected]
+        for (_, got), (_, want) in zip(results, expected):
+            assert got == pytest.approx(want, abs=1e-5)
+
+    def test_search_restricted_to_ids(self, store):
+        """pattern_ids limits the candidate set"""
+        s, vectors = store
+        query = vectors["p7"]
+
+        results = s.search(query, top_k=3, pattern_ids=["p7", "p8", "missing"])
+
+        assert results[0][0] == "p7"
+        assert {pid for pid, _ in results} == {"p7", "p8"}
+
+    def test_threshold(self, store):
+        """Results below threshold are dropped"""
+        s, vectors = store
+        results = s.search(vectors["p3"], top_k=100, threshold=0.99)
+        assert [pid for pid, _ in results] == ["p3"]
+
+    def test_remove_keeps_index_consistent(self, store):
+        """Removing moves the last row into the freed slot"""
+        s, vectors = store
+        s.remove("p10")
+        s.remove("p99")
+        s.remove("unknown")
+
+        assert len(s) == 98
+        assert not s.has("p10")
+        for pid in ("p0", "p50", "p98"):
+            assert _cosine(s.get(pid), vectors[pid]) == pytest.approx(1.0, abs=1e-5)
+        assert s.search(vectors["p98"], top_k=1)[0][0] == "p98"
+
+    def test_overwrite_in_place(self, store):
+        """set() on an existing id replaces its row"""
+        s, vectors = store
+        s.set("p1", vectors["p2"])
+
+        assert len(s) == 100
+        assert s.similarities(vectors["p2"], ["p1"])["p1"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_dimension_mismatch(self, store):
+        """Vectors of a different dimension are rejected"""
+        s, _ = store
+        with pytest.raises(ValueError):
+            s.set("bad", np.ones(8))
+
+    def test_save_load_roundtrip(self, store, tmp_path):
+        """Embeddings survive save/load"""
+        s, vectors = store
+        s.save()
+
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+
+        assert len(loaded) == 100
+        assert loaded.search(vectors["p42"], top_k=1)[0][0] == "p42"
+
+    def test_load_is_memory_mapped(self, store, tmp_path):
+        """Saved stores are memory-mapped on load and detached on first write"""
+        s, vectors = store
+        s.save()
+
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+        assert isinstance(loaded.matrix.base, np.memmap) or isinstance(loaded.matrix, np.memmap)
+
+        loaded.set("p0", vectors["p1"])
+        assert loaded.similarities(vectors["p1"], ["p0"])["p0"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_incremental_save(self, store, tmp_path):
+        """Appends, overwrites and removals persist without rewriting saved rows"""
+        s, vectors = store
+        s.save()
+        saved = (tmp_path / "embeddings.f32").read_bytes()
+
+        extra = np.random.default_rng(2).normal(size=16)
+        s.set("new", extra)
+        s.set("p5", vectors["p6"])
+        s.remove("p0")
+        s.save()
+
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+
+        assert len(loaded) == 100
+        assert not loaded.has("p0")
+        assert loaded.search(extra, top_k=1)[0][0] == "new"
+        assert loaded.similarities(vectors["p6"], ["p5"])["p5"] == pytest.approx(1.0, abs=1e-5)
+        assert all(np.allclose(loaded.get(pid), s.get(pid)) for pid in s.ids)
+        # "new" and the overwritten p5 are appended; p0 is only a tombstone
+        data = (tmp_path / "embeddings.f32").read_bytes()
+        assert len(data) == 102 * 16 * 4
+        assert data.startswith(saved)
+        assert '{"deleted": "p0"}' in (tmp_path / "embeddings.ids").read_text()
+
+    def test_save_compacts_dead_rows(self, store, tmp_path):
+        """Once superseded rows outnumber live ones the files are rewritten"""
+        s, vectors = store
+        s.save()
+
+        for round_ in range(2):
+            for i in range(60):
+                s.set(f"p{i}", vectors[f"p{99 - i}"])
+            s.save()
+
+        assert (tmp_path / "embeddings.f32").stat().st_size == 100 * 16 * 4
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+        assert len(loaded) == 100
+        assert loaded.similarities(vectors["p90"], ["p9"])["p9"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_save_leaves_other_maps_intact(self, tmp_path):
+        """A store mapping the same directory keeps its snapshot across saves"""
+        rng = np.random.default_rng(3)
+        vectors = {f"p{i}": rng.normal(size=16) for i in range(2000)}
+        seed = VectorStore(tmp_path)
+        seed.load_matrix(list(vectors), np.stack(list(vectors.values())))
+        seed.save()
+
+        writer, reader = VectorStore(tmp_path), VectorStore(tmp_path)
+        writer.load()
+        reader.load()
+        before = np.array(reader.matrix)
+
+        for i in range(1990):
+            writer.remove(f"p{i}")
+        writer.set("p1995", vectors["p0"])
+        writer.save()
+
+        assert np.array_equal(reader.matrix, before)
+        assert reader.search(vectors["p10"], top_k=1)[0][0] == "p10"
+
+        fresh = VectorStore(tmp_path)
+        fresh.load()
+        assert len(fresh) == 10
+        assert fresh.search(vectors["p0"], top_k=1)[0][0] == "p1995"
+
+    def test_append_only_save_extends_file(self, store, tmp_path):
+        """New rows are appended without disturbing rows a reader has mapped"""
+        s, vectors = store
+        s.save()
+
+        reader = VectorStore(tmp_path)
+        reader.load()
+        s.set("new", np.ones(16))
+        s.save()
+
+        assert len(reader) == 100
+        assert reader.search(vectors["p7"], top_k=1)[0][0] == "p7"
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+        assert len(loaded) == 101 and loaded.has("new")
+
+
+class TestEmbeddingMigration:
+    """Test legacy JSON migration"""
+
+    def test_migrate_json(self, tmp_path):
+        """embeddings.json converts to the binary format"""
+        from generic_framework.core.embeddings import migrate_json_embeddings
+
+        raw = {"a": [1.0, 0.0, 0.0], "b": [0.0, 2.0, 0.0]}
+        (tmp_path / "embeddings.json").write_text(json.dumps(raw))
+
+        assert migrate_json_embeddings(tmp_path) == 2
+
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+        assert loaded.ids == ["a", "b"]
+        assert loaded.search(np.array([0.0, 1.0, 0.0]), top_k=1)[0][0] == "b"
+
+    def test_migrate_keeps_newer_binary(self, tmp_path):
+        """Re-running the migration does not replace vectors written since"""
+        from generic_framework.core.embeddings import migrate_json_embeddings
+
+        (tmp_path / "embeddings.json").write_text(json.dumps({"a": [1.0, 0.0, 0.0]}))
+        assert migrate_json_embeddings(tmp_path) == 1
+
+        store = VectorStore(tmp_path)
+        store.load()
+        store.set("new", np.array([0.0, 0.0, 1.0]))
+        store.save()
+
+        assert migrate_json_embeddings(tmp_path) is None
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+        assert loaded.ids == ["a", "new"]
+
+        assert migrate_json_embeddings(tmp_path, force=True) == 1
+        loaded.load()
+        assert loaded.ids == ["a"]
+
+    def test_legacy_json_read_when_no_binary(self, tmp_path):
+        """load() falls back to embeddings.json"""
+        (tmp_path / "embeddings.json").write_text(json.dumps({"a": [3.0, 4.0]}))
+
+        loaded = VectorStore(tmp_path)
+        loaded.load()
+        assert loaded.get("a") == pytest.approx([0.6, 0.8])
+
+
+def _clustered(n, dim=32, clusters=50, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    return centres[rng.integers(clusters, size=n)] + 0.8 * rng.normal(size=(n, dim))
+
+
+class TestANNIndex:
+    """Test the IVF index behind VectorStore"""
+
+    def test_exact_below_min_size(self, tmp_path):
+        """Stores smaller than min_size never consult the index"""
+        s = VectorStore(tmp_path, index_config={"type": "ivf", "min_size": 1000})
+        for i, vec in enumerate(_clustered(200)):
+            s.set(f"p{i}", vec)
+
+        assert not s.ann_active
+        assert s.search(np.ones(32), top_k=3)
+        assert not s.ann.is_built
+
+    def test_recall_and_incremental_updates(self, tmp_path):
+        """IVF search meets its recall target and follows inserts/deletes"""
+        vectors = _clustered(3000)
+        s = VectorStore(tmp_path, index_config={"type": "ivf", "min_size": 500, "nprobe": 1, "min_recall": 0.97})
+        for i, vec in enumerate(vectors):
+            s.set(f"p{i}", vec)
+        assert s.ann_active
+        s.build_ann_index(wait=True)
+
+        # Fresh queries from the same distribution
+        queries = vectors[:40] + 0.8 * np.random.default_rng(1).normal(size=(40, 32))
+        approx = [s.search(q, top_k=10) for q in queries]
+        assert s.ann.recall >= 0.97
+        assert s.ann.nprobe > 1  # widened by the self-check
+
+        exact = [s.search(q, top_k=10, pattern_ids=s.ids) for q in queries]
+        hits = sum(len({p for p, _ in a} & {p for p, _ in e}) for a, e in zip(approx, exact))
+        assert hits / (10 * len(queries)) >= 0.85
+
+        # New vectors are findable without a rebuild; removed ones disappear
+        s.set("new", vectors[7] * 3)
+        assert "new" in [pid for pid, _ in s.search(vectors[7], top_k=3)]
+        s.remove("p7")
+        s.remove("new")
+        assert {"p7", "new"}.isdisjoint(pid for pid, _ in s.search(vectors[7], top_k=10))
+        assert s.index_stats()["indexed"] == 2999
+
+    def test_search_stays_exact_while_building(self, tmp_path, monkeypatch):
+        """The first search starts a background build instead of training inline"""
+        vectors = _clustered(1000)
+        s = VectorStore(tmp_path, index_config={"type": "ivf", "min_size": 500})
+        for i, vec in enumerate(vectors):
+            s.set(f"p{i}", vec)
+
+        release = threading.Event()
+        real_build = s.ann.build
+        monkeypatch.setattr(s.ann, "build", lambda ids, matrix: (release.wait(5), real_build(ids, matrix)))
+
+        assert s.search(vectors[3], top_k=1)[0][0] == "p3"
+        assert not s.ann.is_built
+        s.set("late", vectors[3] * 2)
+        s.remove("p4")
+
+        release.set()
+        s.build_ann_index(wait=True)
+        assert s.ann.is_built
+        assert s.index_stats()["indexed"] == 1000
+        assert "late" in [pid for pid, _ in s.search(vectors[3], top_k=2)]
+
+    def test_load_builds_index_in_background(self, tmp_path):
+        """Loading a store past min_size trains the index without a query"""
+        s = VectorStore(tmp_path)
+        for i, vec in enumerate(_clustered(600)):
+            s.set(f"p{i}", vec)
+        s.save()
+
+        loaded = VectorStore(tmp_path, index_config={"type": "ivf", "min_size": 500})
+        loaded.load()
+        assert loaded._ann_thread is not None
+        loaded.build_ann_index(wait=True)
+        assert loaded.ann.is_built and loaded.index_stats()["indexed"] == 600
+
+    def test_hybrid_subset_is_scored_exactly(self, tmp_path):
+        """A filtered HybridSearcher search keeps semantic scores for its subset"""
+        from generic_framework.core.hybrid_search import HybridSearcher
+
+        vectors = _clustered(3000)
+        s = VectorStore(tmp_path, index_config={"type": "ivf", "min_size": 500})
+        for i, vec in enumerate(vectors):
+            s.set(f"p{i}", vec)
+        s.build_ann_index(wait=True)
+
+        class Embeddings:
+            is_loaded = True
+
+            def encode(self, text):
+                return vectors[0]
+
+        # A "category" well outside the global top candidates
+        ranked = [pid for pid, _ in s.search(vectors[0], top_k=3000, pattern_ids=s.ids)]
+        subset = ranked[500:550]
+        patterns = [{"id": pid, "name": pid} for pid in subset]
+
+        results = HybridSearcher(Embeddings(), s).search("q", patterns, {}, top_k=5)
+        assert [r.pattern["id"] for r in results] == subset[:5]
+        assert all(r.semantic_score > 0 for r in results)
+
+    def test_exact_config_has_no_index(self, tmp_path):
+        """type "exact" (the default) keeps brute-force search"""
+        assert VectorStore(tmp_path, index_config={"type": "exact"}).index_stats()["type"] == "exact"
+        with pytest.raises(ValueError):
+            VectorStore(tmp_path, index_config={"type": "lsh"})